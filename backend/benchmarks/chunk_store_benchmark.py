@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+"""
+chunk_store_benchmark.py
+
+Benchmark of the compact ChunkStore against a list of langchain Documents.
+- Builds web-like sections (about 1 KB of text, url/title/html_content_length metadata)
+- Measures the memory held by both layouts with tracemalloc and the time to build them
+- Measures the time to read the top-k Documents of a search from each layout
+
+Run from the backend folder:
+    python -m benchmarks.chunk_store_benchmark [--sizes 10000 100000]
+"""
+
+import argparse
+import random
+import time
+import tracemalloc
+from typing import Callable, List, Sequence, Tuple
+
+from langchain_core.documents import Document
+
+from src.utils.chunk_store import ChunkStore
+
+SECTIONS_PER_PAGE = 12
+TOP_K = 8
+LOOKUPS = 2_000
+
+WORDS = (
+    "estimator fit predict transform pipeline regression classifier kernel "
+    "gradient feature sample matrix sparse dense cross validation score"
+).split()
+
+
+def make_section(n: int, rng: random.Random) -> Document:
+    page = n // SECTIONS_PER_PAGE
+    text = " ".join(rng.choices(WORDS, k=140))
+    return Document(
+        page_content=f"Section {n}: {text}",
+        metadata={
+            "url": f"https://scikit-learn.org/stable/modules/page_{page}.html",
+            "title": f"Page {page} - scikit-learn documentation",
+            "html_content_length": str(40_000 + page),
+        },
+    )
+
+
+def traced(build: Callable[[], Sequence[Document]]) -> Tuple[Sequence[Document], float, float]:
+    """Returns what `build` returns, the MB it holds and the seconds it took."""
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        started = time.perf_counter()
+        built = build()
+        elapsed = time.perf_counter() - started
+        held = (tracemalloc.get_traced_memory()[0] - before) / 1e6
+    finally:
+        tracemalloc.stop()
+    return built, held, elapsed
+
+
+def lookup_ms(sections: Sequence[Document], chunk_ids: List[List[int]]) -> float:
+    """Milliseconds per search to read the Documents of its top-k chunk IDs."""
+    started = time.perf_counter()
+    for top_k in chunk_ids:
+        [sections[chunk_id].page_content for chunk_id in top_k]
+    return (time.perf_counter() - started) / len(chunk_ids) * 1000
+
+
+def run(size: int) -> None:
+    # Both layouts hold the same sections; the Documents are regenerated for each
+    documents, documents_mb, documents_s = traced(
+        lambda: [make_section(n, random.Random(n)) for n in range(size)]
+    )
+    store, store_mb, store_s = traced(
+        lambda: ChunkStore(make_section(n, random.Random(n)) for n in range(size))
+    )
+
+    rng = random.Random(0)
+    chunk_ids = [rng.sample(range(size), TOP_K) for _ in range(LOOKUPS)]
+    documents_lookup = lookup_ms(documents, chunk_ids)
+    store_lookup = lookup_ms(store, chunk_ids)
+    assert [store[i].page_content for i in chunk_ids[0]] == [
+        documents[i].page_content for i in chunk_ids[0]
+    ]
+
+    print(
+        f"{size:>7} sections | memory: Documents {documents_mb:8.1f} MB, "
+        f"ChunkStore {store_mb:7.1f} MB ({documents_mb / store_mb:4.1f}x less) | "
+        f"build: {documents_s:5.2f} s vs {store_s:5.2f} s | "
+        f"top-{TOP_K} read: {documents_lookup:.3f} ms vs {store_lookup:.3f} ms"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[3])
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=[10_000, 100_000]
+    )
+    args = parser.parse_args()
+    for size in args.sizes:
+        run(size)
+
+
+if __name__ == "__main__":
+    main()
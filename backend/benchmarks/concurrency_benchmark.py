@@ -0,0 +1,191 @@
+# -*- coding: utf-8 -*-
+"""
+concurrency_benchmark.py
+
+Benchmark of concurrent conversations through the chatbot graph.
+- Builds the graph with local fakes: a Flash LLM rewriting questions, embeddings and
+  searches, and a chat model answering, each waiting like a remote call (time.sleep on the
+  sync path, asyncio.sleep on the async path)
+- Runs the sessions (each a new conversation) with graph.ainvoke on one event loop, with
+  graph.invoke on a thread per session, and with graph.invoke on the default asyncio
+  executor (asyncio.to_thread)
+- Reports the wall time, sessions per second, p50/p95 session latency and the peak number
+  of threads of each mode
+
+Run from the backend folder:
+    python -m benchmarks.concurrency_benchmark [--sessions 100] [--answer-ms 800]
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List
+
+from langchain_core.documents import Document
+from langchain_core.messages import AIMessage
+
+from src.config.config_init import QUESTION_REWRITE_CONFIG
+
+MODES = ("async", "threads", "to_thread")
+
+
+class FakeModel:
+    """Answers after a latency: rewrites for the Flash LLM, a short answer otherwise."""
+
+    def __init__(self, latency: float, rewrites: bool) -> None:
+        self._latency = latency
+        self._rewrites = rewrites
+
+    def _answer(self, prompt) -> AIMessage:
+        if self._rewrites and "</question>" in str(prompt):
+            question = str(prompt).split("</question>")[-2].strip()
+            return AIMessage(content=json.dumps({"language": "en", "question": question}))
+        return AIMessage(content="The answer.")
+
+    def invoke(self, prompt):
+        time.sleep(self._latency)
+        return self._answer(prompt)
+
+    async def ainvoke(self, prompt):
+        await asyncio.sleep(self._latency)
+        return self._answer(prompt)
+
+
+class FakeEmbeddingManager:
+    """Embeds and searches with a latency, like a remote embedding model."""
+
+    def __init__(self, embed_latency: float, search_latency: float) -> None:
+        self._embed_latency = embed_latency
+        self._search_latency = search_latency
+
+    def embed_query(self, query):
+        time.sleep(self._embed_latency)
+        return [0.0] * 8
+
+    async def aembed_query(self, query):
+        await asyncio.sleep(self._embed_latency)
+        return [0.0] * 8
+
+    def query_local_embeddings_by_vector(self, embedding, k):
+        time.sleep(self._search_latency)
+        return [Document(page_content="local section")] * k
+
+    def query_web_embeddings_by_vector(self, embedding, k):
+        time.sleep(self._search_latency)
+        return [Document(page_content="web section")] * k
+
+    async def aquery_local_embeddings_by_vector(self, embedding, k):
+        await asyncio.sleep(self._search_latency)
+        return [Document(page_content="local section")] * k
+
+    async def aquery_web_embeddings_by_vector(self, embedding, k):
+        await asyncio.sleep(self._search_latency)
+        return [Document(page_content="web section")] * k
+
+
+class FakeModelManager:
+    def __init__(self, args: argparse.Namespace) -> None:
+        self.flash_llm = FakeModel(args.translate_ms / 1000, rewrites=True)
+        self.llm = FakeModel(args.answer_ms / 1000, rewrites=False)
+
+
+def session_input(n: int):
+    question = f"How do I use the estimator number {n} in Laredo?"
+    return {"question": question}, {"configurable": {"thread_id": f"session {n}"}}
+
+
+# Each mode returns the latency of every session, from the start of the run (so time spent
+# waiting for a worker counts) to its answer
+
+
+def run_async(graph, sessions: int) -> List[float]:
+    async def session(n: int, started: float) -> float:
+        await graph.ainvoke(*session_input(n))
+        return (time.perf_counter() - started) * 1000
+
+    async def run() -> List[float]:
+        started = time.perf_counter()
+        return list(await asyncio.gather(*(session(n, started) for n in range(sessions))))
+
+    return asyncio.run(run())
+
+
+def sync_session(graph, n: int, started: float) -> float:
+    graph.invoke(*session_input(n))
+    return (time.perf_counter() - started) * 1000
+
+
+def run_threads(graph, sessions: int) -> List[float]:
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=sessions) as executor:
+        return list(executor.map(lambda n: sync_session(graph, n, started), range(sessions)))
+
+
+def run_to_thread(graph, sessions: int) -> List[float]:
+    async def run() -> List[float]:
+        started = time.perf_counter()
+        return list(
+            await asyncio.gather(
+                *(asyncio.to_thread(sync_session, graph, n, started) for n in range(sessions))
+            )
+        )
+
+    return asyncio.run(run())
+
+
+def measure(run: Callable[[object, int], List[float]], graph, sessions: int) -> str:
+    peak = [threading.active_count()]
+    stop = threading.Event()
+
+    def sample() -> None:
+        while not stop.wait(0.01):
+            peak[0] = max(peak[0], threading.active_count())
+
+    sampler = threading.Thread(target=sample)
+    sampler.start()
+    started = time.perf_counter()
+    latencies = run(graph, sessions)
+    elapsed = time.perf_counter() - started
+    stop.set()
+    sampler.join()
+
+    cuts = statistics.quantiles(latencies, n=100)
+    return (
+        f"{elapsed * 1000:8.0f} ms | {sessions / elapsed:6.1f} sessions/s | "
+        f"p50 {cuts[49]:7.0f} ms, p95 {cuts[94]:7.0f} ms | peak threads {peak[0] - 1}"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[3])
+    parser.add_argument("--sessions", type=int, default=100)
+    parser.add_argument("--modes", nargs="+", default=list(MODES), choices=MODES)
+    parser.add_argument("--translate-ms", type=float, default=300.0)
+    parser.add_argument("--embed-ms", type=float, default=100.0)
+    parser.add_argument("--search-ms", type=float, default=5.0)
+    parser.add_argument("--answer-ms", type=float, default=800.0)
+    args = parser.parse_args()
+
+    from src.chatbot.graph_initializer import GraphInitializer
+
+    graph = GraphInitializer(
+        FakeModelManager(args),  # type: ignore
+        FakeEmbeddingManager(args.embed_ms / 1000, args.search_ms / 1000),  # type: ignore
+        # Every question goes through the (fake) translate LLM
+        rewrite_config={**QUESTION_REWRITE_CONFIG, "fast_path": False, "cache_enabled": False},
+    )
+    graph.build_graph()
+
+    runs = {"async": run_async, "threads": run_threads, "to_thread": run_to_thread}
+    one_session = args.translate_ms + args.embed_ms + args.search_ms + args.answer_ms
+    print(f"{args.sessions} sessions, about {one_session:.0f} ms of model calls each")
+    for mode in args.modes:
+        print(f"  {mode:9} | {measure(runs[mode], graph.graph, args.sessions)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,184 @@
+# -*- coding: utf-8 -*-
+"""
+conversation_memory_benchmark.py
+
+Benchmark of the prompt size of long conversations with the token-budgeted memory.
+- Runs one long conversation through the chatbot graph with local fakes: a chat model
+  giving Markdown answers with Gemini-like metadata, a Flash LLM giving summaries
+- Compares the previous memory (message reprs in the prompt, summary past 6 messages
+  keeping the last 2) with the token-budgeted one (compact transcript, summary past
+  "summarize_above_tokens" keeping "recent_tokens" of turns)
+- Reports the mean and max tokens of the answer prompts and of their history, the
+  summaries made, the tokens sent over the conversation and the prefill time they cost
+  (modelled per 1k prompt tokens, the fakes answer instantly)
+
+Run from the backend folder:
+    python -m benchmarks.conversation_memory_benchmark [--turns 30] [--answer-words 200]
+"""
+
+import argparse
+import math
+import statistics
+import uuid
+from typing import Dict, List, Sequence, Tuple
+
+from langchain_core.documents import Document
+from langchain_core.messages import AIMessage, BaseMessage
+
+from src.config.config_init import QUESTION_REWRITE_CONFIG, SUMMARY_CONFIG
+from src.utils.conversation_memory import ConversationMemory
+
+WORDS = (
+    "estimator pipeline parameter dataset fit predict transform feature model score "
+    "cross validation grid search scaler encoder split metric regression classifier"
+).split()
+SAFETY_RATINGS = [
+    {"category": f"HARM_CATEGORY_{category}", "probability": "NEGLIGIBLE", "blocked": False}
+    for category in ("HATE_SPEECH", "DANGEROUS_CONTENT", "HARASSMENT", "SEXUALLY_EXPLICIT")
+]
+
+
+def tokens(text: str) -> int:
+    return math.ceil(len(text) / 4)
+
+
+class LegacyMemory(ConversationMemory):
+    """The previous memory: message reprs, summary past 6 messages keeping the last 2."""
+
+    def render(self, messages: Sequence[BaseMessage]) -> str:
+        return str(list(messages))
+
+    def split(self, messages, budget=None) -> Tuple[List[BaseMessage], List[BaseMessage]]:
+        return list(messages[:-2]), list(messages[-2:])
+
+    def needs_summary(self, messages: Sequence[BaseMessage]) -> bool:
+        return len(messages) > 6
+
+    def prompt_messages(self, messages: Sequence[BaseMessage]) -> List[BaseMessage]:
+        return list(messages)
+
+
+class FakeLLM:
+    """Answers with Markdown of a fixed length and records the size of every prompt."""
+
+    def __init__(self, answer_words: int) -> None:
+        self._answer_words = answer_words
+        self.prompts: List[int] = []
+        self.histories: List[int] = []
+
+    def invoke(self, messages):
+        prompt = "\n".join(str(m.content) for m in messages)
+        history = next(
+            (str(m.content) for m in messages if "Recent conversation history" in str(m.content)),
+            "",
+        )
+        self.prompts.append(tokens(prompt))
+        self.histories.append(tokens(history))
+        n = len(self.prompts)
+        words = [WORDS[(n * 7 + i) % len(WORDS)] for i in range(self._answer_words)]
+        lines = [" ".join(words[i : i + 12]) for i in range(0, len(words), 12)]
+        content = f"## Answer {n}\n\n" + "\n".join(f"- {line}." for line in lines)
+        return AIMessage(
+            content=content,
+            id=f"run-{uuid.uuid4()}-0",
+            response_metadata={
+                "prompt_feedback": {"block_reason": 0, "safety_ratings": []},
+                "finish_reason": "STOP",
+                "model_name": "gemini-2.0-flash",
+                "safety_ratings": SAFETY_RATINGS,
+            },
+            usage_metadata={
+                "input_tokens": self.prompts[-1],
+                "output_tokens": tokens(content),
+                "total_tokens": self.prompts[-1] + tokens(content),
+            },
+        )
+
+
+class FakeFlashLLM:
+    """Summarizes conversations with a fixed-length summary."""
+
+    def __init__(self, summary_words: int) -> None:
+        self._summary_words = summary_words
+        self.prompts: List[int] = []
+
+    def invoke(self, messages):
+        self.prompts.append(tokens("\n".join(str(m.content) for m in messages)))
+        return AIMessage(content=" ".join(WORDS[i % len(WORDS)] for i in range(self._summary_words)))
+
+
+class FakeEmbeddingManager:
+    def embed_query(self, query):
+        return [1.0, 0.0]
+
+    def query_local_embeddings_by_vector(self, embedding, k):
+        return [Document(page_content="local section")]
+
+    query_web_embeddings_by_vector = query_local_embeddings_by_vector
+
+
+class FakeModelManager:
+    def __init__(self, args: argparse.Namespace) -> None:
+        self.flash_llm = FakeFlashLLM(args.summary_words)
+        self.llm = FakeLLM(args.answer_words)
+
+
+def run(legacy: bool, args: argparse.Namespace) -> Dict[str, float]:
+    from src.chatbot.graph_initializer import GraphInitializer
+
+    models = FakeModelManager(args)
+    graph = GraphInitializer(
+        models,  # type: ignore
+        FakeEmbeddingManager(),  # type: ignore
+        rewrite_config={**QUESTION_REWRITE_CONFIG, "cache_enabled": False},
+        # The summary is written before the next turn either way (invoke waits for it)
+        summary_config={**SUMMARY_CONFIG, "background": True},
+    )
+    if legacy:
+        graph._memory = LegacyMemory()
+    graph.build_graph()
+    config = {"configurable": {"thread_id": "legacy" if legacy else "budgeted"}}
+    for n in range(args.turns):
+        graph.invoke({"question": f"How do I tune the {WORDS[n % len(WORDS)]} of case {n}?"}, config)
+
+    answers = models.llm.prompts
+    summaries = models.flash_llm.prompts
+    sent = sum(answers) + sum(summaries)
+    return {
+        "prompt_mean": statistics.fmean(answers),
+        "prompt_max": max(answers),
+        "history_mean": statistics.fmean(models.llm.histories),
+        "history_max": max(models.llm.histories),
+        "summaries": len(summaries),
+        "sent": sent,
+        "prefill_ms": sum(answers) * args.ms_per_1k_tokens / 1000,
+        "sent_ms": sent * args.ms_per_1k_tokens / 1000,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[3])
+    parser.add_argument("--turns", type=int, default=30)
+    parser.add_argument("--answer-words", type=int, default=200)
+    parser.add_argument("--summary-words", type=int, default=120)
+    parser.add_argument("--ms-per-1k-tokens", type=float, default=100.0)
+    args = parser.parse_args()
+
+    print(
+        f"{args.turns} turns, {args.answer_words}-word answers, budgets "
+        f"{SUMMARY_CONFIG['summarize_above_tokens']}/{SUMMARY_CONFIG['recent_tokens']} tokens, "
+        f"{args.ms_per_1k_tokens:g} ms prefill per 1k prompt tokens"
+    )
+    for legacy in (True, False):
+        r = run(legacy, args)
+        print(
+            f"  {'previous' if legacy else 'budgeted'} | answer prompt mean {r['prompt_mean']:6.0f}, "
+            f"max {r['prompt_max']:6.0f} tokens | history mean {r['history_mean']:6.0f}, "
+            f"max {r['history_max']:6.0f} | {r['summaries']:2d} summaries | "
+            f"{r['sent']:7.0f} tokens sent | prefill {r['prefill_ms']:6.0f} ms answering, "
+            f"{r['sent_ms']:6.0f} ms in all"
+        )
+
+
+if __name__ == "__main__":
+    main()
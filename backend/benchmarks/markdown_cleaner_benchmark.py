@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+"""
+markdown_cleaner_benchmark.py
+
+Benchmark of MarkdownCleaner against the previous plain-words cleaning of DocumentManager
+(one `re.sub` call per rule, reproduced below as `legacy_clean`).
+- Splits the Markdown files in the docs directory like DocumentManager does
+- Reports sections per second of both implementations and checks they give the same text
+
+Run from the backend folder:
+    python -m benchmarks.markdown_cleaner_benchmark [--rounds 50]
+"""
+
+import argparse
+import glob
+import re
+import time
+from typing import Callable, List
+
+from langchain.text_splitter import MarkdownTextSplitter
+
+from src.config.config_init import MARKDOWN_SPLITTER_CONFIG
+from src.utils.markdown_cleaner import MarkdownCleaner
+
+
+def legacy_clean(section: str) -> str:
+    """The cleaning chain that DocumentManager._process_section used to run."""
+    text = section
+    text = re.sub(r"```[\s\S]*?```", "", text)
+    text = re.sub(r"!\[[^\]]*\]\([^\)]*\)", "", text)
+    text = re.sub(r"\[[^\]]*\]\([^\)]*\)", "", text)
+    text = re.sub(r"\[\[[^\]]*\]\]\([^\)]*\)", "", text)
+    text = re.sub(r"\[[^\]]*\]\[[^\]]*\]", "", text)
+    text = re.sub(r"\[\^\d+\]", "", text)
+    text = re.sub(r"^\s*\|.*\|\s*$", "", text, flags=re.MULTILINE)
+    text = re.sub(r"^\s*\|?\s*:?-+:?\s*\|.*$", "", text, flags=re.MULTILINE)
+    text = re.sub(r"<[^>]+>", "", text)
+    text = re.sub(r"^#+\s*", "", text, flags=re.MULTILINE)
+    text = re.sub(r"(\*\*|__|\*|_)", "", text)
+    text = re.sub(r"`+", "", text)
+    text = re.sub(r"^>\s*", "", text, flags=re.MULTILINE)
+    text = re.sub(r"^(\s*[-*+])\s+", "", text, flags=re.MULTILINE)
+    text = re.sub(r"^---+$", "", text, flags=re.MULTILINE)
+    text = re.sub(r"\n+", "\n", text)
+    text = re.sub(r"\t+", "\t", text)
+    return text.strip()
+
+
+def _sections_per_second(clean: Callable[[str], str], sections: List[str], rounds: int) -> float:
+    started = time.perf_counter()
+    for _ in range(rounds):
+        for section in sections:
+            clean(section)
+    return len(sections) * rounds / (time.perf_counter() - started)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[3])
+    parser.add_argument("--rounds", type=int, default=50)
+    args = parser.parse_args()
+
+    splitter = MarkdownTextSplitter(**MARKDOWN_SPLITTER_CONFIG)
+    sections: List[str] = []
+    for path in sorted(glob.glob("./docs/*.md")):
+        with open(path, encoding="utf-8") as file:
+            sections.extend(splitter.split_text(file.read()))
+    assert all(legacy_clean(s) == MarkdownCleaner.clean(s) for s in sections)
+    print(f"{len(sections)} sections, {args.rounds} rounds")
+
+    before = _sections_per_second(legacy_clean, sections, args.rounds)
+    after = _sections_per_second(MarkdownCleaner.clean, sections, args.rounds)
+    print(f"before (re.sub per rule) | {before:9.0f} sections/s")
+    print(f"after  (MarkdownCleaner) | {after:9.0f} sections/s | speedup {after / before:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,224 @@
+# -*- coding: utf-8 -*-
+"""
+mixed_load_benchmark.py
+
+Benchmark of /chatbot retrieval latency while documents are upserted and deleted.
+- Serves the Flask app with a retrieval-only service (no LLM) over a generated docs directory
+- Runs reader threads posting questions to /chatbot, first alone, then while a writer thread
+  upserts and deletes documents through /admin/documents
+- Reports the read throughput and p50/p95/p99 latencies, the write latencies, and checks
+  that no read saw two versions of a document, for the in-memory and the Chroma managers
+
+Run from the backend folder:
+    python -m benchmarks.mixed_load_benchmark [--managers in_memory chroma] [--seconds 5]
+"""
+
+import argparse
+import hashlib
+import os
+import re
+import shutil
+import statistics
+import tempfile
+import threading
+import time
+from typing import Dict, List
+
+from langchain_core.embeddings import Embeddings
+
+from src.api.api import create_app
+from src.api.chatbot_service import ChatbotService
+from src.config.config_init import ADMIN_API_CONFIG
+from src.utils.document_manager import DocumentManager
+from src.utils.document_updater import DocumentUpdater
+
+TOKEN = "benchmark-admin-token"
+DIMENSIONS = 64
+WORDS = (
+    "estimator fit predict transform pipeline regression classifier kernel "
+    "gradient feature sample matrix sparse dense cross validation score"
+).split()
+UPDATED_FILES = 5  # Files the writer keeps replacing
+VERSION_PATTERN = re.compile(r"Version (\d+) of (doc_\d+)")
+
+
+class HashingEmbeddings(Embeddings):
+    """Embeds word counts into hashed buckets, waiting like a remote model per call."""
+
+    def __init__(self, latency: float) -> None:
+        self._latency = latency
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        time.sleep(self._latency)
+        return [self._embed(text) for text in texts]
+
+    def embed_query(self, text: str) -> List[float]:
+        time.sleep(self._latency)
+        return self._embed(text)
+
+    @staticmethod
+    def _embed(text: str) -> List[float]:
+        vector = [0.0] * DIMENSIONS
+        for word in text.lower().split():
+            vector[hashlib.md5(word.encode()).digest()[0] % DIMENSIONS] += 1.0
+        return vector
+
+
+class RetrievalService:
+    """Answers with the retrieved sections of both collections instead of calling an LLM."""
+
+    upsert_document = ChatbotService.upsert_document
+    delete_document = ChatbotService.delete_document
+
+    def __init__(self, document_updater, embedding_manager) -> None:
+        self.document_updater = document_updater
+        self.embedding_manager = embedding_manager
+
+    async def generate_response(self, question: str) -> List[List[str]]:
+        results = self.embedding_manager.query_embeddings(question, k=8)
+        # The (version, file) pairs of the retrieved sections
+        return [
+            list(match)
+            for r in results
+            for match in VERSION_PATTERN.findall(r.page_content)
+        ]
+
+
+def page(name: str, version: int, paragraphs: int) -> str:
+    return f"# {name}\n\n" + "\n\n".join(
+        f"Version {version} of {name} paragraph {n}: "
+        + " ".join(WORDS[(n + i) % len(WORDS)] for i in range(30))
+        for n in range(paragraphs)
+    )
+
+
+def build_docs(directory: str, files: int, paragraphs: int) -> None:
+    os.makedirs(os.path.join(directory, "bench"))
+    for n in range(files):
+        with open(os.path.join(directory, "bench", f"doc_{n}.md"), "w", encoding="utf-8") as file:
+            file.write(page(f"doc_{n}", 0, paragraphs))
+
+
+def create_manager(kind: str, embeddings, sections, root: str):
+    if kind == "in_memory":
+        from src.utils.in_memory_embedding_manager import InMemoryEmbeddingManager
+
+        return InMemoryEmbeddingManager(embeddings, sections, [])
+    from src.utils.embedding_manager import EmbeddingManager
+
+    return EmbeddingManager(
+        embeddings, sections, [], persist_directory=os.path.join(root, "database")
+    )
+
+
+def percentiles(latencies: List[float]) -> str:
+    if len(latencies) < 2:
+        return "n/a"
+    cuts = statistics.quantiles(latencies, n=100)
+    return f"p50 {cuts[49]:6.1f} ms, p95 {cuts[94]:6.1f} ms, p99 {cuts[98]:6.1f} ms"
+
+
+def read(client, stop: threading.Event, latencies: List[float], mixed: List[int]) -> None:
+    """Posts questions until stopped, recording latencies and reads mixing versions."""
+    reader = threading.get_ident()
+    n = 0
+    while not stop.is_set():
+        # Every question is new, so each read also embeds its query
+        question = f"{WORDS[n % len(WORDS)]} {WORDS[(n * 7) % len(WORDS)]} {reader} {n}"
+        started = time.perf_counter()
+        response = client.post("/chatbot", json={"question": question})
+        latencies.append((time.perf_counter() - started) * 1000)
+        assert response.status_code == 200, response.get_json()
+        versions: Dict[str, set] = {}
+        for version, name in response.get_json()["answer"]:
+            versions.setdefault(name, set()).add(version)
+        if any(len(seen) > 1 for seen in versions.values()):
+            mixed.append(n)
+        n += 1
+
+
+def write(client, stop: threading.Event, latencies: List[float], paragraphs: int) -> None:
+    """Upserts new versions of a few files (deleting one now and then) until stopped."""
+    headers = {"Authorization": f"Bearer {TOKEN}"}
+    version = 0
+    while not stop.is_set():
+        version += 1
+        name = f"doc_{version % UPDATED_FILES}"
+        document = {"collection": "local", "source": f"bench/{name}.md"}
+        started = time.perf_counter()
+        if version % 4 == 0:
+            response = client.delete("/admin/documents", json=document, headers=headers)
+        else:
+            document["content"] = page(name, version, paragraphs)
+            response = client.put("/admin/documents", json=document, headers=headers)
+        latencies.append((time.perf_counter() - started) * 1000)
+        assert response.status_code in (200, 404), response.get_json()
+
+
+def run_phase(client, readers: int, seconds: float, writer: bool, paragraphs: int) -> Dict:
+    stop = threading.Event()
+    read_latencies: List[float] = []
+    write_latencies: List[float] = []
+    mixed: List[int] = []
+    threads = [
+        threading.Thread(target=read, args=(client, stop, read_latencies, mixed))
+        for _ in range(readers)
+    ]
+    if writer:
+        threads.append(
+            threading.Thread(target=write, args=(client, stop, write_latencies, paragraphs))
+        )
+    for thread in threads:
+        thread.start()
+    time.sleep(seconds)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    return {"reads": read_latencies, "writes": write_latencies, "mixed": len(mixed)}
+
+
+def run(kind: str, args: argparse.Namespace) -> None:
+    root = tempfile.mkdtemp()
+    try:
+        directory = os.path.join(root, "docs")
+        build_docs(directory, args.files, args.paragraphs)
+        documents = DocumentManager(directory_path=directory, split_processes=0)
+        embeddings = HashingEmbeddings(args.embed_ms / 1000)
+        manager = create_manager(kind, embeddings, documents.local_sections, root)
+        service = RetrievalService(DocumentUpdater(documents, manager, directory), manager)
+        client = create_app(service_factory=lambda progress: service).test_client()
+        while client.get("/ready").status_code != 200:
+            time.sleep(0.01)
+
+        print(f"{kind}: {len(documents.local_sections)} sections, {args.readers} readers")
+        for name, writer in (("read only", False), ("mixed", True)):
+            phase = run_phase(client, args.readers, args.seconds, writer, args.paragraphs)
+            reads = phase["reads"]
+            line = (
+                f"  {name:9} | {len(reads) / args.seconds:7.1f} reads/s | "
+                f"reads {percentiles(reads)}"
+            )
+            if writer:
+                line += f" | {len(phase['writes'])} writes, {percentiles(phase['writes'])}"
+            print(f"{line} | reads mixing versions: {phase['mixed']}")
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[3])
+    parser.add_argument("--managers", nargs="+", default=["in_memory", "chroma"])
+    parser.add_argument("--readers", type=int, default=4)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--files", type=int, default=40)
+    parser.add_argument("--paragraphs", type=int, default=60)
+    parser.add_argument("--embed-ms", type=float, default=20.0)
+    args = parser.parse_args()
+
+    os.environ[ADMIN_API_CONFIG["token_env"]] = TOKEN
+    for kind in args.managers:
+        run(kind, args)
+
+
+if __name__ == "__main__":
+    main()
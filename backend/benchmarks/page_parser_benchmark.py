@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+"""
+page_parser_benchmark.py
+
+Benchmark of the PageParser backends ("html.parser", "lxml" and "article").
+- Parses the saved pages in tests/sample_pages, with the navigation sidebar of each page
+  padded with `--nav-links` extra links (real documentation pages carry a few hundred)
+- Reports pages per second for each backend and the speedup over "html.parser"
+- Checks that every backend produced the same documents
+
+Run from the backend folder:
+    python -m benchmarks.page_parser_benchmark [--pages 200] [--nav-links 400]
+"""
+
+import argparse
+import glob
+import os
+import time
+from typing import List
+
+from loguru import logger
+
+from src.utils.page_parser import PARSER_BACKENDS, PageParser
+
+SAMPLE_PAGES = os.path.join(os.path.dirname(__file__), "..", "tests", "sample_pages")
+NAV_LINK = (
+    '<li class="toctree-l2"><a class="reference internal" href="page_{n}.html">'
+    "1.{n}. Section {n} of the user guide</a></li>\n"
+)
+
+
+def load_pages(nav_links: int) -> List[str]:
+    """Reads the sample pages and pads their sidebars with extra links."""
+    sidebar = '<nav class="bd-links"><ul>' + "".join(
+        NAV_LINK.format(n=n) for n in range(nav_links)
+    ) + "</ul></nav>"
+    pages = []
+    for path in sorted(glob.glob(os.path.join(SAMPLE_PAGES, "*.html"))):
+        with open(path, encoding="utf-8") as file:
+            html = file.read()
+        head, body_tag, rest = html.partition("<body")
+        end = rest.index(">") + 1
+        pages.append(head + body_tag + rest[:end] + sidebar + rest[end:])
+    return pages
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[3])
+    parser.add_argument("--pages", type=int, default=200)
+    parser.add_argument("--nav-links", type=int, default=400)
+    args = parser.parse_args()
+
+    logger.remove()  # Per-page logs would dominate the measurement
+    samples = load_pages(args.nav_links)
+    pages = [samples[n % len(samples)] for n in range(args.pages)]
+    size_kb = sum(len(page) for page in pages) / len(pages) / 1024
+    print(f"{len(pages)} pages, {size_kb:.0f} KB per page on average")
+
+    results = {}
+    reference = None
+    for backend in PARSER_BACKENDS:
+        page_parser = PageParser(backend)
+        started = time.perf_counter()
+        documents = [page_parser.parse(page, f"page-{n}") for n, page in enumerate(pages)]
+        elapsed = time.perf_counter() - started
+        results[backend] = elapsed
+        reference = reference or documents
+        assert documents == reference, f"{backend} produced different documents"
+        print(
+            f"{backend:<11} | {elapsed:6.2f} s | {len(pages) / elapsed:7.1f} pages/s | "
+            f"speedup {results['html.parser'] / elapsed:5.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,179 @@
+# -*- coding: utf-8 -*-
+"""
+speculative_search_benchmark.py
+
+Benchmark of the time to first token with and without speculative search.
+- Streams answers through ChatbotService.generate_response_stream with local fakes: a Flash
+  LLM that rewrites questions after a delay, embeddings and searches with a latency, and a
+  chat model streaming its answer after a first-token delay
+- Asks questions whose rewrite is nearly the same (results kept), different (searched
+  again) and in Spanish (not speculated), each in a new conversation
+- Reports the mean and p50 time to first token of each kind of question, and the kept /
+  searched again / skipped counts
+
+Run from the backend folder:
+    python -m benchmarks.speculative_search_benchmark [--questions 10] [--translate-ms 400]
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import time
+from typing import Any, AsyncIterator, Dict, List
+
+from langchain_core.documents import Document
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+from langchain_core.messages import AIMessage
+
+from src.api.chatbot_service import ChatbotService
+from src.config.config_init import QUESTION_REWRITE_CONFIG, SPECULATIVE_SEARCH_CONFIG
+
+KINDS = ("kept", "requeried", "skipped")
+TOPICS = (
+    "cross validation", "grid search", "pipelines", "random forests", "feature scaling",
+    "one hot encoding", "logistic regression", "kernel selection", "model persistence",
+    "missing values", "learning curves", "class imbalance",
+)
+
+
+def question(kind: str, n: int) -> str:
+    topic = TOPICS[n % len(TOPICS)]
+    if kind == "skipped":
+        return f"¿Cómo se usan los {topic} del caso {n:03d}?"
+    if kind == "requeried":
+        return f"what about {topic} in case {n:03d}"
+    return f"how do I use {topic} in case {n:03d}"
+
+
+def rewrite(kind: str, text: str) -> Dict[str, str]:
+    """The rewrite of the fake Flash LLM: nearly the same, expanded or translated."""
+    if kind == "kept":
+        return {"language": "en", "question": text.capitalize() + "?"}
+    if kind == "requeried":
+        return {
+            "language": "en",
+            "question": f"In scikit-learn, what is the recommended way to apply {text}, with an example?",
+        }
+    return {"language": "es", "question": f"How are {text} used?"}
+
+
+class FakeFlashLLM:
+    """Rewrites the questions of the benchmark after a delay."""
+
+    def __init__(self, latency: float, kinds: Dict[str, str]) -> None:
+        self._latency = latency
+        self._kinds = kinds
+
+    async def ainvoke(self, prompt):
+        await asyncio.sleep(self._latency)
+        for text, kind in self._kinds.items():
+            if text in str(prompt):
+                return AIMessage(content=json.dumps(rewrite(kind, text)))
+        return AIMessage(content="Summary.")
+
+
+class FakeEmbeddingManager:
+    """Embeds and searches with a fixed latency, like a remote embedding model."""
+
+    def __init__(self, embed_latency: float, search_latency: float) -> None:
+        self._embed_latency = embed_latency
+        self._search_latency = search_latency
+
+    async def aembed_query(self, query):
+        await asyncio.sleep(self._embed_latency)
+        return [0.0] * 8
+
+    async def aquery_local_embeddings_by_vector(self, embedding, k):
+        await asyncio.sleep(self._search_latency)
+        return [Document(page_content="local section")] * k
+
+    async def aquery_web_embeddings_by_vector(self, embedding, k):
+        await asyncio.sleep(self._search_latency)
+        return [Document(page_content="web section")] * k
+
+
+class SlowFakeChatModel(FakeListChatModel):
+    """Streams its answer character by character after a first-token delay."""
+
+    first_token_latency: float = 0.3
+
+    async def _astream(self, messages, stop=None, run_manager=None, **kwargs: Any) -> AsyncIterator:
+        await asyncio.sleep(self.first_token_latency)
+        async for chunk in super()._astream(messages, stop=stop, run_manager=run_manager, **kwargs):
+            yield chunk
+
+
+class FakeModelManager:
+    def __init__(self, args: argparse.Namespace, kinds: Dict[str, str]) -> None:
+        self.flash_llm = FakeFlashLLM(args.translate_ms / 1000, kinds)
+        self.llm = SlowFakeChatModel(
+            responses=["The answer."], first_token_latency=args.first_token_ms / 1000
+        )
+
+
+class StreamingService:
+    """A ChatbotService over a graph built with the fakes."""
+
+    generate_response_stream = ChatbotService.generate_response_stream
+
+    def __init__(self, chatbot_graph) -> None:
+        self.chatbot_graph = chatbot_graph
+        self.config: Dict[str, Any] = {}
+
+
+async def time_to_first_token(service: StreamingService, text: str) -> float:
+    service.config = {"configurable": {"thread_id": text}}  # A new conversation
+    started = time.perf_counter()
+    ttft = 0.0
+    async for _ in service.generate_response_stream(text):
+        if not ttft:
+            ttft = (time.perf_counter() - started) * 1000
+    return ttft
+
+
+def run(speculative: bool, args: argparse.Namespace) -> None:
+    from src.chatbot.graph_initializer import GraphInitializer
+
+    kinds = {question(kind, n): kind for kind in KINDS for n in range(args.questions)}
+    graph = GraphInitializer(
+        FakeModelManager(args, kinds),  # type: ignore
+        FakeEmbeddingManager(args.embed_ms / 1000, args.search_ms / 1000),  # type: ignore
+        # Every question goes through the (fake) translate LLM, the case speculation targets
+        rewrite_config={**QUESTION_REWRITE_CONFIG, "fast_path": False, "cache_enabled": False},
+        speculation_config={**SPECULATIVE_SEARCH_CONFIG, "enabled": speculative},
+    )
+    graph.build_graph()
+    service = StreamingService(graph)
+
+    latencies: Dict[str, List[float]] = {kind: [] for kind in KINDS}
+    for text, kind in kinds.items():
+        latencies[kind].append(asyncio.run(time_to_first_token(service, text)))
+
+    print(f"Speculative search {'on' if speculative else 'off'}:")
+    for kind in KINDS:
+        values = latencies[kind]
+        print(
+            f"  {kind:9} questions | TTFT mean {statistics.fmean(values):6.1f} ms, "
+            f"p50 {statistics.median(values):6.1f} ms"
+        )
+    if speculative:
+        stats = graph.speculative_search_stats
+        print(f"  kept {stats['kept']}, searched again {stats['requeried']}, skipped {stats['skipped']}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[3])
+    parser.add_argument("--questions", type=int, default=10)
+    parser.add_argument("--translate-ms", type=float, default=400.0)
+    parser.add_argument("--embed-ms", type=float, default=150.0)
+    parser.add_argument("--search-ms", type=float, default=30.0)
+    parser.add_argument("--first-token-ms", type=float, default=300.0)
+    args = parser.parse_args()
+
+    for speculative in (False, True):
+        run(speculative, args)
+
+
+if __name__ == "__main__":
+    main()
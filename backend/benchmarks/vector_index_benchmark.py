@@ -0,0 +1,101 @@
+# -*- coding: utf-8 -*-
+"""
+vector_index_benchmark.py
+
+Benchmark of NumpyVectorIndex against langchain's InMemoryVectorStore.
+- Indexes 1k, 10k and 100k random sections (768 dimensions, like text-embedding-004)
+- Measures the latency of single top-k queries on both stores
+- Measures the latency per query of a batched top-k search on the NumPy index
+
+Run from the backend folder:
+    python -m benchmarks.vector_index_benchmark [sizes...]
+"""
+
+import sys
+import time
+from typing import List
+
+import numpy as np
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+from langchain_core.vectorstores import InMemoryVectorStore
+
+from src.utils.numpy_vector_index import NumpyVectorIndex
+
+DIMENSION = 768
+QUERIES = 20
+K = 4
+
+
+class RandomEmbeddings(Embeddings):
+    """Returns reproducible random vectors without any remote call."""
+
+    def __init__(self, seed: int = 0) -> None:
+        self._rng = np.random.default_rng(seed)
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        vectors = self._rng.standard_normal((len(texts), DIMENSION))
+        return vectors.astype(np.float32).tolist()
+
+    def embed_query(self, text: str) -> List[float]:
+        return self._rng.standard_normal(DIMENSION).astype(np.float32).tolist()
+
+
+def _time_per_query(search, queries: List[List[float]]) -> float:
+    started = time.perf_counter()
+    for query in queries:
+        search(query)
+    return (time.perf_counter() - started) / len(queries) * 1000
+
+
+def run(size: int) -> None:
+    embeddings = RandomEmbeddings()
+    documents = [Document(page_content=f"section {i}") for i in range(size)]
+    vectors = embeddings.embed_documents([doc.page_content for doc in documents])
+    queries = [embeddings.embed_query("q") for _ in range(QUERIES)]
+
+    started = time.perf_counter()
+    numpy_index = NumpyVectorIndex(embeddings, documents, np.asarray(vectors))
+    numpy_build = (time.perf_counter() - started) * 1000
+
+    started = time.perf_counter()
+    store = InMemoryVectorStore(embeddings)
+    # Fill the store directly so both builds skip the embedding step
+    store.store = {
+        str(i): {"id": str(i), "vector": vector, "text": doc.page_content, "metadata": {}}
+        for i, (doc, vector) in enumerate(zip(documents, vectors))
+    }
+    store_build = (time.perf_counter() - started) * 1000
+
+    numpy_query = _time_per_query(
+        lambda q: numpy_index.similarity_search_by_vector(q, k=K), queries
+    )
+    store_query = _time_per_query(
+        lambda q: store.similarity_search_by_vector(q, k=K), queries
+    )
+
+    started = time.perf_counter()
+    numpy_index.similarity_search_by_vectors(queries, k=K)
+    numpy_batch = (time.perf_counter() - started) / len(queries) * 1000
+
+    # Both stores must agree on the best match
+    for query in queries[:3]:
+        best_numpy = numpy_index.similarity_search_by_vector(query, k=1)[0]
+        best_store = store.similarity_search_by_vector(query, k=1)[0]
+        assert best_numpy.page_content == best_store.page_content
+
+    print(
+        f"{size:>7} sections | build: numpy {numpy_build:8.1f} ms, store {store_build:8.1f} ms"
+        f" | query: numpy {numpy_query:7.2f} ms, store {store_query:8.2f} ms"
+        f" ({store_query / numpy_query:5.1f}x) | numpy batched {numpy_batch:6.2f} ms/query"
+    )
+
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or [1_000, 10_000, 100_000]
+    for size in sizes:
+        run(size)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+# -*- coding: utf-8 -*-
+"""
+web_loader_benchmark.py
+
+Benchmark of the asyncio fetch engine (AsyncWebLoader) against the threaded WebLoader.
+- Serves documentation-like pages from a local HTTP server (in a separate process, so it
+  does not compete for the GIL) with a simulated network latency
+- Loads 100, 1,000 and 5,000 URLs with both engines at the same concurrency limit
+- Reports wall time, pages per second and the peak number of threads of each engine
+- Pages are parsed on the loader threads, or in `--parse-processes` parser processes
+
+Run from the backend folder:
+    python -m benchmarks.web_loader_benchmark [sizes...] [--latency-ms 50] [--concurrency 64]
+        [--parse-processes 0]
+"""
+
+import argparse
+import multiprocessing
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import List
+
+from loguru import logger
+
+from src.utils.async_web_loader import AsyncWebLoader
+from src.utils.web_loader import WebLoader
+
+PAGE = (
+    "<html><head><title>Page {n}</title></head><body><nav>menu</nav>"
+    '<article class="bd-article"><h1>Page {n}</h1>'
+    + "<p>Paragraph with <code>code</code> and <a href='#'>a link</a>.</p>" * 10
+    + "</article></body></html>"
+)
+
+
+class BenchmarkServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 1024  # Accept bursts of connections
+
+
+class PageHandler(BaseHTTPRequestHandler):
+    """Serves numbered pages after a fixed delay (the simulated network latency)."""
+
+    protocol_version = "HTTP/1.1"
+    latency = 0.05
+
+    def do_GET(self):
+        time.sleep(self.latency)
+        body = PAGE.format(n=self.path.strip("/")).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def _serve(port_queue: "multiprocessing.Queue", latency: float) -> None:
+    """Runs the page server (in a child process) and reports its port."""
+    PageHandler.latency = latency
+    server = BenchmarkServer(("127.0.0.1", 0), PageHandler)
+    port_queue.put(server.server_address[1])
+    server.serve_forever()
+
+
+def _peak_threads(run) -> tuple:
+    """Runs a function while sampling the number of live threads."""
+    peak = threading.active_count()
+    done = threading.Event()
+
+    def sample():
+        nonlocal peak
+        while not done.is_set():
+            peak = max(peak, threading.active_count())
+            time.sleep(0.005)
+
+    sampler = threading.Thread(target=sample, daemon=True)
+    sampler.start()
+    started = time.perf_counter()
+    result = run()
+    elapsed = time.perf_counter() - started
+    done.set()
+    sampler.join()
+    return result, elapsed, peak - 1  # Do not count the sampler
+
+
+def run(base: str, size: int, concurrency: int, parse_processes: int) -> None:
+    urls: List[str] = [f"{base}/{n}" for n in range(size)]
+
+    def threaded():
+        with WebLoader(
+            urls,
+            max_workers=concurrency,
+            max_connections_per_host=concurrency,
+            parse_processes=parse_processes,
+        ) as loader:
+            return loader.get_documents()
+
+    def asynchronous():
+        with AsyncWebLoader(
+            urls,
+            max_concurrency=concurrency,
+            max_connections_per_host=concurrency,
+            max_workers=os.cpu_count() or 4,
+            parse_processes=parse_processes,
+        ) as loader:
+            return loader.get_documents()
+
+    results = {}
+    for name, engine in (("threads", threaded), ("asyncio", asynchronous)):
+        documents, elapsed, peak = _peak_threads(engine)
+        assert len(documents) == size
+        results[name] = elapsed
+        print(
+            f"{size:>6} URLs | {name:<7} | {elapsed:7.2f} s | "
+            f"{size / elapsed:7.1f} pages/s | peak threads {peak:>4}"
+        )
+    speedup = results["threads"] / results["asyncio"]
+    print(f"{'':>6}        speedup asyncio vs threads: {speedup:.2f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[3])
+    parser.add_argument("sizes", nargs="*", type=int, default=[100, 1_000, 5_000])
+    parser.add_argument("--latency-ms", type=float, default=50.0)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--parse-processes", type=int, default=0)
+    args = parser.parse_args()
+
+    logger.remove()  # Per-URL logs would dominate the measurement
+    port_queue: "multiprocessing.Queue" = multiprocessing.Queue()
+    server = multiprocessing.Process(
+        target=_serve, args=(port_queue, args.latency_ms / 1000), daemon=True
+    )
+    server.start()
+    base = f"http://127.0.0.1:{port_queue.get()}"
+    print(
+        f"Simulated latency {args.latency_ms:.0f} ms, concurrency limit {args.concurrency}, "
+        f"parser processes {args.parse_processes}"
+    )
+    try:
+        for size in args.sizes:
+            run(base, size, args.concurrency, args.parse_processes)
+    finally:
+        server.terminate()
+
+
+if __name__ == "__main__":
+    main()
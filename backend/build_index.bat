@@ -0,0 +1,18 @@
+@echo off
+REM === LaredocMind - Index Bundle Build Script ===
+
+REM 1. Check if the virtual environment exists
+if not exist ".venv" (
+    echo Virtual environment not found. Please run setup_backend.bat first.
+    exit /b 1
+)
+
+REM 2. Activate the virtual environment
+call .venv\Scripts\activate
+
+REM 3. Set PYTHONPATH to the src directory
+set PYTHONPATH=%CD%
+
+REM 4. Build the index bundle (the server loads it on the next start)
+echo Building index bundle...
+python src/build_index.py %*
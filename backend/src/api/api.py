@@ -1,16 +1,41 @@
 """
 api.py - Main Flask API for the chatbot backend
 ------------------------------------------------
-Defines endpoints for synchronous and streaming chatbot responses.
+Defines endpoints for synchronous and streaming chatbot responses, and admin endpoints
+to upsert and delete local or web documents without restarting (protected by a bearer
+token; questions answered meanwhile keep reading the previous version of a document).
+The chatbot service is built in the background, so the app answers health,
+readiness and status checks immediately while the index is being built.
 Includes CORS support and helper functions for validation and error handling.
+The chatbot service (and with it the model providers, vector stores and LangGraph) is
+imported by the background build, which only starts when create_app is called (by the
+wsgi.py entry point), so importing this module stays cheap and starts nothing.
 """
 
+import hmac
+import multiprocessing
+import os
+import time
+
+_IMPORT_STARTED = time.perf_counter()
+
 from flask import Flask, jsonify, request, Response
 from flask_cors import CORS
-from src.api.chatbot_service import ChatbotService
-from src.config.config_init import FLASK_PORT, FLASK_DEBUG
+from src.api.service_loader import ServiceLoader
+from src.config.config_init import (
+    ADMIN_API_CONFIG,
+    FLASK_PORT,
+    FLASK_DEBUG,
+    SERVICE_RETRY_AFTER_SECONDS,
+)
+from src.utils.startup_profiler import startup_profiler
 import asyncio
-from typing import Any, Optional, Tuple
+from typing import TYPE_CHECKING, Any, Callable, Dict, Optional, Tuple
+
+if TYPE_CHECKING:
+    from src.api.chatbot_service import ChatbotService
+
+startup_profiler.record("import", (time.perf_counter() - _IMPORT_STARTED) * 1000)
 
 
 def _get_question_from_request() -> Tuple[Optional[str], Any, Optional[int]]:
@@ -24,6 +49,57 @@ def _get_question_from_request() -> Tuple[Optional[str], Any, Optional[int]]:
     return data["question"], None, None
 
 
+def _get_document_from_request(
+    upsert: bool,
+) -> Tuple[Optional[Dict[str, Any]], Any, Optional[int]]:
+    """
+    Extracts and validates the document fields of an admin request: 'collection' and
+    'source', plus the optional 'content' and 'title' of an upsert.
+    Returns (fields, error_response, status_code).
+    """
+    data = request.get_json(silent=True)
+    fields = ("collection", "source", "content", "title") if upsert else ("collection", "source")
+    if not isinstance(data, dict) or not all(
+        isinstance(data.get(name), str) for name in ("collection", "source")
+    ):
+        return None, jsonify({"error": "'collection' and 'source' (strings) are required"}), 400
+    if any(data.get(name) is not None and not isinstance(data[name], str) for name in fields):
+        return None, jsonify({"error": f"{', '.join(fields)} must be strings"}), 400
+    content = data.get("content")
+    if content is not None and len(content) > ADMIN_API_CONFIG["max_content_length"]:
+        return None, jsonify({"error": "The document content is too large"}), 413
+    return {name: data.get(name) for name in fields}, None, None
+
+
+def _check_admin_token() -> Optional[Tuple[Any, int]]:
+    """
+    Checks the bearer token of an admin request against the configured token.
+    Returns an error response (None if the request is allowed).
+    """
+    token = os.getenv(ADMIN_API_CONFIG["token_env"])
+    if not ADMIN_API_CONFIG["enabled"] or not token:
+        return jsonify({"error": "The admin endpoints are disabled"}), 403
+    header = request.headers.get("Authorization", "")
+    if not hmac.compare_digest(header.encode("utf-8"), f"Bearer {token}".encode("utf-8")):
+        return jsonify({"error": "Invalid admin token"}), 401
+    return None
+
+
+def _handle_document_exception(e: Exception) -> Tuple[Any, int]:
+    """
+    Returns a JSON error response for an admin request: 400 for an invalid document,
+    404 for a missing one and 500 for anything else (e.g. an error of the embedding
+    manager), even if it is a ValueError or a LookupError.
+    """
+    from src.utils.document_updater import DocumentNotFoundError, InvalidDocumentError
+
+    if isinstance(e, InvalidDocumentError):
+        return jsonify({"error": str(e)}), 400
+    if isinstance(e, DocumentNotFoundError):
+        return jsonify({"error": str(e)}), 404
+    return _handle_exception(e)
+
+
 def _handle_exception(e: Exception) -> Tuple[Any, int]:
     """
     Returns a JSON error response for any exception.
@@ -31,20 +107,59 @@ def _handle_exception(e: Exception) -> Tuple[Any, int]:
     return jsonify({"error": str(e)}), 500
 
 
-def create_app() -> Flask:
+def _not_ready_response(service_loader: ServiceLoader) -> Tuple[Any, int]:
+    """
+    Returns a 503 JSON response while the service is being built (with a Retry-After
+    header) or after its build failed.
+    """
+    status = service_loader.status
+    if status["phase"] == "failed":
+        return jsonify({"error": "The chatbot failed to start", "status": status}), 503
+    response = jsonify({"error": "The chatbot is starting up", "status": status})
+    response.headers["Retry-After"] = str(SERVICE_RETRY_AFTER_SECONDS)
+    return response, 503
+
+
+def _build_chatbot_service(
+    progress_callback: Callable[[str], None],
+) -> "ChatbotService":
+    """
+    Imports and builds the chatbot service (runs in the service loader's thread).
+    """
+    with startup_profiler.measure("service.import"):
+        from src.api.chatbot_service import ChatbotService
+
+    return ChatbotService(progress_callback=progress_callback)
+
+
+def create_app(
+    service_factory: Callable[[Callable[[str], None]], Any] = _build_chatbot_service,
+) -> Flask:
     """
     Creates and configures the Flask app, including all chatbot endpoints.
+    The chatbot service is built in a background thread.
+
+    Args:
+        service_factory (Callable[[Callable[[str], None]], Any]): Builds the chatbot
+            service from a progress callback (tests and benchmarks pass a lighter one).
     """
     app = Flask(__name__)
     CORS(app)  # Enable CORS globally
 
-    chatbot_service = ChatbotService()
+    service_loader = ServiceLoader(service_factory)
+    # Spawned helper processes (e.g. the web loader's parsers) re-import the entry
+    # module, so only a process that was not started by multiprocessing builds the service
+    if multiprocessing.current_process().name == "MainProcess":
+        service_loader.start()
 
     @app.route("/chatbot", methods=["POST"])
     async def chatbot_endpoint() -> tuple[Any, int]:  # type: ignore
         """
         Synchronous endpoint: returns the full chatbot response as JSON.
         """
+        chatbot_service = service_loader.service
+        if chatbot_service is None:
+            return _not_ready_response(service_loader)
         try:
             question, error_response, status = _get_question_from_request()
             if error_response:
@@ -65,6 +180,9 @@ def create_app() -> Flask:
         Streaming endpoint: returns the chatbot response in real time
         Uses SSE but with final delimiter <END_OF_CHUNK> for compatibility with markdown.
         """
+        chatbot_service = service_loader.service
+        if chatbot_service is None:
+            return _not_ready_response(service_loader)
         try:
             question, error_response, status = _get_question_from_request()
             if error_response:
@@ -98,6 +216,47 @@ def create_app() -> Flask:
         except Exception as e:
             return _handle_exception(e)
 
+    @app.route("/admin/documents", methods=["PUT"])
+    def upsert_document_endpoint() -> tuple[Any, int]:  # type: ignore
+        """
+        Admin endpoint: adds or replaces a local or web document and reindexes only its
+        sections. Expects JSON with 'collection' ("local" or "web"), 'source' (file name
+        or URL), 'content' (Markdown, optional for web pages) and 'title' (optional).
+        """
+        error = _check_admin_token()
+        if error:
+            return error
+        chatbot_service = service_loader.service
+        if chatbot_service is None:
+            return _not_ready_response(service_loader)
+        document, error_response, status = _get_document_from_request(upsert=True)
+        if error_response:
+            return error_response, status or 400
+        try:
+            return jsonify(chatbot_service.upsert_document(**document)), 200  # type: ignore
+        except Exception as e:
+            return _handle_document_exception(e)
+
+    @app.route("/admin/documents", methods=["DELETE"])
+    def delete_document_endpoint() -> tuple[Any, int]:  # type: ignore
+        """
+        Admin endpoint: removes a local or web document from its collection. Expects JSON
+        with 'collection' and 'source'.
+        """
+        error = _check_admin_token()
+        if error:
+            return error
+        chatbot_service = service_loader.service
+        if chatbot_service is None:
+            return _not_ready_response(service_loader)
+        document, error_response, status = _get_document_from_request(upsert=False)
+        if error_response:
+            return error_response, status or 400
+        try:
+            return jsonify(chatbot_service.delete_document(**document)), 200  # type: ignore
+        except Exception as e:
+            return _handle_document_exception(e)
+
     @app.route("/hello", methods=["GET"])
     def saludo() -> tuple[Any, int]:  # type: ignore
         """
@@ -105,11 +264,38 @@ def create_app() -> Flask:
         """
         return jsonify({"mensaje": "Hello, I'm working", "version": "1.0"}), 200
 
-    return app
+    @app.route("/ready", methods=["GET"])
+    def ready_endpoint() -> tuple[Any, int]:  # type: ignore
+        """
+        Readiness endpoint: 200 once the chatbot can answer, 503 while it is being built.
+        """
+        if not service_loader.ready:
+            return _not_ready_response(service_loader)
+        return jsonify({"ready": True}), 200
 
+    @app.route("/status", methods=["GET"])
+    def status_endpoint() -> tuple[Any, int]:  # type: ignore
+        """
+        Status endpoint: reports the build phase, progress and elapsed time, the
+        milliseconds spent in each startup step so far and, once ready, how often each
+        question rewrite path was taken, how often speculative search results were kept and
+        how the background conversation summaries went.
+        """
+        status = {**service_loader.status, "startup_ms": startup_profiler.report()}
+        rewrite_stats = getattr(service_loader.service, "question_rewrite_stats", None)
+        if rewrite_stats is not None:
+            status["question_rewrite"] = rewrite_stats
+        speculation_stats = getattr(service_loader.service, "speculative_search_stats", None)
+        if speculation_stats is not None:
+            status["speculative_search"] = speculation_stats
+        summary_stats = getattr(service_loader.service, "summary_stats", None)
+        if summary_stats:
+            status["summary"] = summary_stats
+        return jsonify(status), 200
+
+    return app
 
-# Entrypoint for running the Flask application
-app = create_app()
 
+# The app is created by the entry point (wsgi.py), so importing this module builds nothing
 if __name__ == "__main__":
-    app.run(port=FLASK_PORT, debug=FLASK_DEBUG)
+    create_app().run(port=FLASK_PORT, debug=FLASK_DEBUG)
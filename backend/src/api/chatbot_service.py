@@ -4,14 +4,18 @@ chatbot_service.py
 
 Service class for chatbot initialization and response generation.
 
-This module defines the ChatbotService class, which manages the setup of core chatbot components, builds the chatbot graph, and provides methods for generating responses to user questions (including streaming responses).
+This module defines the ChatbotService class, which manages the setup of core chatbot components, builds the chatbot graph, and provides methods for generating responses to user questions (including streaming responses). The graph (and LangGraph) is imported when the service is built.
 """
 
-from typing import AsyncGenerator, List, Any, Dict
+from typing import TYPE_CHECKING, AsyncGenerator, Callable, List, Any, Dict, Optional
 
 from src.chatbot.core_initializer import CoreInitializer
 from src.config.config_url import DOCS_URL
-from src.chatbot.graph_initializer import GraphInitializer
+from src.utils.startup_profiler import startup_profiler
+
+if TYPE_CHECKING:
+    from src.chatbot.graph_initializer import GraphInitializer
+    from src.utils.document_updater import DocumentUpdater
 
 
 class ChatbotService:
@@ -22,7 +26,10 @@ class ChatbotService:
     """
 
     def __init__(
-        self, docs_path: str = "./docs", web_paths: List[str] = DOCS_URL
+        self,
+        docs_path: str = "./docs",
+        web_paths: List[str] = DOCS_URL,
+        progress_callback: Optional[Callable[[str], None]] = None,
     ) -> None:
         """
         Initialize the chatbot system and start a conversation.
@@ -30,22 +37,31 @@ class ChatbotService:
         Args:
             docs_path (str): Path to the documentation directory. Defaults to './docs'.
             web_paths (List[str]): List of web documentation URLs. Defaults to DOCS_URL.
+            progress_callback (Optional[Callable[[str], None]]): Called with the name of each
+                initialization phase as it starts (the last one is 'graph').
 
         This method sets up the core components (LLM, embeddings, etc.), retrieves the initialized managers, builds the chatbot graph, and configures the chatbot conversation.
         """
         # Initialize core components (LLM, embeddings, etc.)
         core = CoreInitializer(docs_path=docs_path, web_paths=web_paths)
-        core.initialize()
+        core.initialize(progress_callback=progress_callback)
+        if progress_callback:
+            progress_callback("graph")
 
         # Retrieve initialized managers
         model_manager = core.model_manager
         embedding_manager = core.embedding_manager
+        self.document_updater: "DocumentUpdater" = core.document_updater
 
         # Create and compile the chatbot graph
-        self.chatbot_graph: GraphInitializer = GraphInitializer(
-            model_manager=model_manager, embedding_manager=embedding_manager
-        )
-        self.chatbot_graph.build_graph()
+        with startup_profiler.measure("graph"):
+            with startup_profiler.measure("graph.import"):
+                from src.chatbot.graph_initializer import GraphInitializer
+
+            self.chatbot_graph: "GraphInitializer" = GraphInitializer(
+                model_manager=model_manager, embedding_manager=embedding_manager
+            )
+            self.chatbot_graph.build_graph()
 
         # Configure and start the chatbot conversation
         self.config = {"configurable": {"thread_id": "1"}}
@@ -59,11 +75,65 @@ class ChatbotService:
         Returns:
             str: The chatbot's answer.
         """
-        response: Dict[str, Any] = await self.chatbot_graph.graph.invoke(  # type: ignore
+        response: Dict[str, Any] = await self.chatbot_graph.ainvoke(  # type: ignore
             {"question": question}, self.config
         )
         return response["answer"]  # type: ignore
 
+    def upsert_document(
+        self,
+        collection: str,
+        source: str,
+        content: Optional[str] = None,
+        title: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """
+        Add or replace a local or web document without rebuilding the index. Questions
+        answered meanwhile keep using the previous version of the document.
+
+        Args:
+            collection (str): "local" or "web".
+            source (str): The file name relative to the docs directory, or the page URL.
+            content (Optional[str]): The Markdown content (without it, a web page is fetched).
+            title (Optional[str]): The title of a web page given as content.
+        Returns:
+            Dict[str, Any]: The number of sections of the document and of sections added, removed and reused.
+        """
+        return self.document_updater.upsert(collection, source, content, title)
+
+    def delete_document(self, collection: str, source: str) -> Dict[str, Any]:
+        """
+        Remove a local or web document without rebuilding the index.
+
+        Args:
+            collection (str): "local" or "web".
+            source (str): The file name relative to the docs directory, or the page URL.
+        Returns:
+            Dict[str, Any]: The number of sections removed.
+        """
+        return self.document_updater.delete(collection, source)
+
+    @property
+    def question_rewrite_stats(self) -> Dict[str, Any]:
+        """
+        Metrics of the question rewrite: how often the fast path, the rewrite cache and the LLM were used.
+        """
+        return self.chatbot_graph.question_rewriter.stats
+
+    @property
+    def speculative_search_stats(self) -> Dict[str, Any]:
+        """
+        Metrics of the speculative search: how often its results were kept or searched again.
+        """
+        return self.chatbot_graph.speculative_search_stats
+
+    @property
+    def summary_stats(self) -> Dict[str, Any]:
+        """
+        Metrics of the background summaries: how many were written, waited for or abandoned.
+        """
+        return self.chatbot_graph.summary_stats
+
     async def generate_response_stream(
         self, question: str
     ) -> AsyncGenerator[str, None]:
@@ -75,7 +145,7 @@ class ChatbotService:
         Yields:
             str: Chunks of the chatbot's answer, delimited by <END_OF_CHUNK>.
         """
-        async for event in self.chatbot_graph.graph.astream_events(  # type: ignore
+        async for event in self.chatbot_graph.astream_events(  # type: ignore
             {"question": question}, self.config
         ):
             # Only yield content from the 'generate_answer' node stream events
@@ -0,0 +1,143 @@
+# -*- coding: utf-8 -*-
+"""
+service_loader.py
+
+Background loader for the chatbot service.
+
+This module defines the ServiceLoader class, which builds the ChatbotService (keys, models, documents, embeddings and graph) in a background thread, so the Flask app can bind its port and answer health checks immediately. It tracks the current build phase and progress for the readiness and status endpoints.
+"""
+
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from src.utils.logger_manager import logger
+
+# Initialization phases in the order they are reported
+PHASES: List[str] = ["keys", "models", "documents", "embeddings", "graph"]
+
+
+class ServiceLoader:
+    """
+    Builds a service in a background thread and reports its build phase and progress.
+    """
+
+    def __init__(self, service_factory: Callable[[Callable[[str], None]], Any]) -> None:
+        """
+        Initialize the loader without starting the build.
+
+        Args:
+            service_factory (Callable[[Callable[[str], None]], Any]): Builds the service. It receives a progress callback to call with the name of each phase as it starts.
+        """
+        self._service_factory = service_factory
+        self._service: Optional[Any] = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+        self._phase = "pending"
+        self._error: Optional[str] = None
+        self._started_at: Optional[float] = None
+        self._finished_at: Optional[float] = None
+        self._ready_event = threading.Event()
+
+    def start(self) -> None:
+        """
+        Start building the service in a daemon thread (only the first call has an effect).
+        """
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._started_at = time.monotonic()
+            self._phase = "starting"
+            self._thread = threading.Thread(
+                target=self._build, name="service-loader", daemon=True
+            )
+            self._thread.start()
+        logger.info("Chatbot service build started in the background.")
+
+    def _build(self) -> None:
+        """
+        Build the service, recording the reached phase, and mark it ready or failed.
+        """
+        try:
+            service = self._service_factory(self._set_phase)
+            with self._lock:
+                self._service = service
+                self._phase = "ready"
+                self._finished_at = time.monotonic()
+            self._ready_event.set()
+            logger.info(
+                f"Chatbot service ready after {self._elapsed_seconds():.1f}s."
+            )
+        except Exception as e:
+            with self._lock:
+                self._phase = "failed"
+                self._error = str(e)
+                self._finished_at = time.monotonic()
+            logger.error(f"Chatbot service build failed: {e}")
+
+    def _set_phase(self, phase: str) -> None:
+        """
+        Record the phase the build has reached.
+
+        Args:
+            phase (str): Name of the phase that just started.
+        """
+        with self._lock:
+            self._phase = phase
+        logger.info(f"Chatbot service build phase: {phase}")
+
+    def _elapsed_seconds(self) -> float:
+        """
+        Return the seconds spent building (up to now, or until the build finished).
+        """
+        if self._started_at is None:
+            return 0.0
+        end = self._finished_at if self._finished_at is not None else time.monotonic()
+        return end - self._started_at
+
+    def wait_until_ready(self, timeout: Optional[float] = None) -> bool:
+        """
+        Block until the service is ready.
+
+        Args:
+            timeout (Optional[float]): Maximum seconds to wait. None waits forever.
+        Returns:
+            bool: True if the service is ready.
+        """
+        return self._ready_event.wait(timeout)
+
+    @property
+    def ready(self) -> bool:
+        """
+        Whether the service has been built and can answer requests.
+        """
+        return self._ready_event.is_set()
+
+    @property
+    def service(self) -> Optional[Any]:
+        """
+        The built service, or None while it is not ready.
+        """
+        with self._lock:
+            return self._service
+
+    @property
+    def status(self) -> Dict[str, Any]:
+        """
+        The build status: phase, progress (0 to 1), readiness, error and elapsed seconds.
+        """
+        with self._lock:
+            if self._phase == "ready":
+                progress = 1.0
+            elif self._phase in PHASES:
+                progress = PHASES.index(self._phase) / len(PHASES)
+            else:
+                progress = 0.0
+            return {
+                "phase": self._phase,
+                "progress": round(progress, 2),
+                "ready": self._phase == "ready",
+                "error": self._error,
+                "elapsed_seconds": round(self._elapsed_seconds(), 3),
+            }
@@ -0,0 +1,37 @@
+# -*- coding: utf-8 -*-
+"""
+File: build_index.py
+
+Builds the prebuilt index bundle served by the backend. It loads, splits and embeds
+the local and web documents once and writes the bundle (manifest, sections and
+memory-mappable embedding matrices), so the server starts without re-embedding.
+
+Usage (from the backend folder, with PYTHONPATH set):
+    python src/build_index.py [--output ./index_bundle] [--docs-path ./docs]
+"""
+
+import argparse
+
+from src.chatbot.core_initializer import CoreInitializer
+from src.config.config_init import INDEX_BUNDLE_CONFIG
+from src.config.config_url import DOCS_URL
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Build the LaredocMind index bundle.")
+    parser.add_argument(
+        "--output",
+        default=INDEX_BUNDLE_CONFIG["bundle_path"],
+        help="Directory where the bundle is written.",
+    )
+    parser.add_argument(
+        "--docs-path", default="./docs", help="Directory of the local documents."
+    )
+    args = parser.parse_args()
+
+    core = CoreInitializer(docs_path=args.docs_path, web_paths=DOCS_URL)
+    core.build_index_bundle(args.output)
+
+
+if __name__ == "__main__":
+    main()
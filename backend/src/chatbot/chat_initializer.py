@@ -42,7 +42,7 @@ class ChatInitializer:
             input_message = user_input
 
             # Execute the graph without streaming
-            response = self._chatbot_graph.graph.invoke(
+            response = self._chatbot_graph.invoke(
                 {"question": input_message}, self._config
             )
             response_message = response["answer"]
@@ -65,7 +65,7 @@ class ChatInitializer:
 
             print("Bot:", end=" ", flush=True)  # Imprime "Bot:" sin salto de línea
 
-            async for event in self._chatbot_graph.graph.astream_events(
+            async for event in self._chatbot_graph.astream_events(
                 {"question": input_message}, self._config
             ):
                 # Get chat model tokens from a particular node
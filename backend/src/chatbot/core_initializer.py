@@ -5,14 +5,42 @@ File: core_initializer.py
 This file contains the CoreInitializer class, responsible for initializing
 the key components of the application. It loads necessary services such as
 API keys, models, documents, and embeddings before the main process begins.
+
+The model providers, vector stores and document loaders are imported lazily, when the
+phase that builds them starts, so importing this module (e.g. from the Flask app or a
+command-line tool) stays cheap. The duration of every phase is recorded in the shared
+startup profiler and logged once the core is initialized. When the memory report is
+enabled, the memory held after the documents and embeddings phases is traced as well.
+
+Once initialized, single documents can be upserted or deleted through the
+DocumentUpdater (e.g. by the admin API), and the local documents directory is watched
+(when enabled): the files that change are split again and only their sections are
+reindexed in the running embedding manager. When the index bundle is served, the local
+files changed since it was built (e.g. by the admin API before a restart) are reindexed
+the same way before the core is ready.
 """
 
-from typing import List
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, List, Optional
 from src.utils.key_manager import KeyManager
-from src.utils.gemini_model_manager import ModelManager
-from src.utils.embedding_manager import EmbeddingManager
-from src.utils.document_manager import DocumentManager
 from src.utils.logger_manager import logger
+from src.utils.memory_profiler import memory_profiler
+from src.utils.startup_profiler import startup_profiler
+from src.config.config_init import (
+    DOCS_WATCHER_CONFIG,
+    DOCUMENT_PIPELINE_CONFIG,
+    EMBEDDING_CACHE_CONFIG,
+    EMBEDDING_PIPELINE_CONFIG,
+    INDEX_BUNDLE_CONFIG,
+)
+
+if TYPE_CHECKING:
+    from langchain_core.documents import Document
+    from src.utils.gemini_model_manager import ModelManager
+    from src.utils.embedding_manager import EmbeddingManager
+    from src.utils.in_memory_embedding_manager import InMemoryEmbeddingManager
+    from src.utils.document_manager import DocumentManager
+    from src.utils.directory_watcher import DirectoryWatcher
+    from src.utils.document_updater import DocumentUpdater
 
 
 class CoreInitializer:
@@ -26,50 +54,344 @@ class CoreInitializer:
         """
         self._docs_path: str = docs_path
         self._web_paths: List[str] = web_paths
-        self._model_manager: ModelManager | None = None
-        self._document_manager: DocumentManager | None = None
-        self._embedding_manager: EmbeddingManager | None = None
+        self._model_manager: Optional["ModelManager"] = None
+        self._document_manager: Optional["DocumentManager"] = None
+        self._embedding_manager: Optional[
+            "EmbeddingManager | InMemoryEmbeddingManager"
+        ] = None
+        self._docs_watcher: Optional["DirectoryWatcher"] = None
+        self._document_updater: Optional["DocumentUpdater"] = None
 
-    def initialize(self) -> None:
+    def initialize(
+        self, progress_callback: Optional[Callable[[str], None]] = None
+    ) -> None:
         """
-        Initializes the key components of the application.
+        Initializes the key components of the application. If a prebuilt index bundle is
+        available, it is memory-mapped instead of loading, splitting and embedding documents,
+        and only the local files changed since it was built are reindexed.
+
+        Args:
+            progress_callback (Optional[Callable[[str], None]]): Called with the name of each
+                phase ('keys', 'models', 'documents', 'embeddings') as it starts.
         """
+        report = progress_callback or (lambda phase: None)
         try:
             # Initializing KeyManager, ModelManager, DocumentManager, and EmbeddingManager
-            KeyManager()
-            self._model_manager = ModelManager()
-            self._document_manager = DocumentManager(
-                directory_path=self._docs_path, web_paths=self._web_paths
-            )
-            self._embedding_manager = EmbeddingManager(
-                embedding_model=self._model_manager.embeddings,
-                local_documents=self._document_manager.local_sections,
-                web_documents=self._document_manager.web_sections,
-            )
+            report("keys")
+            with startup_profiler.measure("keys"):
+                KeyManager()
+
+            report("models")
+            with startup_profiler.measure("models"):
+                self._model_manager = self._create_model_manager()
+                embedding_model = self._get_embedding_model()
+
+            # Changes made while the index is built are picked up once watching starts
+            if DOCS_WATCHER_CONFIG["enabled"]:
+                self._docs_watcher = self._create_docs_watcher()
+
+            with startup_profiler.measure("bundle"):
+                self._embedding_manager = self._load_index_bundle(embedding_model)
+            bundle_served = self._embedding_manager is not None
+
+            if not bundle_served:
+                self._build_embedding_manager(embedding_model, report)
+
+            self._document_updater = self._create_document_updater()
+            if bundle_served:
+                with startup_profiler.measure("refresh"):
+                    self._refresh_bundle_local_files(INDEX_BUNDLE_CONFIG["bundle_path"])
+            if self._docs_watcher is not None:
+                self._docs_watcher.start()
 
             # Log successful initialization
             logger.info("Core initialized successfully.")
+            logger.info(startup_profiler.format_report())
         except Exception as e:
             # Log any errors encountered during initialization
             logger.error(f"Error during core initialization: {e}")
             raise
 
+    def _build_embedding_manager(
+        self, embedding_model: Any, report: Callable[[str], None]
+    ) -> None:
+        """
+        Loads and splits the documents and indexes their sections in the Chroma database.
+        When streaming, documents are loaded and split while the sections are embedded.
+        In low-memory mode the split sections are handed over to the EmbeddingManager,
+        so the DocumentManager does not keep a second reference to them.
+
+        Args:
+            embedding_model (Embeddings): The model used to embed the sections.
+            report (Callable[[str], None]): Called with the name of each phase as it starts.
+        """
+        streaming: bool = DOCUMENT_PIPELINE_CONFIG["streaming"]
+        if DOCUMENT_PIPELINE_CONFIG["memory_report"]:
+            memory_profiler.start()
+        try:
+            report("documents")
+            with startup_profiler.measure("documents"), memory_profiler.measure(
+                "documents"
+            ):
+                self._document_manager = self._create_document_manager(stream=streaming)
+                if streaming:
+                    local_sections: Iterable["Document"] = (
+                        self._document_manager.iter_local_sections()
+                    )
+                    web_sections: Iterable["Document"] = (
+                        self._document_manager.iter_web_sections()
+                    )
+                elif DOCUMENT_PIPELINE_CONFIG["low_memory"]:
+                    local_sections, web_sections = (
+                        self._document_manager.hand_over_sections()
+                    )
+                else:
+                    local_sections = self._document_manager.local_sections
+                    web_sections = self._document_manager.web_sections
+
+            report("embeddings")
+            with startup_profiler.measure("embeddings"), memory_profiler.measure(
+                "embeddings"
+            ):
+                with startup_profiler.measure("embeddings.import"):
+                    from src.utils.embedding_manager import EmbeddingManager
+
+                with self._document_manager:
+                    self._embedding_manager = EmbeddingManager(
+                        embedding_model=embedding_model,
+                        local_documents=local_sections,
+                        web_documents=web_sections,
+                    )
+                # The embedding manager keeps (or drops) the sections from here on
+                del local_sections, web_sections
+
+            if memory_profiler.enabled:
+                logger.info(memory_profiler.format_report())
+        finally:
+            memory_profiler.stop()
+
+    def build_index_bundle(self, bundle_path: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Loads, splits and embeds all documents and writes them as a prebuilt index bundle.
+        This is meant to run separately from the server (see `src/build_index.py`).
+
+        Args:
+            bundle_path (Optional[str]): Output directory. Defaults to the configured bundle path.
+
+        Returns:
+            Dict[str, Any]: The manifest of the written bundle.
+        """
+        from src.utils.directory_loader import DirectoryLoader
+        from src.utils.embedding_pipeline import EmbeddingPipeline
+        from src.utils.index_bundle import IndexBundle
+
+        KeyManager()
+        self._model_manager = self._create_model_manager()
+        # Taken before loading, so a file changed meanwhile is reindexed when served
+        local_files = DirectoryLoader(self._docs_path).snapshot()
+        self._document_manager = self._create_document_manager()
+        embedding_model = EmbeddingPipeline(
+            self._get_embedding_model(), **EMBEDDING_PIPELINE_CONFIG
+        )
+        return IndexBundle(bundle_path or INDEX_BUNDLE_CONFIG["bundle_path"]).write(
+            embedding_model=embedding_model,
+            local_sections=self._document_manager.local_sections,
+            web_sections=self._document_manager.web_sections,
+            local_files=local_files,
+        )
+
+    def close(self) -> None:
+        """
+        Stops watching the local documents.
+        """
+        if self._docs_watcher is not None:
+            self._docs_watcher.stop()
+            self._docs_watcher = None
+
+    def _create_docs_watcher(self) -> Optional["DirectoryWatcher"]:
+        """
+        Creates the watcher of the local documents directory (None if it does not exist).
+        """
+        from src.utils.directory_loader import DirectoryLoader
+        from src.utils.directory_watcher import DirectoryWatcher
+
+        options = dict(DOCS_WATCHER_CONFIG)
+        options.pop("enabled")
+        try:
+            return DirectoryWatcher(
+                DirectoryLoader(self._docs_path),
+                on_change=self._reindex_local_files,
+                **options,
+            )
+        except (OSError, ValueError) as e:
+            logger.warning(f"Not watching the local documents: {e}")
+            return None
+
+    def _reindex_local_files(self, changed: List[str], removed: List[str]) -> None:
+        """
+        Splits the changed local files again and replaces their sections (and those of the
+        removed files) in the running embedding manager. Runs on the watcher thread.
+
+        Args:
+            changed (List[str]): The added or modified file names.
+            removed (List[str]): The removed file names.
+        """
+        if self._document_updater is not None:
+            self._document_updater.refresh_local_files(changed, removed)
+
+    def _refresh_bundle_local_files(self, bundle_path: str) -> Dict[str, int]:
+        """
+        Reindexes the local files added, modified or removed since the served index
+        bundle was built, so they are not served from the outdated bundle. A bundle
+        that did not record its local files has all of them split again (unchanged
+        sections keep their vectors).
+
+        Args:
+            bundle_path (str): Directory of the served index bundle.
+
+        Returns:
+            Dict[str, int]: The number of sections 'added', 'removed' and 'reused'.
+        """
+        from src.utils.directory_loader import DirectoryLoader
+        from src.utils.index_bundle import IndexBundle
+
+        built = IndexBundle(bundle_path).local_files()
+        if built is None:
+            logger.warning(
+                "The index bundle does not record its local documents. Reindexing all "
+                "of them (rebuild the bundle to avoid this)."
+            )
+            built = {}
+        try:
+            current = DirectoryLoader(self._docs_path).snapshot()
+        except (OSError, ValueError) as e:
+            logger.warning(f"Could not check the local documents of the index bundle: {e}")
+            return {"added": 0, "removed": 0, "reused": 0}
+
+        changed, removed = DirectoryLoader.diff_snapshots(built, current)
+        if not changed and not removed:
+            return {"added": 0, "removed": 0, "reused": 0}
+        logger.info(
+            f"Local documents changed since the index bundle was built: {len(changed)} "
+            f"added or modified, {len(removed)} removed. Reindexing them..."
+        )
+        return self._document_updater.refresh_local_files(changed, removed)  # type: ignore
+
+    def _create_document_updater(self) -> "DocumentUpdater":
+        """
+        Creates the DocumentUpdater of the running embedding manager. It shares the
+        DocumentManager when the documents were loaded (a streaming one, which loads
+        nothing up front, when the index bundle was served).
+        """
+        from src.utils.document_updater import DocumentUpdater
+
+        if self._document_manager is None:
+            self._document_manager = self._create_document_manager(stream=True)
+        return DocumentUpdater(
+            self._document_manager,
+            self._embedding_manager,  # type: ignore
+            docs_path=self._docs_path,
+        )
+
+    def _create_model_manager(self) -> "ModelManager":
+        """
+        Imports the model provider and creates the ModelManager.
+        """
+        with startup_profiler.measure("models.import"):
+            from src.utils.gemini_model_manager import ModelManager
+
+        return ModelManager()
+
+    def _create_document_manager(self, stream: bool = False) -> "DocumentManager":
+        """
+        Imports the document loaders and creates the DocumentManager, which loads and
+        splits the local and web documents (up front, or as its sections are consumed
+        when streaming).
+        """
+        with startup_profiler.measure("documents.import"):
+            from src.utils.document_manager import DocumentManager
+
+        return DocumentManager(
+            directory_path=self._docs_path, web_paths=self._web_paths, stream=stream
+        )
+
+    def _load_index_bundle(
+        self, embedding_model: Any
+    ) -> Optional["InMemoryEmbeddingManager"]:
+        """
+        Loads the prebuilt index bundle when it is enabled and present.
+
+        Args:
+            embedding_model (Embeddings): The embedding model used for queries.
+
+        Returns:
+            Optional[InMemoryEmbeddingManager]: The manager serving the bundle, or None to
+            fall back to building the index from the documents.
+        """
+        if not INDEX_BUNDLE_CONFIG["enabled"]:
+            return None
+
+        from src.utils.index_bundle import IndexBundle
+
+        bundle_path: str = INDEX_BUNDLE_CONFIG["bundle_path"]
+        if not IndexBundle(bundle_path).exists():
+            return None
+
+        from src.utils.in_memory_embedding_manager import InMemoryEmbeddingManager
+
+        try:
+            return InMemoryEmbeddingManager.from_bundle(embedding_model, bundle_path)
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning(
+                f"Could not load index bundle at {bundle_path}: {e}. Rebuilding the index..."
+            )
+            return None
+
+    def _get_embedding_model(self) -> Any:
+        """
+        Returns the embedding model handed to the embedding manager, wrapped in the
+        persistent embedding cache when it is enabled.
+        """
+        embeddings = self._model_manager.embeddings  # type: ignore
+        cache_config = dict(EMBEDDING_CACHE_CONFIG)
+        if not cache_config.pop("enabled", False):
+            return embeddings
+
+        from src.utils.embedding_cache import CachedEmbeddings
+
+        return CachedEmbeddings(embedding_model=embeddings, **cache_config)  # type: ignore
+
     @property
-    def model_manager(self) -> ModelManager:
+    def model_manager(self) -> "ModelManager":
         """
         Returns the ModelManager instance.
         """
         return self._model_manager  # type: ignore
 
     @property
-    def document_manager(self) -> DocumentManager:
+    def document_manager(self) -> "DocumentManager":
         """
-        Returns the DocumentManager instance.
+        Returns the DocumentManager instance (a streaming one, which loaded nothing up
+        front, when the index bundle was served).
         """
         return self._document_manager  # type: ignore
 
     @property
-    def embedding_manager(self) -> EmbeddingManager:
+    def document_updater(self) -> "DocumentUpdater":
+        """
+        Returns the DocumentUpdater of the running embedding manager.
+        """
+        return self._document_updater  # type: ignore
+
+    @property
+    def docs_watcher(self) -> Optional["DirectoryWatcher"]:
+        """
+        Returns the watcher of the local documents (None when not watching).
+        """
+        return self._docs_watcher
+
+    @property
+    def embedding_manager(self) -> "EmbeddingManager | InMemoryEmbeddingManager":
         """
         Returns the EmbeddingManager instance.
         """
@@ -6,12 +6,31 @@ This file contains the GraphInitializer class, responsible for managing the chat
 graph logic, including searching for context, generating answers using a language model,
 and summarizing the conversation. It integrates different components like a model manager,
 embedding manager, and utility functions to process questions and generate appropriate responses.
+
+Questions are translated and optimized by the QuestionRewriter: short English questions
+skip the LLM call (local language detection), and repeated questions are served from a
+persistent rewrite cache.
+
+With speculative search enabled, the local and web searches start on the raw question while
+it is translated/optimized; their results are kept when the rewritten question is nearly
+the same, and the search runs again on the rewritten question otherwise.
+
+Every node has an async variant (prefixed with 'a') that awaits the models, the embeddings
+and the subgraphs. The compiled graph runs the async variants with ainvoke/astream/
+astream_events and the sync ones with invoke/stream, so many conversations can share one
+event loop without blocking it.
+
+Long conversations are summarized in the background after the answer is returned (see
+BackgroundSummarizer): run turns through the invoke, ainvoke and astream_events methods of
+this class, which wait for the pending summary of the conversation before answering and
+schedule a new one afterwards.
 """
 
-import json
+import hashlib
 import re
+import threading
 
-from typing import List, Dict, Union, TypedDict
+from typing import TYPE_CHECKING, Any, AsyncIterator, Awaitable, Callable, List, Dict, Optional, Tuple, Union, TypedDict
 
 from langgraph.graph import StateGraph, MessagesState, START, END
 from langgraph.checkpoint.memory import MemorySaver
@@ -23,9 +42,8 @@ from langchain_core.messages import (
     MessageLikeRepresentation,
 )
 from langchain_core.documents import Document
+from langchain_core.runnables import RunnableLambda
 
-from src.utils.gemini_model_manager import ModelManager
-from src.utils.embedding_manager import EmbeddingManager
 from src.utils.logger_manager import logger
 from src.config.config_chatbot import (
     SUMMARY_PROMPT,
@@ -34,7 +52,21 @@ from src.config.config_chatbot import (
     SUMMARIZATION_PROMPT,
     TRANSLATE_OPTIMIZE_QUESTION_PROMPT,
 )
-from src.config.config_init import K_WEB_SEARCH, K_LOCAL_SEARCH
+from src.config.config_init import (
+    K_WEB_SEARCH,
+    K_LOCAL_SEARCH,
+    LLM_FLASH_CONFIG,
+    QUESTION_REWRITE_CONFIG,
+    SPECULATIVE_SEARCH_CONFIG,
+    SUMMARY_CONFIG,
+)
+from src.utils.background_summarizer import BackgroundSummarizer
+from src.utils.conversation_memory import ConversationMemory
+from src.utils.question_rewriter import QuestionRewriter, extract_json
+
+if TYPE_CHECKING:
+    from src.utils.gemini_model_manager import ModelManager
+    from src.utils.embedding_manager import EmbeddingManager
 
 
 # States for each graph to modularize
@@ -48,6 +80,7 @@ class TranslateState(TypedDict):
 
 class SearchState(TypedDict):
     question: MessageLikeRepresentation
+    question_embedding: List[float]  # Embedding shared by the local and web searches
     local_context: List[Document]
     web_context: List[Document]
     language: str  # Nuevo campo para el idioma
@@ -60,6 +93,9 @@ class GenerationState(MessagesState):
     web_context: List[Document]  # Web context (web search results)
     summary: str  # Summary of previous conversation (if available)
     language: str  # Nuevo campo para el idioma
+    speculative_question: str  # Raw question searched while translating ("" if skipped)
+    speculative_local_context: List[Document]  # Local results for the raw question
+    speculative_web_context: List[Document]  # Web results for the raw question
 
 
 class SummarizationState(MessagesState):
@@ -78,8 +114,15 @@ class JsonState(TypedDict):
 
 
 class GraphInitializer:
+    _WORD_PATTERN = re.compile(r"\w+")
+
     def __init__(
-        self, model_manager: ModelManager, embedding_manager: EmbeddingManager
+        self,
+        model_manager: "ModelManager",
+        embedding_manager: "EmbeddingManager",
+        rewrite_config: Optional[Dict[str, Any]] = None,
+        speculation_config: Optional[Dict[str, Any]] = None,
+        summary_config: Optional[Dict[str, Any]] = None,
     ) -> None:
         """
         Initializes the chatbot graph with the provided ModelManager and EmbeddingManager.
@@ -87,15 +130,91 @@ class GraphInitializer:
         Args:
             model_manager (ModelManager): The model manager responsible for interacting with the LLM.
             embedding_manager (EmbeddingManager): The embedding manager responsible for managing local and web search embeddings.
+            rewrite_config (Optional[Dict[str, Any]]): The question rewrite settings, with the
+                keys of QUESTION_REWRITE_CONFIG (the default).
+            speculation_config (Optional[Dict[str, Any]]): The speculative search settings,
+                with the keys of SPECULATIVE_SEARCH_CONFIG (the default).
+            summary_config (Optional[Dict[str, Any]]): The conversation summary settings,
+                with the keys of SUMMARY_CONFIG (the default).
         """
         logger.info(
             "Initializing GraphInitializer with model and embedding managers."
         )  # Log the initialization
 
         # Private attributes
-        self._model_manager: ModelManager = model_manager
-        self._embedding_manager: EmbeddingManager = embedding_manager
+        self._model_manager: "ModelManager" = model_manager
+        self._embedding_manager: "EmbeddingManager" = embedding_manager
         self._graph: StateGraph
+        self._rewrite_config: Dict[str, Any] = (
+            QUESTION_REWRITE_CONFIG if rewrite_config is None else rewrite_config
+        )
+        self._speculation_config: Dict[str, Any] = (
+            SPECULATIVE_SEARCH_CONFIG if speculation_config is None else speculation_config
+        )
+        self._summary_config: Dict[str, Any] = (
+            SUMMARY_CONFIG if summary_config is None else summary_config
+        )
+        self._question_rewriter: QuestionRewriter = self._create_question_rewriter()
+        self._speculation_lock = threading.Lock()
+        self._speculation_counts: Dict[str, int] = {"kept": 0, "requeried": 0, "skipped": 0}
+        self._memory = ConversationMemory(
+            recent_tokens=self._summary_config["recent_tokens"],
+            summarize_above_tokens=self._summary_config["summarize_above_tokens"],
+            chars_per_token=self._summary_config["chars_per_token"],
+        )
+        self._summarizer: Optional[BackgroundSummarizer] = None
+        if self._summary_config["background"]:
+            self._summarizer = BackgroundSummarizer(
+                self._summarize_in_background,
+                self._write_summary,
+                max_workers=self._summary_config["max_workers"],
+                wait_seconds=self._summary_config["wait_seconds"],
+            )
+
+    # --- Conversation turns ---
+    def invoke(self, input: Dict[str, Any], config: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Runs one turn of a conversation: waits for the pending summary of the conversation,
+        answers the question, then summarizes the conversation in the background if needed.
+
+        Args:
+            input (Dict[str, Any]): The graph input (the 'question').
+            config (Dict[str, Any]): The graph config, naming the conversation ('thread_id').
+
+        Returns:
+            Dict[str, Any]: The graph output (the 'answer' and its 'documents').
+        """
+        if self._summarizer is not None:
+            self._summarizer.wait(config)
+        response = self.graph.invoke(input, config)  # type: ignore
+        if self._summarizer is not None and self._needs_summary(self.graph.get_state(config).values):  # type: ignore
+            self._summarizer.schedule(config)
+        return response
+
+    async def ainvoke(self, input: Dict[str, Any], config: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Async variant of invoke.
+        """
+        if self._summarizer is not None:
+            await self._summarizer.await_summary(config)
+        response = await self.graph.ainvoke(input, config)  # type: ignore
+        if self._summarizer is not None and self._needs_summary((await self.graph.aget_state(config)).values):  # type: ignore
+            self._summarizer.schedule(config)
+        return response
+
+    async def astream_events(
+        self, input: Dict[str, Any], config: Dict[str, Any], **kwargs: Any
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Streaming variant of ainvoke: yields the events of the graph (see the astream_events
+        method of LangGraph). The conversation is summarized once the last event is consumed.
+        """
+        if self._summarizer is not None:
+            await self._summarizer.await_summary(config)
+        async for event in self.graph.astream_events(input, config, **kwargs):  # type: ignore
+            yield event
+        if self._summarizer is not None and self._needs_summary((await self.graph.aget_state(config)).values):  # type: ignore
+            self._summarizer.schedule(config)
 
     # --- Main flow methods ---
     def parse_input(self, state: InputState) -> TranslateState:
@@ -107,14 +226,42 @@ class GraphInitializer:
 
     def translate_and_optimize_question(self, state: TranslateState) -> JsonState:
         """
-        Uses the LLM to translate and optimize the question, returning improved_question as MessageLikeRepresentation in JsonState.
+        Translates and optimizes the question, returning improved_question as MessageLikeRepresentation in JsonState.
+        English questions skip the LLM and repeated ones are served from the rewrite cache.
         """
         question = state["question"].content  # type: ignore
-        prompt = TRANSLATE_OPTIMIZE_QUESTION_PROMPT.format(question=question)
-        improved_question = self._model_manager.flash_llm.invoke(prompt).content  # type: ignore
+        improved_question = self._question_rewriter.rewrite(question)
         improved_message = HumanMessage(content=improved_question)
         return JsonState(improved_question=improved_message)
 
+    async def atranslate_and_optimize_question(self, state: TranslateState) -> JsonState:
+        """
+        Async variant of translate_and_optimize_question.
+        """
+        question = state["question"].content  # type: ignore
+        improved_question = await self._question_rewriter.arewrite(question)
+        improved_message = HumanMessage(content=improved_question)
+        return JsonState(improved_question=improved_message)
+
+    def _rewrite_with_llm(self, question: str) -> str:
+        """
+        Uses the Flash LLM to translate and optimize a question.
+
+        Args:
+            question (str): The user's question.
+        Returns:
+            str: The raw answer of the LLM (a JSON object with 'language' and 'question').
+        """
+        prompt = TRANSLATE_OPTIMIZE_QUESTION_PROMPT.format(question=question)
+        return self._model_manager.flash_llm.invoke(prompt).content  # type: ignore
+
+    async def _arewrite_with_llm(self, question: str) -> str:
+        """
+        Async variant of _rewrite_with_llm.
+        """
+        prompt = TRANSLATE_OPTIMIZE_QUESTION_PROMPT.format(question=question)
+        return (await self._model_manager.flash_llm.ainvoke(prompt)).content  # type: ignore
+
     def extract_json(self, text: str) -> dict[str, object] | None:
         """
         Extracts the first JSON object found in a string and parses it.
@@ -124,14 +271,7 @@ class GraphInitializer:
         Returns:
             dict | None: The parsed JSON object if found and valid, otherwise None.
         """
-        match = re.search(r"\{[\s\S]*?\}", text)
-        if match:
-            json_str = match.group(0)
-            try:
-                return json.loads(json_str)
-            except Exception:
-                pass
-        return None
+        return extract_json(text)
 
     def parse_improved_question(self, state: JsonState) -> SearchState:
         """
@@ -173,20 +313,54 @@ class GraphInitializer:
             language=language,
         )
 
+    def embed_question(self, state: SearchState) -> SearchState:
+        """
+        Embeds the user's question once, so the local and web searches share the same vector.
+
+        Args:
+            state (State): The current state containing the user's question.
+
+        Returns:
+            dict: A dictionary containing the embedding of the question.
+        """
+        question = state["question"].content  # type: ignore
+
+        question_embedding = self._embedding_manager.embed_query(question)  # type: ignore
+
+        # Plain floats keep the state serializable by the checkpointer
+        return {"question_embedding": [float(x) for x in question_embedding]}  # type: ignore
+
+    async def aembed_question(self, state: SearchState) -> SearchState:
+        """
+        Async variant of embed_question.
+        """
+        question = state["question"].content  # type: ignore
+
+        question_embedding = await self._embedding_manager.aembed_query(question)  # type: ignore
+
+        return {"question_embedding": [float(x) for x in question_embedding]}  # type: ignore
+
     def search_local(self, state: SearchState) -> GenerationState:
         """
         Searches local documents for relevant context based on the user's question.
 
         Args:
-            state (State): The current state containing the user's question.
+            state (State): The current state containing the embedding of the user's question.
 
         Returns:
             dict: A dictionary containing the local search results added to the local context.
         """
-        question = state["question"].content  # type: ignore
+        local_docs = self._embedding_manager.query_local_embeddings_by_vector(
+            embedding=state["question_embedding"], k=K_LOCAL_SEARCH
+        )
+        return {"local_context": local_docs}  # type: ignore
 
-        local_docs = self._embedding_manager.query_local_embeddings(
-            query=question, k=K_LOCAL_SEARCH  # type: ignore
+    async def asearch_local(self, state: SearchState) -> GenerationState:
+        """
+        Async variant of search_local.
+        """
+        local_docs = await self._embedding_manager.aquery_local_embeddings_by_vector(
+            embedding=state["question_embedding"], k=K_LOCAL_SEARCH
         )
         return {"local_context": local_docs}  # type: ignore
 
@@ -195,18 +369,111 @@ class GraphInitializer:
         Searches web documents for relevant context based on the user's question.
 
         Args:
-            state (State): The current state containing the user's question.
+            state (State): The current state containing the embedding of the user's question.
 
         Returns:
             dict: A dictionary containing the web search results added to the web context.
         """
-        question = state["question"].content  # type: ignore
+        web_docs = self._embedding_manager.query_web_embeddings_by_vector(
+            embedding=state["question_embedding"], k=K_WEB_SEARCH
+        )
+        return {"web_context": web_docs}  # type: ignore
 
-        web_docs = self._embedding_manager.query_web_embeddings(
-            query=question, k=K_WEB_SEARCH  # type: ignore
+    async def asearch_web(self, state: SearchState) -> GenerationState:
+        """
+        Async variant of search_web.
+        """
+        web_docs = await self._embedding_manager.aquery_web_embeddings_by_vector(
+            embedding=state["question_embedding"], k=K_WEB_SEARCH
         )
         return {"web_context": web_docs}  # type: ignore
 
+    def speculative_search(self, state: GenerationState) -> GenerationState:
+        """
+        Searches local and web documents with the raw question, in parallel with its
+        translation/optimization. Questions detected as non-English are not searched, since
+        their rewrite is a translation.
+
+        Args:
+            state (State): The current state containing the user's raw question.
+
+        Returns:
+            dict: The searched question ("" if skipped) and its local and web results.
+        """
+        question = state["question"].content  # type: ignore
+        if not self._should_speculate(question):
+            return self._speculative_results("", {})
+        results = self._search_subgraph.invoke({"question": state["question"]})  # type: ignore
+        return self._speculative_results(question, results)
+
+    async def aspeculative_search(self, state: GenerationState) -> GenerationState:
+        """
+        Async variant of speculative_search.
+        """
+        question = state["question"].content  # type: ignore
+        if not self._should_speculate(question):
+            return self._speculative_results("", {})
+        results = await self._search_subgraph.ainvoke({"question": state["question"]})  # type: ignore
+        return self._speculative_results(question, results)
+
+    def reuse_or_search(self, state: GenerationState) -> GenerationState:
+        """
+        Keeps the speculative search results if the rewritten question is nearly the same
+        as the raw one (word overlap of at least 'min_similarity'), otherwise searches again
+        with the rewritten question.
+
+        Args:
+            state (State): The current state containing the rewritten question and the speculative results.
+
+        Returns:
+            dict: A dictionary containing the local and web context.
+        """
+        kept = self._kept_speculative_results(state)
+        if kept is not None:
+            return kept
+        return self._search_subgraph.invoke(state)  # type: ignore
+
+    async def areuse_or_search(self, state: GenerationState) -> GenerationState:
+        """
+        Async variant of reuse_or_search.
+        """
+        kept = self._kept_speculative_results(state)
+        if kept is not None:
+            return kept
+        return await self._search_subgraph.ainvoke(state)  # type: ignore
+
+    def _kept_speculative_results(self, state: GenerationState) -> Optional[GenerationState]:
+        """
+        Decides whether the speculative search results can be kept and counts the outcome.
+
+        Args:
+            state (State): The current state containing the rewritten question and the speculative results.
+
+        Returns:
+            Optional[dict]: The local and web context to keep, or None to search again.
+        """
+        question = state["question"].content  # type: ignore
+        speculative_question = state.get("speculative_question", "")
+        if not speculative_question:
+            outcome = "skipped"
+        elif (
+            self._question_similarity(speculative_question, question)
+            >= self._speculation_config["min_similarity"]
+        ):
+            outcome = "kept"
+        else:
+            outcome = "requeried"
+        with self._speculation_lock:
+            self._speculation_counts[outcome] += 1
+        logger.debug(f"Speculative search {outcome} for question: {question}")
+
+        if outcome != "kept":
+            return None
+        return {
+            "local_context": state["speculative_local_context"],
+            "web_context": state["speculative_web_context"],
+        }  # type: ignore
+
     def generate_answer(self, state: GenerationState) -> SummarizationState:
         """
         Generates a response to the user's question using the language model, incorporating the relevant context and any available summary.
@@ -220,11 +487,41 @@ class GraphInitializer:
         Returns:
             dict: A dictionary containing the generated response as a list of messages. The key 'messages' contains the response from the model.
         """
+        system_messages, question_message, combined_context = self._answer_messages(state)
+
+        # Invoke the model with the constructed system messages
+        response = self._model_manager.llm.invoke(system_messages)  # type: ignore
+
+        return {"messages": [question_message, response], "answer": response, "documents": combined_context}  # type: ignore
+
+    async def agenerate_answer(self, state: GenerationState) -> SummarizationState:
+        """
+        Async variant of generate_answer.
+        """
+        system_messages, question_message, combined_context = self._answer_messages(state)
+
+        # Invoke the model with the constructed system messages
+        response = await self._model_manager.llm.ainvoke(system_messages)  # type: ignore
+
+        return {"messages": [question_message, response], "answer": response, "documents": combined_context}  # type: ignore
+
+    def _answer_messages(
+        self, state: GenerationState
+    ) -> Tuple[List[BaseMessage], HumanMessage, List[Document]]:
+        """
+        Builds the messages sent to the language model to answer the user's question.
+
+        Args:
+            state (State): The current state containing the user's question, context, and potentially a summary of prior conversation.
+
+        Returns:
+            Tuple[List[BaseMessage], HumanMessage, List[Document]]: The messages for the model, the question message to add to the history and the combined context.
+        """
         question = state["question"].content  # type: ignore
         local_context = state["local_context"]
         web_context = state["web_context"]
         summary = state.get("summary", "")
-        messages = state["messages"]
+        messages = self._memory.prompt_messages(state["messages"])
         language = state.get("language", "en")
 
         # Log to verify the context and messages before invocation
@@ -257,7 +554,7 @@ class GraphInitializer:
         # Append recent messages to the system message
         if messages:
             system_messages.append(
-                SystemMessage(content=RECENT_MESSAGES_PROMPT.format(messages=messages))
+                SystemMessage(content=RECENT_MESSAGES_PROMPT.format(messages=self._memory.render(messages)))
             )
 
         # Add the user question to the message history
@@ -267,11 +564,7 @@ class GraphInitializer:
         system_messages.append(HumanMessage(content=question))
 
         logger.debug(f"System messages before invoking model: {len(system_messages)}")
-
-        # Invoke the model with the constructed system messages
-        response = self._model_manager.llm.invoke(system_messages)  # type: ignore
-
-        return {"messages": [question_message, response], "answer": response, "documents": combined_context}  # type: ignore
+        return system_messages, question_message, combined_context
 
     def summarize_conversation(
         self,
@@ -292,8 +585,27 @@ class GraphInitializer:
             dict: A dictionary containing the conversation summary and a list of messages to delete from the history.
                 The 'summary' key contains the generated summary, and the 'messages' key contains the messages to remove.
         """
+        # Invoke the model with the constructed summarization prompt
+        response = self._model_manager.flash_llm.invoke(self._summarization_messages(state))  # type: ignore
+        return self._summary_update(state, response.content)  # type: ignore
+
+    async def asummarize_conversation(
+        self,
+        state: SummarizationState,
+    ) -> Dict[str, Union[str, List[RemoveMessage]]]:
+        """
+        Async variant of summarize_conversation.
+        """
+        response = await self._model_manager.flash_llm.ainvoke(self._summarization_messages(state))  # type: ignore
+        return self._summary_update(state, response.content)  # type: ignore
+
+    def _summarization_messages(self, state: SummarizationState) -> List[BaseMessage]:
+        """
+        Builds the messages asking the Flash LLM to summarize the conversation.
+        """
         summary = state.get("summary", "")
-        messages = state["messages"]
+        # Only the turns left out of the recent budget are summarized
+        messages, _ = self._memory.split(state["messages"])
 
         # Prepare system messages for summarization
         system_messages: List[BaseMessage] = []
@@ -301,41 +613,43 @@ class GraphInitializer:
         # If there is an existing summary, format it as part of the prompt for summarization
         system_messages.append(
             SystemMessage(
-                content=SUMMARIZATION_PROMPT.format(summary=summary, messages=messages)
+                content=SUMMARIZATION_PROMPT.format(summary=summary, messages=self._memory.render(messages))
             )
         )
 
         # Add an instruction to the model to summarize the conversation
         system_messages.append(HumanMessage(content="Summarize the conversation."))
+        return system_messages
 
-        # Invoke the model with the constructed summarization prompt
-        response = self._model_manager.flash_llm.invoke(system_messages)  # type: ignore
-
-        # Identify old messages to remove from the conversation history
+    def _summary_update(
+        self, state: SummarizationState, summary: str
+    ) -> Dict[str, Union[str, List[RemoveMessage]]]:
+        """
+        Returns the new summary and removes the messages it replaces from the history.
+        """
+        # Identify old messages to remove from the conversation history (the recent turns stay)
+        overflow, _ = self._memory.split(state["messages"])
         delete_messages: List[RemoveMessage] = [
-            RemoveMessage(id=m.id)
-            for m in state["messages"][:-2]  # Keep the last two messages
-            if m.id is not None
+            RemoveMessage(id=m.id) for m in overflow if m.id is not None
         ]
-        return {"summary": response.content, "messages": delete_messages}  # type: ignore
+        return {"summary": summary, "messages": delete_messages}  # type: ignore
 
-    def should_continue(self, state: SummarizationState, message_threshold: int = 6):
+    def should_continue(self, state: SummarizationState):
         """
-        Determines whether to continue the conversation or summarize it based on the number of messages.
+        Determines whether to continue the conversation or summarize it based on the tokens of its transcript.
 
         Args:
             state (State): The current state of the conversation containing all the messages.
-            message_threshold (int, optional): The threshold after which summarization should occur. Default is 6.
 
         Returns:
             Union[str, dict]: The next action, either to continue the conversation or summarize it.
         """
         messages = state["messages"]
 
-        # Check if the conversation exceeds the threshold for summarization
-        if len(messages) > message_threshold:
+        # Check if the conversation exceeds the token budget for summarization (see SUMMARY_CONFIG)
+        if self._memory.needs_summary(messages):
             logger.debug(
-                f"Conversation length exceeds {message_threshold} messages. Initiating summarization."
+                f"Conversation transcript exceeds {self._summary_config['summarize_above_tokens']} tokens. Initiating summarization."
             )
             return "summarize_conversation"
         else:
@@ -353,6 +667,123 @@ class GraphInitializer:
         """
         return OutputState(answer=state["answer"].content, documents=state["documents"])  # type: ignore
 
+    # --- Private helpers ---
+    def _needs_summary(self, state: Dict[str, Any]) -> bool:
+        """
+        Checks whether a conversation holds enough messages to be summarized.
+        """
+        return self.should_continue(state) == "summarize_conversation"  # type: ignore
+
+    def _summarize_in_background(self, config: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Summarizes the conversation of a graph config from its checkpoint (run by the
+        BackgroundSummarizer once the answer was returned).
+
+        Args:
+            config (Dict[str, Any]): The graph config of the conversation.
+
+        Returns:
+            Optional[Dict[str, Any]]: The new summary and the messages it replaces, or None
+            if the conversation does not need a summary.
+        """
+        state = self.graph.get_state(config).values  # type: ignore
+        if not self._needs_summary(state):
+            return None
+        return self.summarize_conversation(state)  # type: ignore
+
+    def _write_summary(self, config: Dict[str, Any], update: Dict[str, Any]) -> None:
+        """
+        Writes a summary to the checkpoint of a conversation, as if the graph produced it.
+        """
+        self.graph.update_state(config, update, as_node="parse_output")  # type: ignore
+
+    def _should_speculate(self, question: str) -> bool:
+        """
+        Checks whether to search with the raw question: not when it is detected as
+        non-English (its rewrite is a translation).
+        """
+        if not self._speculation_config["skip_non_english"]:
+            return True
+        language, confidence = self._question_rewriter.detect_language(question)
+        return language == "en" or confidence < self._rewrite_config["min_confidence"]
+
+    @staticmethod
+    def _speculative_results(question: str, results: Dict[str, Any]) -> GenerationState:
+        """
+        Returns the speculative search state: the searched question ("" if skipped) and
+        its local and web results.
+        """
+        return {
+            "speculative_question": question,
+            "speculative_local_context": results.get("local_context", []),
+            "speculative_web_context": results.get("web_context", []),
+        }  # type: ignore
+
+    @staticmethod
+    def _node(
+        name: str,
+        func: Callable[[Any], Any],
+        afunc: Optional[Callable[[Any], Awaitable[Any]]] = None,
+    ) -> RunnableLambda:
+        """
+        Wraps the sync and async variants of a node: the graph runs func with invoke/stream
+        and afunc with ainvoke/astream. Nodes without I/O (afunc None) run func directly on
+        the event loop.
+
+        Args:
+            name (str): The name of the node.
+            func (Callable[[Any], Any]): The sync variant of the node.
+            afunc (Optional[Callable[[Any], Awaitable[Any]]]): The async variant of the node.
+
+        Returns:
+            RunnableLambda: The node.
+        """
+        if afunc is None:
+
+            async def afunc(state: Any) -> Any:
+                return func(state)
+
+        return RunnableLambda(func, afunc=afunc, name=name)
+
+    @classmethod
+    def _question_similarity(cls, first: str, second: str) -> float:
+        """
+        Returns the word overlap (Jaccard index, case-insensitive) of two questions.
+        """
+        first_words = set(cls._WORD_PATTERN.findall(first.lower()))
+        second_words = set(cls._WORD_PATTERN.findall(second.lower()))
+        if not first_words or not second_words:
+            return 0.0
+        return len(first_words & second_words) / len(first_words | second_words)
+
+    def _create_question_rewriter(self) -> QuestionRewriter:
+        """
+        Creates the QuestionRewriter from the rewrite settings. The rewrite cache is keyed by
+        the rewrite prompt and the Flash model, so changing either starts a new cache.
+        """
+        config = self._rewrite_config
+        cache = None
+        if config["cache_enabled"]:
+            from src.utils.question_rewrite_cache import QuestionRewriteCache
+
+            prompt = TRANSLATE_OPTIMIZE_QUESTION_PROMPT.template
+            signature = f"{LLM_FLASH_CONFIG['model']}|{prompt}"
+            fingerprint = hashlib.sha256(signature.encode("utf-8")).hexdigest()
+            cache = QuestionRewriteCache(
+                cache_path=config["cache_path"],
+                max_entries=config["cache_max_entries"],
+                fingerprint=fingerprint,
+            )
+        return QuestionRewriter(
+            self._rewrite_with_llm,
+            arewrite_with_llm=self._arewrite_with_llm,
+            cache=cache,
+            fast_path=config["fast_path"],
+            min_confidence=config["min_confidence"],
+            max_words=config["max_words"],
+            llm_keywords=config["llm_keywords"],
+        )
+
     # --- Private subgraphs ---
     def _create_translate_subgraph(self) -> None:
         """
@@ -363,8 +794,8 @@ class GraphInitializer:
             input=TranslateState, output=SearchState
         )
         # Add nodes for translation and optimization
-        translate_graph.add_node("translate_and_optimize_question", self.translate_and_optimize_question)  # type: ignore
-        translate_graph.add_node("parse_improved_question", self.parse_improved_question)  # type: ignore
+        translate_graph.add_node("translate_and_optimize_question", self._node("translate_and_optimize_question", self.translate_and_optimize_question, self.atranslate_and_optimize_question), input=TranslateState)  # type: ignore
+        translate_graph.add_node("parse_improved_question", self._node("parse_improved_question", self.parse_improved_question), input=JsonState)  # type: ignore
 
         # Define edges for the translation subgraph
         translate_graph.add_edge(START, "translate_and_optimize_question")
@@ -384,13 +815,15 @@ class GraphInitializer:
         logger.info("Creating subgraph for local and web search.")
         search_graph: StateGraph = StateGraph(input=SearchState, output=GenerationState)
 
-        # Add nodes for local and web search
-        search_graph.add_node("search_local", self.search_local)  # type: ignore
-        search_graph.add_node("search_web", self.search_web)  # type: ignore
+        # Add nodes for question embedding and local and web search
+        search_graph.add_node("embed_question", self._node("embed_question", self.embed_question, self.aembed_question), input=SearchState)  # type: ignore
+        search_graph.add_node("search_local", self._node("search_local", self.search_local, self.asearch_local), input=SearchState)  # type: ignore
+        search_graph.add_node("search_web", self._node("search_web", self.search_web, self.asearch_web), input=SearchState)  # type: ignore
 
-        # Define edges for the search subgraph
-        search_graph.add_edge(START, "search_local")
-        search_graph.add_edge(START, "search_web")
+        # Define edges for the search subgraph (one embedding, two parallel searches)
+        search_graph.add_edge(START, "embed_question")
+        search_graph.add_edge("embed_question", "search_local")
+        search_graph.add_edge("embed_question", "search_web")
         search_graph.add_edge("search_local", END)
         search_graph.add_edge("search_web", END)
 
@@ -408,11 +841,18 @@ class GraphInitializer:
         )
 
         # Add nodes for generating answers and summarizing conversation
-        llm_graph.add_node("generate_answer", self.generate_answer)  # type: ignore
-        llm_graph.add_node("summarize_conversation", self.summarize_conversation)  # type: ignore
+        llm_graph.add_node("generate_answer", self._node("generate_answer", self.generate_answer, self.agenerate_answer), input=GenerationState)  # type: ignore
+        llm_graph.add_edge(START, "generate_answer")
+        if self._summary_config["background"]:
+            # Conversations are summarized after the answer is returned (see invoke)
+            llm_graph.add_edge("generate_answer", END)
+            self._llm_subgraph: StateGraph = llm_graph.compile()  # type: ignore
+            logger.info("LLM subgraph created and compiled (background summaries).")
+            return
+
+        llm_graph.add_node("summarize_conversation", self._node("summarize_conversation", self.summarize_conversation, self.asummarize_conversation), input=SummarizationState)  # type: ignore
 
         # Define edges for the LLM subgraph
-        llm_graph.add_edge(START, "generate_answer")
         llm_graph.add_conditional_edges(
             "generate_answer",
             self.should_continue,
@@ -435,16 +875,23 @@ class GraphInitializer:
         chatbot_graph: StateGraph = StateGraph(GenerationState, output=OutputState)
 
         # Add nodes for parsing input, searching, invoking LLM, and parsing output
-        chatbot_graph.add_node("parse_input", self.parse_input)  # type: ignore
-        chatbot_graph.add_node("translate", lambda state: self._translate_subgraph.invoke(state))  # type: ignore
-        chatbot_graph.add_node("search", lambda state: self._search_subgraph.invoke(state))  # type: ignore
-        chatbot_graph.add_node("llm_invocation", lambda state: self._llm_subgraph.invoke(state))  # type: ignore
-        chatbot_graph.add_node("parse_output", self.parse_output)  # type: ignore
+        chatbot_graph.add_node("parse_input", self._node("parse_input", self.parse_input), input=InputState)  # type: ignore
+        chatbot_graph.add_node("translate", self._node("translate", self._translate_subgraph.invoke, self._translate_subgraph.ainvoke))  # type: ignore
+        chatbot_graph.add_node("llm_invocation", self._node("llm_invocation", self._llm_subgraph.invoke, self._llm_subgraph.ainvoke))  # type: ignore
+        chatbot_graph.add_node("parse_output", self._node("parse_output", self.parse_output), input=SummarizationState)  # type: ignore
 
         # Define edges for the main chatbot graph
         chatbot_graph.add_edge(START, "parse_input")
         chatbot_graph.add_edge("parse_input", "translate")
-        chatbot_graph.add_edge("translate", "search")
+        if self._speculation_config["enabled"]:
+            # Search with the raw question while translating, then keep or redo the search
+            chatbot_graph.add_node("speculative_search", self._node("speculative_search", self.speculative_search, self.aspeculative_search))  # type: ignore
+            chatbot_graph.add_node("search", self._node("search", self.reuse_or_search, self.areuse_or_search))  # type: ignore
+            chatbot_graph.add_edge("parse_input", "speculative_search")
+            chatbot_graph.add_edge(["translate", "speculative_search"], "search")
+        else:
+            chatbot_graph.add_node("search", self._node("search", self._search_subgraph.invoke, self._search_subgraph.ainvoke))  # type: ignore
+            chatbot_graph.add_edge("translate", "search")
         chatbot_graph.add_edge("search", "llm_invocation")
         chatbot_graph.add_edge("llm_invocation", "parse_output")
         chatbot_graph.add_edge("parse_output", END)
@@ -481,6 +928,36 @@ class GraphInitializer:
         self._create_main_graph()
 
     # --- Properties ---
+    @property
+    def question_rewriter(self) -> QuestionRewriter:
+        """
+        Returns the QuestionRewriter (and with it the metrics of each rewrite path).
+        """
+        return self._question_rewriter
+
+    @property
+    def speculative_search_stats(self) -> Dict[str, Any]:
+        """
+        Returns how often the speculative search results were kept, searched again or
+        skipped (non-English questions), and the share kept.
+        """
+        with self._speculation_lock:
+            counts = dict(self._speculation_counts)
+        speculated = counts["kept"] + counts["requeried"]
+        return {
+            "enabled": self._speculation_config["enabled"],
+            **counts,
+            "keep_rate": counts["kept"] / speculated if speculated else 0.0,
+        }
+
+    @property
+    def summary_stats(self) -> Dict[str, Any]:
+        """
+        Returns the counters of the background summaries (empty if summaries are made
+        before answering).
+        """
+        return self._summarizer.stats if self._summarizer is not None else {}
+
     @property
     def graph(self) -> StateGraph:
         """
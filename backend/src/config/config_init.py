@@ -23,6 +23,49 @@ MARKDOWN_SPLITTER_CONFIG: Dict[str, Any] = {
     "keep_separator": True,  # Include separators in the resulting chunks
 }
 
+DOCUMENT_PIPELINE_CONFIG: Dict[str, Any] = {
+    "streaming": True,  # Embed sections as documents arrive instead of after loading everything
+    "split_processes": None,  # Splitter processes (None: one per CPU core, 0: split on the loading threads)
+    "max_pending_documents": 32,  # Documents waiting to be split before loading pauses
+    "low_memory": False,  # Drop raw documents once split and share metadata between sections
+    "memory_report": False,  # Trace allocations (tracemalloc) and log the memory held per phase
+}
+
+DOCS_WATCHER_CONFIG: Dict[str, Any] = {
+    "enabled": True,  # Reindex the local documents that change on disk without a restart
+    "backend": "auto",  # "watchdog" (inotify on Linux, if installed), "polling" or "auto"
+    "poll_interval": 2.0,  # Seconds between scans of the directory when polling
+    "debounce": 0.5,  # Seconds to wait after a change before reindexing
+}
+
+# -------------------------
+# Web Loader Configuration
+# -------------------------
+
+WEB_LOADER_ENGINE = "threads"  # "threads" (WebLoader) or "asyncio" (AsyncWebLoader, for large URL lists)
+
+WEB_LOADER_CONFIG: Dict[str, Any] = {
+    "max_workers": 16,  # Threads fetching and parsing web pages (parsing only with asyncio)
+    "max_connections_per_host": 6,  # Concurrent requests (and pooled connections) per host
+    "max_pooled_hosts": 16,  # Hosts whose keep-alive connections are pooled (threads engine)
+    "timeout": 10.0,  # Seconds to wait for a server response
+    "max_retries": 3,  # Retries for a page failing with a transient error
+    "backoff_base": 0.5,  # Seconds before the first retry (doubled on each retry)
+    "backoff_max": 8.0,  # Maximum seconds between retries
+    "parse_processes": None,  # Parser processes (None: one per CPU core, 0: parse on the fetching threads)
+    "parser_backend": "article",  # "html.parser", "lxml" (if installed) or "article" (parse only the article)
+}
+
+ASYNC_WEB_LOADER_CONFIG: Dict[str, Any] = {
+    "max_concurrency": 64,  # Requests in flight at the same time (asyncio engine only)
+}
+
+HTTP_CACHE_CONFIG: Dict[str, Any] = {
+    "enabled": True,  # Revalidate cached pages (ETag / Last-Modified) instead of refetching
+    "cache_path": "./cache/http.sqlite3",  # SQLite file storing page bodies and documents
+    "offline": False,  # Only load pages from the cache, without any request
+}
+
 # -------------------------
 # LLM (Language Model) Configuration
 # -------------------------
@@ -63,6 +106,86 @@ EMBEDDINGS_CONFIG: Dict[str, Any] = {
     "request_options": None,  # Additional request options
 }
 
+# -------------------------
+# Embedding Cache Configuration
+# -------------------------
+
+EMBEDDING_CACHE_CONFIG: Dict[str, Any] = {
+    "enabled": True,  # Serve repeated texts from the on-disk cache instead of the model
+    "cache_path": "./cache/embeddings.sqlite3",  # SQLite file storing the cached vectors
+    "max_entries": 200_000,  # Maximum cached vectors (least recently used are evicted)
+}
+
+# -------------------------
+# Embedding Pipeline Configuration
+# -------------------------
+
+EMBEDDING_PIPELINE_CONFIG: Dict[str, Any] = {
+    "batch_size": 64,  # Sections sent to the embedding model per request
+    "max_concurrency": 4,  # Maximum batches embedded at the same time
+    "max_retries": 3,  # Retries for a failed batch before giving up
+    "backoff_base": 1.0,  # Seconds before the first retry (doubled on each retry)
+    "backoff_max": 30.0,  # Maximum seconds between retries
+}
+
+# -------------------------
+# Query Embedding Cache Configuration
+# -------------------------
+
+QUERY_EMBEDDING_CACHE_CONFIG: Dict[str, Any] = {
+    "max_entries": 1024,  # Maximum cached questions (least recently used are evicted)
+    "ttl_seconds": 3600.0,  # Seconds a cached question stays valid (None to disable)
+    "lowercase": False,  # Share entries between questions differing only in case
+}
+
+# -------------------------
+# Question Rewrite Configuration
+# -------------------------
+
+QUESTION_REWRITE_CONFIG: Dict[str, Any] = {
+    "fast_path": True,  # Skip the translate/optimize LLM call for questions detected as English
+    "min_confidence": 0.5,  # Minimum confidence of the local language detector for the fast path
+    "max_words": 40,  # Longer questions are always rewritten by the LLM
+    "llm_keywords": ["laredo"],  # Words the rewrite prompt clarifies (always rewritten by the LLM)
+    "cache_enabled": True,  # Reuse the LLM rewrites of repeated questions, also across restarts
+    "cache_path": "./cache/question_rewrites.sqlite3",  # SQLite file storing the rewrites
+    "cache_max_entries": 10_000,  # Maximum cached rewrites (least recently used are evicted)
+}
+
+# -------------------------
+# Conversation Summary Configuration
+# -------------------------
+
+SUMMARY_CONFIG: Dict[str, Any] = {
+    "background": True,  # Summarize after the answer is returned, not before
+    "summarize_above_tokens": 1500,  # Summarize conversations whose transcript is longer (also the most history tokens in the answer prompt)
+    "recent_tokens": 500,  # Tokens of the newest turns kept verbatim by a summary (older turns are summarized)
+    "chars_per_token": 4.0,  # Characters per token of the local token estimate
+    "wait_seconds": 10.0,  # Longest wait of a new turn for its pending summary (then it goes on without it)
+    "max_workers": 2,  # Summaries computed at the same time
+}
+
+# -------------------------
+# Speculative Search Configuration
+# -------------------------
+
+SPECULATIVE_SEARCH_CONFIG: Dict[str, Any] = {
+    "enabled": True,  # Search with the raw question while it is translated/optimized
+    "min_similarity": 0.8,  # Word overlap (Jaccard) with the rewritten question needed to keep the results
+    "skip_non_english": True,  # Do not speculate on questions detected as non-English (they get translated)
+}
+
+# -------------------------
+# Index Bundle Configuration
+# -------------------------
+
+INDEX_BUNDLE_CONFIG: Dict[str, Any] = {
+    "enabled": True,  # Serve a prebuilt bundle (if present) instead of rebuilding the index
+    "bundle_path": "./index_bundle",  # Directory written by `python src/build_index.py`
+}
+
+COMPACT_CHUNK_STORE = True  # Keep in-memory section texts and metadata in a columnar ChunkStore
+
 # -------------------------
 # Chroma Database Configuration
 # -------------------------
@@ -74,6 +197,8 @@ CHROMA_DB_CONFIG: Dict[str, Any] = {
     "create_collection_if_not_exists": True,  # Create the collection if it doesn't exist
 }
 
+CHROMA_INCREMENTAL_INDEXING = True  # Only embed new or changed sections on startup (False wipes the database)
+
 # -----------------------------
 # Logger Configuration
 # -----------------------------
@@ -92,3 +217,11 @@ K_LOCAL_SEARCH = 3  # Default number of local documents to retrieve
 FLASK_PORT = 20000
 
 FLASK_DEBUG = False
+
+SERVICE_RETRY_AFTER_SECONDS = 5  # Retry-After sent with 503 while the index is being built
+
+ADMIN_API_CONFIG: Dict[str, Any] = {
+    "enabled": True,  # Serve the /admin/documents endpoints (they also need a token)
+    "token_env": "ADMIN_API_TOKEN",  # Environment variable (.env) holding the bearer token
+    "max_content_length": 5_000_000,  # Maximum characters of an uploaded document
+}
@@ -64,7 +64,7 @@ class Similarity_Score(BaseModel):
 def chatbot_app(inputs: dict) -> dict:
     """Toma una pregunta y devuelve la respuesta del chatbot."""
     question = inputs["question"]
-    response = chatbot._chatbot_graph.graph.invoke(
+    response = chatbot._chatbot_graph.invoke(
         {"question": question}, chatbot._config
     )
     return {"output": response}
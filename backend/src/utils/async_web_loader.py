@@ -0,0 +1,287 @@
+# -*- coding: utf-8 -*-
+"""
+File: async_web_loader.py
+
+This file contains the AsyncWebLoader class, an asyncio fetch engine for WebLoader meant
+for large URL lists. Pages are downloaded by coroutines on a single event loop through
+one aiohttp session (pooled keep-alive connections), with a bounded number of requests
+in flight, a per-host connection cap, per-request timeouts and retries with exponential
+backoff. Parsing, Markdown conversion and cache access run on the loader's worker pool
+(which hands the parsing to the parser processes), so the event loop never blocks. It
+exposes the same `get_documents()` and `iter_documents()` API as WebLoader.
+"""
+
+import asyncio
+import queue
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterator, List, Mapping, Optional, Tuple
+
+import aiohttp
+from langchain_core.documents import Document
+
+from src.utils.http_cache import HttpCache
+from src.utils.logger_manager import logger
+from src.utils.web_loader import RETRYABLE_STATUS_CODES, WebLoader
+
+# (status, headers, body) of a successful response
+FetchResult = Tuple[int, Mapping[str, str], str]
+
+
+class AsyncWebLoader(WebLoader):
+    """
+    WebLoader whose pages are fetched by asyncio coroutines instead of one blocking thread
+    per in-flight URL.
+    """
+
+    def __init__(
+        self, urls: List[str], max_concurrency: int = 64, **kwargs: Any
+    ) -> None:
+        """
+        Initializes the loader.
+
+        Args:
+            urls (List[str]): List of URLs to be fetched and converted to Markdown.
+            max_concurrency (int): Maximum number of requests in flight at the same time.
+            **kwargs (Any): The WebLoader options. `max_workers` sizes the worker pool that
+                parses the fetched pages.
+        """
+        super().__init__(urls, **kwargs)
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1.")
+        self._max_concurrency = max_concurrency
+
+    def get_documents(self) -> List[Document]:
+        """
+        Fetches and parses the list of URLs, returning a list of Document objects.
+        Runs its own event loop (in a helper thread if the caller already runs one).
+
+        Returns:
+            List[Document]: A list of Document objects containing the content of the parsed web pages.
+        """
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(self.aget_documents())
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            return executor.submit(asyncio.run, self.aget_documents()).result()
+
+    def iter_documents(self) -> Iterator[Document]:
+        """
+        Fetches and parses the list of URLs on an event loop in a helper thread, yielding
+        each Document as soon as its page is ready (in completion order).
+
+        Yields:
+            Document: The parsed web pages.
+        """
+        ready: "queue.Queue[Any]" = queue.Queue()
+        finished = object()
+
+        def run() -> None:
+            try:
+                asyncio.run(self._aload(ready.put))
+            except BaseException as e:
+                ready.put(e)
+            finally:
+                ready.put(finished)
+
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            executor.submit(run)
+            while (item := ready.get()) is not finished:
+                if isinstance(item, BaseException):
+                    raise item
+                yield item
+
+    async def aget_documents(self) -> List[Document]:
+        """
+        Asynchronously fetches and parses the list of URLs.
+
+        Returns:
+            List[Document]: A list of Document objects containing the content of the parsed web pages.
+        """
+        documents: List[Document] = []
+        await self._aload(documents.append)
+        return documents
+
+    async def _aload(self, on_document: Callable[[Document], Any]) -> None:
+        """
+        Fetches and parses the list of URLs, handing each Document to a callback as soon
+        as its page is ready.
+
+        Args:
+            on_document (Callable[[Document], Any]): Called with every loaded Document.
+        """
+        started = time.perf_counter()
+        semaphore = asyncio.Semaphore(self._max_concurrency)
+        connector = aiohttp.TCPConnector(
+            limit=self._max_concurrency, limit_per_host=self._max_connections_per_host
+        )
+        timeout = aiohttp.ClientTimeout(total=self._timeout)
+        loaded = 0
+
+        async def load(url: str) -> None:
+            nonlocal loaded
+            try:
+                document = await self._afetch_and_parse(session, semaphore, url)
+            except Exception as e:
+                logger.error(f"Error getting document for URL {url}: {e}")
+                return
+            if document:
+                loaded += 1
+                on_document(document)
+            else:
+                logger.warning(f"Failed to load URL: {url}")
+
+        async with aiohttp.ClientSession(
+            connector=connector,
+            timeout=timeout,
+            headers={"Accept-Encoding": "gzip, deflate"},
+        ) as session:
+            await asyncio.gather(*(load(url) for url in self.urls))
+
+        logger.info(f"All documents loaded: {loaded}")
+        self._log_fetch_summary(time.perf_counter() - started)
+        if self._http_cache is not None:
+            logger.info(f"HTTP cache: {self.cache_stats}")
+
+    async def _afetch_and_parse(
+        self,
+        session: aiohttp.ClientSession,
+        semaphore: asyncio.Semaphore,
+        url: str,
+    ) -> Optional[Document]:
+        """
+        Fetches a URL on the event loop and parses it on the worker pool (through the
+        HTTP cache when there is one).
+
+        Args:
+            session (aiohttp.ClientSession): The shared HTTP session.
+            semaphore (asyncio.Semaphore): Bounds the requests in flight.
+            url (str): The URL to fetch and process.
+
+        Returns:
+            Optional[Document]: A Document object if successful, None otherwise.
+        """
+        http_cache = self._http_cache
+        entry: Optional[Dict[str, Any]] = None
+        if http_cache is not None:
+            entry = await self._run_in_worker(http_cache.get, url)
+            if self._offline:
+                return await self._run_in_worker(
+                    self._load_offline, url, entry, http_cache
+                )
+
+        result = await self._afetch(
+            session, semaphore, url, HttpCache.conditional_headers(entry)
+        )
+
+        if http_cache is not None:
+            if result is None:
+                return await self._run_in_worker(
+                    self._load_stale, url, entry, http_cache
+                )
+            status, headers, html_content = result
+            return await self._run_in_worker(
+                self._process_cached_response,
+                url,
+                entry,
+                status,
+                headers,
+                html_content,
+                http_cache,
+            )
+
+        if result is None or not result[2]:
+            logger.error(f"No HTML content for: {url}")
+            return None
+        return await self._run_in_worker(self._parse_document, result[2], url)
+
+    async def _afetch(
+        self,
+        session: aiohttp.ClientSession,
+        semaphore: asyncio.Semaphore,
+        url: str,
+        headers: Dict[str, str],
+    ) -> Optional[FetchResult]:
+        """
+        Sends a GET request for a URL, retrying connection errors, timeouts, rate limiting
+        and server errors with exponential backoff and jitter. The request slot is
+        released while waiting between attempts.
+
+        Args:
+            session (aiohttp.ClientSession): The shared HTTP session.
+            semaphore (asyncio.Semaphore): Bounds the requests in flight.
+            url (str): The URL to fetch.
+            headers (Dict[str, str]): Extra request headers (e.g. validators of a
+                conditional request).
+
+        Returns:
+            Optional[FetchResult]: The status, headers and body of the successful (2xx or
+            304) response, None otherwise.
+        """
+        for attempt in range(self._max_retries + 1):
+            retry_after: Optional[float] = None
+            try:
+                async with semaphore:
+                    started = time.perf_counter()
+                    async with session.get(url, headers=headers) as response:
+                        body = await response.read()
+                        latency = time.perf_counter() - started
+                        status = response.status
+                        # Case-insensitive copy (aiohttp reports 'ETag' as 'Etag')
+                        response_headers = response.headers.copy()
+                        encoding = response.get_encoding() if body else "utf-8"
+
+                if status not in RETRYABLE_STATUS_CODES:
+                    if status >= 400:
+                        # Client errors (404, 403...) will not change on retry
+                        error = f"{status} Client Error for url: {url}"
+                        logger.error(f"Error fetching URL {url}: {error}")
+                        self._record_failure(url, attempt + 1, error)
+                        return None
+                    wire_bytes = int(response_headers.get("Content-Length", len(body)))
+                    self._record_fetch(
+                        url, status, latency, attempt + 1, len(body), wire_bytes
+                    )
+                    logger.info(
+                        f"Fetched URL successfully: {url[-30:]} "
+                        f"({status}, {latency * 1000:.0f} ms, {len(body) / 1024:.1f} KB)"
+                    )
+                    return status, response_headers, body.decode(encoding, "replace")
+
+                failure: Exception = aiohttp.ClientResponseError(
+                    response.request_info, (), status=status, message="Server Error"
+                )
+                retry_after = self._parse_retry_after(response)
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                failure = e
+
+            if attempt == self._max_retries:
+                logger.error(
+                    f"Error fetching URL {url} after {self._max_retries + 1} attempts: "
+                    f"{failure!r}"
+                )
+                self._record_failure(url, attempt + 1, repr(failure))
+                return None
+
+            delay = self._retry_delay(attempt, retry_after)
+            logger.warning(
+                f"Fetching {url} failed (attempt {attempt + 1}/{self._max_retries + 1}): "
+                f"{failure!r}. Retrying in {delay:.1f}s..."
+            )
+            await asyncio.sleep(delay)
+        return None  # Unreachable, keeps type checkers happy
+
+    async def _run_in_worker(self, function: Any, *args: Any) -> Any:
+        """
+        Runs a blocking function (parsing, cache access) on the loader's worker pool.
+
+        Args:
+            function (Callable): The function to run.
+            *args (Any): Its arguments.
+
+        Returns:
+            Any: The result of the function.
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._get_executor(), function, *args)
@@ -0,0 +1,196 @@
+# -*- coding: utf-8 -*-
+"""
+File: background_summarizer.py
+
+This file defines the BackgroundSummarizer class, which summarizes conversations after
+their answer has been returned instead of before. Jobs run on a small thread pool (they
+outlive the event loop of an async request), at most one per conversation. A new turn of a
+conversation first waits for its pending summary; if the summary takes too long, the turn
+goes on without it and the late summary is dropped, so it never overwrites a newer turn.
+"""
+
+import asyncio
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from typing import Any, Callable, Dict, Optional
+
+from src.utils.logger_manager import logger
+
+# Summarizes a conversation: returns the checkpoint update, or None if not needed
+SummarizeFunction = Callable[[Dict[str, Any]], Optional[Dict[str, Any]]]
+# Writes a checkpoint update to a conversation
+WriteFunction = Callable[[Dict[str, Any], Dict[str, Any]], None]
+
+
+class _SummaryJob:
+    """A pending summary, whether it was written (or dropped) and whether its conversation
+    stopped waiting for it."""
+
+    def __init__(self) -> None:
+        self.future: "Future[None]" = Future()
+        self.settled = False
+        self.abandoned = False
+
+
+class BackgroundSummarizer:
+    """
+    Runs conversation summaries in the background, one pending summary per conversation.
+    """
+
+    def __init__(
+        self,
+        summarize: SummarizeFunction,
+        write: WriteFunction,
+        max_workers: int = 2,
+        wait_seconds: float = 10.0,
+    ) -> None:
+        """
+        Initializes the summarizer.
+
+        Args:
+            summarize (SummarizeFunction): Reads the conversation of a graph config and
+                returns its summary update (None if it does not need one).
+            write (WriteFunction): Writes a summary update to the conversation.
+            max_workers (int): Number of summaries computed at the same time.
+            wait_seconds (float): Longest time a new turn waits for the pending summary of
+                its conversation before going on without it.
+        """
+        self._summarize = summarize
+        self._write = write
+        self._wait_seconds = wait_seconds
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="summarizer"
+        )
+        self._lock = threading.Lock()
+        self._jobs: Dict[str, _SummaryJob] = {}
+        self._counts: Dict[str, int] = {
+            "scheduled": 0,
+            "written": 0,
+            "not_needed": 0,
+            "failed": 0,
+            "waited": 0,
+            "abandoned": 0,
+        }
+
+    @staticmethod
+    def _thread_id(config: Dict[str, Any]) -> str:
+        """Returns the conversation (thread) ID of a graph config."""
+        return str(config.get("configurable", {}).get("thread_id", ""))
+
+    def schedule(self, config: Dict[str, Any]) -> None:
+        """
+        Starts summarizing a conversation in the background, after one of its turns.
+
+        Args:
+            config (Dict[str, Any]): The graph config of the conversation.
+        """
+        thread_id = self._thread_id(config)
+        job = _SummaryJob()
+        with self._lock:
+            previous = self._jobs.get(thread_id)
+            if previous is not None:
+                previous.abandoned = True
+            self._jobs[thread_id] = job
+            self._counts["scheduled"] += 1
+        self._executor.submit(self._run, thread_id, config, job)
+
+    def _run(self, thread_id: str, config: Dict[str, Any], job: _SummaryJob) -> None:
+        """
+        Computes the summary of a conversation and writes it unless the conversation
+        stopped waiting for it.
+        """
+        try:
+            update = self._summarize(config)
+            with self._lock:
+                job.settled = True
+                if update is None:
+                    self._counts["not_needed"] += 1
+                elif job.abandoned:
+                    logger.warning(
+                        f"Dropped the late summary of conversation {thread_id}."
+                    )
+                else:
+                    self._write(config, update)
+                    self._counts["written"] += 1
+        except Exception as e:
+            with self._lock:
+                job.settled = True
+                self._counts["failed"] += 1
+            logger.error(f"Error summarizing conversation {thread_id}: {e}")
+        finally:
+            with self._lock:
+                if self._jobs.get(thread_id) is job:
+                    del self._jobs[thread_id]
+            job.future.set_result(None)
+
+    def _pending(self, config: Dict[str, Any]) -> Optional[_SummaryJob]:
+        """Returns the pending summary job of a conversation, if any."""
+        with self._lock:
+            job = self._jobs.get(self._thread_id(config))
+            if job is not None:
+                self._counts["waited"] += 1
+            return job
+
+    def _abandon(self, config: Dict[str, Any], job: _SummaryJob) -> None:
+        """Stops waiting for a summary, so it is dropped when it finishes."""
+        with self._lock:
+            if job.settled:
+                return
+            job.abandoned = True
+            self._counts["abandoned"] += 1
+        logger.warning(
+            f"Summary of conversation {self._thread_id(config)} not ready after "
+            f"{self._wait_seconds:g} s; answering without it."
+        )
+
+    def wait(self, config: Dict[str, Any]) -> None:
+        """
+        Waits (up to wait_seconds) for the pending summary of a conversation, before a
+        new turn reads it.
+
+        Args:
+            config (Dict[str, Any]): The graph config of the conversation.
+        """
+        job = self._pending(config)
+        if job is None:
+            return
+        try:
+            job.future.result(timeout=self._wait_seconds)
+        except FutureTimeoutError:
+            self._abandon(config, job)
+
+    async def await_summary(self, config: Dict[str, Any]) -> None:
+        """
+        Async variant of wait, which does not block the event loop.
+
+        Args:
+            config (Dict[str, Any]): The graph config of the conversation.
+        """
+        job = self._pending(config)
+        if job is None:
+            return
+        try:
+            await asyncio.wait_for(
+                asyncio.shield(asyncio.wrap_future(job.future)), self._wait_seconds
+            )
+        except asyncio.TimeoutError:
+            self._abandon(config, job)
+
+    def shutdown(self, wait: bool = True) -> None:
+        """
+        Stops the summary workers.
+
+        Args:
+            wait (bool): If True, waits for the pending summaries to finish.
+        """
+        self._executor.shutdown(wait=wait)
+
+    @property
+    def stats(self) -> Dict[str, Any]:
+        """
+        Returns how many summaries were scheduled, written, not needed, failed, waited
+        for by a new turn and abandoned, and how many are pending.
+        """
+        with self._lock:
+            return {**self._counts, "pending": len(self._jobs)}
@@ -0,0 +1,250 @@
+# -*- coding: utf-8 -*-
+"""
+File: chunk_store.py
+
+This file defines the ChunkStore class, a compact, columnar store for the sections held
+by the in-memory index. Instead of one langchain Document (with its own str and metadata
+dict) per section, the texts are concatenated into one UTF-8 buffer indexed by an offsets
+array, and every section points to rows of two interned tables: its source (URL or file
+name) and its metadata. Sections are identified by integer chunk IDs (their row), and a
+Document is only built when a section is read, e.g. for the top-k results of a search.
+"""
+
+import sys
+from array import array
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, overload
+
+from langchain_core.documents import Document
+
+# Metadata keys naming the source of a section, in order of preference
+SOURCE_KEYS = ("url", "file_name")
+
+
+class ChunkStore(Sequence[Document]):
+    """
+    Append-only columnar store of section texts and metadata, readable as a sequence of
+    Documents built on access.
+    """
+
+    def __init__(self, documents: Optional[Iterable[Document]] = None) -> None:
+        """
+        Initializes the store, optionally with a first set of documents.
+
+        Args:
+            documents (Optional[Iterable[Document]]): Documents to add, in chunk ID order.
+        """
+        self._buffer = bytearray()  # UTF-8 texts, one after the other
+        self._offsets = array("q", [0])  # Chunk i spans _offsets[i]:_offsets[i + 1]
+        self._source_ids = array("i")  # Row of the source table, -1 without a source
+        self._metadata_ids = array("i")  # Row of the metadata table
+
+        self._sources: List[str] = []
+        self._source_rows: Dict[str, int] = {}
+        self._metadata: List[Dict[str, Any]] = []
+        self._metadata_rows: Dict[Tuple[Tuple[str, Any], ...], int] = {}
+
+        if documents is not None:
+            self.extend(documents)
+
+    # --- Writing ---
+    def add(self, text: str, metadata: Optional[Dict[str, Any]] = None) -> int:
+        """
+        Appends a section to the store.
+
+        Args:
+            text (str): The text of the section.
+            metadata (Optional[Dict[str, Any]]): The metadata of the section.
+
+        Returns:
+            int: The chunk ID of the section.
+        """
+        metadata = metadata or {}
+        self._buffer += text.encode("utf-8")
+        self._offsets.append(len(self._buffer))
+        self._source_ids.append(self._source_row(metadata))
+        self._metadata_ids.append(self._metadata_row(metadata))
+        return len(self._metadata_ids) - 1
+
+    def extend(self, documents: Iterable[Document]) -> range:
+        """
+        Appends documents (e.g. a batch of streamed sections) to the store.
+
+        Args:
+            documents (Iterable[Document]): The documents to add.
+
+        Returns:
+            range: The chunk IDs of the added documents.
+        """
+        start = len(self)
+        for document in documents:
+            self.add(document.page_content, document.metadata)
+        return range(start, len(self))
+
+    def _source_row(self, metadata: Dict[str, Any]) -> int:
+        """Returns the row of the section's source in the source table (-1 if none)."""
+        source = next(
+            (metadata[key] for key in SOURCE_KEYS if isinstance(metadata.get(key), str)),
+            None,
+        )
+        if source is None:
+            return -1
+        row = self._source_rows.get(source)
+        if row is None:
+            row = self._source_rows[source] = len(self._sources)
+            self._sources.append(sys.intern(source))
+        return row
+
+    def _metadata_row(self, metadata: Dict[str, Any]) -> int:
+        """
+        Returns the row of the metadata in the metadata table, adding it when it is new.
+        Metadata with unhashable values is stored once per section.
+        """
+        items = tuple(
+            (
+                sys.intern(key) if type(key) is str else key,
+                sys.intern(value) if type(value) is str else value,
+            )
+            for key, value in metadata.items()
+        )
+        try:
+            row = self._metadata_rows.get(items)
+        except TypeError:
+            self._metadata.append(dict(items))
+            return len(self._metadata) - 1
+        if row is None:
+            row = self._metadata_rows[items] = len(self._metadata)
+            self._metadata.append(dict(items))
+        return row
+
+    # --- Reading ---
+    def text(self, chunk_id: int) -> str:
+        """
+        Returns the text of a section.
+
+        Args:
+            chunk_id (int): The chunk ID of the section.
+
+        Returns:
+            str: The decoded text.
+        """
+        return self._buffer[
+            self._offsets[chunk_id] : self._offsets[chunk_id + 1]
+        ].decode("utf-8")
+
+    def metadata(self, chunk_id: int) -> Dict[str, Any]:
+        """
+        Returns a copy of the metadata of a section (the stored row is shared).
+
+        Args:
+            chunk_id (int): The chunk ID of the section.
+
+        Returns:
+            Dict[str, Any]: The metadata of the section.
+        """
+        return dict(self._metadata[self._metadata_ids[chunk_id]])
+
+    def source(self, chunk_id: int) -> Optional[str]:
+        """
+        Returns the source (URL or file name) of a section without building its metadata.
+
+        Args:
+            chunk_id (int): The chunk ID of the section.
+
+        Returns:
+            Optional[str]: The source, or None if the section has none.
+        """
+        row = self._source_ids[chunk_id]
+        return self._sources[row] if row >= 0 else None
+
+    def document(self, chunk_id: int) -> Document:
+        """
+        Builds the Document of a section.
+
+        Args:
+            chunk_id (int): The chunk ID of the section.
+
+        Returns:
+            Document: A new Document with the text and metadata of the section.
+        """
+        if not -len(self) <= chunk_id < len(self):
+            raise IndexError(f"Chunk ID {chunk_id} out of range (0-{len(self) - 1}).")
+        chunk_id %= len(self)
+        return Document(
+            page_content=self.text(chunk_id),
+            metadata=self._metadata[self._metadata_ids[chunk_id]],
+        )
+
+    def documents(self, chunk_ids: Iterable[int]) -> List[Document]:
+        """
+        Builds the Documents of several sections, e.g. the top-k results of a search.
+
+        Args:
+            chunk_ids (Iterable[int]): The chunk IDs of the sections.
+
+        Returns:
+            List[Document]: One Document per chunk ID, in the same order.
+        """
+        return [self.document(int(chunk_id)) for chunk_id in chunk_ids]
+
+    def take(self, chunk_ids: Iterable[int]) -> "ChunkStore":
+        """
+        Copies some sections into a new store (e.g. the sections kept when a source is
+        replaced), without building their Documents.
+
+        Args:
+            chunk_ids (Iterable[int]): The chunk IDs to copy, in their new order.
+
+        Returns:
+            ChunkStore: A new store whose chunk IDs follow the given order.
+        """
+        store = ChunkStore()
+        for chunk_id in chunk_ids:
+            store.add(self.text(chunk_id), self._metadata[self._metadata_ids[chunk_id]])
+        return store
+
+    # --- Sequence interface ---
+    @overload
+    def __getitem__(self, index: int) -> Document: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> List[Document]: ...
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return self.documents(range(len(self))[index])
+        return self.document(index)
+
+    def __iter__(self) -> Iterator[Document]:
+        for chunk_id in range(len(self)):
+            yield self.document(chunk_id)
+
+    def __len__(self) -> int:
+        return len(self._metadata_ids)
+
+    # --- Properties ---
+    @property
+    def sources(self) -> List[str]:
+        """
+        Returns the source table (each distinct URL or file name once).
+        """
+        return self._sources
+
+    @property
+    def metadata_rows(self) -> int:
+        """
+        Returns the number of distinct metadata rows.
+        """
+        return len(self._metadata)
+
+    @property
+    def nbytes(self) -> int:
+        """
+        Returns the size in bytes of the text buffer and the per-chunk columns (the
+        source and metadata tables are not included).
+        """
+        return (
+            len(self._buffer)
+            + self._offsets.itemsize * len(self._offsets)
+            + self._source_ids.itemsize * len(self._source_ids)
+            + self._metadata_ids.itemsize * len(self._metadata_ids)
+        )
@@ -0,0 +1,163 @@
+# -*- coding: utf-8 -*-
+"""
+File: conversation_memory.py
+
+This file defines the ConversationMemory class, which decides how much of a conversation
+goes verbatim into the prompts and how much is summarized, by token count rather than
+message count. Messages are rendered as a compact transcript (one "User:" or "Assistant:"
+line each, no IDs or metadata) and their tokens are estimated locally. A conversation is
+summarized once its transcript grows past a high budget; the newest whole turns fitting a
+lower budget are then kept verbatim and only the older turns (the overflow) are summarized,
+so a summary is not needed on every turn.
+"""
+
+import math
+from typing import Callable, List, Optional, Sequence, Tuple
+
+from langchain_core.messages import BaseMessage
+
+# Names of the message types in the transcript
+ROLES = {"human": "User", "ai": "Assistant", "system": "System"}
+
+
+class ConversationMemory:
+    """
+    Token-budgeted view of a conversation: compact transcript, recent turns and overflow.
+    """
+
+    def __init__(
+        self,
+        recent_tokens: int = 500,
+        summarize_above_tokens: int = 1500,
+        chars_per_token: float = 4.0,
+        count_tokens: Optional[Callable[[str], int]] = None,
+    ) -> None:
+        """
+        Initializes the memory budgets.
+
+        Args:
+            recent_tokens (int): Tokens of the newest turns kept verbatim when a conversation
+                is summarized.
+            summarize_above_tokens (int): Transcript tokens above which a conversation is
+                summarized; also the most history tokens put in the answer prompt.
+            chars_per_token (float): Characters per token of the local token estimate.
+            count_tokens (Optional[Callable[[str], int]]): Counts the tokens of a text
+                instead of the estimate (e.g. the tokenizer of a local model).
+
+        Raises:
+            ValueError: If recent_tokens is larger than summarize_above_tokens.
+        """
+        if recent_tokens > summarize_above_tokens:
+            raise ValueError(
+                f"recent_tokens ({recent_tokens}) must not be larger than "
+                f"summarize_above_tokens ({summarize_above_tokens})."
+            )
+        self._recent_tokens = recent_tokens
+        self._summarize_above_tokens = summarize_above_tokens
+        self._chars_per_token = chars_per_token
+        self._count_tokens = count_tokens
+
+    def count_tokens(self, text: str) -> int:
+        """
+        Counts (or estimates) the tokens of a text.
+
+        Args:
+            text (str): The text to count.
+
+        Returns:
+            int: The number of tokens.
+        """
+        if self._count_tokens is not None:
+            return self._count_tokens(text)
+        return math.ceil(len(text) / self._chars_per_token)
+
+    @staticmethod
+    def _line(message: BaseMessage) -> str:
+        """Renders one message as a transcript line."""
+        content = message.content if isinstance(message.content, str) else message.text()
+        return f"{ROLES.get(message.type, message.type)}: {content.strip()}"
+
+    def render(self, messages: Sequence[BaseMessage]) -> str:
+        """
+        Renders messages as a compact transcript: the role and content of each message.
+
+        Args:
+            messages (Sequence[BaseMessage]): The messages to render.
+
+        Returns:
+            str: One line per message.
+        """
+        return "\n".join(self._line(message) for message in messages)
+
+    def tokens(self, messages: Sequence[BaseMessage]) -> int:
+        """
+        Returns the tokens of the transcript of some messages.
+        """
+        return sum(self.count_tokens(self._line(message)) for message in messages)
+
+    @staticmethod
+    def _turns(messages: Sequence[BaseMessage]) -> List[List[BaseMessage]]:
+        """Groups messages into turns, each starting at a user message."""
+        turns: List[List[BaseMessage]] = []
+        for message in messages:
+            if message.type == "human" or not turns:
+                turns.append([])
+            turns[-1].append(message)
+        return turns
+
+    def split(
+        self, messages: Sequence[BaseMessage], budget: Optional[int] = None
+    ) -> Tuple[List[BaseMessage], List[BaseMessage]]:
+        """
+        Splits a conversation into its older messages (the overflow) and its newest whole
+        turns fitting a token budget. The last turn is always kept, whatever its size.
+
+        Args:
+            messages (Sequence[BaseMessage]): The messages of the conversation.
+            budget (Optional[int]): The token budget. Default is recent_tokens.
+
+        Returns:
+            Tuple[List[BaseMessage], List[BaseMessage]]: The overflow and the recent messages.
+        """
+        budget = self._recent_tokens if budget is None else budget
+        turns = self._turns(messages)
+        kept = 0
+        used = 0
+        for turn in reversed(turns):
+            tokens = self.tokens(turn)
+            if kept and used + tokens > budget:
+                break
+            kept += 1
+            used += tokens
+        overflow = [message for turn in turns[: len(turns) - kept] for message in turn]
+        recent = [message for turn in turns[len(turns) - kept :] for message in turn]
+        return overflow, recent
+
+    def needs_summary(self, messages: Sequence[BaseMessage]) -> bool:
+        """
+        Checks whether a conversation grew past the summary budget and has turns to
+        summarize.
+
+        Args:
+            messages (Sequence[BaseMessage]): The messages of the conversation.
+
+        Returns:
+            bool: True if the conversation should be summarized.
+        """
+        if self.tokens(messages) <= self._summarize_above_tokens:
+            return False
+        overflow, _ = self.split(messages)
+        return bool(overflow)
+
+    def prompt_messages(self, messages: Sequence[BaseMessage]) -> List[BaseMessage]:
+        """
+        Returns the newest turns of a conversation fitting the summary budget, the history
+        put in the answer prompt (older turns are waiting for their summary).
+
+        Args:
+            messages (Sequence[BaseMessage]): The messages of the conversation.
+
+        Returns:
+            List[BaseMessage]: The recent messages.
+        """
+        return self.split(messages, self._summarize_above_tokens)[1]
@@ -3,12 +3,14 @@
 File: directory_loader.py
 
 This file defines the DirectoryLoader class, responsible for loading Markdown documents
-from a specified directory.
+from a specified directory and its subdirectories. Each document is named by its path
+relative to the directory ('file_name' metadata, with '/' separators), so the files of
+the top level keep their plain file name.
 """
 
 import os
 import concurrent.futures
-from typing import List
+from typing import Dict, Iterator, List, Tuple
 
 from langchain_core.documents import Document
 from src.utils.logger_manager import logger
@@ -16,7 +18,10 @@ from src.utils.logger_manager import logger
 
 class DirectoryLoader:
     def __init__(
-        self, directory_path: str, markdown_files_extension: str = ".md"
+        self,
+        directory_path: str,
+        markdown_files_extension: str = ".md",
+        recursive: bool = True,
     ) -> None:
         """
         Initializes the DirectoryLoader instance.
@@ -24,11 +29,109 @@ class DirectoryLoader:
         Args:
             directory_path (str): The path to the directory where Markdown files are stored.
             markdown_files_extension (str): The file extension used to identify Markdown files. Default is ".md".
+            recursive (bool): If True, the Markdown files of the subdirectories are loaded too
+                (hidden directories are skipped).
         """
         self._directory_path: str = directory_path
         self._markdown_files_extension: str = markdown_files_extension
+        self._recursive: bool = recursive
         self._local_documents: List[Document] = []
 
+    def list_files(self) -> List[str]:
+        """
+        Lists the Markdown files of the directory (and its subdirectories when recursive).
+
+        Returns:
+            List[str]: The file names relative to the directory, with '/' separators, sorted.
+
+        Raises:
+            ValueError: If no directory path was provided.
+            FileNotFoundError: If the directory does not exist.
+        """
+        if not self._directory_path:
+            logger.error("The 'directory_path' must be provided.")
+            raise ValueError("The 'directory_path' must be provided.")
+
+        # Check if the directory exists
+        if not os.path.isdir(self._directory_path):
+            logger.error(f"Directory not found: {self._directory_path}")
+            raise FileNotFoundError(f"Directory not found: {self._directory_path}")
+
+        file_names: List[str] = []
+        for root, directories, files in os.walk(self._directory_path):
+            # Hidden directories (e.g. .git) are skipped, subdirectories too when not recursive
+            directories[:] = (
+                sorted(name for name in directories if not name.startswith("."))
+                if self._recursive
+                else []
+            )
+            relative_root = os.path.relpath(root, self._directory_path)
+            for name in files:
+                if name.endswith(self._markdown_files_extension):
+                    relative = os.path.normpath(os.path.join(relative_root, name))
+                    file_names.append(relative.replace(os.sep, "/"))
+        return sorted(file_names)
+
+    def snapshot(self) -> Dict[str, Tuple[int, int]]:
+        """
+        Records the modification time and size of every Markdown file, to detect changes.
+
+        Returns:
+            Dict[str, Tuple[int, int]]: (mtime in nanoseconds, size in bytes) per file name.
+        """
+        snapshot: Dict[str, Tuple[int, int]] = {}
+        for file_name in self.list_files():
+            try:
+                stat = os.stat(self.file_path(file_name))
+            except OSError:
+                continue  # Removed while listing
+            snapshot[file_name] = (stat.st_mtime_ns, stat.st_size)
+        return snapshot
+
+    @staticmethod
+    def diff_snapshots(
+        previous: Dict[str, Tuple[int, int]], current: Dict[str, Tuple[int, int]]
+    ) -> Tuple[List[str], List[str]]:
+        """
+        Compares two snapshots taken by `snapshot()`.
+
+        Args:
+            previous (Dict[str, Tuple[int, int]]): The older snapshot.
+            current (Dict[str, Tuple[int, int]]): The newer snapshot.
+
+        Returns:
+            Tuple[List[str], List[str]]: The added or modified and the removed file names, sorted.
+        """
+        changed = sorted(
+            name for name, state in current.items() if previous.get(name) != state
+        )
+        removed = sorted(name for name in previous if name not in current)
+        return changed, removed
+
+    def file_path(self, file_name: str) -> str:
+        """
+        Returns the path of a Markdown file from its name relative to the directory.
+
+        Args:
+            file_name (str): The file name, as listed by `list_files()`.
+
+        Returns:
+            str: The path of the file.
+        """
+        return os.path.join(self._directory_path, *file_name.split("/"))
+
+    def load_file(self, file_name: str) -> Document:
+        """
+        Reads one Markdown file of the directory.
+
+        Args:
+            file_name (str): The file name, as listed by `list_files()`.
+
+        Returns:
+            Document: A Document object containing the file's content and metadata.
+        """
+        return self._read_file(self.file_path(file_name), file_name)
+
     def _read_file(self, file_path: str, file_name: str) -> Document:
         """
         Reads a Markdown file and creates a Document object containing its content and metadata.
@@ -57,21 +160,19 @@ class DirectoryLoader:
         This method scans the directory for Markdown files, reads them concurrently,
         and stores the resulting documents.
         """
-        if not self._directory_path:
-            logger.error("The 'directory_path' must be provided.")
-            raise ValueError("The 'directory_path' must be provided.")
+        self._local_documents.extend(self.iter_documents())
 
-        # Check if the directory exists
-        if not os.path.exists(self._directory_path):
-            logger.error(f"Directory not found: {self._directory_path}")
-            raise FileNotFoundError(f"Directory not found: {self._directory_path}")
+    def iter_documents(self) -> Iterator[Document]:
+        """
+        Reads the Markdown documents from the specified directory (and its subdirectories
+        when recursive) in parallel, yielding each document as soon as its file is read
+        (without storing it).
 
-        # List of Markdown file paths
-        markdown_files: List[str] = [
-            os.path.join(self._directory_path, file_name)
-            for file_name in os.listdir(self._directory_path)
-            if file_name.endswith(self._markdown_files_extension)
-        ]
+        Yields:
+            Document: A Document object per Markdown file.
+        """
+        # List of Markdown file names
+        markdown_files: List[str] = self.list_files()
 
         if not markdown_files:
             logger.warning(
@@ -81,16 +182,25 @@ class DirectoryLoader:
         # Process files in parallel using ThreadPoolExecutor
         with concurrent.futures.ThreadPoolExecutor() as executor:
             futures = [
-                executor.submit(self._read_file, file_path, os.path.basename(file_path))
-                for file_path in markdown_files
+                executor.submit(self._read_file, self.file_path(file_name), file_name)
+                for file_name in markdown_files
             ]
 
-            # Wait for all futures to complete and append the documents to the list
+            # Yield the documents as their files are read
             for future in concurrent.futures.as_completed(futures):
                 try:
-                    self._local_documents.append(future.result())
+                    document = future.result()
                 except Exception as e:
                     logger.error(f"Error processing file: {e}")
+                    continue
+                yield document
+
+    @property
+    def directory_path(self) -> str:
+        """
+        Returns the path of the loaded directory.
+        """
+        return self._directory_path
 
     def get_documents(self) -> List[Document]:
         """
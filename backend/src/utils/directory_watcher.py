@@ -0,0 +1,189 @@
+# -*- coding: utf-8 -*-
+"""
+File: directory_watcher.py
+
+This file defines the DirectoryWatcher class, which watches the Markdown files of a
+DirectoryLoader and reports the files that were added, modified or removed. Changes are
+detected by comparing snapshots of the modification times and sizes of the files. With
+the "watchdog" backend (optional dependency, using inotify on Linux), the directory is
+only rescanned after the operating system reports an event; the "polling" backend
+rescans it every `poll_interval` seconds.
+"""
+
+import threading
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from src.utils.directory_loader import DirectoryLoader
+from src.utils.logger_manager import logger
+
+WATCHER_BACKENDS = ("auto", "watchdog", "polling")
+
+# Called with the changed (added or modified) and the removed file names
+ChangeCallback = Callable[[List[str], List[str]], None]
+
+
+class DirectoryWatcher:
+    """
+    Watches the Markdown files of a directory in a background thread and reports changes.
+    """
+
+    def __init__(
+        self,
+        loader: DirectoryLoader,
+        on_change: ChangeCallback,
+        backend: str = "auto",
+        poll_interval: float = 2.0,
+        debounce: float = 0.5,
+    ) -> None:
+        """
+        Initializes the watcher. The current state of the directory is the baseline:
+        only later changes are reported.
+
+        Args:
+            loader (DirectoryLoader): The loader listing the watched files.
+            on_change (ChangeCallback): Called from the watcher thread with the changed
+                and the removed file names (relative to the directory).
+            backend (str): One of WATCHER_BACKENDS. "auto" uses watchdog when installed
+                and falls back to polling.
+            poll_interval (float): Seconds between scans with the polling backend.
+            debounce (float): Seconds to wait after an event before scanning, so a file
+                being written is reported once.
+
+        Raises:
+            ValueError: If the backend is unknown.
+        """
+        if backend not in WATCHER_BACKENDS:
+            raise ValueError(
+                f"Unknown watcher backend '{backend}', expected one of {WATCHER_BACKENDS}."
+            )
+        self._loader = loader
+        self._on_change = on_change
+        self._poll_interval = poll_interval
+        self._debounce = debounce
+        self._backend = backend
+        if backend != "polling" and not self._watchdog_available():
+            if backend == "watchdog":
+                logger.warning("watchdog is not installed, polling the directory instead.")
+            self._backend = "polling"
+        elif backend == "auto":
+            self._backend = "watchdog"
+
+        self._snapshot: Dict[str, Tuple[int, int]] = loader.snapshot()
+        self._scan_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._observer: Optional[Any] = None
+
+    def start(self) -> None:
+        """
+        Starts watching in a daemon thread (only the first call has an effect).
+        """
+        if self._thread is not None:
+            return
+        if self._backend == "watchdog":
+            self._observer = self._start_observer()
+        self._thread = threading.Thread(
+            target=self._run, name="directory-watcher", daemon=True
+        )
+        self._thread.start()
+        logger.info(f"Watching the local documents for changes ({self._backend}).")
+
+    def stop(self) -> None:
+        """
+        Stops watching and waits for a running change callback to finish.
+        """
+        self._stopped.set()
+        self._wake.set()
+        if self._observer is not None:
+            self._observer.stop()
+            self._observer.join()
+            self._observer = None
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def __enter__(self) -> "DirectoryWatcher":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.stop()
+
+    def check(self) -> Tuple[List[str], List[str]]:
+        """
+        Scans the directory once and reports the changes since the previous scan to the
+        callback (when there are any).
+
+        Returns:
+            Tuple[List[str], List[str]]: The changed and the removed file names.
+        """
+        with self._scan_lock:
+            snapshot = self._loader.snapshot()
+            changed, removed = DirectoryLoader.diff_snapshots(self._snapshot, snapshot)
+            self._snapshot = snapshot
+            if changed or removed:
+                logger.info(
+                    f"Local documents changed: {len(changed)} added or modified, "
+                    f"{len(removed)} removed."
+                )
+                try:
+                    self._on_change(changed, removed)
+                except Exception as e:
+                    logger.error(f"Error handling the changed local documents: {e}")
+        return changed, removed
+
+    def _run(self) -> None:
+        """
+        Scans the directory after every event (watchdog) or poll interval until stopped.
+        """
+        timeout = None if self._backend == "watchdog" else self._poll_interval
+        while not self._stopped.is_set():
+            if self._wake.wait(timeout):
+                # Let the writer finish before scanning
+                self._stopped.wait(self._debounce)
+                self._wake.clear()
+            if self._stopped.is_set():
+                break
+            try:
+                self.check()
+            except OSError as e:
+                logger.warning(f"Could not scan the local documents: {e}")
+
+    def _start_observer(self) -> Any:
+        """
+        Starts a watchdog observer that wakes the watcher thread on every event below
+        the directory.
+        """
+        from watchdog.events import FileSystemEventHandler
+        from watchdog.observers import Observer
+
+        wake = self._wake
+
+        class _WakeHandler(FileSystemEventHandler):
+            def on_any_event(self, event: Any) -> None:
+                wake.set()
+
+        observer = Observer()
+        observer.schedule(_WakeHandler(), self._loader.directory_path, recursive=True)
+        observer.daemon = True
+        observer.start()
+        return observer
+
+    @staticmethod
+    def _watchdog_available() -> bool:
+        """
+        Checks whether the watchdog package is installed.
+        """
+        try:
+            import watchdog.observers  # noqa: F401
+        except ImportError:
+            return False
+        return True
+
+    @property
+    def backend(self) -> str:
+        """
+        Returns the backend in use ("watchdog" or "polling").
+        """
+        return self._backend
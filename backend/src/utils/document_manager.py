@@ -4,21 +4,46 @@ File: document_manager.py
 
 This file defines the DocumentManager class, responsible for managing the loading
 and splitting of Markdown and web documents.
+
+Loading, splitting and cleaning form a streaming pipeline: every document is handed to
+a pool of splitter processes as soon as it is loaded, and its sections are yielded as
+soon as they are ready, so sections can be embedded while the crawl is still running
+and raw documents are not all held in memory at once.
+
+In low-memory mode the raw documents are not kept once split, the sections of a
+document share one metadata dict (identical metadata is stored once, with interned
+strings) and the split sections can be handed over to the embedding manager.
 """
 
 import concurrent.futures
-from typing import List, Optional
+import multiprocessing
+import os
+import sys
+import threading
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Deque, Dict, Iterable, Iterator, List, Optional, Tuple
 
-from langchain.text_splitter import MarkdownTextSplitter
 from langchain_core.documents import Document
 
-from src.config.config_init import MARKDOWN_SPLITTER_CONFIG
+from src.config.config_init import (
+    ASYNC_WEB_LOADER_CONFIG,
+    DOCUMENT_PIPELINE_CONFIG,
+    HTTP_CACHE_CONFIG,
+    WEB_LOADER_CONFIG,
+    WEB_LOADER_ENGINE,
+)
 from src.utils.logger_manager import logger
 from src.utils.directory_loader import DirectoryLoader
+from src.utils.http_cache import HttpCache
+from src.utils.section_splitter import (
+    SectionSplitter,
+    init_splitter_worker,
+    split_in_worker,
+)
 from src.utils.web_loader import WebLoader
 
-import re
-
 
 class DocumentManager:
     """
@@ -30,6 +55,10 @@ class DocumentManager:
         directory_path: Optional[str] = None,
         web_paths: Optional[List[str]] = None,
         plain_words_only: bool = True,
+        stream: bool = False,
+        split_processes: Optional[int] = DOCUMENT_PIPELINE_CONFIG["split_processes"],
+        max_pending_documents: int = DOCUMENT_PIPELINE_CONFIG["max_pending_documents"],
+        low_memory: bool = DOCUMENT_PIPELINE_CONFIG["low_memory"],
     ) -> None:
         """
         Initializes the DocumentManager by loading and splitting documents.
@@ -38,6 +67,15 @@ class DocumentManager:
             directory_path (Optional[str]): Path to the directory containing Markdown files.
             web_paths (Optional[List[str]]): List of web document URLs.
             plain_words_only (bool): If True, sections will be converted to plain words only.
+            stream (bool): If True, nothing is loaded up front: the sections are produced
+                by `iter_local_sections()` and `iter_web_sections()` as documents arrive,
+                and the raw documents are not kept.
+            split_processes (Optional[int]): Number of splitter processes. 0 splits on the
+                loading threads, None starts one process per CPU core.
+            max_pending_documents (int): Maximum number of loaded documents waiting to be
+                split; loading pauses when it is reached.
+            low_memory (bool): If True, raw documents are released once split and the
+                sections share their metadata instead of holding a copy each.
 
         Raises:
             ValueError: If neither 'directory_path' nor 'web_paths' is provided.
@@ -55,118 +93,364 @@ class DocumentManager:
         self._web_sections: List[Document] = []
 
         self._plain_words_only = plain_words_only
+        self._section_splitter = SectionSplitter(plain_words_only)
+        self._split_processes: int = (
+            (os.cpu_count() or 1) if split_processes is None else split_processes
+        )
+        self._max_pending_documents = max(1, max_pending_documents)
+        self._split_pool: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+        self._low_memory = low_memory
+        # Shared metadata dicts, keyed by their (interned) items
+        self._shared_metadata: Dict[Tuple[Tuple[str, Any], ...], Dict[str, Any]] = {}
+
+        if stream:
+            return
 
         # Execute loading and splitting in parallel
-        with concurrent.futures.ThreadPoolExecutor() as executor:
-            executor.submit(self._load_and_split_local_documents)
-            executor.submit(self._load_and_split_web_documents)
+        try:
+            with concurrent.futures.ThreadPoolExecutor() as executor:
+                executor.submit(self._load_and_split_local_documents)
+                executor.submit(self._load_and_split_web_documents)
+        finally:
+            self.close()
 
     def _load_and_split_local_documents(self) -> None:
         """Loads and splits the local Markdown documents."""
-        logger.info("Loading local documents...")
-        self._load_local_documents()
-        logger.info(f"Loaded {len(self._local_documents)} documents.")
-
-        logger.info("Splitting local documents...")
-        self._split_local_documents()
-        logger.info(f"Split local documents into {len(self._local_sections)} sections.")
+        logger.info("Loading and splitting local documents...")
+        self._local_sections.extend(
+            self._iter_sections(
+                self._iter_local_documents(),
+                None if self._low_memory else self._local_documents,
+            )
+        )
+        if self._low_memory:
+            logger.info(
+                f"Split the local documents into {len(self._local_sections)} sections "
+                "and released the raw documents."
+            )
+            return
+        logger.info(
+            f"Loaded {len(self._local_documents)} documents and split them into "
+            f"{len(self._local_sections)} sections."
+        )
 
     def _load_and_split_web_documents(self) -> None:
         """Loads and splits the web documents."""
-        logger.info("Loading web documents...")
-        self._load_web_documents()
-        logger.info(f"Loaded {len(self._web_documents)} web documents.")
+        logger.info("Loading and splitting web documents...")
+        self._web_sections.extend(
+            self._iter_sections(
+                self._iter_web_documents(),
+                None if self._low_memory else self._web_documents,
+            )
+        )
+        if self._low_memory:
+            logger.info(
+                f"Split the web documents into {len(self._web_sections)} sections "
+                "and released the raw documents."
+            )
+            return
+        logger.info(
+            f"Loaded {len(self._web_documents)} web documents and split them into "
+            f"{len(self._web_sections)} sections."
+        )
+
+    def iter_local_sections(self) -> Iterator[Document]:
+        """
+        Loads, splits and cleans the local Markdown documents, yielding the sections of
+        each document as soon as it is split.
+
+        Yields:
+            Document: The sections, with the metadata of their document.
+        """
+        return self._iter_sections(self._iter_local_documents())
+
+    def iter_web_sections(self) -> Iterator[Document]:
+        """
+        Fetches, splits and cleans the web documents, yielding the sections of each page
+        as soon as it is split (while the remaining pages are still being fetched).
+
+        Yields:
+            Document: The sections, with the metadata of their page.
+        """
+        return self._iter_sections(self._iter_web_documents())
+
+    def close(self) -> None:
+        """
+        Shuts down the splitter processes.
+        """
+        with self._lock:
+            split_pool, self._split_pool = self._split_pool, None
+        if split_pool is not None:
+            split_pool.shutdown(wait=True)
+
+    def hand_over_sections(self) -> Tuple[List[Document], List[Document]]:
+        """
+        Returns the split local and web sections and drops the references the manager
+        keeps to them (and to the raw documents), so whoever indexes them holds the
+        only copy and can release it once they are stored.
+
+        Returns:
+            Tuple[List[Document], List[Document]]: The local and the web sections.
+        """
+        local_sections, self._local_sections = self._local_sections, []
+        web_sections, self._web_sections = self._web_sections, []
+        self._local_documents = []
+        self._web_documents = []
+        self._shared_metadata.clear()
+        return local_sections, web_sections
+
+    def __enter__(self) -> "DocumentManager":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def split_local_files(self, file_names: Iterable[str]) -> Dict[str, List[Document]]:
+        """
+        Loads and splits some local files again (e.g. after they changed on disk), on the
+        calling thread.
 
-        logger.info("Splitting web documents...")
-        self._split_web_documents()
-        logger.info(f"Split web documents into {len(self._web_sections)} sections.")
+        Args:
+            file_names (Iterable[str]): The file names, relative to the directory.
+
+        Returns:
+            Dict[str, List[Document]]: The sections of each file. A file that no longer
+            exists gets an empty list; a file that cannot be read is left out.
+        """
+        loader = self._create_directory_loader()
+        sections: Dict[str, List[Document]] = {}
+        for file_name in file_names:
+            if not os.path.isfile(loader.file_path(file_name)):
+                sections[file_name] = []
+                continue
+            try:
+                document = loader.load_file(file_name)
+            except (OSError, UnicodeDecodeError) as e:
+                logger.error(f"Error reloading local document {file_name}: {e}")
+                continue
+            sections[file_name] = self.split_document(document)
+        return sections
+
+    def split_web_pages(self, urls: Iterable[str]) -> Dict[str, List[Document]]:
+        """
+        Fetches (or revalidates in the HTTP cache) and splits some web pages, on the
+        calling thread. The pages are parsed on the fetching threads.
 
-    def _load_local_documents(self) -> None:
-        """Loads the Markdown documents from the specified directory."""
+        Args:
+            urls (Iterable[str]): The URLs of the pages.
+
+        Returns:
+            Dict[str, List[Document]]: The sections of each URL. A page that cannot be
+            loaded is left out.
+        """
+        return {
+            document.metadata["url"]: self.split_document(document)
+            for document in self._iter_web_documents(list(urls), parse_processes=0)
+        }
+
+    def split_document(self, document: Document) -> List[Document]:
+        """
+        Splits and cleans one document on the calling thread (e.g. a document uploaded
+        through the admin API), like the documents loaded up front.
+
+        Args:
+            document (Document): The document, with the metadata its sections get.
+
+        Returns:
+            List[Document]: The sections of the document.
+        """
+        split: Future = Future()
+        split.set_result(self._section_splitter.split(document.page_content))
+        return list(self._sections_of(document, split))
+
+    def _create_directory_loader(self) -> DirectoryLoader:
+        """Creates the loader of the local Markdown documents."""
         if self._directory_path is None:
             raise ValueError("directory_path must be provided.")
-        loader = DirectoryLoader(
+        return DirectoryLoader(
             directory_path=self._directory_path, markdown_files_extension=".md"
         )
-        self._local_documents = loader.get_documents()
 
-    def _load_web_documents(self) -> None:
-        """Loads the web documents from the specified URLs."""
-        if self.web_paths is None:
+    def _iter_local_documents(self) -> Iterator[Document]:
+        """Yields the Markdown documents of the specified directory as they are read."""
+        loader = self._create_directory_loader()
+        try:
+            yield from loader.iter_documents()
+        except Exception as e:
+            logger.error(f"Error loading local documents: {e}")
+
+    def _iter_web_documents(
+        self, urls: Optional[List[str]] = None, **loader_options: Any
+    ) -> Iterator[Document]:
+        """
+        Yields the web documents of the specified URLs (or of `urls`) as they are loaded.
+        `loader_options` override the configured web loader options.
+        """
+        urls = self.web_paths if urls is None else urls
+        if urls is None:
             raise ValueError("web_paths must be provided.")
-        loader = WebLoader(urls=self.web_paths)
-        self._web_documents = loader.get_documents()
-
-    def _process_section(self, section: str) -> str:
-        """Process a section according to the plain_words_only flag, cleaning markdown
-        symbols, images, links, tables, footnotes, and formatting text."""
-        if self._plain_words_only:
-            text = section
-            # Remove code blocks (```...``` including content)
-            text = re.sub(r"```[\s\S]*?```", "", text)
-            # Remove images ![alt](url)
-            text = re.sub(r"!\[[^\]]*\]\([^\)]*\)", "", text)
-            # Remove links [text](url)
-            text = re.sub(r"\[[^\]]*\]\([^\)]*\)", "", text)
-            # Remove double-bracket links [[text]](url)
-            text = re.sub(r"\[\[[^\]]*\]\]\([^\)]*\)", "", text)
-            # Remove reference-style links [text][id]
-            text = re.sub(r"\[[^\]]*\]\[[^\]]*\]", "", text)
-            # Remove footnote references [^1]
-            text = re.sub(r"\[\^\d+\]", "", text)
-            # Remove tables (lines starting/containing |)
-            text = re.sub(r"^\s*\|.*\|\s*$", "", text, flags=re.MULTILINE)
-            # Remove table header separators (| --- |)
-            text = re.sub(r"^\s*\|?\s*:?-+:?\s*\|.*$", "", text, flags=re.MULTILINE)
-            # Remove HTML tags
-            text = re.sub(r"<[^>]+>", "", text)
-            # Remove headers (#, ##, ###, etc.)
-            text = re.sub(r"^#+\s*", "", text, flags=re.MULTILINE)
-            # Remove emphasis (*, _, **, __)
-            text = re.sub(r"(\*\*|__|\*|_)", "", text)
-            # Remove inline code/backticks
-            text = re.sub(r"`+", "", text)
-            # Remove blockquotes
-            text = re.sub(r"^>\s*", "", text, flags=re.MULTILINE)
-            # Remove unordered list markers (-, *, + at line start)
-            text = re.sub(r"^(\s*[-*+])\s+", "", text, flags=re.MULTILINE)
-            # Remove ordered list markers (1. 2. etc.)
-            # text = re.sub(r"^\s*\d+\.\s+", "", text, flags=re.MULTILINE)
-            # Remove horizontal rules
-            text = re.sub(r"^---+$", "", text, flags=re.MULTILINE)
-            # Remove extra newlines and trim
-            text = re.sub(r"\n+", "\n", text)
-            # Remove extra tabs and trim
-            text = re.sub(r"\t+", "\t", text)
-            text = text.strip()
-            return text
-        return section
-
-    def _split_local_documents(self) -> None:
-        """Splits the local documents into sections, optionally as plain words only."""
-        splitter: MarkdownTextSplitter = MarkdownTextSplitter(
-            **MARKDOWN_SPLITTER_CONFIG
+        http_cache: Optional[HttpCache] = None
+        if HTTP_CACHE_CONFIG["enabled"]:
+            http_cache = HttpCache(cache_path=HTTP_CACHE_CONFIG["cache_path"])
+        try:
+            with self._create_web_loader(http_cache, urls, **loader_options) as loader:
+                yield from loader.iter_documents()
+        except Exception as e:
+            logger.error(f"Error loading web documents: {e}")
+        finally:
+            if http_cache is not None:
+                http_cache.close()
+
+    def _create_web_loader(
+        self, http_cache: Optional[HttpCache], urls: List[str], **loader_options: Any
+    ) -> WebLoader:
+        """Creates the web loader of the configured engine (threads or asyncio)."""
+        options = {**WEB_LOADER_CONFIG, **loader_options}
+        options["http_cache"] = http_cache
+        options["offline"] = http_cache is not None and HTTP_CACHE_CONFIG["offline"]
+        if WEB_LOADER_ENGINE == "asyncio":
+            from src.utils.async_web_loader import AsyncWebLoader
+
+            return AsyncWebLoader(
+                urls=urls, **ASYNC_WEB_LOADER_CONFIG, **options
+            )
+        if WEB_LOADER_ENGINE != "threads":
+            raise ValueError(f"Unknown web loader engine: {WEB_LOADER_ENGINE}")
+        return WebLoader(urls=urls, **options)
+
+    def _iter_sections(
+        self,
+        documents: Iterable[Document],
+        loaded: Optional[List[Document]] = None,
+    ) -> Iterator[Document]:
+        """
+        Splits documents as they arrive, on the splitter processes when the pool is
+        enabled, and yields their sections in document order. At most
+        `max_pending_documents` documents are being split at any time.
+
+        Args:
+            documents (Iterable[Document]): The documents to split, as they are loaded.
+            loaded (Optional[List[Document]]): If given, the raw documents are kept in it.
+
+        Yields:
+            Document: The sections, with the metadata of their document.
+        """
+        pending: Deque[Tuple[Document, Future]] = deque()
+        for document in documents:
+            if loaded is not None:
+                loaded.append(document)
+            pending.append((document, self._submit_split(document.page_content)))
+            # Hand over every document already split, and wait when too many are pending
+            while pending and (
+                pending[0][1].done() or len(pending) >= self._max_pending_documents
+            ):
+                yield from self._sections_of(*pending.popleft())
+        while pending:
+            yield from self._sections_of(*pending.popleft())
+
+    def _submit_split(self, content: str) -> Future:
+        """
+        Splits the content of a document on a splitter process, or right away on the
+        calling thread when the pool is disabled.
+
+        Args:
+            content (str): The Markdown content of the document.
+
+        Returns:
+            Future: The future list of section texts.
+        """
+        split_pool = self._get_split_pool()
+        if split_pool is not None:
+            try:
+                return split_pool.submit(split_in_worker, content)
+            except BrokenProcessPool as e:
+                self._disable_split_pool(e)
+        future: Future = Future()
+        future.set_result(self._section_splitter.split(content))
+        return future
+
+    def _sections_of(self, document: Document, split: Future) -> Iterator[Document]:
+        """
+        Builds the section Documents of a split document.
+
+        Args:
+            document (Document): The source document.
+            split (Future): The future list of its section texts.
+
+        Yields:
+            Document: The sections, with the metadata of the document.
+        """
+        try:
+            sections: List[str] = split.result()
+        except BrokenProcessPool as e:
+            self._disable_split_pool(e)
+            sections = self._section_splitter.split(document.page_content)
+        if not self._low_memory:
+            for section in sections:
+                yield Document(page_content=section, metadata=document.metadata)  # type: ignore
+            return
+        # Skipping validation keeps pydantic from copying the shared metadata per section
+        metadata = self._share_metadata(document.metadata)
+        for section in sections:
+            yield Document.model_construct(page_content=section, metadata=metadata)
+
+    def _share_metadata(self, metadata: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Returns one shared dict per distinct metadata, with its string keys and values
+        interned (e.g. the same file name or page title loaded from the HTTP cache).
+        Metadata with unhashable values is shared by the sections of its document only.
+
+        Args:
+            metadata (Dict[str, Any]): The metadata of a loaded document.
+
+        Returns:
+            Dict[str, Any]: The metadata dict shared by the sections.
+        """
+        items = tuple(
+            (
+                sys.intern(key) if type(key) is str else key,
+                sys.intern(value) if type(value) is str else value,
+            )
+            for key, value in metadata.items()
         )
-        for doc in self._local_documents:
-            split_sections: List[str] = splitter.split_text(doc.page_content)
-            for section in split_sections:
-                processed_section: str = self._process_section(section)
-                self._local_sections.append(
-                    Document(page_content=processed_section, metadata=doc.metadata)  # type: ignore
+        try:
+            hash(items)
+        except TypeError:
+            return dict(items)
+        with self._lock:
+            return self._shared_metadata.setdefault(items, dict(items))
+
+    def _get_split_pool(self) -> Optional[ProcessPoolExecutor]:
+        """
+        Returns the pool of splitter processes, started on first use (None when documents
+        are split on the loading threads). Every process keeps one long-lived
+        SectionSplitter. Processes are spawned rather than forked, as the pipeline runs
+        next to other threads.
+        """
+        if self._split_processes < 1:
+            return None
+        with self._lock:
+            if self._split_pool is None:
+                self._split_pool = ProcessPoolExecutor(
+                    max_workers=self._split_processes,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=init_splitter_worker,
+                    initargs=(self._plain_words_only,),
                 )
+                logger.info(f"Started {self._split_processes} splitter processes.")
+            return self._split_pool
 
-    def _split_web_documents(self) -> None:
-        """Splits the web documents into sections, optionally as plain words only."""
-        splitter: MarkdownTextSplitter = MarkdownTextSplitter(
-            **MARKDOWN_SPLITTER_CONFIG
+    def _disable_split_pool(self, error: Exception) -> None:
+        """Falls back to splitting on the loading threads after the pool broke."""
+        with self._lock:
+            if self._split_processes < 1:
+                return
+            self._split_processes = 0
+        logger.warning(
+            f"Splitter processes stopped ({error}). Splitting on the loading threads instead."
         )
-        for doc in self._web_documents:
-            split_sections: List[str] = splitter.split_text(doc.page_content)
-            for section in split_sections:
-                processed_section: str = self._process_section(section)
-                self._web_sections.append(
-                    Document(page_content=processed_section, metadata=doc.metadata)  # type: ignore
-                )
 
     @property
     def local_documents(self) -> List[Document]:
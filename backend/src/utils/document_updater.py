@@ -0,0 +1,274 @@
+# -*- coding: utf-8 -*-
+"""
+File: document_updater.py
+
+This file defines the DocumentUpdater class, which adds, replaces and removes single
+local or web documents in a running embedding manager (e.g. through the admin API).
+
+Documents go through the same splitting and cleaning as the documents loaded at
+startup, and only the sections of the changed source are updated in its collection.
+Writers are serialized by a lock, while searches never take it: they keep reading the
+previous sections of a source until its new sections are complete. Local documents are
+also written to (or removed from) the docs directory, so they survive a restart; a file
+whose sections could not be updated is restored to its previous content.
+"""
+
+import os
+import posixpath
+import tempfile
+import threading
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
+
+from langchain_core.documents import Document
+
+from src.utils.directory_loader import DirectoryLoader
+from src.utils.logger_manager import logger
+
+if TYPE_CHECKING:
+    from src.utils.document_manager import DocumentManager
+    from src.utils.embedding_manager import EmbeddingManager
+    from src.utils.in_memory_embedding_manager import InMemoryEmbeddingManager
+
+COLLECTIONS = ("local", "web")
+
+
+class InvalidDocumentError(ValueError):
+    """Raised when the collection, the source or the content of a document is invalid."""
+
+
+class DocumentNotFoundError(LookupError):
+    """Raised when a document to remove (or a web page to fetch) does not exist."""
+
+
+class DocumentUpdater:
+    """
+    Upserts and deletes local and web documents in a running embedding manager.
+    """
+
+    def __init__(
+        self,
+        document_manager: "DocumentManager",
+        embedding_manager: "EmbeddingManager | InMemoryEmbeddingManager",
+        docs_path: Optional[str] = None,
+    ) -> None:
+        """
+        Initializes the updater.
+
+        Args:
+            document_manager (DocumentManager): Splits and cleans the documents.
+            embedding_manager (EmbeddingManager | InMemoryEmbeddingManager): The manager
+                whose collections are updated.
+            docs_path (Optional[str]): The local documents directory. Without it, local
+                documents cannot be changed.
+        """
+        self._document_manager = document_manager
+        self._embedding_manager = embedding_manager
+        self._loader: Optional[DirectoryLoader] = (
+            DirectoryLoader(docs_path) if docs_path is not None else None
+        )
+        self._lock = threading.Lock()
+
+    def upsert(
+        self,
+        collection: str,
+        source: str,
+        content: Optional[str] = None,
+        title: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """
+        Adds or replaces a document.
+
+        Args:
+            collection (str): "local" or "web".
+            source (str): The file name relative to the docs directory (a ".md" file) or
+                the URL of the web page.
+            content (Optional[str]): The Markdown content. Required for local documents;
+                without it, the web page is fetched and parsed like the configured ones.
+            title (Optional[str]): The title of a web page given as content.
+
+        Returns:
+            Dict[str, Any]: The collection, the source, the number of 'sections' of the
+            document and the number of sections 'added', 'removed' and 'reused'.
+
+        Raises:
+            InvalidDocumentError: If the collection, the source or the content is invalid.
+            DocumentNotFoundError: If the web page could not be loaded.
+        """
+        self._check_collection(collection)
+        if collection == "local":
+            file_name = self._check_file_name(source)
+            if content is None:
+                raise InvalidDocumentError("'content' is required for local documents.")
+            document = Document(page_content=content, metadata={"file_name": file_name})
+            with self._lock:
+                sections = self._document_manager.split_document(document)
+                previous = self._read_file(file_name)
+                self._write_file(file_name, content)
+                try:
+                    stats = self._embedding_manager.update_local_sources({file_name: sections})
+                except BaseException:
+                    # Keep the docs directory in line with the index
+                    self._restore_file(file_name, previous)
+                    raise
+        else:
+            url = self._check_url(source)
+            with self._lock:
+                sections = self._split_web_page(url, content, title)
+                stats = self._embedding_manager.update_web_sources({url: sections})
+        logger.info(f"Upserted {collection} document {source}: {stats}")
+        return {"collection": collection, "source": source, "sections": len(sections), **stats}
+
+    def delete(self, collection: str, source: str) -> Dict[str, Any]:
+        """
+        Removes a document.
+
+        Args:
+            collection (str): "local" or "web".
+            source (str): The file name or the URL of the document.
+
+        Returns:
+            Dict[str, Any]: The collection, the source and the number of sections
+            'added' (0), 'removed' and 'reused' (0).
+
+        Raises:
+            InvalidDocumentError: If the collection or the source is invalid.
+            DocumentNotFoundError: If the document is neither indexed nor on disk.
+        """
+        self._check_collection(collection)
+        with self._lock:
+            if collection == "local":
+                file_name = self._check_file_name(source)
+                existed = self._remove_file(file_name)
+                stats = self._embedding_manager.update_local_sources({file_name: []})
+            else:
+                existed = False
+                stats = self._embedding_manager.update_web_sources(
+                    {self._check_url(source): []}
+                )
+        if not existed and stats["removed"] == 0:
+            raise DocumentNotFoundError(f"No {collection} document named {source}.")
+        logger.info(f"Deleted {collection} document {source}: {stats}")
+        return {"collection": collection, "source": source, "sections": 0, **stats}
+
+    def refresh_local_files(self, changed: List[str], removed: List[str]) -> Dict[str, int]:
+        """
+        Splits changed local files again and replaces their sections (and those of the
+        removed files), e.g. when the docs directory watcher reports them.
+
+        Args:
+            changed (List[str]): The added or modified file names.
+            removed (List[str]): The removed file names.
+
+        Returns:
+            Dict[str, int]: The number of sections 'added', 'removed' and 'reused'.
+        """
+        with self._lock:
+            updates = self._document_manager.split_local_files(changed)
+            updates.update({file_name: [] for file_name in removed})
+            return self._embedding_manager.update_local_sources(updates)
+
+    def _split_web_page(
+        self, url: str, content: Optional[str], title: Optional[str]
+    ) -> List[Document]:
+        """
+        Splits the given Markdown content of a web page, or fetches and splits the page.
+        """
+        if content is None:
+            sections = self._document_manager.split_web_pages([url])
+            if url not in sections:
+                raise DocumentNotFoundError(f"Could not load the web page {url}.")
+            return sections[url]
+        metadata = {
+            "url": url,
+            "title": title or "No title",
+            "html_content_length": str(len(content)),
+        }
+        return self._document_manager.split_document(
+            Document(page_content=content, metadata=metadata)
+        )
+
+    def _write_file(self, file_name: str, content: str) -> None:
+        """
+        Writes a local document atomically, so the directory watcher never reads it
+        half-written.
+        """
+        path = self._loader.file_path(file_name)  # type: ignore
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        handle, temporary_path = tempfile.mkstemp(
+            dir=os.path.dirname(path), prefix=".", suffix=".tmp"
+        )
+        try:
+            with os.fdopen(handle, "w", encoding="utf-8") as file:
+                file.write(content)
+            os.replace(temporary_path, path)
+        except BaseException:
+            os.unlink(temporary_path)
+            raise
+
+    def _read_file(self, file_name: str) -> Optional[str]:
+        """
+        Reads a local document from the docs directory.
+
+        Returns:
+            Optional[str]: The content of the file, or None if it does not exist.
+        """
+        try:
+            with open(self._loader.file_path(file_name), encoding="utf-8") as file:  # type: ignore
+                return file.read()
+        except FileNotFoundError:
+            return None
+
+    def _restore_file(self, file_name: str, content: Optional[str]) -> None:
+        """
+        Puts back the previous content of a local document, or removes it if it is new.
+        """
+        if content is None:
+            self._remove_file(file_name)
+        else:
+            self._write_file(file_name, content)
+
+    def _remove_file(self, file_name: str) -> bool:
+        """
+        Removes a local document from the docs directory.
+
+        Returns:
+            bool: True if the file existed.
+        """
+        try:
+            os.remove(self._loader.file_path(file_name))  # type: ignore
+        except FileNotFoundError:
+            return False
+        return True
+
+    @staticmethod
+    def _check_collection(collection: str) -> None:
+        """Raises an InvalidDocumentError for an unknown collection."""
+        if collection not in COLLECTIONS:
+            raise InvalidDocumentError(f"Unknown collection '{collection}', expected one of {COLLECTIONS}.")
+
+    def _check_file_name(self, file_name: str) -> str:
+        """
+        Checks that a local file name is a Markdown file inside the docs directory, in the
+        form listed by the DirectoryLoader (relative, '/'-separated, not hidden).
+        """
+        if self._loader is None:
+            raise InvalidDocumentError("No local documents directory is configured.")
+        parts = file_name.split("/")
+        if (
+            not file_name.endswith(".md")
+            or posixpath.normpath(file_name) != file_name
+            or any(character in file_name for character in ("\\", ":"))
+            or any(part in ("", "..") or part.startswith(".") for part in parts)
+        ):
+            raise InvalidDocumentError(
+                f"Invalid local file name '{file_name}': expected a relative path to a "
+                "'.md' file inside the docs directory."
+            )
+        return file_name
+
+    @staticmethod
+    def _check_url(url: str) -> str:
+        """Checks that a web source is an HTTP(S) URL."""
+        if not url.startswith(("http://", "https://")):
+            raise InvalidDocumentError(f"Invalid URL '{url}': expected an http(s) URL.")
+        return url
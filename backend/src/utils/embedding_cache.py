@@ -0,0 +1,296 @@
+# -*- coding: utf-8 -*-
+"""
+File: embedding_cache.py
+
+This file defines the CachedEmbeddings class, a persistent on-disk cache wrapped
+around any LangChain embeddings model. Vectors are stored in a SQLite database keyed
+by (embedding model, task type, text hash), so identical text is never embedded twice,
+whichever vector backend requests it. The cache is bounded with LRU eviction and keeps
+hit/miss counters.
+"""
+
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from array import array
+from typing import Any, Dict, List, Optional
+
+from langchain_core.embeddings import Embeddings
+
+from src.utils.logger_manager import logger
+
+# Task type label used for query embeddings (documents use the model's own task type)
+QUERY_TASK_TYPE = "retrieval_query"
+
+
+class CachedEmbeddings(Embeddings):
+    """
+    Embeddings wrapper that serves vectors from a persistent SQLite cache and only
+    forwards cache misses to the underlying embedding model.
+    """
+
+    def __init__(
+        self,
+        embedding_model: Embeddings,
+        cache_path: str = "./cache/embeddings.sqlite3",
+        max_entries: int = 200_000,
+    ) -> None:
+        """
+        Initializes the cache and opens (or creates) the SQLite database.
+
+        Args:
+            embedding_model (Embeddings): The model used to compute missing embeddings.
+            cache_path (str): Path of the SQLite file storing the cached vectors.
+            max_entries (int): Maximum number of vectors kept; least recently used ones are evicted.
+        """
+        self._embedding_model = embedding_model
+        self._cache_path = cache_path
+        self._max_entries = max_entries
+        self._lock = threading.Lock()
+
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+        directory = os.path.dirname(cache_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._connection = sqlite3.connect(cache_path, check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings ("
+            "key TEXT PRIMARY KEY, vector BLOB NOT NULL, last_access INTEGER NOT NULL)"
+        )
+        self._connection.execute(
+            "CREATE INDEX IF NOT EXISTS embeddings_last_access ON embeddings (last_access)"
+        )
+        self._connection.commit()
+        self._entries: int = self._connection.execute(
+            "SELECT COUNT(*) FROM embeddings"
+        ).fetchone()[0]
+
+        logger.info(
+            f"Embedding cache ready at {cache_path} ({self._entries} cached vectors)."
+        )
+
+    # --- Embeddings interface ---
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        """
+        Embeds a list of documents, computing only the texts missing from the cache.
+
+        Args:
+            texts (List[str]): The texts to embed.
+
+        Returns:
+            List[List[float]]: One embedding per text, in the same order.
+        """
+        return self._embed(texts, self.task_type, self._embedding_model.embed_documents)
+
+    def embed_query(self, text: str) -> List[float]:
+        """
+        Embeds a query, serving it from the cache when possible.
+
+        Args:
+            text (str): The query text to embed.
+
+        Returns:
+            List[float]: The embedding of the query.
+        """
+        return self._embed(
+            [text],
+            QUERY_TASK_TYPE,
+            lambda missing: [self._embedding_model.embed_query(missing[0])],
+        )[0]
+
+    async def aembed_query(self, text: str) -> List[float]:
+        """
+        Async variant of embed_query: the cache is looked up and updated in place and
+        only a miss awaits the async API of the wrapped model.
+
+        Args:
+            text (str): The query text to embed.
+
+        Returns:
+            List[float]: The embedding of the query.
+        """
+        key = self._key(QUERY_TASK_TYPE, text)
+        found = self._lookup({key})
+        with self._lock:
+            if key in found:
+                self._hits += 1
+            else:
+                self._misses += 1
+
+        if key in found:
+            return list(found[key])
+        vector = await self._embedding_model.aembed_query(text)
+        self._store({key: vector})
+        return list(vector)
+
+    # --- Cache logic ---
+    def _embed(
+        self, texts: List[str], task_type: Optional[str], compute: Any
+    ) -> List[List[float]]:
+        """
+        Looks up every text in the cache, computes the missing ones in a single call,
+        stores them and returns all vectors in input order.
+
+        Args:
+            texts (List[str]): The texts to embed.
+            task_type (Optional[str]): The task type the embeddings are computed for.
+            compute (Callable[[List[str]], List[List[float]]]): Computes embeddings for cache misses.
+
+        Returns:
+            List[List[float]]: One embedding per text, in the same order.
+        """
+        keys = [self._key(task_type, text) for text in texts]
+        found = self._lookup(set(keys))
+
+        # Deduplicate the misses so repeated texts are embedded only once
+        missing: Dict[str, str] = {}
+        for key, text in zip(keys, texts):
+            if key not in found and key not in missing:
+                missing[key] = text
+
+        misses = sum(1 for key in keys if key not in found)
+        with self._lock:
+            self._hits += len(keys) - misses
+            self._misses += misses
+
+        if missing:
+            vectors = compute(list(missing.values()))
+            computed = dict(zip(missing.keys(), vectors))
+            self._store(computed)
+            found.update(computed)
+
+        return [list(found[key]) for key in keys]
+
+    def _key(self, task_type: Optional[str], text: str) -> str:
+        """
+        Builds the cache key of a text for the wrapped model and a task type.
+
+        Args:
+            task_type (Optional[str]): The task type the embedding is computed for.
+            text (str): The text to embed.
+
+        Returns:
+            str: The cache key.
+        """
+        text_hash = hashlib.sha256(text.encode("utf-8")).hexdigest()
+        return f"{self.model}|{task_type}|{text_hash}"
+
+    def _lookup(self, keys: set[str]) -> Dict[str, List[float]]:
+        """
+        Fetches the cached vectors for a set of keys and refreshes their LRU position.
+
+        Args:
+            keys (set[str]): The keys to look up.
+
+        Returns:
+            Dict[str, List[float]]: The vectors found in the cache, by key.
+        """
+        found: Dict[str, List[float]] = {}
+        key_list = list(keys)
+        now = time.time_ns()
+        with self._lock:
+            # SQLite limits the number of bound parameters per statement
+            for start in range(0, len(key_list), 500):
+                chunk = key_list[start : start + 500]
+                placeholders = ",".join("?" * len(chunk))
+                rows = self._connection.execute(
+                    f"SELECT key, vector FROM embeddings WHERE key IN ({placeholders})",
+                    chunk,
+                ).fetchall()
+                for key, blob in rows:
+                    found[key] = array("f", blob).tolist()
+            if found:
+                self._connection.executemany(
+                    "UPDATE embeddings SET last_access = ? WHERE key = ?",
+                    [(now, key) for key in found],
+                )
+                self._connection.commit()
+        return found
+
+    def _store(self, vectors: Dict[str, List[float]]) -> None:
+        """
+        Stores new vectors and evicts the least recently used entries above the size limit.
+
+        Args:
+            vectors (Dict[str, List[float]]): The vectors to store, by key.
+        """
+        now = time.time_ns()
+        rows = [(key, array("f", vector).tobytes(), now) for key, vector in vectors.items()]
+        with self._lock:
+            # Only new keys count as entries; keys stored meanwhile (e.g. by a concurrent
+            # miss of the same text) are updated instead
+            skipped = [
+                row
+                for row in rows
+                if not self._connection.execute(
+                    "INSERT OR IGNORE INTO embeddings (key, vector, last_access) VALUES (?, ?, ?)",
+                    row,
+                ).rowcount
+            ]
+            if skipped:
+                self._connection.executemany(
+                    "UPDATE embeddings SET vector = ?, last_access = ? WHERE key = ?",
+                    [(vector, last_access, key) for key, vector, last_access in skipped],
+                )
+            self._entries += len(rows) - len(skipped)
+            if self._entries > self._max_entries:
+                self._entries = self._connection.execute(
+                    "SELECT COUNT(*) FROM embeddings"
+                ).fetchone()[0]
+                overflow = self._entries - self._max_entries
+                if overflow > 0:
+                    self._connection.execute(
+                        "DELETE FROM embeddings WHERE key IN ("
+                        "SELECT key FROM embeddings ORDER BY last_access ASC LIMIT ?)",
+                        (overflow,),
+                    )
+                    self._entries -= overflow
+                    self._evictions += overflow
+                    logger.debug(f"Evicted {overflow} embeddings from the cache.")
+            self._connection.commit()
+
+    def close(self) -> None:
+        """
+        Closes the underlying SQLite connection.
+        """
+        with self._lock:
+            self._connection.close()
+
+    # --- Properties ---
+    @property
+    def model(self) -> str:
+        """
+        Returns the name of the wrapped embedding model.
+        """
+        return str(
+            getattr(self._embedding_model, "model", type(self._embedding_model).__name__)
+        )
+
+    @property
+    def task_type(self) -> Optional[str]:
+        """
+        Returns the task type the wrapped model embeds documents for.
+        """
+        return getattr(self._embedding_model, "task_type", None)
+
+    @property
+    def stats(self) -> Dict[str, Any]:
+        """
+        Returns the cache counters: hits, misses, hit rate, evictions and stored entries.
+        """
+        with self._lock:
+            total = self._hits + self._misses
+            return {
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": self._hits / total if total else 0.0,
+                "evictions": self._evictions,
+                "entries": self._entries,
+            }
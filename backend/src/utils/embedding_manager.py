@@ -6,17 +6,57 @@ This file defines the EmbeddingManager class, which is responsible for managing
 document embeddings and storing them in the Chroma database. The embeddings are
 organized into two collections: one for local documents and one for web documents.
 The class provides functionality to query these collections for relevant embeddings.
+
+The sections of a source (file or page) can be replaced while the collections are being
+searched: the new sections are stored hidden from searches, then shown while the old ones
+are hidden in a single assignment, and the old ones are deleted afterwards. Every step
+publishes a new generation of the hidden sections, and a search that overlapped a step
+runs again, so it sees either all the old or all the new sections of a source.
+
+The query methods have async variants for the chatbot graph: the query is embedded with the
+async API of the embedding model, and the (synchronous) Chroma searches run in a thread.
 """
 
+import asyncio
+import os
+import threading
+from collections import deque
 from concurrent.futures import ThreadPoolExecutor
-from typing import List, Optional, Any
+from typing import (
+    Any,
+    Deque,
+    Dict,
+    FrozenSet,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+)
 
 
 from langchain_chroma import Chroma
 from langchain_core.documents import Document
 
-from src.config.config_init import CHROMA_DB_CONFIG
+from src.config.config_init import (
+    CHROMA_DB_CONFIG,
+    CHROMA_INCREMENTAL_INDEXING,
+    DOCUMENT_PIPELINE_CONFIG,
+    EMBEDDING_PIPELINE_CONFIG,
+    QUERY_EMBEDDING_CACHE_CONFIG,
+)
+from src.utils.embedding_pipeline import EmbeddingPipeline, iter_batches
 from src.utils.logger_manager import logger
+from src.utils.query_embedding_cache import QueryEmbeddingCache
+from src.utils.section_hashing import SECTION_SLOT_KEY, iter_section_ids
+
+# Times a search overlapping the steps of an update is run before its results are kept
+SEARCH_ATTEMPTS = 5
+# Generations of hidden sections remembered for a search whose attempts all overlapped a change
+HIDDEN_HISTORY = 64
 
 
 class EmbeddingManager:
@@ -29,9 +69,11 @@ class EmbeddingManager:
     def __init__(
         self,
         embedding_model: Any,
-        local_documents: List[Document],
-        web_documents: List[Document],
+        local_documents: Iterable[Document],
+        web_documents: Iterable[Document],
         persist_directory: str = "./database",
+        incremental: bool = CHROMA_INCREMENTAL_INDEXING,
+        low_memory: bool = DOCUMENT_PIPELINE_CONFIG["low_memory"],
     ) -> None:
         """
         Initializes the EmbeddingManager, which manages embeddings for local and web
@@ -39,14 +81,25 @@ class EmbeddingManager:
 
         Args:
             embedding_model (Embeddings): The model used to generate embeddings.
-            local_documents (List[Document]): Local documents to index.
-            web_documents (List[Document]): Web documents to index.
+            local_documents (Iterable[Document]): Local documents to index (a list, or a
+                stream of sections embedded in batches as they arrive).
+            web_documents (Iterable[Document]): Web documents to index.
             persist_directory (str): Directory to store the Chroma database.
+            incremental (bool): If True, reuse the persisted collections and only embed
+                new or changed sections. If False, the database is wiped and rebuilt.
+            low_memory (bool): If True, the sections are released once they are stored
+                (Chroma keeps their text), instead of being referenced by the manager.
         """
-        self.embedding_model = embedding_model
+        # Sections are embedded through the batched, concurrent pipeline stage
+        self.embedding_model = EmbeddingPipeline(
+            embedding_model, **EMBEDDING_PIPELINE_CONFIG
+        )
+        # Repeated questions are answered from memory instead of the embedding model
+        self.query_cache = QueryEmbeddingCache(**QUERY_EMBEDDING_CACHE_CONFIG)
         self.local_documents = local_documents
         self.web_documents = web_documents
         self.persist_directory = persist_directory
+        self.incremental = incremental
 
         self.database: Optional[Chroma] = None
         self.local_collection: Optional[Chroma] = None
@@ -54,21 +107,43 @@ class EmbeddingManager:
 
         self.local_collection_name = "local_documents"
         self.web_collection_name = "web_documents"
+        # Sections added, updated, removed and reused by the incremental sync, by collection
+        self.sync_stats: Dict[str, Dict[str, int]] = {}
+
+        # Generation and section IDs being swapped in or out, left out of the search results
+        self._hidden_ids: Dict[str, Tuple[int, FrozenSet[str]]] = {
+            self.local_collection_name: (0, frozenset()),
+            self.web_collection_name: (0, frozenset()),
+        }
+        # Hidden sections of the last generations, for a search whose attempts ran out
+        self._hidden_history: Dict[str, Deque[Tuple[int, FrozenSet[str]]]] = {
+            name: deque([state], maxlen=HIDDEN_HISTORY)
+            for name, state in self._hidden_ids.items()
+        }
+        # Serializes updates (searches do not take it)
+        self._update_lock = threading.Lock()
 
         # Initialize the database and collections
         self._initialize_database()
 
+        if low_memory:
+            self.local_documents = []
+            self.web_documents = []
+
     def _initialize_database(self) -> None:
         """
-        Initializes the Chroma database and its collections. If the `reset_database`
-        flag is set to True, the database will be deleted and recreated.
+        Initializes the Chroma database and its collections. Unless incremental indexing
+        is enabled, the database will be deleted and recreated.
 
         This method also initializes the collections for local and web documents in parallel.
         """
         logger.info("Initializing database...")
 
         # Reset the database if required
-        self._reset_database()
+        if self.incremental:
+            os.makedirs(self.persist_directory, exist_ok=True)
+        else:
+            self._reset_database()
 
         # Load the Chroma database
         self.database = Chroma(
@@ -102,8 +177,6 @@ class EmbeddingManager:
         recreates it from scratch. Tries 3 times; if it fails, logs a warning and continues.
         """
         import shutil
-        import os
-        from src.utils.logger_manager import logger
 
         max_retries = 3
         for attempt in range(max_retries):
@@ -125,31 +198,428 @@ class EmbeddingManager:
         os.makedirs(self.persist_directory, exist_ok=True)
 
     def _get_chroma_collection(
-        self, collection_name: str, documents: List[Document]
+        self, collection_name: str, documents: Iterable[Document]
     ) -> Chroma:
         """
         Loads an existing Chroma collection or creates a new one if it doesn't exist.
 
         Args:
             collection_name (str): The name of the collection to load or create.
-            documents (List[Document]): The documents to index in the collection.
+            documents (Iterable[Document]): The documents to index in the collection.
 
         Returns:
             Chroma: The Chroma collection object.
         """
         logger.info(f"Loading or creating Chroma collection '{collection_name}'...")
 
+        if self.incremental:
+            collection = self._sync_chroma_collection(collection_name, documents)
+            logger.info(f"Chroma collection '{collection_name}' is ready.")
+            return collection
+
         # Chroma automatically creates the collection if it doesn't exist
-        collection = Chroma.from_documents(  # type: ignore
-            documents=documents,
-            embedding=self.embedding_model,
-            persist_directory=self.persist_directory,
+        collection = Chroma(
             collection_name=collection_name,
+            embedding_function=self.embedding_model,
+            persist_directory=self.persist_directory,
         )
+        # Streamed sections are embedded batch by batch as they arrive
+        for batch in iter_batches(documents, self.embedding_model.stream_batch_size):
+            collection.add_documents(documents=batch)
 
         logger.info(f"Chroma collection '{collection_name}' is ready.")
         return collection
 
+    def _sync_chroma_collection(
+        self, collection_name: str, documents: Iterable[Document]
+    ) -> Chroma:
+        """
+        Brings a persisted Chroma collection in line with the given documents. Each section
+        is identified by a content-derived ID, so only new or changed sections are embedded,
+        vanished sections are deleted and the rest are reused as stored (with their slot
+        moved if their position changed). New sections are embedded batch by batch as they
+        arrive; vanished ones are deleted at the end.
+
+        Args:
+            collection_name (str): The name of the collection to synchronize.
+            documents (Iterable[Document]): The current sections of the collection.
+
+        Returns:
+            Chroma: The synchronized Chroma collection object.
+        """
+        collection = Chroma(
+            collection_name=collection_name,
+            embedding_function=self.embedding_model,
+            persist_directory=self.persist_directory,
+            collection_metadata={"embedding_model": self._embedding_fingerprint()},
+            **CHROMA_DB_CONFIG,
+        )
+
+        # Vectors from a different embedding model cannot be reused
+        stored_fingerprint = (collection._collection.metadata or {}).get(  # type: ignore
+            "embedding_model"
+        )
+        if stored_fingerprint != self._embedding_fingerprint():
+            logger.info(
+                f"Embedding model changed for '{collection_name}' "
+                f"({stored_fingerprint} -> {self._embedding_fingerprint()}). Rebuilding collection..."
+            )
+            collection.delete_collection()
+            collection = Chroma(
+                collection_name=collection_name,
+                embedding_function=self.embedding_model,
+                persist_directory=self.persist_directory,
+                collection_metadata={"embedding_model": self._embedding_fingerprint()},
+                **CHROMA_DB_CONFIG,
+            )
+
+        stored = collection.get(include=["metadatas"])
+        stored_slots = {
+            stored_id: (metadata or {}).get(SECTION_SLOT_KEY)
+            for stored_id, metadata in zip(stored["ids"], stored["metadatas"])
+        }
+
+        current_ids: set[str] = set()
+        new_slots: List[str] = []
+        moved: Dict[str, Dict[str, Any]] = {}
+
+        def new_sections() -> Iterator[Tuple[str, Document]]:
+            for document, section_id, slot in iter_section_ids(documents):
+                current_ids.add(section_id)
+                if section_id in stored_slots:
+                    if stored_slots[section_id] != slot:
+                        moved[section_id] = {**document.metadata, SECTION_SLOT_KEY: slot}
+                    continue
+                new_slots.append(slot)
+                yield section_id, Document(
+                    page_content=document.page_content,
+                    metadata={**document.metadata, SECTION_SLOT_KEY: slot},
+                )
+
+        # New sections are embedded batch by batch as they arrive
+        for batch in iter_batches(
+            new_sections(), self.embedding_model.stream_batch_size
+        ):
+            new_ids, new_documents = zip(*batch)
+            collection.add_documents(documents=list(new_documents), ids=list(new_ids))
+
+        vanished_ids = [
+            stored_id for stored_id in stored_slots if stored_id not in current_ids
+        ]
+        vanished_slots = {stored_slots[stored_id] for stored_id in vanished_ids}
+
+        # A new section taking the place of a vanished one counts as an update
+        updated = sum(1 for slot in new_slots if slot in vanished_slots)
+        added = len(new_slots) - updated
+        removed = len(vanished_ids) - updated
+        reused = len(current_ids) - len(new_slots)
+
+        if vanished_ids:
+            collection.delete(ids=vanished_ids)
+        self._move_slots(collection, moved)
+
+        self.sync_stats[collection_name] = {
+            "added": added,
+            "updated": updated,
+            "removed": removed,
+            "reused": reused,
+        }
+        logger.info(
+            f"Collection '{collection_name}' synchronized: {added} added, {updated} updated, "
+            f"{removed} removed, {reused} reused ({len(moved)} moved)."
+        )
+        return collection
+
+    def _move_slots(self, collection: Chroma, moved: Mapping[str, Dict[str, Any]]) -> None:
+        """
+        Stores the new metadata of reused sections whose position in their source changed,
+        so their slot tells where they sit now (and the next sync counts updates right).
+
+        Args:
+            collection (Chroma): The collection holding the sections.
+            moved (Mapping[str, Dict[str, Any]]): The new metadata of each moved section ID.
+        """
+        ids = list(moved)
+        batch_size = self.embedding_model.stream_batch_size
+        for start in range(0, len(ids), batch_size):
+            batch = ids[start : start + batch_size]
+            collection._collection.update(  # type: ignore
+                ids=batch, metadatas=[moved[section_id] for section_id in batch]
+            )
+
+    def update_local_sources(
+        self, sections_by_source: Mapping[str, Sequence[Document]]
+    ) -> Dict[str, int]:
+        """
+        Replaces the sections of some local files (e.g. after they changed on disk). Only
+        sections whose content changed are embedded, and searches running meanwhile see
+        either all the old or all the new sections of the files.
+
+        Args:
+            sections_by_source (Mapping[str, Sequence[Document]]): The new sections of each
+                file name (an empty sequence removes the file).
+
+        Returns:
+            Dict[str, int]: The number of sections 'added', 'removed' and 'reused'.
+        """
+        return self._update_sources(
+            self.local_collection,  # type: ignore
+            self.local_collection_name,
+            "file_name",
+            sections_by_source,
+        )
+
+    def update_web_sources(
+        self, sections_by_source: Mapping[str, Sequence[Document]]
+    ) -> Dict[str, int]:
+        """
+        Replaces the sections of some web pages. See `update_local_sources`.
+
+        Args:
+            sections_by_source (Mapping[str, Sequence[Document]]): The new sections of each
+                URL (an empty sequence removes the page).
+
+        Returns:
+            Dict[str, int]: The number of sections 'added', 'removed' and 'reused'.
+        """
+        return self._update_sources(
+            self.web_collection,  # type: ignore
+            self.web_collection_name,
+            "url",
+            sections_by_source,
+        )
+
+    def _update_sources(
+        self,
+        collection: Chroma,
+        collection_name: str,
+        source_key: str,
+        sections_by_source: Mapping[str, Sequence[Document]],
+    ) -> Dict[str, int]:
+        """
+        Replaces the sections of some sources in a collection, without blocking searches.
+
+        Args:
+            collection (Chroma): The collection to update.
+            collection_name (str): The name of the collection.
+            source_key (str): The metadata key naming the source ('file_name' or 'url').
+            sections_by_source (Mapping[str, Sequence[Document]]): The new sections of
+                each source.
+
+        Returns:
+            Dict[str, int]: The number of sections 'added', 'removed' and 'reused'.
+        """
+        if not sections_by_source:
+            return {"added": 0, "removed": 0, "reused": 0}
+
+        with self._update_lock:
+            stored = collection.get(
+                where={source_key: {"$in": list(sections_by_source)}}, include=["metadatas"]
+            )
+            stored_slots = {
+                stored_id: (metadata or {}).get(SECTION_SLOT_KEY)
+                for stored_id, metadata in zip(stored["ids"], stored["metadatas"])
+            }
+            stored_ids = set(stored_slots)
+
+            current_ids: set[str] = set()
+            new_ids: List[str] = []
+            new_documents: List[Document] = []
+            moved: Dict[str, Dict[str, Any]] = {}
+            sections = (
+                section for source in sections_by_source.values() for section in source
+            )
+            for document, section_id, slot in iter_section_ids(sections):
+                current_ids.add(section_id)
+                if section_id in stored_ids:
+                    if stored_slots[section_id] != slot:
+                        moved[section_id] = {**document.metadata, SECTION_SLOT_KEY: slot}
+                    continue
+                new_ids.append(section_id)
+                new_documents.append(
+                    Document(
+                        page_content=document.page_content,
+                        metadata={**document.metadata, SECTION_SLOT_KEY: slot},
+                    )
+                )
+            retired_ids = frozenset(stored_ids - current_ids)
+
+            # New sections are stored hidden, then swapped with the retired ones at once
+            hidden = self._hidden_ids[collection_name][1]
+            self._set_hidden_ids(collection_name, hidden | set(new_ids))
+            batch_size = self.embedding_model.stream_batch_size
+            for start in range(0, len(new_ids), batch_size):
+                collection.add_documents(
+                    documents=new_documents[start : start + batch_size],
+                    ids=new_ids[start : start + batch_size],
+                )
+            self._set_hidden_ids(collection_name, hidden | retired_ids)
+
+            if retired_ids:
+                collection.delete(ids=list(retired_ids))
+            self._set_hidden_ids(collection_name, hidden)
+            self._move_slots(collection, moved)
+
+        stats = {
+            "added": len(new_ids),
+            "removed": len(retired_ids),
+            "reused": len(current_ids) - len(new_ids),
+        }
+        logger.info(
+            f"Updated {len(sections_by_source)} sources of '{collection_name}': "
+            f"{stats['added']} sections added, {stats['removed']} removed, "
+            f"{stats['reused']} reused."
+        )
+        return stats
+
+    def _set_hidden_ids(self, collection_name: str, hidden: FrozenSet[str]) -> None:
+        """
+        Publishes the sections hidden from the searches of a collection as a new generation.
+        Called before the collection changes, so a search that saw the same generation
+        before and after running did not overlap a change of the hidden sections.
+        """
+        generation = self._hidden_ids[collection_name][0] + 1
+        self._hidden_history[collection_name].append((generation, frozenset(hidden)))
+        self._hidden_ids[collection_name] = (generation, frozenset(hidden))
+
+    def _hidden_since(self, collection_name: str, generation: int) -> FrozenSet[str]:
+        """
+        Returns every section hidden from a generation on. An update hides its new
+        sections before the swap and its retired ones after it, so a search filtered with
+        them may miss a document being updated but never returns two versions of it.
+        """
+        history = list(self._hidden_history[collection_name])
+        if history[0][0] > generation:
+            logger.warning(
+                f"Searches of '{collection_name}' overlapped more than {HIDDEN_HISTORY} "
+                "update steps; a result may mix two versions of a document."
+            )
+        hidden: Set[str] = set()
+        for step, step_hidden in history:
+            if step >= generation:
+                hidden |= step_hidden
+        return frozenset(hidden)
+
+    def _search(
+        self, collection: Chroma, collection_name: str, embedding: List[float], k: int
+    ) -> List[Document]:
+        """
+        Searches a collection, leaving out the sections of an update in progress. A search
+        that overlapped a step of an update runs again (without waiting for the update);
+        if the last attempt overlapped one too, its results leave out every section hidden
+        meanwhile.
+
+        Args:
+            collection (Chroma): The collection to search.
+            collection_name (str): The name of the collection.
+            embedding (List[float]): The embedding of the query.
+            k (int): The number of most similar documents to return.
+
+        Returns:
+            List[Document]: The most similar visible documents.
+        """
+        for attempt in range(1, SEARCH_ATTEMPTS + 1):
+            generation, hidden = self._hidden_ids[collection_name]
+            try:
+                results = self._search_visible(collection, embedding, k, hidden)
+            except Exception:
+                # A section written after the search read the hidden IDs may be incomplete
+                changed = self._hidden_ids[collection_name][0] != generation
+                if attempt == SEARCH_ATTEMPTS or not changed:
+                    raise
+                continue
+            if self._hidden_ids[collection_name][0] == generation:
+                return results
+        logger.warning(
+            f"Searches of '{collection_name}' overlapped updates {SEARCH_ATTEMPTS} times; "
+            "leaving out the documents being updated."
+        )
+        hidden = self._hidden_since(collection_name, generation)
+        return [result for result in results if result.id not in hidden]
+
+    @staticmethod
+    def _search_visible(
+        collection: Chroma, embedding: List[float], k: int, hidden: FrozenSet[str]
+    ) -> List[Document]:
+        """
+        Searches a collection, skipping the hidden sections.
+
+        Args:
+            collection (Chroma): The collection to search.
+            embedding (List[float]): The embedding of the query.
+            k (int): The number of most similar documents to return.
+            hidden (FrozenSet[str]): The IDs of the sections to leave out.
+
+        Returns:
+            List[Document]: The most similar visible documents.
+        """
+        if not hidden:
+            return collection.similarity_search_by_vector(embedding, k)
+
+        # Hidden sections may still be half-written, so they are dropped before any
+        # Document is built
+        found = collection._collection.query(  # type: ignore
+            query_embeddings=[embedding],
+            n_results=k + len(hidden),
+            include=["documents", "metadatas"],  # type: ignore
+        )
+        results: List[Document] = []
+        for section_id, text, metadata in zip(
+            found["ids"][0], found["documents"][0], found["metadatas"][0]  # type: ignore
+        ):
+            if section_id in hidden:
+                continue
+            results.append(
+                Document(id=section_id, page_content=text, metadata=metadata or {})
+            )
+            if len(results) == k:
+                break
+        return results
+
+    def _embedding_fingerprint(self) -> str:
+        """
+        Describes the embedding model so stored vectors are only reused with the same model.
+
+        Returns:
+            str: The model name and task type of the embedding model.
+        """
+        model = getattr(self.embedding_model, "model", type(self.embedding_model).__name__)
+        task_type = getattr(self.embedding_model, "task_type", None)
+        return f"{model}:{task_type}"
+
+    def embed_query(self, query: str) -> List[float]:
+        """
+        Embeds a query once so it can be searched in several collections. Repeated queries
+        are served from the query embedding cache.
+
+        Args:
+            query (str): The query string to embed.
+
+        Returns:
+            List[float]: The embedding of the query.
+        """
+        embedding = self.query_cache.get_or_compute(
+            query, self.embedding_model.embed_query
+        )
+        logger.debug(f"Query embedding cache stats: {self.query_cache.stats}")
+        return embedding
+
+    async def aembed_query(self, query: str) -> List[float]:
+        """
+        Async variant of embed_query, awaiting the embedding model on a cache miss.
+
+        Args:
+            query (str): The query string to embed.
+
+        Returns:
+            List[float]: The embedding of the query.
+        """
+        embedding = await self.query_cache.aget_or_compute(
+            query, self.embedding_model.aembed_query
+        )
+        logger.debug(f"Query embedding cache stats: {self.query_cache.stats}")
+        return embedding
+
     def query_local_embeddings(self, query: str, k: int) -> List[Document]:
         """
         Queries the local collection for relevant embeddings.
@@ -162,9 +632,39 @@ class EmbeddingManager:
             List[Document]: A list of the most relevant documents from the local collection.
         """
         logger.debug(f"Querying local embeddings for: {query} with k={k}")
+        return self.query_local_embeddings_by_vector(self.embed_query(query), k)
+
+    def query_web_embeddings(self, query: str, k: int) -> List[Document]:
+        """
+        Queries the web collection for relevant embeddings.
+
+        Args:
+            query (str): The query string to search for in the web collection.
+            k (int): The number of most similar documents to return.
 
+        Returns:
+            List[Document]: A list of the most relevant documents from the web collection.
+        """
+        logger.debug(f"Querying web embeddings for: {query} with k={k}")
+        return self.query_web_embeddings_by_vector(self.embed_query(query), k)
+
+    def query_local_embeddings_by_vector(
+        self, embedding: List[float], k: int
+    ) -> List[Document]:
+        """
+        Queries the local collection with an already computed query embedding.
+
+        Args:
+            embedding (List[float]): The embedding of the query.
+            k (int): The number of most similar documents to return.
+
+        Returns:
+            List[Document]: A list of the most relevant documents from the local collection.
+        """
         # Perform similarity search on the local collection
-        results = self.local_collection.similarity_search(query, k)  # type: ignore
+        results = self._search(
+            self.local_collection, self.local_collection_name, embedding, k  # type: ignore
+        )
 
         for result in results:
             logger.debug(
@@ -173,21 +673,23 @@ class EmbeddingManager:
 
         return results
 
-    def query_web_embeddings(self, query: str, k: int) -> List[Document]:
+    def query_web_embeddings_by_vector(
+        self, embedding: List[float], k: int
+    ) -> List[Document]:
         """
-        Queries the web collection for relevant embeddings.
+        Queries the web collection with an already computed query embedding.
 
         Args:
-            query (str): The query string to search for in the web collection.
+            embedding (List[float]): The embedding of the query.
             k (int): The number of most similar documents to return.
 
         Returns:
             List[Document]: A list of the most relevant documents from the web collection.
         """
-        logger.debug(f"Querying web embeddings for: {query} with k={k}")
-
         # Perform similarity search on the web collection
-        results = self.web_collection.similarity_search(query, k)  # type: ignore
+        results = self._search(
+            self.web_collection, self.web_collection_name, embedding, k  # type: ignore
+        )
 
         for result in results:
             logger.debug(
@@ -196,9 +698,42 @@ class EmbeddingManager:
 
         return results
 
+    async def aquery_local_embeddings_by_vector(
+        self, embedding: List[float], k: int
+    ) -> List[Document]:
+        """
+        Async variant of query_local_embeddings_by_vector. Chroma searches are
+        synchronous, so the search runs in a thread instead of blocking the event loop.
+
+        Args:
+            embedding (List[float]): The embedding of the query.
+            k (int): The number of most similar documents to return.
+
+        Returns:
+            List[Document]: A list of the most relevant documents from the local collection.
+        """
+        return await asyncio.to_thread(self.query_local_embeddings_by_vector, embedding, k)
+
+    async def aquery_web_embeddings_by_vector(
+        self, embedding: List[float], k: int
+    ) -> List[Document]:
+        """
+        Async variant of query_web_embeddings_by_vector. Chroma searches are
+        synchronous, so the search runs in a thread instead of blocking the event loop.
+
+        Args:
+            embedding (List[float]): The embedding of the query.
+            k (int): The number of most similar documents to return.
+
+        Returns:
+            List[Document]: A list of the most relevant documents from the web collection.
+        """
+        return await asyncio.to_thread(self.query_web_embeddings_by_vector, embedding, k)
+
     def query_embeddings(self, query: str, k: int) -> List[Document]:
         """
         Queries both the local and web collections for relevant embeddings.
+        The query is embedded once and the same vector is used for both collections.
 
         Args:
             query (str): The query string to search for in both collections.
@@ -208,12 +743,13 @@ class EmbeddingManager:
             List[Document]: A combined list of relevant documents from both collections.
         """
         logger.debug(f"Querying all collections for: {query} with k={k}")
+        embedding = self.embed_query(query)
 
         # Use ThreadPoolExecutor to parallelize similarity search across collections
         with ThreadPoolExecutor() as executor:
             futures = [
-                executor.submit(self.query_local_embeddings, query, k),
-                executor.submit(self.query_web_embeddings, query, k),
+                executor.submit(self.query_local_embeddings_by_vector, embedding, k),
+                executor.submit(self.query_web_embeddings_by_vector, embedding, k),
             ]
             results = [future.result() for future in futures]
 
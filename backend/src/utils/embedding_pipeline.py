@@ -0,0 +1,214 @@
+# -*- coding: utf-8 -*-
+"""
+File: embedding_pipeline.py
+
+This file defines the EmbeddingPipeline class, the indexing stage placed in front of
+the embedding model by both embedding managers. Sections are sent to the model in
+configurable batches, several batches run concurrently under a cap, failed batches
+are retried with exponential backoff and the throughput is logged as it progresses.
+`iter_batches` groups streamed sections so indexing can start before loading ends.
+"""
+
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Iterable, Iterator, List, Optional, TypeVar
+
+from langchain_core.embeddings import Embeddings
+
+from src.utils.logger_manager import logger
+
+T = TypeVar("T")
+
+
+def iter_batches(items: Iterable[T], batch_size: int) -> Iterator[List[T]]:
+    """
+    Groups a (possibly streamed) sequence into lists of at most `batch_size` items,
+    yielding each batch as soon as it is full.
+
+    Args:
+        items (Iterable[T]): The items to group.
+        batch_size (int): The maximum number of items per batch.
+
+    Yields:
+        List[T]: The batches, in order.
+    """
+    batch: List[T] = []
+    for item in items:
+        batch.append(item)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+class EmbeddingPipeline(Embeddings):
+    """
+    Embeddings wrapper that embeds documents in concurrent, retried batches.
+    Query embeddings (sync and async) are forwarded to the wrapped model unchanged.
+    """
+
+    def __init__(
+        self,
+        embedding_model: Embeddings,
+        batch_size: int = 64,
+        max_concurrency: int = 4,
+        max_retries: int = 3,
+        backoff_base: float = 1.0,
+        backoff_max: float = 30.0,
+    ) -> None:
+        """
+        Initializes the pipeline around an embedding model.
+
+        Args:
+            embedding_model (Embeddings): The model used to compute the embeddings.
+            batch_size (int): Number of sections sent to the model per request.
+            max_concurrency (int): Maximum number of batches embedded at the same time.
+            max_retries (int): Number of retries for a failed batch before giving up.
+            backoff_base (float): Delay in seconds before the first retry (doubled on each retry).
+            backoff_max (float): Upper bound in seconds for the delay between retries.
+        """
+        if batch_size < 1 or max_concurrency < 1:
+            raise ValueError("batch_size and max_concurrency must be at least 1.")
+
+        self._embedding_model = embedding_model
+        self._batch_size = batch_size
+        self._max_concurrency = max_concurrency
+        self._max_retries = max_retries
+        self._backoff_base = backoff_base
+        self._backoff_max = backoff_max
+
+    # --- Embeddings interface ---
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        """
+        Embeds the texts in concurrent batches, preserving the input order.
+
+        Args:
+            texts (List[str]): The texts to embed.
+
+        Returns:
+            List[List[float]]: One embedding per text, in the same order.
+
+        Raises:
+            Exception: The last error of a batch that still fails after all retries.
+        """
+        if not texts:
+            return []
+
+        batches = [
+            (start, texts[start : start + self._batch_size])
+            for start in range(0, len(texts), self._batch_size)
+        ]
+        embeddings: List[Optional[List[float]]] = [None] * len(texts)
+        progress_lock = threading.Lock()
+        done = 0
+        started = time.perf_counter()
+
+        logger.info(
+            f"Embedding {len(texts)} sections in {len(batches)} batches "
+            f"(batch_size={self._batch_size}, max_concurrency={self._max_concurrency})..."
+        )
+
+        with ThreadPoolExecutor(max_workers=self._max_concurrency) as executor:
+            futures = {
+                executor.submit(self._embed_batch, batch): (start, len(batch))
+                for start, batch in batches
+            }
+            for future in as_completed(futures):
+                start, size = futures[future]
+                embeddings[start : start + size] = future.result()
+                with progress_lock:
+                    done += size
+                    elapsed = time.perf_counter() - started
+                logger.debug(
+                    f"Embedded {done}/{len(texts)} sections "
+                    f"({done / elapsed if elapsed else 0.0:.1f} sections/s)."
+                )
+
+        elapsed = time.perf_counter() - started
+        logger.info(
+            f"Embedded {len(texts)} sections in {elapsed:.2f}s "
+            f"({len(texts) / elapsed if elapsed else 0.0:.1f} sections/s)."
+        )
+        return embeddings  # type: ignore
+
+    def embed_query(self, text: str) -> List[float]:
+        """
+        Embeds a query with the wrapped model.
+
+        Args:
+            text (str): The query text to embed.
+
+        Returns:
+            List[float]: The embedding of the query.
+        """
+        return self._embedding_model.embed_query(text)
+
+    async def aembed_query(self, text: str) -> List[float]:
+        """
+        Async variant of embed_query, awaiting the async API of the wrapped model.
+
+        Args:
+            text (str): The query text to embed.
+
+        Returns:
+            List[float]: The embedding of the query.
+        """
+        return await self._embedding_model.aembed_query(text)
+
+    # --- Batch handling ---
+    def _embed_batch(self, batch: List[str]) -> List[List[float]]:
+        """
+        Embeds one batch, retrying with exponential backoff and jitter on failure.
+
+        Args:
+            batch (List[str]): The texts of the batch.
+
+        Returns:
+            List[List[float]]: The embeddings of the batch.
+        """
+        for attempt in range(self._max_retries + 1):
+            try:
+                return self._embedding_model.embed_documents(batch)
+            except Exception as e:
+                if attempt == self._max_retries:
+                    logger.error(
+                        f"Embedding batch of {len(batch)} sections failed after "
+                        f"{self._max_retries + 1} attempts: {e}"
+                    )
+                    raise
+                delay = min(self._backoff_max, self._backoff_base * 2**attempt)
+                delay += random.uniform(0, self._backoff_base)
+                logger.warning(
+                    f"Embedding batch failed (attempt {attempt + 1}/{self._max_retries + 1}): "
+                    f"{e}. Retrying in {delay:.1f}s..."
+                )
+                time.sleep(delay)
+        return []  # Unreachable, keeps type checkers happy
+
+    # --- Properties ---
+    @property
+    def stream_batch_size(self) -> int:
+        """
+        Returns how many streamed sections to gather per `embed_documents` call so that
+        every concurrent batch slot is used.
+        """
+        return self._batch_size * self._max_concurrency
+
+    @property
+    def model(self) -> Any:
+        """
+        Returns the name of the wrapped embedding model.
+        """
+        return getattr(
+            self._embedding_model, "model", type(self._embedding_model).__name__
+        )
+
+    @property
+    def task_type(self) -> Optional[str]:
+        """
+        Returns the task type the wrapped model embeds documents for.
+        """
+        return getattr(self._embedding_model, "task_type", None)
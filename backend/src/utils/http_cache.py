@@ -0,0 +1,178 @@
+# -*- coding: utf-8 -*-
+"""
+File: http_cache.py
+
+This file defines the HttpCache class, a persistent cache of fetched web pages used by
+WebLoader. For every URL it stores the response body, the ETag and Last-Modified
+validators and the parsed Markdown document in a SQLite database, so later runs can
+send conditional requests and reuse the parsed document when the server answers
+304 Not Modified, or work entirely offline from the cache. Each document is stored with
+the fingerprint of the parser that produced it, so a document parsed with other
+settings is not reused.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from typing import Any, Dict, Optional
+
+from langchain_core.documents import Document
+
+from src.utils.logger_manager import logger
+
+
+class HttpCache:
+    """
+    Thread-safe SQLite store of page bodies, HTTP validators and parsed documents by URL.
+    """
+
+    def __init__(self, cache_path: str = "./cache/http.sqlite3") -> None:
+        """
+        Opens (or creates) the cache database.
+
+        Args:
+            cache_path (str): Path of the SQLite file storing the cached pages.
+        """
+        self._cache_path = cache_path
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(cache_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._connection = sqlite3.connect(cache_path, check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS pages ("
+            "url TEXT PRIMARY KEY, etag TEXT, last_modified TEXT, body BLOB NOT NULL, "
+            "document_content TEXT, document_metadata TEXT, fetched_at INTEGER NOT NULL, "
+            "parser TEXT)"
+        )
+        columns = {row[1] for row in self._connection.execute("PRAGMA table_info(pages)")}
+        if "parser" not in columns:
+            # Caches created before the parser fingerprint: their documents are parsed again
+            self._connection.execute("ALTER TABLE pages ADD COLUMN parser TEXT")
+        self._connection.commit()
+        entries = self._connection.execute("SELECT COUNT(*) FROM pages").fetchone()[0]
+
+        logger.info(f"HTTP cache ready at {cache_path} ({entries} cached pages).")
+
+    def get(self, url: str) -> Optional[Dict[str, Any]]:
+        """
+        Returns the cached entry of a URL.
+
+        Args:
+            url (str): The page URL.
+
+        Returns:
+            Optional[Dict[str, Any]]: The entry ('etag', 'last_modified', 'body',
+            'document', 'parser' and 'fetched_at'), or None if the URL was never cached.
+            'document' is None when the page was fetched but could not be parsed, and
+            'parser' is the fingerprint of the parser that produced it (None if unknown).
+        """
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT etag, last_modified, body, document_content, document_metadata, "
+                "fetched_at, parser FROM pages WHERE url = ?",
+                (url,),
+            ).fetchone()
+        if row is None:
+            return None
+
+        etag, last_modified, body, content, metadata, fetched_at, parser = row
+        document = (
+            Document(page_content=content, metadata=json.loads(metadata))
+            if content is not None
+            else None
+        )
+        return {
+            "etag": etag,
+            "last_modified": last_modified,
+            "body": zlib.decompress(body).decode("utf-8"),
+            "document": document,
+            "parser": parser,
+            "fetched_at": fetched_at,
+        }
+
+    def put(
+        self,
+        url: str,
+        body: str,
+        etag: Optional[str],
+        last_modified: Optional[str],
+        document: Optional[Document],
+        parser: Optional[str] = None,
+    ) -> None:
+        """
+        Stores (or replaces) the cached entry of a URL.
+
+        Args:
+            url (str): The page URL.
+            body (str): The response body.
+            etag (Optional[str]): The ETag header of the response.
+            last_modified (Optional[str]): The Last-Modified header of the response.
+            document (Optional[Document]): The parsed document, or None if parsing failed.
+            parser (Optional[str]): The fingerprint of the parser that produced `document`.
+        """
+        content = document.page_content if document is not None else None
+        metadata = json.dumps(document.metadata) if document is not None else None
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO pages (url, etag, last_modified, body, "
+                "document_content, document_metadata, fetched_at, parser) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    url,
+                    etag,
+                    last_modified,
+                    zlib.compress(body.encode("utf-8")),
+                    content,
+                    metadata,
+                    int(time.time()),
+                    parser,
+                ),
+            )
+            self._connection.commit()
+
+    def touch(self, url: str) -> None:
+        """
+        Records that a cached URL was revalidated (the server answered 304).
+
+        Args:
+            url (str): The page URL.
+        """
+        with self._lock:
+            self._connection.execute(
+                "UPDATE pages SET fetched_at = ? WHERE url = ?", (int(time.time()), url)
+            )
+            self._connection.commit()
+
+    def close(self) -> None:
+        """
+        Closes the database connection.
+        """
+        with self._lock:
+            self._connection.close()
+
+    @staticmethod
+    def conditional_headers(entry: Optional[Dict[str, Any]]) -> Dict[str, str]:
+        """
+        Builds the validator headers of a conditional request for a cached entry.
+
+        Args:
+            entry (Optional[Dict[str, Any]]): The cached entry, or None.
+
+        Returns:
+            Dict[str, str]: If-None-Match and/or If-Modified-Since headers (empty if none).
+        """
+        headers: Dict[str, str] = {}
+        if entry is None:
+            return headers
+        if entry["etag"]:
+            headers["If-None-Match"] = entry["etag"]
+        if entry["last_modified"]:
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
@@ -3,18 +3,33 @@
 File: in_memory_embedding_manager.py
 
 This file defines the InMemoryEmbeddingManager class, which is responsible for managing
-in-memory document embeddings using InMemoryVectorStore from langchain_core. The embeddings are
+in-memory document embeddings using the NumPy-backed NumpyVectorIndex. The embeddings are
 organized into two stores: one for local documents and one for web documents.
 The class provides functionality to query these stores for relevant embeddings.
 Suitable for prototyping, testing, or use cases where persistence is not required.
+Section texts and metadata are kept in compact ChunkStores unless disabled in the config.
+Updated sources are indexed into a copy of a store that replaces it in a single
+assignment, so searches never wait for (or see half of) an update.
+The async query methods await only the embedding model: the in-memory searches are short
+and do not wait on I/O, so they run directly on the event loop.
 """
 
+import threading
 from concurrent.futures import ThreadPoolExecutor
-from typing import List, Optional, Any
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence
 
-from langchain_core.vectorstores import InMemoryVectorStore
 from langchain_core.documents import Document
+
+from src.config.config_init import (
+    COMPACT_CHUNK_STORE,
+    EMBEDDING_PIPELINE_CONFIG,
+    QUERY_EMBEDDING_CACHE_CONFIG,
+)
+from src.utils.embedding_pipeline import EmbeddingPipeline
+from src.utils.index_bundle import IndexBundle
 from src.utils.logger_manager import logger
+from src.utils.numpy_vector_index import NumpyVectorIndex
+from src.utils.query_embedding_cache import QueryEmbeddingCache
 
 class InMemoryEmbeddingManager:
     """
@@ -25,8 +40,10 @@ class InMemoryEmbeddingManager:
     def __init__(
         self,
         embedding_model: Any,
-        local_documents: List[Document],
-        web_documents: List[Document],
+        local_documents: Iterable[Document],
+        web_documents: Iterable[Document],
+        local_store: Optional[NumpyVectorIndex] = None,
+        web_store: Optional[NumpyVectorIndex] = None,
     ) -> None:
         """
         Initializes the InMemoryEmbeddingManager, which manages embeddings for local and web
@@ -34,18 +51,54 @@ class InMemoryEmbeddingManager:
 
         Args:
             embedding_model (Embeddings): The model used to generate embeddings.
-            local_documents (List[Document]): Local documents to index.
-            web_documents (List[Document]): Web documents to index.
+            local_documents (Iterable[Document]): Local documents to index (a list, or a
+                stream of sections embedded in batches as they arrive).
+            web_documents (Iterable[Document]): Web documents to index.
+            local_store (Optional[NumpyVectorIndex]): Prebuilt local store (e.g. loaded from an
+                index bundle). If both stores are given, nothing is embedded.
+            web_store (Optional[NumpyVectorIndex]): Prebuilt web store.
         """
-        self.embedding_model = embedding_model
+        # Sections are embedded through the batched, concurrent pipeline stage
+        self.embedding_model = EmbeddingPipeline(
+            embedding_model, **EMBEDDING_PIPELINE_CONFIG
+        )
+        # Repeated questions are answered from memory instead of the embedding model
+        self.query_cache = QueryEmbeddingCache(**QUERY_EMBEDDING_CACHE_CONFIG)
         self.local_documents = local_documents
         self.web_documents = web_documents
 
-        self.local_store: Optional[InMemoryVectorStore] = None
-        self.web_store: Optional[InMemoryVectorStore] = None
+        self.local_store: Optional[NumpyVectorIndex] = local_store
+        self.web_store: Optional[NumpyVectorIndex] = web_store
+        # Serializes updates (searches do not take it)
+        self._update_lock = threading.Lock()
 
         # Initialize the in-memory stores
-        self._initialize_stores()
+        if local_store is None or web_store is None:
+            self._initialize_stores()
+
+    @classmethod
+    def from_bundle(
+        cls, embedding_model: Any, bundle_path: str
+    ) -> "InMemoryEmbeddingManager":
+        """
+        Creates the manager from a prebuilt index bundle, memory-mapping its embeddings
+        instead of embedding the documents.
+
+        Args:
+            embedding_model (Embeddings): The model the bundle was built with (used for queries).
+            bundle_path (str): Directory of the index bundle.
+
+        Returns:
+            InMemoryEmbeddingManager: The manager serving the bundle's collections.
+        """
+        local_store, web_store = IndexBundle(bundle_path).load(embedding_model)
+        return cls(
+            embedding_model=embedding_model,
+            local_documents=local_store.documents,
+            web_documents=web_store.documents,
+            local_store=local_store,
+            web_store=web_store,
+        )
 
     def _initialize_stores(self) -> None:
         """
@@ -55,20 +108,115 @@ class InMemoryEmbeddingManager:
         with ThreadPoolExecutor() as executor:
             futures = [
                 executor.submit(
-                    InMemoryVectorStore.from_documents,
+                    NumpyVectorIndex.from_documents,
                     self.local_documents,
                     self.embedding_model,
+                    self.embedding_model.stream_batch_size,
+                    COMPACT_CHUNK_STORE,
                 ),
                 executor.submit(
-                    InMemoryVectorStore.from_documents,
+                    NumpyVectorIndex.from_documents,
                     self.web_documents,
                     self.embedding_model,
+                    self.embedding_model.stream_batch_size,
+                    COMPACT_CHUNK_STORE,
                 ),
             ]
             results = [future.result() for future in futures]
             self.local_store, self.web_store = results
+        # Streamed (or compacted) sections only exist in the stores
+        self.local_documents = self.local_store.documents
+        self.web_documents = self.web_store.documents
         logger.info("In-memory vector stores initialized successfully.")
 
+    def update_local_sources(
+        self, sections_by_source: Mapping[str, Sequence[Document]]
+    ) -> Dict[str, int]:
+        """
+        Replaces the sections of some local files (e.g. after they changed on disk). Only
+        sections whose text changed are embedded, into a copy of the store that is
+        swapped in once it is complete.
+
+        Args:
+            sections_by_source (Mapping[str, Sequence[Document]]): The new sections of each
+                file name (an empty sequence removes the file).
+
+        Returns:
+            Dict[str, int]: The number of sections 'added', 'removed' and 'reused'.
+        """
+        with self._update_lock:
+            store = self.local_store or NumpyVectorIndex(self.embedding_model)
+            updated, stats = store.replace_sources(sections_by_source)
+            self.local_store, self.local_documents = updated, updated.documents
+        self._log_update("local", sections_by_source, stats)
+        return stats
+
+    def update_web_sources(
+        self, sections_by_source: Mapping[str, Sequence[Document]]
+    ) -> Dict[str, int]:
+        """
+        Replaces the sections of some web pages. See `update_local_sources`.
+
+        Args:
+            sections_by_source (Mapping[str, Sequence[Document]]): The new sections of each
+                URL (an empty sequence removes the page).
+
+        Returns:
+            Dict[str, int]: The number of sections 'added', 'removed' and 'reused'.
+        """
+        with self._update_lock:
+            store = self.web_store or NumpyVectorIndex(self.embedding_model)
+            updated, stats = store.replace_sources(sections_by_source)
+            self.web_store, self.web_documents = updated, updated.documents
+        self._log_update("web", sections_by_source, stats)
+        return stats
+
+    @staticmethod
+    def _log_update(
+        name: str,
+        sections_by_source: Mapping[str, Sequence[Document]],
+        stats: Dict[str, int],
+    ) -> None:
+        """Logs how many sections an update embedded, removed and reused."""
+        logger.info(
+            f"Updated {len(sections_by_source)} {name} sources in memory: "
+            f"{stats['added']} sections added, {stats['removed']} removed, "
+            f"{stats['reused']} reused."
+        )
+
+    def embed_query(self, query: str) -> List[float]:
+        """
+        Embeds a query once so it can be searched in several stores. Repeated queries
+        are served from the query embedding cache.
+
+        Args:
+            query (str): The query string to embed.
+
+        Returns:
+            List[float]: The embedding of the query.
+        """
+        embedding = self.query_cache.get_or_compute(
+            query, self.embedding_model.embed_query
+        )
+        logger.debug(f"Query embedding cache stats: {self.query_cache.stats}")
+        return embedding
+
+    async def aembed_query(self, query: str) -> List[float]:
+        """
+        Async variant of embed_query, awaiting the embedding model on a cache miss.
+
+        Args:
+            query (str): The query string to embed.
+
+        Returns:
+            List[float]: The embedding of the query.
+        """
+        embedding = await self.query_cache.aget_or_compute(
+            query, self.embedding_model.aembed_query
+        )
+        logger.debug(f"Query embedding cache stats: {self.query_cache.stats}")
+        return embedding
+
     def query_local_embeddings(self, query: str, k: int) -> List[Document]:
         """
         Queries the local in-memory store for relevant embeddings.
@@ -83,12 +231,7 @@ class InMemoryEmbeddingManager:
         logger.debug(f"Querying local in-memory embeddings for: {query} with k={k}")
         if not self.local_store:
             return []
-        results = self.local_store.similarity_search(query, k=k)
-        for result in results:
-            logger.debug(
-                f"Found local document: {result.page_content[:50]} and {getattr(result, 'id', None)}"
-            )
-        return results
+        return self.query_local_embeddings_by_vector(self.embed_query(query), k)
 
     def query_web_embeddings(self, query: str, k: int) -> List[Document]:
         """
@@ -104,16 +247,88 @@ class InMemoryEmbeddingManager:
         logger.debug(f"Querying web in-memory embeddings for: {query} with k={k}")
         if not self.web_store:
             return []
-        results = self.web_store.similarity_search(query, k=k)
+        return self.query_web_embeddings_by_vector(self.embed_query(query), k)
+
+    def query_local_embeddings_by_vector(
+        self, embedding: List[float], k: int
+    ) -> List[Document]:
+        """
+        Queries the local in-memory store with an already computed query embedding.
+
+        Args:
+            embedding (List[float]): The embedding of the query.
+            k (int): The number of most similar documents to return.
+
+        Returns:
+            List[Document]: A list of the most relevant documents from the local store.
+        """
+        store = self.local_store  # One snapshot, even if an update swaps the store
+        if not store:
+            return []
+        results = store.similarity_search_by_vector(embedding, k=k)
+        for result in results:
+            logger.debug(
+                f"Found local document: {result.page_content[:50]} and {getattr(result, 'id', None)}"
+            )
+        return results
+
+    def query_web_embeddings_by_vector(
+        self, embedding: List[float], k: int
+    ) -> List[Document]:
+        """
+        Queries the web in-memory store with an already computed query embedding.
+
+        Args:
+            embedding (List[float]): The embedding of the query.
+            k (int): The number of most similar documents to return.
+
+        Returns:
+            List[Document]: A list of the most relevant documents from the web store.
+        """
+        store = self.web_store  # One snapshot, even if an update swaps the store
+        if not store:
+            return []
+        results = store.similarity_search_by_vector(embedding, k=k)
         for result in results:
             logger.debug(
                 f"Found web document: {result.page_content[:50]} and {getattr(result, 'id', None)}"
             )
         return results
 
+    async def aquery_local_embeddings_by_vector(
+        self, embedding: List[float], k: int
+    ) -> List[Document]:
+        """
+        Async variant of query_local_embeddings_by_vector (the search runs on the event loop).
+
+        Args:
+            embedding (List[float]): The embedding of the query.
+            k (int): The number of most similar documents to return.
+
+        Returns:
+            List[Document]: A list of the most relevant documents from the local store.
+        """
+        return self.query_local_embeddings_by_vector(embedding, k)
+
+    async def aquery_web_embeddings_by_vector(
+        self, embedding: List[float], k: int
+    ) -> List[Document]:
+        """
+        Async variant of query_web_embeddings_by_vector (the search runs on the event loop).
+
+        Args:
+            embedding (List[float]): The embedding of the query.
+            k (int): The number of most similar documents to return.
+
+        Returns:
+            List[Document]: A list of the most relevant documents from the web store.
+        """
+        return self.query_web_embeddings_by_vector(embedding, k)
+
     def query_embeddings(self, query: str, k: int) -> List[Document]:
         """
         Queries both the local and web in-memory stores for relevant embeddings.
+        The query is embedded once and the same vector is used for both stores.
 
         Args:
             query (str): The query string to search for in both stores.
@@ -123,10 +338,11 @@ class InMemoryEmbeddingManager:
             List[Document]: A combined list of relevant documents from both stores.
         """
         logger.debug(f"Querying all in-memory stores for: {query} with k={k}")
+        embedding = self.embed_query(query)
         with ThreadPoolExecutor() as executor:
             futures = [
-                executor.submit(self.query_local_embeddings, query, k),
-                executor.submit(self.query_web_embeddings, query, k),
+                executor.submit(self.query_local_embeddings_by_vector, embedding, k),
+                executor.submit(self.query_web_embeddings_by_vector, embedding, k),
             ]
             results = [future.result() for future in futures]
         all_results = results[0] + results[1]
@@ -0,0 +1,252 @@
+# -*- coding: utf-8 -*-
+"""
+File: index_bundle.py
+
+This file defines the IndexBundle class, which writes and loads prebuilt index bundles.
+A bundle is a directory holding a manifest, the section texts and metadata of each
+collection, and one float32 matrix of pre-normalized embeddings per collection. The
+matrices are loaded read-only through memory mapping, so startup does not fetch,
+split or embed anything and several worker processes share the same physical pages.
+The sections are loaded into compact ChunkStores unless disabled in the config. The
+manifest also records the modification time and size of the local documents the bundle
+was built from, so the files changed since then can be reindexed when it is served.
+"""
+
+import json
+import os
+import shutil
+import time
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+
+from src.config.config_init import COMPACT_CHUNK_STORE
+from src.utils.chunk_store import ChunkStore
+from src.utils.logger_manager import logger
+from src.utils.numpy_vector_index import NumpyVectorIndex
+
+# Version of the on-disk layout, bumped on incompatible changes
+BUNDLE_FORMAT_VERSION = 1
+
+MANIFEST_FILE = "manifest.json"
+COLLECTIONS = ("local", "web")
+
+
+class IndexBundle:
+    """
+    Writes and loads memory-mapped index bundles for the local and web collections.
+    """
+
+    def __init__(self, bundle_path: str) -> None:
+        """
+        Initializes the bundle handler for a directory.
+
+        Args:
+            bundle_path (str): Directory where the bundle is written to or loaded from.
+        """
+        self._bundle_path = bundle_path
+
+    def exists(self) -> bool:
+        """
+        Checks whether a complete bundle is present (the manifest is written last).
+
+        Returns:
+            bool: True if the bundle manifest exists.
+        """
+        return os.path.isfile(os.path.join(self._bundle_path, MANIFEST_FILE))
+
+    def write(
+        self,
+        embedding_model: Embeddings,
+        local_sections: List[Document],
+        web_sections: List[Document],
+        local_files: Optional[Dict[str, Tuple[int, int]]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Embeds the sections and writes a new bundle, replacing any previous one atomically.
+
+        Args:
+            embedding_model (Embeddings): The model used to embed the sections.
+            local_sections (List[Document]): The sections of the local collection.
+            web_sections (List[Document]): The sections of the web collection.
+            local_files (Optional[Dict[str, Tuple[int, int]]]): The DirectoryLoader
+                snapshot of the local documents, taken before they were loaded.
+
+        Returns:
+            Dict[str, Any]: The manifest of the written bundle.
+        """
+        temporary_path = f"{self._bundle_path}.tmp"
+        shutil.rmtree(temporary_path, ignore_errors=True)
+        os.makedirs(temporary_path)
+
+        manifest: Dict[str, Any] = {
+            "format_version": BUNDLE_FORMAT_VERSION,
+            "embedding_model": self.embedding_fingerprint(embedding_model),
+            "created_at": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "collections": {},
+            "local_files": local_files,
+        }
+
+        for name, sections in zip(COLLECTIONS, (local_sections, web_sections)):
+            logger.info(f"Embedding {len(sections)} {name} sections for the bundle...")
+            vectors = embedding_model.embed_documents(
+                [section.page_content for section in sections]
+            )
+            index = NumpyVectorIndex(
+                embedding_model, list(sections), np.asarray(vectors, dtype=np.float32)
+            )
+            np.save(
+                os.path.join(temporary_path, f"{name}.embeddings.npy"), index.matrix
+            )
+            with open(
+                os.path.join(temporary_path, f"{name}.sections.json"),
+                "w",
+                encoding="utf-8",
+            ) as file:
+                json.dump(
+                    [
+                        {"text": section.page_content, "metadata": section.metadata}
+                        for section in sections
+                    ],
+                    file,
+                    ensure_ascii=False,
+                )
+            manifest["collections"][name] = {
+                "sections": len(sections),
+                "dimension": index.dimension,
+            }
+
+        # The manifest is written last: a bundle without it is incomplete
+        with open(
+            os.path.join(temporary_path, MANIFEST_FILE), "w", encoding="utf-8"
+        ) as file:
+            json.dump(manifest, file, indent=2)
+
+        previous_path = f"{self._bundle_path}.old"
+        shutil.rmtree(previous_path, ignore_errors=True)
+        if os.path.exists(self._bundle_path):
+            os.replace(self._bundle_path, previous_path)
+        os.replace(temporary_path, self._bundle_path)
+        shutil.rmtree(previous_path, ignore_errors=True)
+
+        logger.info(
+            f"Index bundle written to {self._bundle_path}: {manifest['collections']}"
+        )
+        return manifest
+
+    def load(
+        self, embedding_model: Embeddings, compact: bool = COMPACT_CHUNK_STORE
+    ) -> Tuple[NumpyVectorIndex, NumpyVectorIndex]:
+        """
+        Loads the bundle, memory-mapping the embedding matrices read-only.
+
+        Args:
+            embedding_model (Embeddings): The model used to embed queries. It must be the
+                model the bundle was built with.
+            compact (bool): If True, the sections are kept in ChunkStores instead of
+                one Document each.
+
+        Returns:
+            Tuple[NumpyVectorIndex, NumpyVectorIndex]: The local and web indexes.
+
+        Raises:
+            FileNotFoundError: If the bundle is missing or incomplete.
+            ValueError: If the bundle format or embedding model does not match.
+        """
+        manifest = self._read_manifest()
+        if manifest.get("format_version") != BUNDLE_FORMAT_VERSION:
+            raise ValueError(
+                f"Unsupported bundle format {manifest.get('format_version')} "
+                f"(expected {BUNDLE_FORMAT_VERSION})."
+            )
+        fingerprint = self.embedding_fingerprint(embedding_model)
+        if manifest.get("embedding_model") != fingerprint:
+            raise ValueError(
+                f"Bundle was built with '{manifest.get('embedding_model')}', "
+                f"but the current embedding model is '{fingerprint}'."
+            )
+
+        indexes: List[NumpyVectorIndex] = []
+        for name in COLLECTIONS:
+            if not manifest["collections"][name]["sections"]:
+                indexes.append(NumpyVectorIndex(embedding_model))
+                continue
+            matrix = np.load(
+                os.path.join(self._bundle_path, f"{name}.embeddings.npy"), mmap_mode="r"
+            )
+            with open(
+                os.path.join(self._bundle_path, f"{name}.sections.json"),
+                "r",
+                encoding="utf-8",
+            ) as file:
+                entries = json.load(file)
+            sections: Sequence[Document]
+            if compact:
+                store = ChunkStore()
+                for entry in entries:
+                    store.add(entry["text"], entry["metadata"])
+                sections = store
+            else:
+                sections = [
+                    Document(page_content=entry["text"], metadata=entry["metadata"])
+                    for entry in entries
+                ]
+            del entries
+            indexes.append(
+                NumpyVectorIndex(embedding_model, sections, matrix, normalized=True)
+            )
+
+        logger.info(
+            f"Index bundle loaded from {self._bundle_path} "
+            f"(built {manifest.get('created_at')}): "
+            f"{len(indexes[0])} local and {len(indexes[1])} web sections."
+        )
+        return indexes[0], indexes[1]
+
+    def local_files(self) -> Optional[Dict[str, Tuple[int, int]]]:
+        """
+        Returns the snapshot of the local documents the bundle was built from.
+
+        Returns:
+            Optional[Dict[str, Tuple[int, int]]]: (mtime in nanoseconds, size in bytes) per
+            file name, or None if the bundle did not record it.
+
+        Raises:
+            FileNotFoundError: If the bundle is missing or incomplete.
+        """
+        local_files = self._read_manifest().get("local_files")
+        if local_files is None:
+            return None
+        return {name: (state[0], state[1]) for name, state in local_files.items()}
+
+    def _read_manifest(self) -> Dict[str, Any]:
+        """
+        Reads the manifest of the bundle.
+
+        Raises:
+            FileNotFoundError: If the bundle is missing or incomplete.
+        """
+        if not self.exists():
+            raise FileNotFoundError(f"No index bundle found at {self._bundle_path}")
+
+        with open(
+            os.path.join(self._bundle_path, MANIFEST_FILE), "r", encoding="utf-8"
+        ) as file:
+            return json.load(file)
+
+    @staticmethod
+    def embedding_fingerprint(embedding_model: Embeddings) -> str:
+        """
+        Describes the embedding model so a bundle is only used with the model that built it.
+
+        Args:
+            embedding_model (Embeddings): The embedding model to describe.
+
+        Returns:
+            str: The model name and task type of the embedding model.
+        """
+        model = getattr(embedding_model, "model", type(embedding_model).__name__)
+        task_type = getattr(embedding_model, "task_type", None)
+        return f"{model}:{task_type}"
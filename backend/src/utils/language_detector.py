@@ -0,0 +1,187 @@
+# -*- coding: utf-8 -*-
+"""
+File: language_detector.py
+
+This file defines the LanguageDetector class, a small in-process language detector for
+user questions, with no model or dependency to load. Questions written in a non-Latin
+script are identified by the Unicode script of their letters. Questions written in the
+Latin script are scored against the function words (articles, pronouns, question words...)
+and the accented letters typical of each supported language; the confidence is the share
+of the evidence pointing to the detected language.
+"""
+
+import re
+import unicodedata
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# Function words of each Latin-script language. A word shared by several languages
+# counts for each of them in proportion.
+FUNCTION_WORDS: Dict[str, str] = {
+    "en": (
+        "the a an of to in on for with by from at about into as is are was were be been "
+        "being do does did doing have has had can could should would will shall may might "
+        "must i you he she it we they me my your its our their this that these those what "
+        "which who whom whose when where why how there here not no and or but if then than "
+        "so any some all each every other another use using used get make way between"
+    ),
+    "es": (
+        "el la los las un una unos unas de del al en con por para sin sobre entre es son "
+        "está están era fue ser estar hay tiene tienen puede pueden hacer cómo como qué que "
+        "cuál cuáles cuándo dónde por quién quiénes y o pero si no sí muy más menos también "
+        "yo tú él ella nosotros ellos mi mis su sus este esta estos estas ese esa lo se le "
+        "les me te nos cuando donde usar uso"
+    ),
+    "fr": (
+        "le la les un une des de du au aux en dans avec pour par sur sans entre est sont "
+        "était être avoir a ont peut peuvent faire comment que qu quel quelle quels quelles "
+        "quand où pourquoi qui et ou mais si ne pas plus moins aussi je tu il elle nous vous "
+        "ils elles mon ma mes son sa ses ce cette ces cet se utiliser"
+    ),
+    "de": (
+        "der die das den dem des ein eine einen einem einer und oder aber wenn dann nicht "
+        "kein keine mit von zu im in auf für aus bei nach über ist sind war waren sein haben "
+        "hat kann können wie was welche welcher welches wann wo warum wer ich du er sie es "
+        "wir ihr mein dein sich auch noch nur man verwenden"
+    ),
+    "it": (
+        "il lo la i gli le un uno una di del della dei delle da in con su per tra fra è sono "
+        "era essere avere ha hanno può possono fare come che quale quali quando dove perché "
+        "chi e o ma se non più meno anche io tu lui lei noi voi loro mio mia suo sua questo "
+        "questa quello quella si usare"
+    ),
+    "pt": (
+        "o a os as um uma uns umas de do da dos das em no na nos nas com por para sem sobre "
+        "entre é são está estão era foi ser estar há tem têm pode podem fazer como que qual "
+        "quais quando onde porque quem e ou mas se não sim muito mais menos também eu você "
+        "ele ela nós eles meu minha seu sua este esta isso isto usar"
+    ),
+    "nl": (
+        "de het een van in op met voor door aan bij naar over uit is zijn was waren hebben "
+        "heeft kan kunnen hoe wat welke wanneer waar waarom wie en of maar als niet geen "
+        "ook ik jij je hij zij wij jullie mijn dit dat deze die gebruiken"
+    ),
+}
+
+# Accented letters hinting at Latin-script languages other than English
+ACCENT_HINTS: Dict[str, Tuple[str, ...]] = {
+    "ñ¿¡": ("es",),
+    "ãõ": ("pt",),
+    "ß": ("de",),
+    "äöü": ("de",),
+    "ç": ("fr", "pt"),
+    "áíóú": ("es", "pt"),
+    "é": ("es", "fr", "pt", "it"),
+    "àèìòù": ("fr", "it", "pt"),
+    "âêîôû": ("fr", "pt"),
+    "ëï": ("fr", "nl"),
+}
+
+# Unicode character name prefixes of non-Latin scripts, by language
+SCRIPTS: Tuple[Tuple[str, str], ...] = (
+    ("HIRAGANA", "ja"),
+    ("KATAKANA", "ja"),
+    ("HANGUL", "ko"),
+    ("CJK", "zh"),
+    ("CYRILLIC", "ru"),
+    ("ARABIC", "ar"),
+    ("HEBREW", "he"),
+    ("GREEK", "el"),
+    ("DEVANAGARI", "hi"),
+    ("THAI", "th"),
+)
+
+
+class LanguageDetector:
+    """
+    Detects the language of short texts from their script, function words and accents.
+    """
+
+    _WORD_PATTERN = re.compile(r"[^\W\d_]+")
+
+    def __init__(self, default_language: str = "en") -> None:
+        """
+        Initializes the detector.
+
+        Args:
+            default_language (str): The language reported (with no confidence) when the
+                text gives no evidence, e.g. a list of identifiers.
+        """
+        self._default_language = default_language
+        # Languages of each function word
+        languages: Dict[str, List[str]] = {}
+        for language, words in FUNCTION_WORDS.items():
+            for word in set(words.split()):
+                languages.setdefault(word, []).append(language)
+        self._languages: Dict[str, Tuple[str, ...]] = {
+            word: tuple(word_languages) for word, word_languages in languages.items()
+        }
+
+    def detect(self, text: str) -> Tuple[str, float]:
+        """
+        Detects the language of a text.
+
+        Args:
+            text (str): The text, e.g. a user question.
+
+        Returns:
+            Tuple[str, float]: The language code (e.g. 'en', 'es', 'ja') and the
+            confidence, from 0.0 (no evidence) to 1.0.
+        """
+        text = unicodedata.normalize("NFC", text).lower()
+        letters = [c for c in text if c.isalpha()]
+        if not letters:
+            return self._default_language, 0.0
+
+        script, share = self._dominant_script(letters)
+        if script is not None:
+            return script, share
+
+        scores = self._score_latin(self._WORD_PATTERN.findall(text), text)
+        total = sum(scores.values())
+        if not total:
+            return self._default_language, 0.0
+        language = max(scores, key=scores.__getitem__)
+        return language, scores[language] / total
+
+    def _dominant_script(self, letters: Iterable[str]) -> Tuple[Optional[str], float]:
+        """
+        Returns the language of the non-Latin script holding most letters and its share of
+        the letters, or (None, 0.0) when most letters are Latin. Han characters next to
+        kana are Japanese.
+        """
+        counts: Dict[str, int] = {}
+        total = 0
+        for letter in letters:
+            total += 1
+            if letter.isascii():
+                continue
+            name = unicodedata.name(letter, "")
+            for prefix, language in SCRIPTS:
+                if name.startswith(prefix):
+                    counts[language] = counts.get(language, 0) + 1
+                    break
+        if "ja" in counts and "zh" in counts:
+            counts["ja"] += counts.pop("zh")
+        if not counts:
+            return None, 0.0
+        language = max(counts, key=counts.__getitem__)
+        share = counts[language] / total
+        return (language, share) if share >= 0.5 else (None, 0.0)
+
+    def _score_latin(self, words: Iterable[str], text: str) -> Dict[str, float]:
+        """
+        Scores the Latin-script languages: every function word and every accent hint adds
+        one point, split between the languages it belongs to.
+        """
+        scores: Dict[str, float] = {}
+        for word in words:
+            languages = self._languages.get(word)
+            if languages:
+                for language in languages:
+                    scores[language] = scores.get(language, 0.0) + 1 / len(languages)
+        for letters, languages in ACCENT_HINTS.items():
+            hits = sum(text.count(letter) for letter in letters)
+            for language in languages:
+                if hits:
+                    scores[language] = scores.get(language, 0.0) + hits / len(languages)
+        return scores
@@ -0,0 +1,103 @@
+# -*- coding: utf-8 -*-
+"""
+File: markdown_cleaner.py
+
+This file defines the MarkdownCleaner class, which reduces a Markdown section to plain
+words (no code blocks, images, links, tables, HTML tags or formatting symbols) for
+DocumentManager. The cleaning rules are applied in a fixed order with precompiled
+patterns; a rule is only run when the text contains the literal it needs to match, and
+rules that delete single characters or collapse whitespace are merged into one pass
+each, so a typical section is scanned a handful of times instead of once per rule.
+"""
+
+import re
+from typing import Pattern, Tuple
+
+# (triggers, pattern, replacement): a rule runs only if the text contains one of its
+# triggers, a literal that every match of the pattern includes
+CleaningRule = Tuple[Tuple[str, ...], Pattern[str], str]
+
+# Rules applied before the formatting characters are deleted, in this order
+_MARKUP_RULES: Tuple[CleaningRule, ...] = (
+    # Code blocks (```...``` including content)
+    (("```",), re.compile(r"```[\s\S]*?```"), ""),
+    # Images ![alt](url)
+    (("](",), re.compile(r"!\[[^\]]*\]\([^\)]*\)"), ""),
+    # Links [text](url)
+    (("](",), re.compile(r"\[[^\]]*\]\([^\)]*\)"), ""),
+    # Double-bracket links [[text]](url)
+    (("]](",), re.compile(r"\[\[[^\]]*\]\]\([^\)]*\)"), ""),
+    # Reference-style links [text][id]
+    (("][",), re.compile(r"\[[^\]]*\]\[[^\]]*\]"), ""),
+    # Footnote references [^1]
+    (("[^",), re.compile(r"\[\^\d+\]"), ""),
+    # Tables (lines starting/containing |)
+    (("|",), re.compile(r"^\s*\|.*\|\s*$", re.MULTILINE), ""),
+    # Table header separators (| --- |)
+    (("|",), re.compile(r"^\s*\|?\s*:?-+:?\s*\|.*$", re.MULTILINE), ""),
+    # HTML tags
+    (("<",), re.compile(r"<[^>]+>"), ""),
+    # Headers (#, ##, ###, etc.)
+    (("#",), re.compile(r"^#+\s*", re.MULTILINE), ""),
+)
+
+# Emphasis (*, _, **, __) and inline code/backticks: every such character is removed
+_FORMATTING_CHARACTERS = str.maketrans("", "", "*_`")
+
+# Rules applied after the formatting characters are deleted, in this order
+_LINE_RULES: Tuple[CleaningRule, ...] = (
+    # Blockquotes
+    ((">",), re.compile(r"^>\s*", re.MULTILINE), ""),
+    # Unordered list markers (-, + at line start; '*' is already gone)
+    (("-", "+"), re.compile(r"^(\s*[-*+])\s+", re.MULTILINE), ""),
+    # Ordered list markers (1. 2. etc.) are kept
+    # Horizontal rules
+    (("---",), re.compile(r"^---+$", re.MULTILINE), ""),
+    # Extra newlines
+    (("\n\n",), re.compile(r"\n{2,}"), "\n"),
+    # Extra tabs (collapsing newlines never joins two runs of tabs)
+    (("\t\t",), re.compile(r"\t{2,}"), "\t"),
+)
+
+
+class MarkdownCleaner:
+    """
+    Converts Markdown sections into plain words.
+    """
+
+    @staticmethod
+    def clean(text: str) -> str:
+        """
+        Removes code blocks, images, links, footnotes, tables, HTML tags, headers,
+        emphasis, backticks, blockquotes, list markers and horizontal rules from a
+        section, collapses repeated newlines and tabs and trims the result.
+
+        Args:
+            text (str): The Markdown section.
+
+        Returns:
+            str: The section as plain words.
+        """
+        text = MarkdownCleaner._apply(text, _MARKUP_RULES)
+        text = text.translate(_FORMATTING_CHARACTERS)
+        text = MarkdownCleaner._apply(text, _LINE_RULES)
+        return text.strip()
+
+    @staticmethod
+    def _apply(text: str, rules: Tuple[CleaningRule, ...]) -> str:
+        """
+        Applies cleaning rules in order, skipping those that cannot match.
+
+        Args:
+            text (str): The text to clean.
+            rules (Tuple[CleaningRule, ...]): The rules to apply.
+
+        Returns:
+            str: The cleaned text.
+        """
+        for triggers, pattern, replacement in rules:
+            for trigger in triggers:
+                if trigger in text:
+                    text = pattern.sub(replacement, text)
+                    break
+        return text
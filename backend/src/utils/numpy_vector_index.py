@@ -0,0 +1,353 @@
+# -*- coding: utf-8 -*-
+"""
+File: numpy_vector_index.py
+
+This file defines the NumpyVectorIndex class, a native in-memory vector index with the
+same query API as langchain's InMemoryVectorStore. All section embeddings live in one
+contiguous float32 matrix of pre-normalized rows, so a top-k cosine search (single or
+batched queries) is one matrix product followed by `argpartition`. The sections can be
+kept in a compact ChunkStore, in which case a Document is only built for the top-k rows.
+"""
+
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+
+from src.utils.chunk_store import ChunkStore
+from src.utils.embedding_pipeline import iter_batches
+from src.utils.logger_manager import logger
+from src.utils.section_hashing import section_source
+
+
+class NumpyVectorIndex:
+    """
+    In-memory cosine-similarity index backed by a contiguous float32 NumPy matrix.
+    """
+
+    def __init__(
+        self,
+        embedding: Embeddings,
+        documents: Optional[Sequence[Document]] = None,
+        matrix: Optional[np.ndarray] = None,
+        normalized: bool = False,
+    ) -> None:
+        """
+        Initializes the index from documents and their (not necessarily normalized) embeddings.
+
+        Args:
+            embedding (Embeddings): The model used to embed queries.
+            documents (Optional[Sequence[Document]]): The indexed documents, one per matrix
+                row (a list, or a ChunkStore building them on access).
+            matrix (Optional[np.ndarray]): The embeddings of the documents, shape (n, dim).
+            normalized (bool): If True, the matrix is a float32 matrix of unit-length rows and
+                is used as is (without copying), e.g. a read-only memory-mapped file.
+
+        Raises:
+            ValueError: If the number of documents and matrix rows differ.
+        """
+        self.embedding = embedding
+        self._documents: Sequence[Document] = documents if documents is not None else []
+        if matrix is None or not np.size(matrix):
+            self._matrix: np.ndarray = np.zeros((0, 0), dtype=np.float32)
+        elif normalized:
+            self._matrix = matrix
+        else:
+            self._matrix = self._normalize(np.asarray(matrix, dtype=np.float32))
+
+        if len(self._documents) != self._matrix.shape[0]:
+            raise ValueError(
+                f"Got {len(self._documents)} documents for {self._matrix.shape[0]} embeddings."
+            )
+
+    @classmethod
+    def from_documents(
+        cls,
+        documents: Iterable[Document],
+        embedding: Embeddings,
+        batch_size: int = 256,
+        compact: bool = False,
+    ) -> "NumpyVectorIndex":
+        """
+        Embeds the documents and builds an index over them. Documents may be streamed:
+        they are embedded in batches as they arrive.
+
+        Args:
+            documents (Iterable[Document]): The documents to index.
+            embedding (Embeddings): The model used to embed documents and queries.
+            batch_size (int): Number of streamed documents embedded per call.
+            compact (bool): If True, the documents are copied into a ChunkStore batch by
+                batch, so the Document objects are released once embedded.
+
+        Returns:
+            NumpyVectorIndex: The index over the documents.
+        """
+        indexed: "List[Document] | ChunkStore" = ChunkStore() if compact else []
+        blocks: List[np.ndarray] = []
+        for batch in iter_batches(documents, batch_size):
+            vectors = embedding.embed_documents([doc.page_content for doc in batch])
+            blocks.append(np.asarray(vectors, dtype=np.float32))
+            indexed.extend(batch)
+        if not indexed:
+            return cls(embedding)
+        index = cls(embedding, indexed, np.concatenate(blocks))
+        logger.debug(
+            f"Built NumPy index with {len(index)} rows of dimension {index.dimension}."
+        )
+        return index
+
+    def replace_sources(
+        self, sections_by_source: Mapping[str, Sequence[Document]]
+    ) -> Tuple["NumpyVectorIndex", Dict[str, int]]:
+        """
+        Returns a copy of the index where the rows of some sources (URL or file name) are
+        replaced by their new sections. Only sections whose text changed are embedded;
+        the others keep their vectors. The index itself is left untouched, so searches
+        running on it are not affected and the copy can be swapped in once it is complete.
+
+        Args:
+            sections_by_source (Mapping[str, Sequence[Document]]): The new sections of each
+                replaced source (an empty sequence removes the source).
+
+        Returns:
+            Tuple[NumpyVectorIndex, Dict[str, int]]: The updated index, and the number of
+            sections 'added' (embedded), 'removed' and 'reused'.
+        """
+        kept: List[int] = []
+        # Rows of the replaced sources, by (source, text), whose vectors can be reused
+        reusable: Dict[Tuple[str, str], List[int]] = {}
+        for row, source in enumerate(self._row_sources()):
+            if source not in sections_by_source:
+                kept.append(row)
+            else:
+                text = (
+                    self._documents.text(row)
+                    if isinstance(self._documents, ChunkStore)
+                    else self._documents[row].page_content
+                )
+                reusable.setdefault((source, text), []).append(row)
+        new_sections = [
+            section for sections in sections_by_source.values() for section in sections
+        ]
+
+        reused_rows: List[int] = []  # Row of the reused vector, -1 to embed
+        for section in new_sections:
+            rows = reusable.get((section_source(section), section.page_content))
+            reused_rows.append(rows.pop(0) if rows else -1)
+        to_embed = [i for i, row in enumerate(reused_rows) if row < 0]
+
+        documents: Sequence[Document]
+        if isinstance(self._documents, ChunkStore):
+            store = self._documents.take(kept)
+            store.extend(new_sections)
+            documents = store
+        else:
+            documents = [self._documents[row] for row in kept] + new_sections
+
+        blocks: List[np.ndarray] = []
+        if kept:
+            blocks.append(self._matrix[kept])
+        if new_sections:
+            embedded: Optional[np.ndarray] = None
+            if to_embed:
+                vectors = self.embedding.embed_documents(
+                    [new_sections[i].page_content for i in to_embed]
+                )
+                embedded = self._normalize(np.asarray(vectors, dtype=np.float32))
+            dimension = embedded.shape[1] if embedded is not None else self.dimension
+            block = np.empty((len(new_sections), dimension), dtype=np.float32)
+            reused = [(i, row) for i, row in enumerate(reused_rows) if row >= 0]
+            if reused:
+                positions, rows = zip(*reused)
+                block[list(positions)] = self._matrix[list(rows)]
+            if embedded is not None:
+                block[to_embed] = embedded
+            blocks.append(block)
+
+        reused_count = len(new_sections) - len(to_embed)
+        stats = {
+            "added": len(to_embed),
+            "removed": len(self) - len(kept) - reused_count,
+            "reused": reused_count,
+        }
+        if not blocks:
+            return NumpyVectorIndex(self.embedding), stats
+        index = NumpyVectorIndex(
+            self.embedding, documents, np.concatenate(blocks), normalized=True
+        )
+        return index, stats
+
+    def _row_sources(self) -> List[str]:
+        """
+        Returns the source (URL or file name, or an empty string) of every row.
+        """
+        if isinstance(self._documents, ChunkStore):
+            return [self._documents.source(row) or "" for row in range(len(self))]
+        return [section_source(document) for document in self._documents]
+
+    # --- Query API ---
+    def similarity_search(self, query: str, k: int = 4) -> List[Document]:
+        """
+        Returns the documents most similar to a query string.
+
+        Args:
+            query (str): The query text.
+            k (int): The number of documents to return.
+
+        Returns:
+            List[Document]: The most similar documents, best first.
+        """
+        return self.similarity_search_by_vector(self.embedding.embed_query(query), k=k)
+
+    def similarity_search_by_vector(
+        self, embedding: Sequence[float], k: int = 4
+    ) -> List[Document]:
+        """
+        Returns the documents most similar to a query embedding.
+
+        Args:
+            embedding (Sequence[float]): The query embedding.
+            k (int): The number of documents to return.
+
+        Returns:
+            List[Document]: The most similar documents, best first.
+        """
+        return [
+            doc for doc, _ in self.similarity_search_with_score_by_vector(embedding, k)
+        ]
+
+    def similarity_search_with_score_by_vector(
+        self, embedding: Sequence[float], k: int = 4
+    ) -> List[Tuple[Document, float]]:
+        """
+        Returns the documents most similar to a query embedding with their cosine similarity.
+
+        Args:
+            embedding (Sequence[float]): The query embedding.
+            k (int): The number of documents to return.
+
+        Returns:
+            List[Tuple[Document, float]]: (document, score) pairs, best first.
+        """
+        return self.similarity_search_with_score_by_vectors([embedding], k)[0]
+
+    def similarity_search_by_vectors(
+        self, embeddings: Sequence[Sequence[float]], k: int = 4
+    ) -> List[List[Document]]:
+        """
+        Answers a batch of query embeddings with a single matrix product.
+
+        Args:
+            embeddings (Sequence[Sequence[float]]): The query embeddings.
+            k (int): The number of documents to return per query.
+
+        Returns:
+            List[List[Document]]: The most similar documents for each query, best first.
+        """
+        return [
+            [doc for doc, _ in results]
+            for results in self.similarity_search_with_score_by_vectors(embeddings, k)
+        ]
+
+    def similarity_search_with_score_by_vectors(
+        self, embeddings: Sequence[Sequence[float]], k: int = 4
+    ) -> List[List[Tuple[Document, float]]]:
+        """
+        Answers a batch of query embeddings with their cosine similarities.
+
+        Args:
+            embeddings (Sequence[Sequence[float]]): The query embeddings.
+            k (int): The number of documents to return per query.
+
+        Returns:
+            List[List[Tuple[Document, float]]]: (document, score) pairs for each query, best first.
+        """
+        if not len(embeddings):
+            return []
+        if len(self._documents) == 0 or k <= 0:
+            return [[] for _ in embeddings]
+
+        queries = self._normalize(np.asarray(embeddings, dtype=np.float32))
+        scores = queries @ self._matrix.T  # (queries, rows) cosine similarities
+        top_indices = self._top_k(scores, k)
+
+        return [
+            [
+                (self._documents[index], float(scores[row, index]))
+                for index in top_indices[row]
+            ]
+            for row in range(scores.shape[0])
+        ]
+
+    # --- Helpers ---
+    @staticmethod
+    def _top_k(scores: np.ndarray, k: int) -> np.ndarray:
+        """
+        Returns the column indices of the k highest scores of every row, best first.
+        Equal scores are ordered by column, so ties (also at the k-th place) always keep
+        the first indexed documents.
+
+        Args:
+            scores (np.ndarray): Similarity scores, shape (queries, rows).
+            k (int): The number of indices to keep per row.
+
+        Returns:
+            np.ndarray: Indices of shape (queries, min(k, rows)).
+        """
+        k = min(k, scores.shape[1])
+        if k < scores.shape[1]:
+            candidates = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+            # argpartition picks any of the columns tied with the k-th score
+            kth = np.take_along_axis(scores, candidates, axis=1).min(axis=1)
+            for row in np.flatnonzero((scores >= kth[:, None]).sum(axis=1) > k):
+                above = np.flatnonzero(scores[row] > kth[row])
+                tied = np.flatnonzero(scores[row] == kth[row])
+                candidates[row] = np.concatenate([above, tied[: k - len(above)]])
+            candidates = np.sort(candidates, axis=1)
+        else:
+            candidates = np.broadcast_to(np.arange(scores.shape[1]), scores.shape)
+        candidate_scores = np.take_along_axis(scores, candidates, axis=1)
+        order = np.argsort(-candidate_scores, axis=1, kind="stable")
+        return np.take_along_axis(candidates, order, axis=1)
+
+    @staticmethod
+    def _normalize(matrix: np.ndarray) -> np.ndarray:
+        """
+        Scales every row to unit length (zero rows are left untouched).
+
+        Args:
+            matrix (np.ndarray): The vectors to normalize, shape (n, dim).
+
+        Returns:
+            np.ndarray: A contiguous float32 matrix of unit-length rows.
+        """
+        matrix = np.atleast_2d(matrix).astype(np.float32, copy=False)
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return np.ascontiguousarray(matrix / norms, dtype=np.float32)
+
+    # --- Properties ---
+    @property
+    def documents(self) -> Sequence[Document]:
+        """
+        Returns the indexed documents, in row order.
+        """
+        return self._documents
+
+    @property
+    def matrix(self) -> np.ndarray:
+        """
+        Returns the matrix of normalized embeddings, one row per document.
+        """
+        return self._matrix
+
+    @property
+    def dimension(self) -> int:
+        """
+        Returns the dimension of the indexed embeddings.
+        """
+        return int(self._matrix.shape[1]) if self._matrix.size else 0
+
+    def __len__(self) -> int:
+        return len(self._documents)
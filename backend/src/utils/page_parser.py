@@ -0,0 +1,320 @@
+# -*- coding: utf-8 -*-
+"""
+File: page_parser.py
+
+This file contains the PageParser class, responsible for turning the HTML of a
+documentation page into a Markdown document: it parses the page with BeautifulSoup,
+extracts the article and its metadata and converts the article with a Markdownify
+transformer that is created once and reused for every page. It also defines the
+functions run by WebLoader's parser processes, each of which keeps one long-lived
+PageParser.
+
+The parser backend is pluggable:
+- "html.parser": builds a tree of the whole page with Python's built-in parser.
+- "lxml": builds a tree of the whole page with lxml (C implementation, optional dependency).
+- "article": scans the raw HTML for the `article.bd-article` element and the `<title>`
+  and builds a tree of just those, with the built-in parser. Pages where the scan does
+  not find them are parsed whole.
+"""
+
+import json
+import re
+from typing import Dict, Optional, Sequence, Tuple
+
+from bs4 import BeautifulSoup, FeatureNotFound
+
+from langchain_core.documents import Document
+from langchain_community.document_transformers.markdownify import MarkdownifyTransformer
+
+from src.config.config_init import MARKDOWNIFY_CONFIG
+from src.utils.logger_manager import logger
+
+
+PARSER_BACKENDS = ("html.parser", "lxml", "article")
+
+# Version of the documents produced by the parser: bump it whenever a change to this file
+# changes the Markdown of a page, so documents cached by an older version are parsed again
+PARSER_VERSION = 1
+
+_ARTICLE_TAG_PATTERN = re.compile(r"<(/?)article\b[^>]*>", re.IGNORECASE)
+_CLASS_ATTRIBUTE_PATTERN = re.compile(
+    r"""\sclass\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s"'=<>`]+))""", re.IGNORECASE
+)
+_TITLE_PATTERN = re.compile(r"<title\b[^>]*>.*?</title\s*>", re.IGNORECASE | re.DOTALL)
+
+
+class PageParser:
+    """
+    Converts the HTML of documentation pages into Markdown documents.
+    """
+
+    def __init__(self, backend: str = "html.parser") -> None:
+        """
+        Initializes the parser and its Markdownify transformer.
+
+        Args:
+            backend (str): The parser backend, one of PARSER_BACKENDS. "lxml" falls back
+                to "html.parser" when lxml is not installed.
+
+        Raises:
+            ValueError: If the backend is unknown.
+        """
+        if backend not in PARSER_BACKENDS:
+            raise ValueError(
+                f"Unknown parser backend '{backend}' (expected one of {PARSER_BACKENDS})."
+            )
+        if backend == "lxml" and not self._lxml_available():
+            logger.warning("lxml is not installed, using the html.parser backend.")
+            backend = "html.parser"
+
+        self._backend = backend
+        self._tree_builder = "lxml" if backend == "lxml" else "html.parser"
+        self._transformer: MarkdownifyTransformer = MarkdownifyTransformer(
+            **MARKDOWNIFY_CONFIG
+        )
+
+    @property
+    def fingerprint(self) -> str:
+        """
+        Returns a key of everything that shapes the parsed documents: the backend, the
+        Markdownify settings and PARSER_VERSION. Documents parsed under another
+        fingerprint may differ from what this parser produces.
+        """
+        return json.dumps(
+            {
+                "backend": self._backend,
+                "markdownify": MARKDOWNIFY_CONFIG,
+                "version": PARSER_VERSION,
+            },
+            sort_keys=True,
+            default=str,
+        )
+
+    def parse(self, html_content: str, url: str) -> Optional[Document]:
+        """
+        Parses the HTML of a page, extracts its article and converts it into a Markdown document.
+
+        Args:
+            html_content (str): The HTML content of the page.
+            url (str): The URL of the page.
+
+        Returns:
+            Optional[Document]: A Document object if successful, None otherwise.
+        """
+        if self._backend == "article":
+            html_content = self._extract_article_fast(html_content) or html_content
+
+        soup: Optional[BeautifulSoup] = self._parse_html(html_content)
+        if not soup:
+            logger.error(f"No soup for: {url}")
+            return None
+
+        article_html: Optional[str] = self._extract_article(soup)
+        if not article_html:
+            logger.error(f"No article found for: {url}")
+            return None
+
+        markdown_content: str = self._convert_to_markdown(article_html)
+        metadata: Dict[str, str] = self._extract_metadata(soup, url)
+        metadata["html_content_length"] = str(len(markdown_content))
+
+        logger.debug(f"Document created for: {url}")
+        return self._create_document(markdown_content, metadata)
+
+    def _parse_html(self, html: str) -> Optional[BeautifulSoup]:
+        """
+        Parses the HTML content and returns a BeautifulSoup object.
+
+        Args:
+            html (str): The HTML content of the page.
+
+        Returns:
+            Optional[BeautifulSoup]: A BeautifulSoup object if parsing is successful, None otherwise.
+        """
+        try:
+            return BeautifulSoup(html, self._tree_builder) if html else None
+        except Exception as e:
+            logger.error(f"Error parsing HTML: {e}")
+            return None
+
+    @staticmethod
+    def _extract_article_fast(html: str) -> Optional[str]:
+        """
+        Cuts the `<title>` and the first `article.bd-article` element (with everything
+        nested in it) out of the raw HTML, without building a tree of the page.
+
+        Args:
+            html (str): The HTML content of the page.
+
+        Returns:
+            Optional[str]: A small HTML snippet holding the title (if any) and the
+            article, or None if the article could not be located.
+        """
+        span = PageParser._find_article_span(html)
+        if span is None:
+            return None
+        title = _TITLE_PATTERN.search(html)
+        return (title.group(0) if title else "") + html[span[0] : span[1]]
+
+    @staticmethod
+    def _find_article_span(html: str) -> Optional[Tuple[int, int]]:
+        """
+        Locates the first `<article>` whose class list contains `bd-article` and its
+        matching closing tag (nested articles are balanced).
+
+        Args:
+            html (str): The HTML content of the page.
+
+        Returns:
+            Optional[Tuple[int, int]]: Start and end offsets of the element, or None.
+        """
+        start: Optional[int] = None
+        depth = 0
+        for match in _ARTICLE_TAG_PATTERN.finditer(html):
+            closing = match.group(1) == "/"
+            if start is None:
+                if not closing and PageParser._has_article_class(match.group(0)):
+                    start, depth = match.start(), 1
+                continue
+            depth += -1 if closing else 1
+            if depth == 0:
+                return start, match.end()
+        return None
+
+    @staticmethod
+    def _has_article_class(tag: str) -> bool:
+        """
+        Checks whether an opening tag has `bd-article` in its class attribute.
+
+        Args:
+            tag (str): The opening tag, e.g. '<article class="bd-article" role="main">'.
+
+        Returns:
+            bool: True if the class list contains `bd-article`.
+        """
+        match = _CLASS_ATTRIBUTE_PATTERN.search(tag)
+        if not match:
+            return False
+        classes = next(group for group in match.groups() if group is not None)
+        return "bd-article" in classes.split()
+
+    @staticmethod
+    def _lxml_available() -> bool:
+        """
+        Checks whether BeautifulSoup can use the lxml tree builder.
+        """
+        try:
+            BeautifulSoup("", "lxml")
+            return True
+        except FeatureNotFound:
+            return False
+
+    def _extract_article(self, soup: BeautifulSoup) -> Optional[str]:
+        """
+        Extracts the main article content from the parsed HTML.
+
+        Args:
+            soup (BeautifulSoup): A BeautifulSoup object containing the parsed HTML.
+
+        Returns:
+            Optional[str]: The HTML content of the article section if found, None otherwise.
+        """
+        try:
+            article_section: Optional[BeautifulSoup] = soup.find(
+                "article", class_="bd-article"
+            )  # type: ignore
+            if article_section:
+                gallery_examples_section: Optional[BeautifulSoup] = article_section.find("section", id="gallery-examples")  # type: ignore
+                if gallery_examples_section:
+                    gallery_examples_section.decompose()  # Remove the gallery section
+                return str(article_section)
+            return None
+        except Exception as e:
+            logger.error(f"Error extracting article: {e}")
+            return None
+
+    def _extract_metadata(self, soup: BeautifulSoup, url: str) -> Dict[str, str]:
+        """
+        Extracts metadata from the HTML, such as the page title.
+
+        Args:
+            soup (BeautifulSoup): A BeautifulSoup object containing the parsed HTML.
+            url (str): The URL of the web page.
+
+        Returns:
+            Dict[str, str]: A dictionary containing metadata, including the URL and title of the page.
+        """
+        try:
+            title: str = soup.find("title").text if soup.find("title") else "No title"  # type: ignore
+            return {"url": url, "title": title}
+        except Exception as e:
+            logger.error(f"Error extracting metadata: {e}")
+            return {"url": url, "title": "No title"}
+
+    def _convert_to_markdown(self, html_content: str) -> str:
+        """
+        Converts the HTML content to Markdown using the parser's Markdownify transformer.
+
+        Args:
+            html_content (str): The HTML content to be converted to Markdown.
+
+        Returns:
+            str: The content converted to Markdown.
+        """
+        try:
+            html_document: Document = Document(page_content=html_content)
+            markdown_content: Sequence[Document] = self._transformer.transform_documents(
+                [html_document]
+            )
+            return str(markdown_content[0])
+        except Exception as e:
+            logger.error(f"Error converting to Markdown: {e}")
+            return ""
+
+    def _create_document(self, html_content: str, metadata: Dict[str, str]) -> Document:
+        """
+        Creates a Document object from the HTML content and metadata.
+
+        Args:
+            html_content (str): The content of the document.
+            metadata (Dict[str, str]): Metadata related to the document.
+
+        Returns:
+            Document: The created Document object.
+        """
+        try:
+            return Document(page_content=html_content, metadata=metadata)
+        except Exception as e:
+            logger.error(f"Error creating document: {e}")
+            return Document(page_content="", metadata=metadata)
+
+
+# --- Parser process workers ---
+_worker_parser: Optional[PageParser] = None
+
+
+def init_parser_worker(backend: str = "html.parser") -> None:
+    """
+    Creates the PageParser of a parser process (runs once when the process starts).
+
+    Args:
+        backend (str): The parser backend, one of PARSER_BACKENDS.
+    """
+    global _worker_parser
+    _worker_parser = PageParser(backend)
+
+
+def parse_in_worker(html_content: str, url: str) -> Optional[Document]:
+    """
+    Parses a page with the long-lived PageParser of the current parser process.
+
+    Args:
+        html_content (str): The HTML content of the page.
+        url (str): The URL of the page.
+
+    Returns:
+        Optional[Document]: A Document object if successful, None otherwise.
+    """
+    if _worker_parser is None:
+        init_parser_worker()
+    return _worker_parser.parse(html_content, url)  # type: ignore
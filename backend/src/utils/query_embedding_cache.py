@@ -0,0 +1,179 @@
+# -*- coding: utf-8 -*-
+"""
+File: query_embedding_cache.py
+
+This file defines the QueryEmbeddingCache class, an in-process cache placed in front
+of the embedding model for user questions. Questions are normalized before lookup,
+entries are bounded with LRU eviction and an optional time-to-live, and hit-rate
+metrics are exposed so repeated questions skip the remote embedding round-trip.
+"""
+
+import re
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from src.utils.logger_manager import logger
+
+
+class QueryEmbeddingCache:
+    """
+    Thread-safe LRU cache of query embeddings with an optional time-to-live.
+    """
+
+    _WHITESPACE_PATTERN = re.compile(r"\s+")
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        ttl_seconds: Optional[float] = 3600.0,
+        lowercase: bool = False,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """
+        Initializes an empty query embedding cache.
+
+        Args:
+            max_entries (int): Maximum number of cached queries; the least recently used is evicted.
+            ttl_seconds (Optional[float]): Seconds an entry stays valid. None keeps entries until evicted.
+            lowercase (bool): If True, queries differing only in case share the same entry.
+            clock (Callable[[], float]): Returns the current time in seconds for the TTL.
+        """
+        self._max_entries = max_entries
+        self._ttl_seconds = ttl_seconds
+        self._lowercase = lowercase
+        self._clock = clock
+        self._entries: "OrderedDict[str, Tuple[float, List[float]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+
+    def normalize(self, query: str) -> str:
+        """
+        Normalizes a query so trivially different spellings share the same entry.
+
+        Args:
+            query (str): The raw query text.
+
+        Returns:
+            str: The query in NFKC form with collapsed, trimmed whitespace.
+        """
+        text = unicodedata.normalize("NFKC", query)
+        text = self._WHITESPACE_PATTERN.sub(" ", text).strip()
+        return text.lower() if self._lowercase else text
+
+    def get_or_compute(
+        self, query: str, compute: Callable[[str], List[float]]
+    ) -> List[float]:
+        """
+        Returns the cached embedding of a query, computing and storing it on a miss.
+
+        Args:
+            query (str): The query text.
+            compute (Callable[[str], List[float]]): Embeds the normalized query on a miss.
+
+        Returns:
+            List[float]: The embedding of the query.
+        """
+        key = self.normalize(query)
+        cached = self.get(key)
+        if cached is not None:
+            return cached
+
+        embedding = compute(key)
+        self.put(key, embedding)
+        return embedding
+
+    async def aget_or_compute(
+        self, query: str, compute: Callable[[str], Awaitable[List[float]]]
+    ) -> List[float]:
+        """
+        Async variant of get_or_compute: awaits the embedding of the query on a miss.
+
+        Args:
+            query (str): The query text.
+            compute (Callable[[str], Awaitable[List[float]]]): Embeds the normalized query on a miss.
+
+        Returns:
+            List[float]: The embedding of the query.
+        """
+        key = self.normalize(query)
+        cached = self.get(key)
+        if cached is not None:
+            return cached
+
+        embedding = await compute(key)
+        self.put(key, embedding)
+        return embedding
+
+    def get(self, key: str) -> Optional[List[float]]:
+        """
+        Looks up a normalized query, dropping it if it has expired.
+
+        Args:
+            key (str): The normalized query text.
+
+        Returns:
+            Optional[List[float]]: The cached embedding, or None on a miss.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._misses += 1
+                return None
+
+            stored_at, embedding = entry
+            age = self._clock() - stored_at
+            if self._ttl_seconds is not None and age > self._ttl_seconds:
+                del self._entries[key]
+                self._expirations += 1
+                self._misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return embedding
+
+    def put(self, key: str, embedding: List[float]) -> None:
+        """
+        Stores the embedding of a normalized query, evicting the least recently used entry if full.
+
+        Args:
+            key (str): The normalized query text.
+            embedding (List[float]): The embedding to cache.
+        """
+        with self._lock:
+            self._entries[key] = (self._clock(), embedding)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+    def clear(self) -> None:
+        """
+        Removes every cached entry (the counters are kept).
+        """
+        with self._lock:
+            self._entries.clear()
+        logger.debug("Query embedding cache cleared.")
+
+    @property
+    def stats(self) -> Dict[str, Any]:
+        """
+        Returns the cache metrics: hits, misses, hit rate, evictions, expirations and size.
+        """
+        with self._lock:
+            total = self._hits + self._misses
+            return {
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": self._hits / total if total else 0.0,
+                "evictions": self._evictions,
+                "expirations": self._expirations,
+                "entries": len(self._entries),
+            }
@@ -0,0 +1,192 @@
+# -*- coding: utf-8 -*-
+"""
+File: question_rewrite_cache.py
+
+This file defines the QuestionRewriteCache class, a persistent cache of the questions
+rewritten by the translate/optimize LLM call: for each question, the improved (English)
+question and the detected language. Entries are stored in a SQLite database keyed by the
+normalized question and a fingerprint of the rewrite prompt and model, so a repeated
+question skips the LLM round-trip, also after a restart, and changing the prompt or the
+model starts from an empty cache. The cache is bounded with LRU eviction and keeps
+hit/miss counters.
+"""
+
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from typing import Any, Dict, Optional, Tuple
+
+from src.utils.logger_manager import logger
+
+
+class QuestionRewriteCache:
+    """
+    Thread-safe SQLite cache of (question -> improved question, language) rewrites.
+    """
+
+    _WHITESPACE_PATTERN = re.compile(r"\s+")
+
+    def __init__(
+        self,
+        cache_path: str = "./cache/question_rewrites.sqlite3",
+        max_entries: int = 10_000,
+        fingerprint: str = "",
+    ) -> None:
+        """
+        Initializes the cache and opens (or creates) the SQLite database.
+
+        Args:
+            cache_path (str): Path of the SQLite file storing the rewrites.
+            max_entries (int): Maximum number of rewrites kept; least recently used ones are evicted.
+            fingerprint (str): Identifies the rewrite prompt and model; entries written
+                with another fingerprint are ignored.
+        """
+        self._cache_path = cache_path
+        self._max_entries = max_entries
+        self._fingerprint = fingerprint
+        self._lock = threading.Lock()
+
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+        directory = os.path.dirname(cache_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._connection = sqlite3.connect(cache_path, check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS rewrites ("
+            "key TEXT PRIMARY KEY, question TEXT NOT NULL, language TEXT NOT NULL, "
+            "last_access INTEGER NOT NULL)"
+        )
+        self._connection.execute(
+            "CREATE INDEX IF NOT EXISTS rewrites_last_access ON rewrites (last_access)"
+        )
+        self._connection.commit()
+        self._entries: int = self._connection.execute(
+            "SELECT COUNT(*) FROM rewrites"
+        ).fetchone()[0]
+
+        logger.info(
+            f"Question rewrite cache ready at {cache_path} ({self._entries} cached rewrites)."
+        )
+
+    def normalize(self, question: str) -> str:
+        """
+        Normalizes a question so trivially different spellings share the same entry.
+
+        Args:
+            question (str): The raw question text.
+
+        Returns:
+            str: The question in NFKC form with collapsed, trimmed whitespace.
+        """
+        text = unicodedata.normalize("NFKC", question)
+        return self._WHITESPACE_PATTERN.sub(" ", text).strip()
+
+    def get(self, question: str) -> Optional[Tuple[str, str]]:
+        """
+        Returns the cached rewrite of a question and refreshes its LRU position.
+
+        Args:
+            question (str): The user's question.
+
+        Returns:
+            Optional[Tuple[str, str]]: The improved question and its language, or None.
+        """
+        key = self._key(question)
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT question, language FROM rewrites WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self._misses += 1
+                return None
+            self._hits += 1
+            self._connection.execute(
+                "UPDATE rewrites SET last_access = ? WHERE key = ?", (time.time_ns(), key)
+            )
+            self._connection.commit()
+        return row[0], row[1]
+
+    def put(self, question: str, improved_question: str, language: str) -> None:
+        """
+        Stores the rewrite of a question, evicting the least recently used entries above
+        the size limit.
+
+        Args:
+            question (str): The user's question.
+            improved_question (str): The improved (English) question.
+            language (str): The language of the user's question.
+        """
+        key = self._key(question)
+        now = time.time_ns()
+        with self._lock:
+            # Only a new key counts as an entry; a key stored meanwhile is updated instead
+            inserted = self._connection.execute(
+                "INSERT OR IGNORE INTO rewrites (key, question, language, last_access) "
+                "VALUES (?, ?, ?, ?)",
+                (key, improved_question, language, now),
+            ).rowcount
+            if not inserted:
+                self._connection.execute(
+                    "UPDATE rewrites SET question = ?, language = ?, last_access = ? WHERE key = ?",
+                    (improved_question, language, now, key),
+                )
+            self._entries += inserted
+            if self._entries > self._max_entries:
+                self._entries = self._connection.execute(
+                    "SELECT COUNT(*) FROM rewrites"
+                ).fetchone()[0]
+                overflow = self._entries - self._max_entries
+                if overflow > 0:
+                    self._connection.execute(
+                        "DELETE FROM rewrites WHERE key IN ("
+                        "SELECT key FROM rewrites ORDER BY last_access ASC LIMIT ?)",
+                        (overflow,),
+                    )
+                    self._entries -= overflow
+                    self._evictions += overflow
+                    logger.debug(f"Evicted {overflow} question rewrites from the cache.")
+            self._connection.commit()
+
+    def _key(self, question: str) -> str:
+        """
+        Builds the cache key of a question for the current prompt and model.
+
+        Args:
+            question (str): The user's question.
+
+        Returns:
+            str: The cache key.
+        """
+        text = f"{self._fingerprint}|{self.normalize(question)}"
+        return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+    def close(self) -> None:
+        """
+        Closes the underlying SQLite connection.
+        """
+        with self._lock:
+            self._connection.close()
+
+    @property
+    def stats(self) -> Dict[str, Any]:
+        """
+        Returns the cache counters: hits, misses, hit rate, evictions and stored entries.
+        """
+        with self._lock:
+            total = self._hits + self._misses
+            return {
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": self._hits / total if total else 0.0,
+                "evictions": self._evictions,
+                "entries": self._entries,
+            }
@@ -0,0 +1,247 @@
+# -*- coding: utf-8 -*-
+"""
+File: question_rewriter.py
+
+This file defines the QuestionRewriter class, which turns a user question into the JSON
+rewrite ({"language": ..., "question": ...}) expected by the chatbot graph, taking the
+cheapest path that gives the same result:
+- fast path: short questions detected as English by the local LanguageDetector are used
+  as they are (the LLM would only return them unchanged);
+- cache: questions rewritten before are served from the persistent QuestionRewriteCache;
+- llm: the translate/optimize LLM call, whose valid rewrites are stored in the cache.
+It counts how often each path is taken and the languages detected. Questions can be
+rewritten synchronously (rewrite) or on an event loop (arewrite); the fast path and the
+cache are local and quick, so only the LLM call is awaited.
+"""
+
+import asyncio
+import json
+import re
+import threading
+import time
+from typing import Any, Awaitable, Callable, Dict, Iterable, Optional, Tuple
+
+from src.utils.language_detector import LanguageDetector
+from src.utils.logger_manager import logger
+from src.utils.question_rewrite_cache import QuestionRewriteCache
+
+REWRITE_PATHS = ("fast_path", "cache", "llm")
+
+
+def extract_json(text: str) -> Optional[Dict[str, object]]:
+    """
+    Extracts the first JSON object found in a string and parses it.
+
+    Args:
+        text (str): The input string potentially containing a JSON object.
+
+    Returns:
+        Optional[Dict[str, object]]: The parsed JSON object if found and valid, otherwise None.
+    """
+    match = re.search(r"\{[\s\S]*?\}", text)
+    if match:
+        try:
+            parsed = json.loads(match.group(0))
+        except ValueError:
+            return None
+        return parsed if isinstance(parsed, dict) else None
+    return None
+
+
+class QuestionRewriter:
+    """
+    Rewrites user questions through the fast path, the rewrite cache or the LLM.
+    """
+
+    def __init__(
+        self,
+        rewrite_with_llm: Callable[[str], str],
+        detector: Optional[LanguageDetector] = None,
+        cache: Optional[QuestionRewriteCache] = None,
+        fast_path: bool = True,
+        min_confidence: float = 0.5,
+        max_words: int = 40,
+        llm_keywords: Iterable[str] = (),
+        arewrite_with_llm: Optional[Callable[[str], Awaitable[str]]] = None,
+    ) -> None:
+        """
+        Initializes the rewriter.
+
+        Args:
+            rewrite_with_llm (Callable[[str], str]): Calls the translate/optimize LLM on a
+                question and returns its raw answer.
+            detector (Optional[LanguageDetector]): The local language detector (a default
+                one if None).
+            cache (Optional[QuestionRewriteCache]): The persistent rewrite cache (no
+                caching if None).
+            fast_path (bool): If True, English questions skip the LLM.
+            min_confidence (float): Minimum detector confidence for the fast path.
+            max_words (int): Longer questions always go through the LLM.
+            llm_keywords (Iterable[str]): Words the rewrite prompt handles specially;
+                questions containing them always go through the LLM (or the cache).
+            arewrite_with_llm (Optional[Callable[[str], Awaitable[str]]]): Async variant of
+                rewrite_with_llm used by arewrite (rewrite_with_llm runs in a thread if None).
+        """
+        self._rewrite_with_llm = rewrite_with_llm
+        self._arewrite_with_llm = arewrite_with_llm
+        self._detector = detector or LanguageDetector()
+        self._cache = cache
+        self._fast_path = fast_path
+        self._min_confidence = min_confidence
+        self._max_words = max_words
+        self._llm_keywords = tuple(keyword.lower() for keyword in llm_keywords)
+        self._lock = threading.Lock()
+
+        self._paths: Dict[str, int] = dict.fromkeys(REWRITE_PATHS, 0)
+        self._milliseconds: Dict[str, float] = dict.fromkeys(REWRITE_PATHS, 0.0)
+        self._languages: Dict[str, int] = {}
+        self._llm_failures = 0
+
+    def rewrite(self, question: str) -> str:
+        """
+        Rewrites a question.
+
+        Args:
+            question (str): The user's question.
+
+        Returns:
+            str: The JSON rewrite with the 'language' and the improved 'question', or the
+            raw LLM answer when it holds no valid JSON.
+        """
+        started = time.perf_counter()
+        rewrite = self._rewrite_locally(question)
+        if rewrite is None:
+            rewrite = self._parse_llm_answer(question, self._rewrite_with_llm(question))
+        return self._record(rewrite, started)
+
+    async def arewrite(self, question: str) -> str:
+        """
+        Rewrites a question, awaiting the LLM call instead of blocking the event loop.
+
+        Args:
+            question (str): The user's question.
+
+        Returns:
+            str: The JSON rewrite with the 'language' and the improved 'question', or the
+            raw LLM answer when it holds no valid JSON.
+        """
+        started = time.perf_counter()
+        rewrite = self._rewrite_locally(question)
+        if rewrite is None:
+            if self._arewrite_with_llm is not None:
+                answer = await self._arewrite_with_llm(question)
+            else:
+                answer = await asyncio.to_thread(self._rewrite_with_llm, question)
+            rewrite = self._parse_llm_answer(question, answer)
+        return self._record(rewrite, started)
+
+    def _record(self, rewrite: Tuple[str, Optional[str], str], started: float) -> str:
+        """
+        Counts the path taken, its time and the language of a rewrite, and returns the rewrite.
+        """
+        path, language, rewritten = rewrite
+        elapsed = (time.perf_counter() - started) * 1000
+        with self._lock:
+            self._paths[path] += 1
+            self._milliseconds[path] += elapsed
+            if language is not None:
+                self._languages[language] = self._languages.get(language, 0) + 1
+            else:
+                self._llm_failures += 1
+        logger.debug(f"Question rewritten through the {path} in {elapsed:.1f} ms.")
+        return rewritten
+
+    def _rewrite_locally(self, question: str) -> Optional[Tuple[str, Optional[str], str]]:
+        """
+        Returns the path taken, the language and the rewrite of a question through the fast
+        path or the cache, or None if the question needs the LLM.
+        """
+        if self._fast_path and self.is_fast_path(question):
+            return "fast_path", "en", self._to_json("en", question.strip())
+
+        if self._cache is not None:
+            cached = self._cache.get(question)
+            if cached is not None:
+                improved_question, language = cached
+                return "cache", language, self._to_json(language, improved_question)
+        return None
+
+    def _parse_llm_answer(self, question: str, answer: str) -> Tuple[str, Optional[str], str]:
+        """
+        Returns the path, the language (None if the answer holds no valid JSON) and the
+        rewrite of an LLM answer, caching valid rewrites.
+        """
+        parsed = extract_json(answer)
+        if parsed is None:
+            return "llm", None, answer
+        language = str(parsed.get("language", "en"))
+        improved_question = str(parsed.get("question", "")).strip()
+        if self._cache is not None and improved_question:
+            self._cache.put(question, improved_question, language)
+        return "llm", language, answer
+
+    def is_fast_path(self, question: str) -> bool:
+        """
+        Checks whether a question can skip the LLM rewrite: a short question made of ASCII
+        letters only, confidently detected as English and not mentioning a keyword the
+        rewrite prompt handles specially. Text without accents can still be in another
+        language, so the detector has the last word.
+
+        Args:
+            question (str): The user's question.
+
+        Returns:
+            bool: True if the question can be used as it is.
+        """
+        text = question.lower()
+        if len(text.split()) > self._max_words or not text.strip():
+            return False
+        if not all(c.isascii() for c in text if c.isalpha()):
+            return False
+        if any(keyword in text for keyword in self._llm_keywords):
+            return False
+        language, confidence = self._detector.detect(question)
+        return language == "en" and confidence >= self._min_confidence
+
+    def detect_language(self, question: str) -> Tuple[str, float]:
+        """
+        Detects the language of a question with the local detector.
+
+        Args:
+            question (str): The user's question.
+
+        Returns:
+            Tuple[str, float]: The language code and the detector confidence.
+        """
+        return self._detector.detect(question)
+
+    @staticmethod
+    def _to_json(language: str, question: str) -> str:
+        """Formats a rewrite like the translate/optimize LLM answer."""
+        return json.dumps({"language": language, "question": question}, ensure_ascii=False)
+
+    @property
+    def stats(self) -> Dict[str, Any]:
+        """
+        Returns how many questions took each path (and their share and mean milliseconds),
+        the invalid LLM answers, the detected languages and the cache counters.
+        """
+        with self._lock:
+            total = sum(self._paths.values())
+            stats: Dict[str, Any] = {
+                "questions": total,
+                "paths": dict(self._paths),
+                "path_rates": {
+                    path: count / total if total else 0.0
+                    for path, count in self._paths.items()
+                },
+                "mean_ms": {
+                    path: self._milliseconds[path] / count if count else 0.0
+                    for path, count in self._paths.items()
+                },
+                "llm_failures": self._llm_failures,
+                "languages": dict(self._languages),
+            }
+        if self._cache is not None:
+            stats["cache"] = self._cache.stats
+        return stats
@@ -0,0 +1,116 @@
+# -*- coding: utf-8 -*-
+"""
+File: section_hashing.py
+
+This file defines the helpers used to derive stable, content-based identifiers for
+document sections. The same section text coming from the same source with the same
+metadata always gets the same ID, which lets the vector stores detect new, changed and
+vanished sections instead of re-embedding the whole corpus. The metadata is part of the ID
+because it is stored with the section (and shown to the model), so a section whose page
+title changed is replaced like one whose text changed.
+"""
+
+import hashlib
+import json
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Tuple
+
+from langchain_core.documents import Document
+
+# Metadata key storing the position of a section inside its source document
+SECTION_SLOT_KEY = "section_slot"
+
+
+def section_source(document: Document) -> str:
+    """
+    Returns the identifier of the source a section was split from.
+
+    Args:
+        document (Document): The section whose source is requested.
+
+    Returns:
+        str: The URL for web sections, the file name for local sections, or an empty string.
+    """
+    metadata = document.metadata or {}
+    return str(metadata.get("url") or metadata.get("file_name") or "")
+
+
+def compute_section_id(
+    source: str,
+    content: str,
+    occurrence: int = 0,
+    metadata: Optional[Mapping[str, Any]] = None,
+) -> str:
+    """
+    Computes the content-derived ID of a section.
+
+    Args:
+        source (str): The source (URL or file name) the section belongs to.
+        content (str): The text of the section.
+        occurrence (int): How many identical sections from the same source precede it.
+        metadata (Optional[Mapping[str, Any]]): The metadata stored with the section (its
+            slot, which only tells where it sits, is left out).
+
+    Returns:
+        str: A hexadecimal SHA-256 digest identifying the section.
+    """
+    digest = hashlib.sha256()
+    digest.update(source.encode("utf-8"))
+    digest.update(b"\x00")
+    digest.update(content.encode("utf-8"))
+    digest.update(b"\x00")
+    digest.update(str(occurrence).encode("ascii"))
+    if metadata:
+        stored = {key: value for key, value in metadata.items() if key != SECTION_SLOT_KEY}
+        digest.update(b"\x00")
+        digest.update(json.dumps(stored, sort_keys=True, default=str).encode("utf-8"))
+    return digest.hexdigest()
+
+
+def assign_section_ids(documents: List[Document]) -> List[Tuple[str, str]]:
+    """
+    Computes the ID and slot of every section in a list.
+
+    The slot (`source#position`) identifies where a section sits inside its source and
+    is used to tell an updated section apart from an added one.
+
+    Args:
+        documents (List[Document]): The sections to identify, in split order.
+
+    Returns:
+        List[Tuple[str, str]]: One (section_id, slot) pair per section.
+    """
+    return [
+        (section_id, slot) for _, section_id, slot in iter_section_ids(documents)
+    ]
+
+
+def iter_section_ids(
+    documents: Iterable[Document],
+) -> Iterator[Tuple[Document, str, str]]:
+    """
+    Computes the ID and slot of every section of a (possibly streamed) sequence, as the
+    sections arrive. Sections of different sources may be interleaved, as long as the
+    sections of each source come in split order.
+
+    Args:
+        documents (Iterable[Document]): The sections to identify.
+
+    Yields:
+        Tuple[Document, str, str]: Each section with its section_id and slot.
+    """
+    positions: Dict[str, int] = {}
+    occurrences: Dict[Tuple[str, str], int] = {}
+
+    for document in documents:
+        source = section_source(document)
+        position = positions.get(source, 0)
+        positions[source] = position + 1
+
+        occurrence_key = (source, document.page_content)
+        occurrence = occurrences.get(occurrence_key, 0)
+        occurrences[occurrence_key] = occurrence + 1
+
+        section_id = compute_section_id(
+            source, document.page_content, occurrence, document.metadata
+        )
+        yield document, section_id, f"{source}#{position}"
@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+"""
+File: section_splitter.py
+
+This file contains the SectionSplitter class, which splits the content of a Markdown
+document into sections with a MarkdownTextSplitter and, optionally, reduces each section
+to plain words with the MarkdownCleaner. Both are created once and reused for every
+document. It also defines the functions run by DocumentManager's splitter processes,
+each of which keeps one long-lived SectionSplitter.
+"""
+
+from typing import List, Optional
+
+from langchain.text_splitter import MarkdownTextSplitter
+
+from src.config.config_init import MARKDOWN_SPLITTER_CONFIG
+from src.utils.markdown_cleaner import MarkdownCleaner
+
+
+class SectionSplitter:
+    """
+    Splits Markdown documents into (optionally cleaned) section texts.
+    """
+
+    def __init__(self, plain_words_only: bool = True) -> None:
+        """
+        Initializes the Markdown splitter and cleaner.
+
+        Args:
+            plain_words_only (bool): If True, sections are converted to plain words only.
+        """
+        self._plain_words_only = plain_words_only
+        self._splitter = MarkdownTextSplitter(**MARKDOWN_SPLITTER_CONFIG)
+        self._markdown_cleaner = MarkdownCleaner()
+
+    def split(self, content: str) -> List[str]:
+        """
+        Splits the content of a document into sections.
+
+        Args:
+            content (str): The Markdown content of the document.
+
+        Returns:
+            List[str]: The texts of the sections, in document order.
+        """
+        sections: List[str] = self._splitter.split_text(content)
+        if self._plain_words_only:
+            return [self._markdown_cleaner.clean(section) for section in sections]
+        return sections
+
+
+# --- Splitter process workers ---
+_worker_splitter: Optional[SectionSplitter] = None
+
+
+def init_splitter_worker(plain_words_only: bool = True) -> None:
+    """
+    Creates the SectionSplitter of a splitter process (runs once when the process starts).
+
+    Args:
+        plain_words_only (bool): If True, sections are converted to plain words only.
+    """
+    global _worker_splitter
+    _worker_splitter = SectionSplitter(plain_words_only)
+
+
+def split_in_worker(content: str) -> List[str]:
+    """
+    Splits a document with the long-lived SectionSplitter of the current splitter process.
+
+    Args:
+        content (str): The Markdown content of the document.
+
+    Returns:
+        List[str]: The texts of the sections, in document order.
+    """
+    if _worker_splitter is None:
+        init_splitter_worker()
+    return _worker_splitter.split(content)  # type: ignore
@@ -0,0 +1,90 @@
+# -*- coding: utf-8 -*-
+"""
+File: startup_profiler.py
+
+This file defines the StartupProfiler class, which records how long each step of the
+backend startup takes (module imports and the CoreInitializer phases) in milliseconds.
+A shared `startup_profiler` instance collects the timings of the running process so they
+can be logged once the core is initialized and reported by the `/status` endpoint.
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional
+
+
+class StartupProfiler:
+    """
+    Thread-safe recorder of named startup steps and their duration in milliseconds.
+    """
+
+    def __init__(self) -> None:
+        """
+        Initializes an empty profiler.
+        """
+        self._timings: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def measure(self, name: str) -> Iterator[None]:
+        """
+        Measures the duration of the wrapped block and records it under a name. A step
+        measured several times accumulates its durations.
+
+        Args:
+            name (str): Name of the step, e.g. 'import' or 'models'.
+        """
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, (time.perf_counter() - started) * 1000)
+
+    def record(self, name: str, milliseconds: float) -> None:
+        """
+        Records the duration of a step measured elsewhere.
+
+        Args:
+            name (str): Name of the step.
+            milliseconds (float): Duration of the step in milliseconds.
+        """
+        with self._lock:
+            self._timings[name] = self._timings.get(name, 0.0) + milliseconds
+
+    def report(self) -> Dict[str, float]:
+        """
+        Returns the recorded steps in the order they were first recorded.
+
+        Returns:
+            Dict[str, float]: Milliseconds per step, rounded to 0.1 ms.
+        """
+        with self._lock:
+            return {name: round(ms, 1) for name, ms in self._timings.items()}
+
+    def format_report(self, title: Optional[str] = "Startup time") -> str:
+        """
+        Formats the recorded steps as a single log line.
+
+        Args:
+            title (Optional[str]): Prefix of the line.
+
+        Returns:
+            str: e.g. 'Startup time: import 180.2 ms | keys 3.1 ms | ... (total 2450.7 ms)'.
+        """
+        timings = self.report()
+        # Nested steps ('models.import') are already part of their parent step
+        total = sum(ms for name, ms in timings.items() if "." not in name)
+        steps = " | ".join(f"{name} {ms:.1f} ms" for name, ms in timings.items())
+        return f"{title}: {steps} (total {total:.1f} ms)"
+
+    def reset(self) -> None:
+        """
+        Removes every recorded step.
+        """
+        with self._lock:
+            self._timings.clear()
+
+
+# Shared profiler for the startup of the running process
+startup_profiler = StartupProfiler()
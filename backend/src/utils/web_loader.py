@@ -4,148 +4,258 @@ File: web_loader.py
 
 This file contains the WebLoader class, responsible for fetching, parsing,
 and converting web pages into markdown documents. It uses concurrent futures
-to handle multiple URLs simultaneously and BeautifulSoup for HTML parsing.
+to handle multiple URLs simultaneously and a PageParser (BeautifulSoup and
+Markdownify) for HTML parsing. Fetching and parsing are split: fetched pages
+are handed to a pool of parser processes, so parsing scales with CPU cores.
+Pages are fetched through a pooled keep-alive session with compressed transfer,
+a per-host concurrency cap, and retries with exponential backoff and jitter.
+With an HttpCache, pages are revalidated with conditional requests and unchanged
+pages reuse their cached document without being parsed again, unless it was parsed
+with other parser settings (then the cached body is parsed again). Documents can be
+consumed as a stream (`iter_documents()`) while the remaining pages are fetched.
 """
 
-from concurrent.futures import ThreadPoolExecutor, as_completed, Future
-from typing import List, Optional, Dict, Sequence
+import multiprocessing
+import os
+import random
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Dict, Iterator, List, Mapping, Optional
+from urllib.parse import urlsplit
 
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
 
 from langchain_core.documents import Document
-from langchain_community.document_transformers.markdownify import MarkdownifyTransformer
 
-from src.config.config_init import MARKDOWNIFY_CONFIG
+from src.utils.http_cache import HttpCache
 from src.utils.logger_manager import logger
+from src.utils.page_parser import PageParser, init_parser_worker, parse_in_worker
+
+# HTTP status codes worth retrying (rate limiting and transient server errors)
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
 
 
 class WebLoader:
-    def __init__(self, urls: List[str]) -> None:
+    def __init__(
+        self,
+        urls: List[str],
+        max_workers: int = 16,
+        max_connections_per_host: int = 6,
+        max_pooled_hosts: int = 16,
+        timeout: float = 10.0,
+        max_retries: int = 3,
+        backoff_base: float = 0.5,
+        backoff_max: float = 8.0,
+        http_cache: Optional[HttpCache] = None,
+        offline: bool = False,
+        parse_processes: Optional[int] = 0,
+        parser_backend: str = "html.parser",
+    ) -> None:
         """
         Initializes the WebLoader instance with a list of URLs to process.
 
         Args:
             urls (List[str]): List of URLs to be fetched and converted to Markdown.
+            max_workers (int): Number of threads fetching and parsing pages.
+            max_connections_per_host (int): Maximum concurrent requests (and pooled
+                keep-alive connections) per host.
+            max_pooled_hosts (int): Number of hosts whose keep-alive connections are kept
+                in the connection pool (threads engine).
+            timeout (float): Seconds to wait for a server response.
+            max_retries (int): Retries for a page that failed with a transient error.
+            backoff_base (float): Delay in seconds before the first retry (doubled on each retry).
+            backoff_max (float): Upper bound in seconds for the delay between retries.
+            http_cache (Optional[HttpCache]): Cache of fetched pages. When given, cached
+                pages are revalidated with conditional requests.
+            offline (bool): If True, pages are only read from `http_cache` and nothing
+                is fetched.
+            parse_processes (Optional[int]): Number of parser processes. 0 parses on the
+                fetching threads, None starts one process per CPU core.
+            parser_backend (str): The PageParser backend ("html.parser", "lxml" or
+                "article").
         """
+        if offline and http_cache is None:
+            raise ValueError("Offline mode requires an http_cache.")
+        if max_workers < 1 or max_connections_per_host < 1 or max_pooled_hosts < 1:
+            raise ValueError(
+                "max_workers, max_connections_per_host and max_pooled_hosts must be at least 1."
+            )
+
         self.urls: List[str] = urls
+        self._max_workers = max_workers
+        self._max_connections_per_host = max_connections_per_host
+        self._max_pooled_hosts = max_pooled_hosts
+        self._timeout = timeout
+        self._max_retries = max_retries
+        self._backoff_base = backoff_base
+        self._backoff_max = backoff_max
+
+        self._session: Optional[requests.Session] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._host_semaphores: Dict[str, threading.BoundedSemaphore] = {}
+        self._lock = threading.Lock()
+        self._fetch_stats: Dict[str, Dict[str, Any]] = {}
+
+        self._parser_backend = parser_backend
+        self._page_parser = PageParser(parser_backend)
+        self._parse_processes: int = (
+            (os.cpu_count() or 1) if parse_processes is None else parse_processes
+        )
+        self._parse_pool: Optional[ProcessPoolExecutor] = None
+
+        self._http_cache = http_cache
+        self._offline = offline
+        self._cache_stats: Dict[str, int] = {
+            "not_modified": 0,  # Revalidated with a 304, cached document reused
+            "refetched": 0,  # Cached, but the server sent a new body
+            "new": 0,  # Not cached yet
+            "offline_hits": 0,  # Served from the cache in offline mode
+            "offline_misses": 0,  # Missing from the cache in offline mode
+            "stale": 0,  # Fetch failed, stale cached document used instead
+            "reparsed": 0,  # Cached document from other parser settings, cached body parsed again
+        }
 
     def get_documents(self) -> List[Document]:
         """
         Fetches and parses the list of URLs, returning a list of Document objects.
-        Retries up to 3 times for each URL that fails.
+        Pages failing with a transient error are retried with exponential backoff.
 
         Returns:
             List[Document]: A list of Document objects containing the content of the parsed web pages.
         """
-        documents: List[Document] = []
-        max_retries: int = 3
-        url_attempts: Dict[str, int] = {url: 0 for url in self.urls}
-        remaining_urls: set[str] = set(self.urls)
+        return list(self.iter_documents())
 
-        while remaining_urls:
-            remaining_urls = self._process_url_batch(
-                remaining_urls, url_attempts, max_retries, documents
-            )
-        logger.info(f"All documents loaded: {len(documents)}")
-        return documents
+    def iter_documents(self) -> Iterator[Document]:
+        """
+        Fetches and parses the list of URLs, yielding each Document as soon as its page
+        is ready (in completion order), so it can be processed while the crawl goes on.
 
-    def _process_url_batch(
-        self,
-        urls: set[str],
-        url_attempts: Dict[str, int],
-        max_retries: int,
-        documents: List[Document],
-    ) -> set[str]:
+        Yields:
+            Document: The parsed web pages.
         """
-        Processes a batch of URLs concurrently using a thread pool.
-        Submits each URL to be fetched and parsed, then collects results as they complete.
-        Updates the documents list with successful loads and tracks failed URLs for retry.
+        loaded = 0
+        started = time.perf_counter()
+        executor = self._get_executor()
+
+        future_to_url = {
+            executor.submit(self._fetch_and_parse, url): url for url in self.urls
+        }
+        for future in as_completed(future_to_url):
+            url = future_to_url.pop(future)  # Drop the reference to the document
+            try:
+                document: Optional[Document] = future.result()
+            except Exception as e:
+                logger.error(f"Error getting document for URL {url}: {e}")
+                continue
+            if document:
+                loaded += 1
+                yield document
+            else:
+                logger.warning(f"Failed to load URL: {url}")
 
-        Args:
-            urls (set[str]): Set of URLs to process in this batch.
-            url_attempts (Dict[str, int]): Tracks the number of attempts for each URL.
-            max_retries (int): Maximum number of retries per URL.
-            documents (List[Document]): List to append successfully loaded documents to.
+        logger.info(f"All documents loaded: {loaded}")
+        self._log_fetch_summary(time.perf_counter() - started)
+        if self._http_cache is not None:
+            logger.info(f"HTTP cache: {self.cache_stats}")
 
-        Returns:
-            set[str]: Set of URLs that failed in this batch and should be retried.
-        """
-        failed_urls: set[str] = set()
-        with ThreadPoolExecutor(max_workers=20) as executor:
-            future_to_url = self._submit_url_futures(urls, executor)
-            for future in as_completed(future_to_url):
-                url = future_to_url[future]
-                self._handle_future_result(
-                    future, url, documents, url_attempts, max_retries, failed_urls
+    def close(self) -> None:
+        """
+        Shuts down the worker threads and closes the pooled connections.
+        """
+        with self._lock:
+            executor, self._executor = self._executor, None
+            session, self._session = self._session, None
+            parse_pool, self._parse_pool = self._parse_pool, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+        if parse_pool is not None:
+            parse_pool.shutdown(wait=True)
+        if session is not None:
+            session.close()
+
+    def __enter__(self) -> "WebLoader":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """
+        Returns the loader's thread pool, created on first use and reused afterwards.
+        """
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self._max_workers, thread_name_prefix="web-loader"
                 )
-        return failed_urls
+            return self._executor
 
-    def _submit_url_futures(
-        self, urls: set[str], executor: ThreadPoolExecutor
-    ) -> Dict[Future[Optional[Document]], str]:
+    def _get_parse_pool(self) -> Optional[ProcessPoolExecutor]:
         """
-        Submits fetch_and_parse tasks for each URL to the thread pool executor.
-        Returns a mapping from Future objects to their corresponding URLs for tracking.
-
-        Args:
-            urls (set[str]): Set of URLs to submit as tasks.
-            executor (ThreadPoolExecutor): The thread pool executor instance.
+        Returns the pool of parser processes, started on first use (None when pages are
+        parsed on the fetching threads). Every process keeps one long-lived PageParser.
+        Processes are spawned rather than forked, as the loader runs next to other threads.
+        """
+        if self._parse_processes < 1:
+            return None
+        with self._lock:
+            if self._parse_pool is None:
+                self._parse_pool = ProcessPoolExecutor(
+                    max_workers=self._parse_processes,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=init_parser_worker,
+                    initargs=(self._parser_backend,),
+                )
+                logger.info(f"Started {self._parse_processes} parser processes.")
+            return self._parse_pool
 
-        Returns:
-            Dict[Future[Optional[Document]], str]: Mapping from Future to URL.
+    def _get_session(self) -> requests.Session:
         """
-        return {executor.submit(self._fetch_and_parse, url): url for url in urls}
+        Returns the shared HTTP session, created on first use. Its connection pool keeps
+        up to `max_connections_per_host` keep-alive connections for each of up to
+        `max_pooled_hosts` hosts, and it asks servers for compressed responses.
+        """
+        with self._lock:
+            if self._session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(
+                    pool_connections=self._max_pooled_hosts,
+                    pool_maxsize=self._max_connections_per_host,
+                )
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                session.headers.update(
+                    {"Accept-Encoding": "gzip, deflate", "Connection": "keep-alive"}
+                )
+                self._session = session
+            return self._session
 
-    def _handle_future_result(
-        self,
-        future: Future[Optional[Document]],
-        url: str,
-        documents: List[Document],
-        url_attempts: Dict[str, int],
-        max_retries: int,
-        failed_urls: set[str],
-    ) -> None:
+    def _host_semaphore(self, url: str) -> threading.BoundedSemaphore:
         """
-        Handles the result of a completed future for a URL fetch/parse task.
-        If successful, appends the document to the documents list and marks the URL as done.
-        If failed, increments the attempt count and adds to failed_urls if retries remain.
-        Logs errors and warnings as appropriate.
+        Returns the semaphore limiting the concurrent requests to the host of a URL.
 
         Args:
-            future (Future[Optional[Document]]): The completed future object.
-            url (str): The URL associated with this future.
-            documents (List[Document]): List to append successful documents to.
-            url_attempts (Dict[str, int]): Tracks the number of attempts for each URL.
-            max_retries (int): Maximum number of retries per URL.
-            failed_urls (set[str]): Set to add failed URLs to for retrying.
+            url (str): The URL about to be fetched.
+
+        Returns:
+            threading.BoundedSemaphore: The semaphore of the URL's host.
         """
-        try:
-            logger.info(f"Loading URL: {url[-30:]}")
-            document: Optional[Document] = future.result()
-            if document:
-                documents.append(document)
-                url_attempts[url] = max_retries  # Mark as done
-            else:
-                url_attempts[url] += 1
-                if url_attempts[url] < max_retries:
-                    failed_urls.add(url)
-                else:
-                    logger.warning(
-                        f"Failed to load URL after {max_retries} attempts: {url}"
-                    )
-        except Exception as e:
-            url_attempts[url] += 1
-            if url_attempts[url] < max_retries:
-                failed_urls.add(url)
-            else:
-                logger.error(
-                    f"Error getting document for URL {url} after {max_retries} attempts: {e}"
-                )
+        host = urlsplit(url).netloc
+        with self._lock:
+            semaphore = self._host_semaphores.get(host)
+            if semaphore is None:
+                semaphore = threading.BoundedSemaphore(self._max_connections_per_host)
+                self._host_semaphores[host] = semaphore
+            return semaphore
 
     def _fetch_and_parse(self, url: str) -> Optional[Document]:
         """
         Fetches, parses, and converts the HTML content of a URL into a Markdown document.
+        With an HTTP cache, the page is revalidated and an unchanged page reuses its
+        cached document.
 
         Args:
             url (str): The URL to fetch and process.
@@ -155,145 +265,419 @@ class WebLoader:
         """
         try:
             logger.debug(f"Start fetch_and_parse for: {url}")
+            if self._http_cache is not None:
+                return self._fetch_and_parse_cached(url, self._http_cache)
+
             html_content: Optional[str] = self._fetch_html(url)
             if not html_content:
                 logger.error(f"No HTML content for: {url}")
                 return None
-
-            soup: Optional[BeautifulSoup] = self._parse_html(html_content)
-            if not soup:
-                logger.error(f"No soup for: {url}")
-                return None
-
-            article_html: Optional[str] = self._extract_article(soup)
-            if not article_html:
-                logger.error(f"No article found for: {url}")
-                return None
-
-            markdown_content: str = self._convert_to_markdown(article_html)
-            metadata: Dict[str, str] = self._extract_metadata(soup, url)
-            metadata["html_content_length"] = str(len(markdown_content))
-
-            logger.debug(f"Document created for: {url}")
-            return self._create_document(markdown_content, metadata)
+            return self._parse_document(html_content, url)
         except Exception as e:
             logger.error(f"Error fetching and parsing URL {url}: {e}")
             return None
 
-    def _fetch_html(self, url: str) -> Optional[str]:
+    def _fetch_and_parse_cached(
+        self, url: str, http_cache: HttpCache
+    ) -> Optional[Document]:
         """
-        Fetches the HTML content of a given URL.
+        Loads a URL through the HTTP cache: a conditional request is sent for cached pages,
+        a 304 reuses the cached document, and a new body is parsed and stored. In offline
+        mode the cached entry is used without any request.
 
         Args:
-            url (str): The URL to fetch.
+            url (str): The URL to fetch and process.
+            http_cache (HttpCache): The cache of fetched pages.
 
         Returns:
-            Optional[str]: The HTML content of the page if successful, None otherwise.
+            Optional[Document]: A Document object if successful, None otherwise.
         """
-        try:
-            logger.debug(f"Fetching URL: {url}")
-            response: requests.Response = requests.get(url, timeout=10)
-            response.raise_for_status()
-            logger.info(f"Fetched URL successfully: {url[-30:]}")
-            return response.text
-        except requests.exceptions.RequestException as e:
-            logger.error(f"Error fetching URL {url}: {e}")
+        entry = http_cache.get(url)
+        if self._offline:
+            return self._load_offline(url, entry, http_cache)
+
+        response = self._fetch_response(url, HttpCache.conditional_headers(entry))
+        if response is None:
+            return self._load_stale(url, entry, http_cache)
+        return self._process_cached_response(
+            url, entry, response.status_code, response.headers, response.text, http_cache
+        )
+
+    def _load_offline(
+        self, url: str, entry: Optional[Dict[str, Any]], http_cache: HttpCache
+    ) -> Optional[Document]:
+        """
+        Returns the cached document of a URL in offline mode.
+
+        Args:
+            url (str): The page URL.
+            entry (Optional[Dict[str, Any]]): The cached entry, or None.
+            http_cache (HttpCache): The cache of fetched pages.
+
+        Returns:
+            Optional[Document]: The cached document, or None if the page is not cached.
+        """
+        if entry is None:
+            self._count_cache("offline_misses")
+            logger.warning(f"Offline mode: {url} is not cached.")
             return None
+        self._count_cache("offline_hits")
+        return self._cached_document(url, entry, http_cache)
 
-    def _parse_html(self, html: str) -> Optional[BeautifulSoup]:
+    def _load_stale(
+        self, url: str, entry: Optional[Dict[str, Any]], http_cache: HttpCache
+    ) -> Optional[Document]:
         """
-        Parses the HTML content and returns a BeautifulSoup object.
+        Returns the cached document of a URL whose fetch failed, if there is one.
 
         Args:
-            html (str): The HTML content of the page.
+            url (str): The page URL.
+            entry (Optional[Dict[str, Any]]): The cached entry, or None.
+            http_cache (HttpCache): The cache of fetched pages.
 
         Returns:
-            Optional[BeautifulSoup]: A BeautifulSoup object if parsing is successful, None otherwise.
+            Optional[Document]: The stale cached document, or None.
         """
-        try:
-            return BeautifulSoup(html, "html.parser") if html else None
-        except Exception as e:
-            logger.error(f"Error parsing HTML: {e}")
-            return None
+        document = self._cached_document(url, entry, http_cache) if entry else None
+        if document is not None:
+            self._count_cache("stale")
+            logger.warning(f"Using the cached copy of {url} after the fetch failed.")
+            return document
+        logger.error(f"No HTML content for: {url}")
+        return None
+
+    def _cached_document(
+        self, url: str, entry: Dict[str, Any], http_cache: HttpCache
+    ) -> Optional[Document]:
+        """
+        Returns the document of a cached entry. A document stored by a parser with other
+        settings (backend, Markdownify configuration or parser version) is not reused:
+        the cached body is parsed again and the new document replaces it in the cache.
+
+        Args:
+            url (str): The page URL.
+            entry (Dict[str, Any]): The cached entry.
+            http_cache (HttpCache): The cache of fetched pages.
 
-    def _extract_article(self, soup: BeautifulSoup) -> Optional[str]:
+        Returns:
+            Optional[Document]: The page document, or None if it could not be parsed.
+        """
+        fingerprint = self._page_parser.fingerprint
+        if entry["parser"] == fingerprint:
+            return entry["document"]
+
+        self._count_cache("reparsed")
+        logger.debug(f"Parsing the cached body of {url} again (parser settings changed).")
+        document = self._parse_document(entry["body"], url)
+        http_cache.put(
+            url,
+            entry["body"],
+            etag=entry["etag"],
+            last_modified=entry["last_modified"],
+            document=document,
+            parser=fingerprint,
+        )
+        return document
+
+    def _process_cached_response(
+        self,
+        url: str,
+        entry: Optional[Dict[str, Any]],
+        status: int,
+        headers: Mapping[str, str],
+        html_content: str,
+        http_cache: HttpCache,
+    ) -> Optional[Document]:
         """
-        Extracts the main article content from the parsed HTML.
+        Handles the response to a (possibly conditional) request: a 304 reuses the cached
+        document (parsing the cached body again if the parser settings changed), any
+        other response is parsed and stored in the cache.
 
         Args:
-            soup (BeautifulSoup): A BeautifulSoup object containing the parsed HTML.
+            url (str): The page URL.
+            entry (Optional[Dict[str, Any]]): The cached entry the request was based on.
+            status (int): The HTTP status of the response.
+            headers (Mapping[str, str]): The response headers.
+            html_content (str): The response body.
+            http_cache (HttpCache): The cache of fetched pages.
 
         Returns:
-            Optional[str]: The HTML content of the article section if found, None otherwise.
+            Optional[Document]: The page document, or None if it could not be parsed.
         """
+        if status == 304 and entry is not None:
+            self._count_cache("not_modified")
+            if entry["parser"] == self._page_parser.fingerprint:
+                http_cache.touch(url)
+            return self._cached_document(url, entry, http_cache)
+
+        self._count_cache("new" if entry is None else "refetched")
+        document = self._parse_document(html_content, url) if html_content else None
+        http_cache.put(
+            url,
+            html_content,
+            etag=headers.get("ETag"),
+            last_modified=headers.get("Last-Modified"),
+            document=document,
+            parser=self._page_parser.fingerprint,
+        )
+        return document
+
+    def _parse_document(self, html_content: str, url: str) -> Optional[Document]:
+        """
+        Parses the HTML of a page, extracts its article and converts it into a Markdown
+        document, in a parser process when the pool is enabled.
+
+        Args:
+            html_content (str): The HTML content of the page.
+            url (str): The URL of the page.
+
+        Returns:
+            Optional[Document]: A Document object if successful, None otherwise.
+        """
+        parse_pool = self._get_parse_pool()
+        if parse_pool is None:
+            return self._page_parser.parse(html_content, url)
+
         try:
-            article_section: Optional[BeautifulSoup] = soup.find(
-                "article", class_="bd-article"
-            )  # type: ignore
-            if article_section:
-                gallery_examples_section: Optional[BeautifulSoup] = article_section.find("section", id="gallery-examples")  # type: ignore
-                if gallery_examples_section:
-                    gallery_examples_section.decompose()  # Remove the gallery section
-                return str(article_section)
-            return None
-        except Exception as e:
-            logger.error(f"Error extracting article: {e}")
-            return None
+            # The calling thread waits without holding the GIL while a process parses
+            return parse_pool.submit(parse_in_worker, html_content, url).result()
+        except BrokenProcessPool as e:
+            logger.warning(
+                f"Parser processes stopped ({e}). Parsing on the fetching threads instead."
+            )
+            with self._lock:
+                self._parse_processes = 0
+            return self._page_parser.parse(html_content, url)
 
-    def _extract_metadata(self, soup: BeautifulSoup, url: str) -> Dict[str, str]:
+    def _fetch_html(self, url: str) -> Optional[str]:
         """
-        Extracts metadata from the HTML, such as the page title.
+        Fetches the HTML content of a given URL.
 
         Args:
-            soup (BeautifulSoup): A BeautifulSoup object containing the parsed HTML.
-            url (str): The URL of the web page.
+            url (str): The URL to fetch.
 
         Returns:
-            Dict[str, str]: A dictionary containing metadata, including the URL and title of the page.
+            Optional[str]: The HTML content of the page if successful, None otherwise.
         """
-        try:
-            title: str = soup.find("title").text if soup.find("title") else "No title"  # type: ignore
-            return {"url": url, "title": title}
-        except Exception as e:
-            logger.error(f"Error extracting metadata: {e}")
-            return {"url": url, "title": "No title"}
+        response = self._fetch_response(url)
+        return response.text if response is not None else None
 
-    def _convert_to_markdown(self, html_content: str) -> str:
+    def _fetch_response(
+        self, url: str, headers: Optional[Dict[str, str]] = None
+    ) -> Optional[requests.Response]:
         """
-        Converts the HTML content to Markdown using the Markdownify transformer.
+        Sends a GET request for a URL, retrying connection errors, timeouts, rate limiting
+        and server errors with exponential backoff and jitter. The host slot is released
+        while waiting between attempts.
 
         Args:
-            html_content (str): The HTML content to be converted to Markdown.
+            url (str): The URL to fetch.
+            headers (Optional[Dict[str, str]]): Extra request headers (e.g. validators of
+                a conditional request).
 
         Returns:
-            str: The content converted to Markdown.
+            Optional[requests.Response]: The successful (2xx or 304) response, None otherwise.
         """
-        try:
-            html_document: Document = Document(page_content=html_content)
-            transformer: MarkdownifyTransformer = MarkdownifyTransformer(
-                **MARKDOWNIFY_CONFIG
-            )
-            markdown_content: Sequence[Document] = transformer.transform_documents(
-                [html_document]
+        session = self._get_session()
+        semaphore = self._host_semaphore(url)
+
+        for attempt in range(self._max_retries + 1):
+            retry_after: Optional[float] = None
+            try:
+                logger.debug(f"Fetching URL: {url}")
+                with semaphore:
+                    started = time.perf_counter()
+                    response: requests.Response = session.get(
+                        url, headers=headers, timeout=self._timeout
+                    )
+                    latency = time.perf_counter() - started
+
+                if response.status_code not in RETRYABLE_STATUS_CODES:
+                    response.raise_for_status()
+                    wire_bytes = getattr(response.raw, "tell", lambda: None)()
+                    self._record_fetch(
+                        url,
+                        response.status_code,
+                        latency,
+                        attempt + 1,
+                        len(response.content),
+                        wire_bytes or len(response.content),
+                    )
+                    logger.info(
+                        f"Fetched URL successfully: {url[-30:]} "
+                        f"({response.status_code}, {latency * 1000:.0f} ms, "
+                        f"{len(response.content) / 1024:.1f} KB)"
+                    )
+                    return response
+
+                error: Exception = requests.exceptions.HTTPError(
+                    f"{response.status_code} Server Error for url: {url}"
+                )
+                retry_after = self._parse_retry_after(response)
+            except requests.exceptions.HTTPError as e:
+                # Client errors (404, 403...) will not change on retry
+                logger.error(f"Error fetching URL {url}: {e}")
+                self._record_failure(url, attempt + 1, str(e))
+                return None
+            except requests.exceptions.RequestException as e:
+                error = e
+
+            if attempt == self._max_retries:
+                logger.error(
+                    f"Error fetching URL {url} after {self._max_retries + 1} attempts: {error}"
+                )
+                self._record_failure(url, attempt + 1, str(error))
+                return None
+
+            delay = self._retry_delay(attempt, retry_after)
+            logger.warning(
+                f"Fetching {url} failed (attempt {attempt + 1}/{self._max_retries + 1}): "
+                f"{error}. Retrying in {delay:.1f}s..."
             )
-            return str(markdown_content[0])
-        except Exception as e:
-            logger.error(f"Error converting to Markdown: {e}")
-            return ""
+            time.sleep(delay)
+        return None  # Unreachable, keeps type checkers happy
 
-    def _create_document(self, html_content: str, metadata: Dict[str, str]) -> Document:
+    def _retry_delay(self, attempt: int, retry_after: Optional[float]) -> float:
         """
-        Creates a Document object from the HTML content and metadata.
+        Returns the seconds to wait before retrying: exponential backoff with jitter,
+        extended to the delay requested by the server (both capped by `backoff_max`).
 
         Args:
-            html_content (str): The content of the document.
-            metadata (Dict[str, str]): Metadata related to the document.
+            attempt (int): Zero-based number of the attempt that just failed.
+            retry_after (Optional[float]): Delay requested in a Retry-After header.
 
         Returns:
-            Document: The created Document object.
+            float: The delay in seconds.
+        """
+        delay = min(self._backoff_max, self._backoff_base * 2**attempt)
+        delay += random.uniform(0, self._backoff_base)
+        if retry_after is not None:
+            delay = max(delay, min(retry_after, self._backoff_max))
+        return delay
+
+    @staticmethod
+    def _parse_retry_after(response: Any) -> Optional[float]:
+        """
+        Reads the delay requested by the server in the Retry-After header, in seconds.
+
+        Args:
+            response (Any): The rate-limited or failed response (any object with `headers`).
+
+        Returns:
+            Optional[float]: The requested delay, or None if absent or not a number.
         """
         try:
-            return Document(page_content=html_content, metadata=metadata)
-        except Exception as e:
-            logger.error(f"Error creating document: {e}")
-            return Document(page_content="", metadata=metadata)
+            return float(response.headers.get("Retry-After", ""))
+        except ValueError:
+            return None
+
+    # --- Fetch metrics ---
+    def _record_fetch(
+        self,
+        url: str,
+        status: int,
+        latency: float,
+        attempts: int,
+        body_bytes: int,
+        wire_bytes: int,
+    ) -> None:
+        """
+        Records the latency and size of a successful fetch.
+
+        Args:
+            url (str): The fetched URL.
+            status (int): The HTTP status of the response.
+            latency (float): Seconds spent on the successful request.
+            attempts (int): Number of requests sent for the URL.
+            body_bytes (int): Size of the decoded response body.
+            wire_bytes (int): Bytes transferred for the body (compressed size).
+        """
+        with self._lock:
+            self._fetch_stats[url] = {
+                "url": url,
+                "status": status,
+                "attempts": attempts,
+                "latency_ms": round(latency * 1000, 1),
+                "bytes": body_bytes,
+                "wire_bytes": wire_bytes,
+                "error": None,
+            }
+
+    def _record_failure(self, url: str, attempts: int, error: str) -> None:
+        """
+        Records a URL that could not be fetched.
+
+        Args:
+            url (str): The URL that failed.
+            attempts (int): Number of requests sent for the URL.
+            error (str): The last error.
+        """
+        with self._lock:
+            self._fetch_stats[url] = {
+                "url": url,
+                "status": None,
+                "attempts": attempts,
+                "latency_ms": None,
+                "bytes": 0,
+                "wire_bytes": 0,
+                "error": error,
+            }
+
+    def _log_fetch_summary(self, elapsed: float) -> None:
+        """
+        Logs the per-URL fetch metrics and their totals.
+
+        Args:
+            elapsed (float): Seconds spent loading all the URLs.
+        """
+        stats = self.fetch_stats
+        for entry in stats:
+            logger.debug(
+                f"Fetch {entry['url']}: status={entry['status']} attempts={entry['attempts']} "
+                f"latency={entry['latency_ms']} ms bytes={entry['bytes']} "
+                f"wire_bytes={entry['wire_bytes']}"
+            )
+        latencies = sorted(e["latency_ms"] for e in stats if e["latency_ms"] is not None)
+        if not latencies:
+            return
+        total_bytes = sum(e["bytes"] for e in stats)
+        wire_bytes = sum(e["wire_bytes"] for e in stats)
+        logger.info(
+            f"Fetched {len(latencies)}/{len(stats)} URLs in {elapsed:.2f}s: "
+            f"latency p50 {latencies[len(latencies) // 2]:.0f} ms, "
+            f"max {latencies[-1]:.0f} ms, {total_bytes / 1024:.0f} KB "
+            f"({wire_bytes / 1024:.0f} KB transferred)."
+        )
+
+    def _count_cache(self, outcome: str) -> None:
+        """
+        Counts one HTTP cache outcome.
+
+        Args:
+            outcome (str): One of the keys of `cache_stats`.
+        """
+        with self._lock:
+            self._cache_stats[outcome] += 1
+
+    @property
+    def cache_stats(self) -> Dict[str, Any]:
+        """
+        Returns the HTTP cache outcomes: pages revalidated as not modified, refetched,
+        new, served offline, missing offline and served stale, plus the hit rate and
+        the cached pages parsed again because the parser settings changed.
+        """
+        with self._lock:
+            stats: Dict[str, Any] = dict(self._cache_stats)
+        hits = stats["not_modified"] + stats["offline_hits"] + stats["stale"]
+        total = hits + stats["refetched"] + stats["new"] + stats["offline_misses"]
+        stats["hit_rate"] = hits / total if total else 0.0
+        return stats
+
+    @property
+    def fetch_stats(self) -> List[Dict[str, Any]]:
+        """
+        Returns the metrics of every fetched URL: status, attempts, latency in
+        milliseconds, decoded bytes and bytes transferred over the wire.
+        """
+        with self._lock:
+            return [dict(entry) for entry in self._fetch_stats.values()]
@@ -1,6 +1,9 @@
 # -*- coding: utf-8 -*-
-from src.api.api import app
+from src.api.api import create_app
 from src.config.config_init import FLASK_PORT, FLASK_DEBUG
 
+# Entrypoint for running the Flask application (starts building the chatbot service)
+app = create_app()
+
 if __name__ == "__main__":
     app.run(port=FLASK_PORT, debug=FLASK_DEBUG)
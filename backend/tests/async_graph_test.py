@@ -0,0 +1,261 @@
+# -*- coding: utf-8 -*-
+"""
+async_graph_test.py
+
+Unit test for the async path of the chatbot graph, with fake models and embeddings (no
+internet or API key needed).
+- Checks that ainvoke only awaits the models, embeddings and searches (the fakes fail on
+  any synchronous call) and that concurrent conversations overlap on one event loop (the
+  fake translations wait until every conversation is translating)
+- Checks that the event loop keeps running while the conversations wait on the models (the
+  fake answers wait for a tick of another task); the timings are only printed
+- Checks that ChatbotService.generate_response and generate_response_stream use the
+  async path, the latter streaming the answer of a chat model
+- Checks that the async query methods of the in-memory and Chroma managers return the same
+  sections as the sync ones
+- Checks that a query embedded through the pipeline and the persistent embedding cache
+  awaits the async API of the model on the event loop thread, once per new query
+"""
+
+import asyncio
+import os
+import shutil
+import tempfile
+import threading
+import time
+from typing import Any, List, Optional
+
+from langchain_core.documents import Document
+from langchain_core.embeddings import DeterministicFakeEmbedding
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+from langchain_core.messages import AIMessage
+
+from src.config.config_init import QUESTION_REWRITE_CONFIG
+from tests.fakes import (
+    FakeEmbeddingManager,
+    FakeFlashLLM,
+    FakeModelManager,
+    Service,
+    build_graph,
+)
+
+LATENCY = 0.2  # Seconds of every fake model call
+SESSIONS = 20
+
+
+class AsyncOnly:
+    """Fails on any synchronous call, so the async path is checked to never block."""
+
+    def invoke(self, *args, **kwargs):
+        raise AssertionError("Synchronous call on the async path")
+
+    embed_query = query_local_embeddings_by_vector = query_web_embeddings_by_vector = invoke
+
+
+class Ticker:
+    """Ticks every 10 ms on the event loop, recording the gaps between ticks."""
+
+    def __init__(self) -> None:
+        self.gaps: List[float] = []
+        self._waiters: List[asyncio.Future] = []
+
+    async def run(self, stop: asyncio.Event) -> None:
+        last = time.perf_counter()
+        while not stop.is_set():
+            await asyncio.sleep(0.01)
+            now = time.perf_counter()
+            self.gaps.append(now - last)
+            last = now
+            for waiter in self._waiters:
+                waiter.set_result(None)
+            self._waiters.clear()
+
+    async def next_tick(self) -> None:
+        """Returns after the next tick, so only if the event loop runs the ticker meanwhile."""
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        await asyncio.wait_for(waiter, timeout=10)
+
+
+class SlowFlashLLM(AsyncOnly, FakeFlashLLM):
+    """Translates once `sessions` calls are waiting at the same time (at most 10 seconds)."""
+
+    def __init__(self, sessions: int = 1) -> None:
+        super().__init__()
+        self.sessions = sessions
+        self.barrier: Optional[asyncio.Barrier] = None
+
+    async def ainvoke(self, prompt):
+        if self.barrier is None:
+            self.barrier = asyncio.Barrier(self.sessions)
+        await asyncio.wait_for(self.barrier.wait(), timeout=10)
+        await asyncio.sleep(LATENCY)
+        return await super().ainvoke(prompt)
+
+
+class SlowLLM(AsyncOnly):
+    """Answers once the ticker ticked while the call was waiting."""
+
+    def __init__(self, ticker: Ticker) -> None:
+        self.ticker = ticker
+
+    async def ainvoke(self, messages):
+        await self.ticker.next_tick()
+        await asyncio.sleep(LATENCY)
+        return AIMessage(content=f"Answer to: {messages[-1].content}")
+
+
+class SlowEmbeddingManager(AsyncOnly, FakeEmbeddingManager):
+    async def aembed_query(self, query):
+        await asyncio.sleep(LATENCY / 4)
+        return await super().aembed_query(query)
+
+
+def build(llm: Any, sessions: int = 1):
+    # Every question goes through the (fake) translate LLM
+    return build_graph(
+        FakeModelManager(SlowFlashLLM(sessions), llm),
+        SlowEmbeddingManager(),
+        rewrite_config={**QUESTION_REWRITE_CONFIG, "fast_path": False, "cache_enabled": False},
+    )
+
+
+async def run_sessions(graph, ticker: Ticker) -> float:
+    stop = asyncio.Event()
+    ticking = asyncio.create_task(ticker.run(stop))
+    started = time.perf_counter()
+    answers = await asyncio.gather(
+        *(
+            Service(graph, f"session {n}").generate_response(f"Laredo question {n}")
+            for n in range(SESSIONS)
+        )
+    )
+    elapsed = time.perf_counter() - started
+    stop.set()
+    await ticking
+
+    # Every session was translating at the same time (the fake translations wait for
+    # each other) and the ticker ran while the answers were waiting
+    assert answers == [f"Answer to: Laredo question {n}" for n in range(SESSIONS)], answers[:1]
+    # One after the other, the sessions would take about SESSIONS * 2 * LATENCY
+    print(
+        f"Async path: {SESSIONS} sessions in {elapsed * 1000:.0f} ms "
+        f"(longest event loop gap {max(ticker.gaps) * 1000:.0f} ms)"
+    )
+    return elapsed
+
+
+def check_concurrent_sessions():
+    ticker = Ticker()
+    graph = build(SlowLLM(ticker), sessions=SESSIONS)
+    asyncio.run(run_sessions(graph, ticker))
+    stats = graph.question_rewriter.stats
+    assert stats["paths"]["llm"] == SESSIONS, stats
+
+
+def check_stream():
+    graph = build(FakeListChatModel(responses=["Streamed answer."]))
+
+    async def stream() -> List[str]:
+        service = Service(graph, "stream")
+        return [chunk async for chunk in service.generate_response_stream("Laredo question")]
+
+    chunks = asyncio.run(stream())
+    text = "".join(chunk[len("data: "):-len("\n\n<END_OF_CHUNK>")] for chunk in chunks)
+    assert text == "Streamed answer.", chunks
+    print(f"Stream: {len(chunks)} chunks from the generate_answer node")
+
+
+def check_managers():
+    from src.utils.embedding_manager import EmbeddingManager
+    from src.utils.in_memory_embedding_manager import InMemoryEmbeddingManager
+
+    sections = [
+        Document(page_content=f"Section {n} about estimators", metadata={"source": f"doc_{n}.md"})
+        for n in range(20)
+    ]
+    root = tempfile.mkdtemp()
+    try:
+        managers = [
+            InMemoryEmbeddingManager(DeterministicFakeEmbedding(size=16), sections, sections),
+            EmbeddingManager(
+                DeterministicFakeEmbedding(size=16), sections, sections,
+                persist_directory=os.path.join(root, "database"),
+            ),
+        ]
+        for manager in managers:
+
+            async def query():
+                embedding = await manager.aembed_query("Section 3 about estimators")
+                local, web = await asyncio.gather(
+                    manager.aquery_local_embeddings_by_vector(embedding, 3),
+                    manager.aquery_web_embeddings_by_vector(embedding, 3),
+                )
+                return embedding, local, web
+
+            embedding, local, web = asyncio.run(query())
+            assert embedding == manager.embed_query("Section 3 about estimators")
+            for results, expected in (
+                (local, manager.query_local_embeddings_by_vector(embedding, 3)),
+                (web, manager.query_web_embeddings_by_vector(embedding, 3)),
+            ):
+                assert [r.page_content for r in results] == [r.page_content for r in expected]
+                assert results[0].page_content == "Section 3 about estimators"
+            print(f"{type(manager).__name__}: async queries match the sync ones")
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+class AsyncOnlyEmbeddings(DeterministicFakeEmbedding):
+    """Embeds queries only through the async API, recording the threads it was awaited on."""
+
+    threads: List[str] = []
+
+    def embed_query(self, text: str) -> List[float]:
+        raise AssertionError("Synchronous query embedding on the async path")
+
+    async def aembed_query(self, text: str) -> List[float]:
+        self.threads.append(threading.current_thread().name)
+        return self._get_embedding(seed=self._get_seed(text))
+
+
+def check_wrapped_model():
+    from src.utils.embedding_cache import CachedEmbeddings
+    from src.utils.in_memory_embedding_manager import InMemoryEmbeddingManager
+
+    sections = [Document(page_content=f"Section {n} about estimators") for n in range(5)]
+    model = AsyncOnlyEmbeddings(size=16)
+    with tempfile.TemporaryDirectory() as directory:
+        cache = CachedEmbeddings(model, cache_path=os.path.join(directory, "embeddings.sqlite3"))
+        # The manager wraps the cache in the embedding pipeline
+        manager = InMemoryEmbeddingManager(cache, sections, sections)
+
+        async def query(text: str) -> List[float]:
+            return await manager.aembed_query(text)
+
+        embedding = asyncio.run(query("Section 3 about estimators"))
+        assert embedding == DeterministicFakeEmbedding(size=16).embed_query(
+            "Section 3 about estimators"
+        )
+        assert model.threads == [threading.main_thread().name], model.threads
+
+        # A new query cache misses, but the persistent cache serves the vector
+        manager.query_cache.clear()
+        misses = cache.stats["misses"]
+        cached = asyncio.run(query("Section 3 about estimators"))
+        assert [round(x, 5) for x in cached] == [round(x, 5) for x in embedding]
+        assert len(model.threads) == 1 and cache.stats["misses"] == misses, cache.stats
+        cache.close()
+    print(f"Wrapped model: query awaited on the {model.threads[0]} thread, then cached")
+
+
+def main():
+    check_concurrent_sessions()
+    check_stream()
+    check_managers()
+    check_wrapped_model()
+    print("Async graph tests passed.")
+
+
+if __name__ == "__main__":
+    main()
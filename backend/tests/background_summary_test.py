@@ -0,0 +1,155 @@
+# -*- coding: utf-8 -*-
+"""
+background_summary_test.py
+
+Unit test for the background conversation summaries, with fake models and embeddings (no
+internet or API key needed).
+- Checks that the turn which makes a conversation too long returns while its summary is
+  still blocked, and that the next turn waits for the summary and answers with it
+- Checks that a turn waiting too long for the summary goes on without it, that the late
+  summary is dropped and that a new one replaces it
+- Checks the same through the async path (ChatbotService.generate_response)
+The fake summaries are held back by a gate, so the checks only rely on the order of events
+(the latencies are printed).
+"""
+
+import asyncio
+import threading
+import time
+from typing import Any, Callable, Dict, List
+
+from src.config.config_init import SUMMARY_CONFIG
+from tests.fakes import FakeModelManager, Service, build_graph
+
+# A turn is 13 tokens ("User: How do I use estimator 3?" and "Assistant: Answer 4."):
+# the 4th turn makes a conversation too long and a summary keeps the last turn
+SUMMARY_SETTINGS: Dict[str, Any] = {
+    **SUMMARY_CONFIG,
+    "background": True,
+    "summarize_above_tokens": 45,
+    "recent_tokens": 13,
+    "chars_per_token": 4.0,
+}
+
+
+def build(**settings: Any):
+    models = FakeModelManager()
+    graph = build_graph(models, summary_config={**SUMMARY_SETTINGS, **settings})
+    return graph, models
+
+
+def turn(graph, config: Dict[str, Any], n: int) -> float:
+    """Runs one turn of a conversation and returns its latency in seconds."""
+    started = time.perf_counter()
+    response = graph.invoke({"question": f"How do I use estimator {n}?"}, config)
+    assert response["answer"].startswith("Answer"), response
+    return time.perf_counter() - started
+
+
+def start_turn(graph, config: Dict[str, Any], n: int):
+    """Starts one turn in another thread; its latency is appended to the returned list."""
+    latencies: List[float] = []
+    thread = threading.Thread(target=lambda: latencies.append(turn(graph, config, n)))
+    thread.start()
+    return thread, latencies
+
+
+def wait_for(condition: Callable[[], bool], what: str) -> None:
+    """Waits until a condition holds (failing after 10 seconds)."""
+    deadline = time.perf_counter() + 10
+    while not condition():
+        assert time.perf_counter() < deadline, f"Timed out waiting for {what}"
+        time.sleep(0.01)
+
+
+def check_off_critical_path():
+    graph, models = build()
+    config = {"configurable": {"thread_id": "background"}}
+    for n in range(3):
+        turn(graph, config, n)
+    assert graph.summary_stats["scheduled"] == 0, graph.summary_stats
+
+    # The 4th turn makes the conversation too long: it returns while the summary is blocked
+    models.flash_llm.gate.clear()
+    thread, latencies = start_turn(graph, config, 3)
+    thread.join(timeout=10)
+    assert not thread.is_alive(), "The 4th turn waited for its own summary"
+    assert models.flash_llm.summary_prompts == []
+    state = graph.graph.get_state(config).values
+    assert state.get("summary", "") == "" and len(state["messages"]) == 8, state
+    assert graph.summary_stats["pending"] == 1, graph.summary_stats
+
+    # The 5th turn waits for the summary and answers with it
+    thread, waited = start_turn(graph, config, 4)
+    wait_for(lambda: graph.summary_stats["waited"] == 1, "the 5th turn to wait")
+    assert len(models.llm.prompts) == 4, "The 5th turn answered before the summary"
+    models.flash_llm.gate.set()
+    thread.join(timeout=10)
+    assert not thread.is_alive()
+    assert "Summary 1" in models.llm.prompts[-1], models.llm.prompts[-1]
+    state = graph.graph.get_state(config).values
+    assert state["summary"] == "Summary 1", state
+    assert [m.content for m in state["messages"]] == [
+        "How do I use estimator 3?", "Answer 4.", "How do I use estimator 4?", "Answer 5.",
+    ], state["messages"]
+
+    stats = graph.summary_stats
+    assert stats["scheduled"] == 1 and stats["written"] == 1 and stats["waited"] == 1, stats
+    print(
+        f"4th turn answered in {latencies[0] * 1000:.0f} ms, 5th turn waited for the summary "
+        f"({waited[0] * 1000:.0f} ms): {stats}"
+    )
+
+
+def check_timeout():
+    graph, models = build(wait_seconds=0.1)
+    config = {"configurable": {"thread_id": "timeout"}}
+    for n in range(3):
+        turn(graph, config, n)
+
+    # The summary is never ready in time: the 5th turn answers without it
+    models.flash_llm.gate.clear()
+    turn(graph, config, 3)
+    thread, latencies = start_turn(graph, config, 4)
+    thread.join(timeout=10)
+    assert not thread.is_alive(), "The 5th turn did not give up on the summary"
+    assert models.flash_llm.summary_prompts == []
+    assert "Summary" not in models.llm.prompts[-1], models.llm.prompts[-1]
+    assert graph.summary_stats["abandoned"] == 1, graph.summary_stats
+
+    # The late summary is dropped (it would delete the 5th turn) and a new one replaces it
+    models.flash_llm.gate.set()
+    wait_for(lambda: not graph.summary_stats["pending"], "the pending summaries")
+    state = graph.graph.get_state(config).values
+    assert state["summary"].startswith("Summary"), state
+    assert len(models.flash_llm.summary_prompts) == 2, models.flash_llm.summary_prompts
+    assert [m.content for m in state["messages"]] == ["How do I use estimator 4?", "Answer 5."], state
+    stats = graph.summary_stats
+    assert stats["scheduled"] == 2 and stats["written"] == 1, stats
+    print(f"Summary late: 5th turn answered in {latencies[0] * 1000:.0f} ms without it, {stats}")
+
+
+def check_async():
+    graph, models = build()
+
+    async def conversation() -> List[str]:
+        service = Service(graph, "async")
+        return [await service.generate_response(f"How do I use estimator {n}?") for n in range(5)]
+
+    answers = asyncio.run(conversation())
+    assert answers == [f"Answer {n}." for n in range(1, 6)], answers
+    assert "Summary 1" in models.llm.prompts[-1], models.llm.prompts[-1]
+    state = graph.graph.get_state({"configurable": {"thread_id": "async"}}).values
+    assert state["summary"] == "Summary 1" and len(state["messages"]) == 4, state
+    print(f"Async path: {graph.summary_stats}")
+
+
+def main():
+    check_off_critical_path()
+    check_async()
+    check_timeout()
+    print("Background summary tests passed.")
+
+
+if __name__ == "__main__":
+    main()
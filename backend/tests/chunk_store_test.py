@@ -0,0 +1,142 @@
+# -*- coding: utf-8 -*-
+"""
+chunk_store_test.py
+
+Unit test for the compact ChunkStore (no internet needed).
+- Checks that every section of the docs directory reads back with the same text and metadata
+- Checks the interned source and metadata tables, slicing and chunk ID bounds
+- Checks that a compact NumpyVectorIndex (built or loaded from a bundle) returns the same
+  results as one holding Documents
+- Compares the traced memory of a ChunkStore and a list of Documents
+"""
+
+import shutil
+import tempfile
+import tracemalloc
+from typing import List
+
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+
+from src.utils.chunk_store import ChunkStore
+from src.utils.document_manager import DocumentManager
+from src.utils.index_bundle import IndexBundle
+from src.utils.numpy_vector_index import NumpyVectorIndex
+
+
+class LengthEmbeddings(Embeddings):
+    """Embeds a text as a few character counts, without any remote call."""
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return [self.embed_query(text) for text in texts]
+
+    def embed_query(self, text: str) -> List[float]:
+        return [1.0 + text.count(c) for c in "aeiost"]
+
+
+def web_section(n):
+    page = n // 10
+    return Document(
+        page_content=f"Sección {n} — estimators, ñandú and 日本語 ({'x' * (n % 50)})",
+        metadata={
+            "url": f"https://scikit-learn.org/stable/page_{page}.html",
+            "title": f"Page {page}",
+            "html_content_length": str(1000 + page),
+        },
+    )
+
+
+def check_round_trip(sections):
+    store = ChunkStore(sections)
+    assert len(store) == len(sections)
+    for chunk_id, section in enumerate(sections):
+        document = store[chunk_id]
+        assert document.page_content == section.page_content == store.text(chunk_id)
+        assert document.metadata == section.metadata == store.metadata(chunk_id)
+    assert [d.page_content for d in store[-3:]] == [s.page_content for s in sections[-3:]]
+    assert store[-1].page_content == sections[-1].page_content
+    try:
+        store[len(store)]
+    except IndexError:
+        pass
+    else:
+        raise AssertionError("Reading past the last chunk should raise IndexError")
+
+    # Documents get their own metadata: the shared row cannot be changed through them
+    store[0].metadata["changed"] = True
+    assert "changed" not in store.metadata(0)
+    print(f"Round trip: {len(store)} sections, {store.nbytes} bytes of columns")
+
+
+def check_tables(sections):
+    store = ChunkStore(sections)
+    urls = {s.metadata["url"] for s in sections}
+    assert len(store.sources) == len(urls) == store.metadata_rows
+    assert store.source(25) == sections[25].metadata["url"]
+    assert store.add("No metadata") == len(sections) and store.source(len(sections)) is None
+    # Unhashable metadata values are stored per section
+    chunk_id = store.add("Tagged", {"file_name": "a.md", "tags": ["x", "y"]})
+    assert store[chunk_id].metadata == {"file_name": "a.md", "tags": ["x", "y"]}
+    assert store.source(chunk_id) == "a.md"
+    print(f"Tables: {len(store.sources)} sources, {store.metadata_rows} metadata rows")
+
+
+def check_compact_index(sections):
+    embeddings = LengthEmbeddings()
+    regular = NumpyVectorIndex.from_documents(sections, embeddings, batch_size=64)
+    compact = NumpyVectorIndex.from_documents(
+        iter(sections), embeddings, batch_size=64, compact=True
+    )
+    assert isinstance(compact.documents, ChunkStore)
+
+    queries = [embeddings.embed_query(s.page_content) for s in sections[::13]]
+    expected = regular.similarity_search_by_vectors(queries, k=4)
+    assert compact.similarity_search_by_vectors(queries, k=4) == expected
+
+    bundle_path = tempfile.mkdtemp()
+    try:
+        IndexBundle(bundle_path).write(embeddings, sections, sections[:5])
+        local_store, web_store = IndexBundle(bundle_path).load(embeddings, compact=True)
+    finally:
+        shutil.rmtree(bundle_path, ignore_errors=True)
+    assert isinstance(local_store.documents, ChunkStore) and len(web_store) == 5
+    assert local_store.similarity_search_by_vectors(queries, k=4) == expected
+    print(f"Compact index: {len(queries)} queries match the Document index")
+
+
+def traced_bytes(build):
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        kept = build()
+        return tracemalloc.get_traced_memory()[0] - before, kept
+    finally:
+        tracemalloc.stop()
+
+
+def check_memory():
+    size = 20_000
+    documents_bytes, _ = traced_bytes(lambda: [web_section(n) for n in range(size)])
+    store_bytes, store = traced_bytes(
+        lambda: ChunkStore(web_section(n) for n in range(size))
+    )
+    print(
+        f"Memory for {size} sections: {documents_bytes / 1e6:.2f} MB as Documents, "
+        f"{store_bytes / 1e6:.2f} MB in a ChunkStore"
+    )
+    assert len(store) == size and store_bytes * 2 < documents_bytes
+
+
+def main():
+    local_sections = DocumentManager(directory_path="./docs", split_processes=0).local_sections
+    check_round_trip(local_sections)
+    web_sections = [web_section(n) for n in range(500)]
+    check_round_trip(web_sections)
+    check_tables(web_sections)
+    check_compact_index(local_sections)
+    check_memory()
+    print("ChunkStore tests passed.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+# -*- coding: utf-8 -*-
+"""
+conversation_memory_test.py
+
+Unit test for the token-budgeted conversation memory, with fake models (no internet or
+API key needed).
+- Checks the compact transcript (roles and content, no IDs or metadata) and the token
+  estimate
+- Checks that the recent turns fit the budget as whole turns, that the last turn is always
+  kept and that a conversation is summarized only past the summary budget
+- Checks through the chatbot graph that the answer prompt holds the compact transcript,
+  that only the overflow is summarized and that the recent turns stay verbatim
+"""
+
+from typing import List
+
+from langchain_core.messages import AIMessage, HumanMessage
+
+from src.config.config_init import SUMMARY_CONFIG
+from src.utils.conversation_memory import ConversationMemory
+from tests.fakes import FakeModelManager, build_graph
+
+
+def conversation(turns: int, answer: str = "Answer") -> List:
+    messages = []
+    for n in range(turns):
+        messages.append(HumanMessage(content=f"Question {n}?", id=f"q{n}"))
+        messages.append(
+            AIMessage(content=f"{answer} {n}.", id=f"a{n}", response_metadata={"finish_reason": "STOP"})
+        )
+    return messages
+
+
+def check_render():
+    memory = ConversationMemory()
+    transcript = memory.render(conversation(2))
+    assert transcript == (
+        "User: Question 0?\nAssistant: Answer 0.\nUser: Question 1?\nAssistant: Answer 1."
+    ), transcript
+    assert memory.count_tokens("x" * 9) == 3
+    assert ConversationMemory(count_tokens=lambda text: len(text.split())).count_tokens("a b c") == 3
+    print(f"Transcript of 2 turns: {memory.tokens(conversation(2))} tokens")
+
+
+def check_budgets():
+    # A turn is 10 tokens ("User: Question 0?" and "Assistant: Answer 0.")
+    memory = ConversationMemory(recent_tokens=25, summarize_above_tokens=40)
+    assert memory.tokens(conversation(1)) == 10
+
+    overflow, recent = memory.split(conversation(5))
+    assert [m.id for m in overflow] == ["q0", "a0", "q1", "a1", "q2", "a2"], overflow
+    assert [m.id for m in recent] == ["q3", "a3", "q4", "a4"], recent
+
+    assert not memory.needs_summary(conversation(4))
+    assert memory.needs_summary(conversation(5))
+    assert [m.id for m in memory.prompt_messages(conversation(6))][0] == "q2"
+
+    # The last turn is kept even past the budget, so it is never summarized alone
+    long_turn = conversation(1, answer="Long answer " * 40)
+    overflow, recent = memory.split(long_turn)
+    assert not overflow and recent == long_turn
+    assert not memory.needs_summary(long_turn)
+
+    try:
+        ConversationMemory(recent_tokens=50, summarize_above_tokens=40)
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("recent_tokens larger than summarize_above_tokens accepted")
+    print("Budgets: whole turns kept, last turn always kept, summary past the budget")
+
+
+def check_graph():
+    models = FakeModelManager()
+    # A turn is 13 tokens ("User: How do I use estimator 3?" and "Assistant: Answer 4."):
+    # the 4th turn makes the conversation too long and a summary keeps the last turn
+    graph = build_graph(
+        models,
+        summary_config={
+            **SUMMARY_CONFIG,
+            "background": True,
+            "summarize_above_tokens": 45,
+            "recent_tokens": 13,
+            "chars_per_token": 4.0,
+        },
+    )
+    config = {"configurable": {"thread_id": "memory"}}
+    for n in range(5):
+        graph.invoke({"question": f"How do I use estimator {n}?"}, config)
+
+    # Answer prompts hold the compact transcript only
+    last = models.llm.prompts[-1]
+    assert "User: How do I use estimator 3?\nAssistant: Answer 4." in last, last
+    assert "id=" not in last and "response_metadata" not in last, last
+
+    # The 4th turn overflows the budget: only the turns out of the recent budget are summarized
+    assert len(models.flash_llm.summary_prompts) == 1, models.flash_llm.summary_prompts
+    summarized = models.flash_llm.summary_prompts[0]
+    assert "User: How do I use estimator 2?" in summarized, summarized
+    assert "estimator 3" not in summarized, summarized
+
+    state = graph.graph.get_state(config).values
+    assert state["summary"] == "Summary 1", state
+    assert [m.content for m in state["messages"]] == [
+        "How do I use estimator 3?", "Answer 4.", "How do I use estimator 4?", "Answer 5.",
+    ], state["messages"]
+    print(f"Graph: last answer prompt {len(last)} characters, history {state['messages'][0].content!r}...")
+
+
+def main():
+    check_render()
+    check_budgets()
+    check_graph()
+    print("Conversation memory tests passed.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,310 @@
+# -*- coding: utf-8 -*-
+"""
+document_admin_test.py
+
+Unit test for the admin document endpoints and the DocumentUpdater (no internet needed).
+- Checks the bearer token, the readiness and the validation of the admin requests, and
+  that internal errors are not reported as invalid or missing documents and leave the
+  docs directory unchanged
+- Upserts and deletes local files (written to the docs directory) and web pages given as
+  content through the Flask app, and checks what /chatbot retrieves afterwards
+- Checks that searches running while a document is replaced again and again see either
+  all the old or all the new sections, in the in-memory and the Chroma managers, even
+  when every attempt of a Chroma search overlaps an update
+- Checks that the stored sections of a web page are replaced when only its title changes
+"""
+
+import os
+import shutil
+import tempfile
+import threading
+
+from langchain_core.documents import Document
+
+from src.api.api import create_app
+from src.api.chatbot_service import ChatbotService
+from src.config.config_init import ADMIN_API_CONFIG
+from src.utils.document_manager import DocumentManager
+from src.utils.document_updater import DocumentUpdater
+from src.utils.embedding_manager import SEARCH_ATTEMPTS, EmbeddingManager
+from src.utils.in_memory_embedding_manager import InMemoryEmbeddingManager
+from tests.fakes import KeywordEmbeddings, build_docs, topic_page
+
+TOKEN = "test-admin-token"
+URL = "https://example.org/guide/pipelines.html"
+
+
+class RetrievalService:
+    """Answers with the sources of the retrieved sections instead of calling an LLM."""
+
+    upsert_document = ChatbotService.upsert_document
+    delete_document = ChatbotService.delete_document
+
+    def __init__(self, document_updater, embedding_manager):
+        self.document_updater = document_updater
+        self.embedding_manager = embedding_manager
+
+    async def generate_response(self, question):
+        results = self.embedding_manager.query_embeddings(question, k=1000)
+        return sorted({r.metadata.get("file_name") or r.metadata["url"] for r in results})
+
+
+def admin(client, method, token=TOKEN, **document):
+    headers = {"Authorization": f"Bearer {token}"} if token else {}
+    return client.open("/admin/documents", method=method, json=document, headers=headers)
+
+
+def ask(client, question):
+    response = client.post("/chatbot", json={"question": question})
+    assert response.status_code == 200, response.get_json()
+    return response.get_json()["answer"]
+
+
+def check_access(client, ready):
+    os.environ.pop(ADMIN_API_CONFIG["token_env"], None)
+    assert admin(client, "PUT", collection="local", source="a.md").status_code == 403
+
+    os.environ[ADMIN_API_CONFIG["token_env"]] = TOKEN
+    assert admin(client, "PUT", token=None, collection="local", source="a.md").status_code == 401
+    assert admin(client, "PUT", token="wrong", collection="local", source="a.md").status_code == 401
+    response = admin(client, "PUT", collection="local", source="a.md", content="# A")
+    assert response.status_code == 503 and response.headers["Retry-After"]
+
+    ready.set()
+    for _ in range(200):
+        if client.get("/ready").status_code == 200:
+            break
+        threading.Event().wait(0.01)
+    print("Access: 403 when disabled, 401 without the token, 503 while starting")
+
+
+def check_validation(client):
+    invalid = [
+        {"collection": "local"},
+        {"collection": "cache", "source": "a.md", "content": "# A"},
+        {"collection": "local", "source": "../escape.md", "content": "# A"},
+        {"collection": "local", "source": "/etc/escape.md", "content": "# A"},
+        {"collection": "local", "source": ".git/hidden.md", "content": "# A"},
+        {"collection": "local", "source": "C:/escape.md", "content": "# A"},
+        {"collection": "local", "source": "notes.txt", "content": "# A"},
+        {"collection": "local", "source": "a.md"},
+        {"collection": "local", "source": "a.md", "content": 42},
+        {"collection": "web", "source": "ftp://example.org/a", "content": "# A"},
+    ]
+    for document in invalid:
+        response = admin(client, "PUT", **document)
+        assert response.status_code == 400, (document, response.get_json())
+    print(f"Validation: {len(invalid)} invalid requests rejected with 400")
+
+
+class BrokenManager:
+    """Fails like an internal bug of an embedding manager."""
+
+    def __init__(self, error: Exception) -> None:
+        self._error = error
+
+    def update_local_sources(self, updates):
+        raise self._error
+
+
+def check_internal_errors(client, updater, directory):
+    manager = updater._embedding_manager
+    try:
+        for error in (KeyError("embeddings"), IndexError("row 12"), ValueError("shapes (3,) and (4,)")):
+            updater._embedding_manager = BrokenManager(error)
+            response = admin(client, "PUT", collection="local", source="broken.md", content="# A")
+            assert response.status_code == 500, (error, response.get_json())
+            # A failed update leaves the docs directory as it was
+            assert not os.path.exists(os.path.join(directory, "broken.md"))
+            response = admin(client, "PUT", collection="local", source="regression.md", content="# A")
+            assert response.status_code == 500, (error, response.get_json())
+            with open(os.path.join(directory, "regression.md"), encoding="utf-8") as file:
+                assert file.read() == topic_page("regression")
+    finally:
+        updater._embedding_manager = manager
+    print("Internal errors (KeyError, IndexError, ValueError) answered with 500, files restored")
+
+
+def check_upsert_and_delete(client, directory):
+    response = admin(
+        client, "PUT", collection="local", source="guides/clustering.md",
+        content=topic_page("clustering"),
+    )
+    created = response.get_json()
+    assert response.status_code == 200, created
+    assert created["sections"] > 1 and created["added"] == created["sections"]
+    assert os.path.isfile(os.path.join(directory, "guides", "clustering.md"))
+    assert ask(client, "clustering") == ["guides/clustering.md", "regression.md"]
+
+    # Only the changed paragraph is embedded again
+    text = topic_page("clustering").replace("Paragraph 3 explains", "Paragraph 3 now covers")
+    updated = admin(
+        client, "PUT", collection="local", source="guides/clustering.md", content=text
+    ).get_json()
+    assert 0 < updated["added"] < created["added"] and updated["reused"] > 0, updated
+
+    response = admin(
+        client, "PUT", collection="web", source=URL, content=topic_page("pipelines"),
+        title="Pipelines guide",
+    )
+    assert response.status_code == 200 and response.get_json()["added"] > 0
+    assert URL in ask(client, "pipelines")
+
+    deleted = admin(client, "DELETE", collection="local", source="guides/clustering.md")
+    assert deleted.status_code == 200 and deleted.get_json()["removed"] == updated["sections"]
+    assert not os.path.exists(os.path.join(directory, "guides", "clustering.md"))
+    assert admin(client, "DELETE", collection="local", source="guides/clustering.md").status_code == 404
+    assert admin(client, "DELETE", collection="web", source=URL).status_code == 200
+    assert admin(client, "DELETE", collection="web", source=URL).status_code == 404
+    assert ask(client, "clustering") == ["regression.md"]
+    print(f"Upsert and delete: created {created}, updated {updated}")
+
+
+def search_versions(manager, source, stop, seen, errors):
+    """Searches until stopped, recording the versions of the source found by each search."""
+    while not stop.is_set():
+        try:
+            results = manager.query_local_embeddings_by_vector([0.0, 0.0, 1.0], k=1000)
+        except Exception as e:  # Any failure during an update is a bug
+            errors.append(e)
+            continue
+        seen.append(
+            frozenset(
+                r.page_content.split()[1]
+                for r in results
+                if r.metadata["file_name"] == source and r.page_content.startswith("Version")
+            )
+        )
+
+
+def check_consistent_reads(manager, documents, directory, versions=6):
+    updater = DocumentUpdater(documents, manager, docs_path=directory)
+    source = "guides/versions.md"
+    updater.upsert("local", source, topic_page("pipelines", label="version 0"))
+
+    stop, seen, errors = threading.Event(), [], []
+    searcher = threading.Thread(
+        target=search_versions, args=(manager, source, stop, seen, errors)
+    )
+    searcher.start()
+    try:
+        for version in range(1, versions + 1):
+            # Every section of the page changes in every version
+            content = "\n\n".join(
+                f"Version {version} paragraph {n} explains pipelines with an example."
+                for n in range(120)
+            )
+            updater.upsert("local", source, content)
+    finally:
+        stop.set()
+        searcher.join()
+
+    print(f"{type(manager).__name__}: {len(seen)} searches during {versions} updates, "
+          f"versions seen: {sorted({v for versions_seen in seen for v in versions_seen})}")
+    assert not errors, errors
+    assert all(len(versions_seen) <= 1 for versions_seen in seen), "Mixed versions"
+    results = manager.query_local_embeddings_by_vector([0.0, 0.0, 1.0], k=1000)
+    assert {r.page_content.split()[1] for r in results if r.metadata["file_name"] == source} == {
+        str(versions)
+    }
+
+
+def web_sections(documents, title):
+    page = Document(page_content=topic_page("pipelines"), metadata={"url": URL, "title": title})
+    return documents.split_document(page)
+
+
+def check_metadata_changes(documents, root):
+    """A web page whose title changes while its text does not, in the Chroma manager."""
+    persist_directory = os.path.join(root, "metadata")
+
+    def titles(manager):
+        results = manager.query_web_embeddings_by_vector([0.0, 0.0, 1.0], k=1000)
+        return {r.metadata["title"] for r in results}
+
+    EmbeddingManager(
+        KeywordEmbeddings(), [], web_sections(documents, "Old title"),
+        persist_directory=persist_directory,
+    )
+    # A restart with the new title replaces the stored sections (and their metadata)
+    manager = EmbeddingManager(
+        KeywordEmbeddings(), [], web_sections(documents, "New title"),
+        persist_directory=persist_directory,
+    )
+    assert titles(manager) == {"New title"}, titles(manager)
+
+    # So does an update of the page
+    updater = DocumentUpdater(documents, manager)
+    stats = updater.upsert("web", URL, topic_page("pipelines"), title="Newer title")
+    assert stats["reused"] == 0 and stats["removed"] == stats["added"], stats
+    assert titles(manager) == {"Newer title"}, titles(manager)
+    print(f"Metadata changes: sections replaced on restart and on update ({stats})")
+
+
+def check_exhausted_retries(manager):
+    """A writer changing the hidden sections during every attempt of a search."""
+    name = manager.local_collection_name
+    old = Document(id="old", page_content="Version 1", metadata={"file_name": "busy.md"})
+    new = Document(id="new", page_content="Version 2", metadata={"file_name": "busy.md"})
+    other = Document(id="other", page_content="Other", metadata={"file_name": "other.md"})
+    attempts = []
+
+    def search_visible(collection, embedding, k, hidden):
+        # One update step of busy.md (new sections stored, then swapped) per attempt; the
+        # search read both versions, written after it read the hidden sections
+        attempts.append(hidden)
+        manager._set_hidden_ids(name, frozenset({"new"}))
+        manager._set_hidden_ids(name, frozenset({"old"}))
+        manager._set_hidden_ids(name, frozenset())
+        return [old, new, other]
+
+    manager._search_visible = search_visible
+    try:
+        results = manager.query_local_embeddings_by_vector([0.0, 0.0, 1.0], k=3)
+    finally:
+        del manager._search_visible
+    assert len(attempts) == SEARCH_ATTEMPTS, attempts
+    # busy.md is missing from the results, but they never hold both of its versions
+    assert [r.id for r in results] == ["other"], results
+    print(f"Retries exhausted: {len(attempts)} attempts, results {[r.id for r in results]}")
+
+
+def main():
+    # Importing the API builds nothing: only the app created below starts a service build
+    assert not any(thread.name == "service-loader" for thread in threading.enumerate())
+    root = tempfile.mkdtemp()
+    try:
+        directory = os.path.join(root, "docs")
+        build_docs(directory, {"regression.md": topic_page("regression")})
+        documents = DocumentManager(directory_path=directory, split_processes=0)
+        manager = InMemoryEmbeddingManager(KeywordEmbeddings(), documents.local_sections, [])
+        service = RetrievalService(DocumentUpdater(documents, manager, directory), manager)
+
+        ready = threading.Event()
+
+        def build_service(progress_callback):
+            ready.wait()
+            return service
+
+        client = create_app(service_factory=build_service).test_client()
+        check_access(client, ready)
+        check_validation(client)
+        check_internal_errors(client, service.document_updater, directory)
+        check_upsert_and_delete(client, directory)
+
+        check_consistent_reads(manager, documents, directory)
+        chroma = EmbeddingManager(
+            KeywordEmbeddings(), documents.local_sections, [],
+            persist_directory=os.path.join(root, "database"),
+        )
+        check_consistent_reads(chroma, documents, directory)
+        check_exhausted_retries(chroma)
+        check_metadata_changes(documents, root)
+    finally:
+        os.environ.pop(ADMIN_API_CONFIG["token_env"], None)
+        shutil.rmtree(root, ignore_errors=True)
+    print("Document admin tests passed.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+"""
+embedding_cache_test.py
+
+Unit test for CachedEmbeddings functionality.
+- Wraps a deterministic fake embedding model that counts its calls
+- Checks that repeated texts are served from the on-disk cache
+- Checks LRU eviction and the hit/miss counters, and that replaced vectors are neither
+  counted as new entries nor rewritten along with the new ones
+"""
+
+import tempfile
+import os
+from typing import List
+
+from langchain_core.embeddings import DeterministicFakeEmbedding
+
+from src.utils.embedding_cache import CachedEmbeddings
+
+
+class CountingEmbeddings(DeterministicFakeEmbedding):
+    """Fake embedding model that records how many texts it embedded."""
+
+    embedded_texts: int = 0
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        self.embedded_texts += len(texts)
+        return super().embed_documents(texts)
+
+
+def main():
+    with tempfile.TemporaryDirectory() as directory:
+        cache_path = os.path.join(directory, "embeddings.sqlite3")
+        model = CountingEmbeddings(size=8)
+
+        # First pass embeds every distinct text once
+        cache = CachedEmbeddings(model, cache_path=cache_path, max_entries=3)
+        first = cache.embed_documents(["a", "b", "a"])
+        assert model.embedded_texts == 2
+        print(f"First pass stats: {cache.stats}")
+        cache.close()
+
+        # A new cache instance on the same file serves everything from disk
+        cache = CachedEmbeddings(model, cache_path=cache_path, max_entries=3)
+        second = cache.embed_documents(["a", "b"])
+        assert model.embedded_texts == 2
+        assert [round(x, 5) for x in second[0]] == [round(x, 5) for x in first[0]]
+        print(f"Second pass stats: {cache.stats}")
+
+        # Storing a key again (e.g. two concurrent misses) replaces it without counting it
+        # twice, and only that key is updated
+        statements: List[str] = []
+        cache._connection.set_trace_callback(statements.append)
+        cache._store({cache._key(cache.task_type, text): [0.5] * 8 for text in ("b", "e")})
+        cache._connection.set_trace_callback(None)
+        assert sum(s.startswith("UPDATE") for s in statements) == 1, statements
+        assert cache.stats["entries"] == 3, cache.stats
+        assert cache.embed_documents(["b"]) == [[0.5] * 8]
+
+        # Going over the size limit evicts the least recently used vectors
+        cache.embed_documents(["c", "d"])
+        assert cache.stats["entries"] == 3
+        assert cache.stats["evictions"] == 2
+        print(f"After eviction stats: {cache.stats}")
+
+        cache.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+# -*- coding: utf-8 -*-
+"""
+embedding_pipeline_test.py
+
+Unit test for the batched EmbeddingPipeline, with fake models (no internet needed).
+- Checks that the embeddings keep the input order while batches finish out of order, and
+  that no more batches than the concurrency limit run at the same time
+- Checks that a failing batch is retried after growing backoff delays until it succeeds
+- Checks that the error of a batch is raised once its last attempt failed
+- Checks the grouping of streamed items by iter_batches
+"""
+
+import threading
+import time
+from typing import Dict, List
+
+from langchain_core.embeddings import Embeddings
+
+from src.utils.embedding_pipeline import EmbeddingPipeline, iter_batches
+
+
+class SlowModel(Embeddings):
+    """Embeds "text <n>" as [n]; earlier batches take longer, so they finish last."""
+
+    def __init__(self) -> None:
+        self.running = 0
+        self.max_running = 0
+        self.batches: List[List[str]] = []
+        self._lock = threading.Lock()
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        with self._lock:
+            self.batches.append(texts)
+            self.running += 1
+            self.max_running = max(self.max_running, self.running)
+        first = int(texts[0].split()[1])
+        time.sleep(0.05 / (1 + first))
+        with self._lock:
+            self.running -= 1
+        return [[float(text.split()[1])] for text in texts]
+
+    def embed_query(self, text: str) -> List[float]:
+        return [float(text.split()[1])]
+
+
+class FlakyModel(SlowModel):
+    """Fails the first `failures` attempts of every batch, recording when each attempt ran."""
+
+    def __init__(self, failures: int) -> None:
+        super().__init__()
+        self.failures = failures
+        self.attempts: Dict[str, List[float]] = {}
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        with self._lock:
+            attempts = self.attempts.setdefault(texts[0], [])
+            attempts.append(time.perf_counter())
+            if len(attempts) <= self.failures:
+                raise ConnectionError(f"Attempt {len(attempts)} of {texts[0]} failed")
+        return super().embed_documents(texts)
+
+
+def texts(count: int) -> List[str]:
+    return [f"text {n}" for n in range(count)]
+
+
+def check_order_and_concurrency():
+    model = SlowModel()
+    pipeline = EmbeddingPipeline(model, batch_size=3, max_concurrency=4)
+    embeddings = pipeline.embed_documents(texts(40))
+    assert embeddings == [[float(n)] for n in range(40)], embeddings
+    assert len(model.batches) == 14 and all(len(batch) <= 3 for batch in model.batches)
+    assert 1 < model.max_running <= 4, model.max_running
+    assert pipeline.embed_documents([]) == [] and len(model.batches) == 14
+    print(f"Order: 40 sections in {len(model.batches)} batches, up to {model.max_running} at once")
+
+
+def check_retries():
+    model = FlakyModel(failures=2)
+    pipeline = EmbeddingPipeline(model, batch_size=4, max_concurrency=2, max_retries=3, backoff_base=0.05)
+    assert pipeline.embed_documents(texts(8)) == [[float(n)] for n in range(8)]
+
+    for first, attempts in model.attempts.items():
+        assert len(attempts) == 3, (first, attempts)
+        gaps = [later - earlier for earlier, later in zip(attempts, attempts[1:])]
+        # At least backoff_base * 2 ** attempt (plus a random jitter)
+        assert gaps[0] >= 0.05 and gaps[1] >= 0.1, gaps
+    print(f"Retries: {len(model.attempts)} batches succeeded on their third attempt")
+
+
+def check_exhausted_retries():
+    model = FlakyModel(failures=10)
+    pipeline = EmbeddingPipeline(model, batch_size=4, max_concurrency=1, max_retries=2, backoff_base=0.01)
+    try:
+        pipeline.embed_documents(texts(4))
+    except ConnectionError as e:
+        assert str(e) == "Attempt 3 of text 0 failed", e
+    else:
+        raise AssertionError("The error of the last attempt was not raised")
+    assert len(model.attempts["text 0"]) == 3
+    print("Exhausted retries: the error of the third attempt is raised")
+
+
+def check_iter_batches():
+    streamed = (n for n in range(7))
+    assert list(iter_batches(streamed, 3)) == [[0, 1, 2], [3, 4, 5], [6]]
+    assert list(iter_batches([], 3)) == []
+
+
+def main():
+    check_order_and_concurrency()
+    check_retries()
+    check_exhausted_retries()
+    check_iter_batches()
+    print("Embedding pipeline tests passed.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,202 @@
+# -*- coding: utf-8 -*-
+"""
+fakes.py
+
+Fake models, embeddings and documents shared by the tests (no internet or API key needed).
+- FakeFlashLLM rewrites questions (as they are, or from a table) and summarizes
+  conversations once its gate is open
+- FakeLLM answers "Answer <n>." and records the prompts
+- FakeEmbeddingManager returns one local and one web section naming the searched question
+- build_graph() builds the chatbot graph over the fakes, with the question rewrite cache
+  disabled unless other rewrite settings are given, and Service is a ChatbotService over it
+- KeywordEmbeddings embeds a text by counting topic words and records the embedded texts
+- topic_page() writes a Markdown page about a topic and build_docs() a docs directory
+"""
+
+import asyncio
+import json
+import os
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+from langchain_core.messages import AIMessage
+
+from src.api.chatbot_service import ChatbotService
+from src.config.config_init import QUESTION_REWRITE_CONFIG
+
+TOPICS = ("regression", "clustering", "pipelines")
+
+
+class FakeFlashLLM:
+    """
+    Answers the translate/optimize prompt with the question in English (or the language
+    and rewrite given in `rewrites`) and summary requests with "Summary <n>" once `gate`
+    is set. Records the rewritten questions and the summary prompts.
+    """
+
+    def __init__(self, rewrites: Optional[Dict[str, Tuple[str, str]]] = None) -> None:
+        self.rewrites = rewrites or {}
+        self.questions: List[str] = []
+        self.summary_prompts: List[str] = []
+        self.gate = threading.Event()
+        self.gate.set()
+        self._lock = threading.Lock()
+
+    def invoke(self, prompt):
+        if isinstance(prompt, list):
+            return self.summarize(prompt)
+        return self.rewrite(str(prompt))
+
+    async def ainvoke(self, prompt):
+        if isinstance(prompt, list):
+            return await asyncio.to_thread(self.summarize, prompt)  # Waits for the gate
+        return self.rewrite(str(prompt))
+
+    def rewrite(self, prompt: str) -> AIMessage:
+        question = prompt.split("</question>")[-2].strip()
+        with self._lock:
+            self.questions.append(question)
+        language, rewrite = self.rewrites.get(question, ("en", question))
+        return AIMessage(content=json.dumps({"language": language, "question": rewrite}))
+
+    def summarize(self, messages) -> AIMessage:
+        assert messages[-1].content == "Summarize the conversation.", messages[-1]
+        self.gate.wait()
+        with self._lock:
+            self.summary_prompts.append(messages[0].content)
+            return AIMessage(content=f"Summary {len(self.summary_prompts)}")
+
+
+class FakeLLM:
+    """Answers "Answer <n>." and records every prompt (the message contents, one per line)."""
+
+    def __init__(self) -> None:
+        self.prompts: List[str] = []
+        self._lock = threading.Lock()
+
+    def invoke(self, messages):
+        return self._answer(messages)
+
+    async def ainvoke(self, messages):
+        return self._answer(messages)
+
+    def _answer(self, messages) -> AIMessage:
+        with self._lock:
+            self.prompts.append("\n".join(str(m.content) for m in messages))
+            answer = f"Answer {len(self.prompts)}."
+        return AIMessage(content=answer, response_metadata={"finish_reason": "STOP"})
+
+
+class FakeEmbeddingManager:
+    """Returns one local and one web section naming the searched question, recording the questions."""
+
+    def __init__(self) -> None:
+        self.questions: List[str] = []
+        self.searching = threading.Event()  # Set once a question is embedded
+        self._lock = threading.Lock()
+
+    def embed_query(self, query):
+        return self._embed(query)
+
+    def query_local_embeddings_by_vector(self, embedding, k):
+        return self._sections("local", embedding)
+
+    def query_web_embeddings_by_vector(self, embedding, k):
+        return self._sections("web", embedding)
+
+    async def aembed_query(self, query):
+        return self._embed(query)
+
+    async def aquery_local_embeddings_by_vector(self, embedding, k):
+        return self._sections("local", embedding)
+
+    async def aquery_web_embeddings_by_vector(self, embedding, k):
+        return self._sections("web", embedding)
+
+    def _embed(self, query: str) -> List[float]:
+        with self._lock:
+            self.questions.append(query)
+            position = len(self.questions)
+        self.searching.set()
+        return [float(position)]
+
+    def _sections(self, collection: str, embedding: List[float]) -> List[Document]:
+        with self._lock:
+            question = self.questions[int(embedding[0]) - 1]
+        return [Document(page_content=f"{collection} {question}")]
+
+
+class FakeModelManager:
+    def __init__(self, flash_llm: Any = None, llm: Any = None) -> None:
+        self.flash_llm = flash_llm or FakeFlashLLM()
+        self.llm = llm or FakeLLM()
+
+
+class Service:
+    """A ChatbotService over a graph built with the fakes."""
+
+    generate_response = ChatbotService.generate_response
+    generate_response_stream = ChatbotService.generate_response_stream
+
+    def __init__(self, chatbot_graph, thread_id: str) -> None:
+        self.chatbot_graph = chatbot_graph
+        self.config: Dict[str, Any] = {"configurable": {"thread_id": thread_id}}
+
+
+def build_graph(
+    model_manager: Optional[FakeModelManager] = None,
+    embedding_manager: Optional[Any] = None,
+    **settings: Any,
+):
+    """Builds the chatbot graph over the fakes; `settings` are GraphInitializer arguments."""
+    from src.chatbot.graph_initializer import GraphInitializer
+
+    settings.setdefault("rewrite_config", {**QUESTION_REWRITE_CONFIG, "cache_enabled": False})
+    graph = GraphInitializer(
+        model_manager or FakeModelManager(),  # type: ignore
+        embedding_manager or FakeEmbeddingManager(),  # type: ignore
+        **settings,
+    )
+    graph.build_graph()
+    return graph
+
+
+class KeywordEmbeddings(Embeddings):
+    """Embeds a text by counting topic words, and records every embedded text."""
+
+    def __init__(self) -> None:
+        self.embedded: List[str] = []
+        self._lock = threading.Lock()
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        with self._lock:
+            self.embedded.extend(texts)
+        return [self.embed_query(text) for text in texts]
+
+    def embed_query(self, text: str) -> List[float]:
+        text = text.lower()
+        return [0.01 + text.count(topic) for topic in TOPICS]
+
+
+def topic_page(topic: str, paragraphs: int = 60, label: str = "explains") -> str:
+    """A Markdown page with a title and `paragraphs` short paragraphs about a topic."""
+    return f"# About {topic}\n\n" + "\n\n".join(
+        f"Paragraph {n} {label} {topic} with an example." for n in range(paragraphs)
+    )
+
+
+def write_file(directory: str, file_name: str, text: str) -> None:
+    """Writes a file given by its '/'-separated name relative to the directory."""
+    path = os.path.join(directory, *file_name.split("/"))
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as file:
+        file.write(text)
+
+
+def build_docs(directory: str, files: Dict[str, str]) -> None:
+    """Creates a docs directory holding the given files (by name relative to it)."""
+    os.makedirs(directory, exist_ok=True)
+    for file_name, text in files.items():
+        write_file(directory, file_name, text)
@@ -0,0 +1,199 @@
+# -*- coding: utf-8 -*-
+"""
+hot_reindex_test.py
+
+Unit test for the recursive DirectoryLoader, the DirectoryWatcher and the hot reindexing of
+changed local documents (no internet needed).
+- Checks that Markdown files of subdirectories are found and hidden directories skipped
+- Checks that the polling watcher reports added, modified and removed files
+- Checks that only the sections of a changed file are embedded again, in the in-memory and
+  the Chroma embedding managers, while searches keep running in another thread
+- Checks that serving an index bundle reindexes the local files changed since it was built
+"""
+
+import os
+import shutil
+import tempfile
+import threading
+import time
+
+from src.chatbot.core_initializer import CoreInitializer
+from src.utils.directory_loader import DirectoryLoader
+from src.utils.directory_watcher import DirectoryWatcher
+from src.utils.document_manager import DocumentManager
+from src.utils.embedding_manager import EmbeddingManager
+from src.utils.in_memory_embedding_manager import InMemoryEmbeddingManager
+from src.utils.index_bundle import IndexBundle
+from tests.fakes import KeywordEmbeddings, build_docs, topic_page, write_file
+
+DOCS = {
+    "regression.md": topic_page("regression"),
+    "guides/clustering.md": topic_page("clustering"),
+    "guides/deep/pipelines.md": topic_page("pipelines"),
+    ".git/ignored.md": topic_page("regression"),
+    "guides/notes.txt": "Not Markdown",
+}
+
+
+def check_recursive_listing(directory):
+    loader = DirectoryLoader(directory)
+    files = loader.list_files()
+    print(f"Listed files: {files}")
+    assert files == ["guides/clustering.md", "guides/deep/pipelines.md", "regression.md"]
+    assert DirectoryLoader(directory, recursive=False).list_files() == ["regression.md"]
+    names = sorted(d.metadata["file_name"] for d in loader.iter_documents())
+    assert names == files
+
+
+def check_watcher(directory):
+    reports = []
+    reported = threading.Event()
+
+    def on_change(changed, removed):
+        reports.append((changed, removed))
+        reported.set()
+
+    watcher = DirectoryWatcher(
+        DirectoryLoader(directory),
+        on_change,
+        backend="polling",
+        poll_interval=0.05,
+        debounce=0.0,
+    )
+    assert watcher.check() == ([], [])
+
+    with watcher:
+        time.sleep(0.1)
+        write_file(directory, "guides/new.md", topic_page("clustering", 2))
+        os.remove(os.path.join(directory, "regression.md"))
+        assert reported.wait(5), "The watcher did not report the changes"
+    assert reports == [(["guides/new.md"], ["regression.md"])], reports
+
+    # Same size and content, new modification time: reported as modified
+    path = os.path.join(directory, "guides", "new.md")
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    assert watcher.check() == (["guides/new.md"], [])
+    print(f"Watcher reports: {reports}")
+
+    # Restore the directory for the next checks
+    os.remove(path)
+    write_file(directory, "regression.md", topic_page("regression"))
+
+
+def search_continuously(manager, stop, errors, counts):
+    """Runs searches until stopped, recording failures and the number of results."""
+    while not stop.is_set():
+        try:
+            results = manager.query_local_embeddings_by_vector([0.0, 1.0, 0.0], k=3)
+            counts.append(len(results))
+        except Exception as e:  # Any failure during the swap is a bug
+            errors.append(e)
+
+
+def check_reindex(manager, embeddings, documents, directory):
+    before = len(embeddings.embedded)
+    stop, errors, counts = threading.Event(), [], []
+    searcher = threading.Thread(
+        target=search_continuously, args=(manager, stop, errors, counts)
+    )
+    searcher.start()
+    try:
+        # One paragraph changes and the clustering page no longer talks about clustering
+        text = topic_page("pipelines").replace("Paragraph 3 explains", "Paragraph 3 now covers")
+        write_file(directory, "guides/deep/pipelines.md", text)
+        write_file(directory, "guides/clustering.md", topic_page("regression", 3))
+        updates = documents.split_local_files(
+            ["guides/deep/pipelines.md", "guides/clustering.md"]
+        )
+        updates["regression.md"] = []  # Reported as removed
+        stats = manager.update_local_sources(updates)
+    finally:
+        stop.set()
+        searcher.join()
+
+    embedded = embeddings.embedded[before:]
+    print(f"{type(manager).__name__}: {stats}, embedded {len(embedded)} sections, "
+          f"{len(counts)} searches during the update")
+    assert not errors, errors
+    assert all(count == 3 for count in counts)
+    # Only the changed sections are embedded; unchanged ones keep their vectors
+    assert len(embedded) == stats["added"] and 0 < stats["added"] < stats["removed"]
+    assert stats["reused"] > 0 and all("clustering" not in text for text in embedded)
+
+    results = manager.query_local_embeddings_by_vector([1.0, 1.0, 1.0], k=1000)
+    sources = {r.metadata["file_name"] for r in results}
+    assert sources == {"guides/clustering.md", "guides/deep/pipelines.md"}, sources
+    assert not any("clustering" in r.page_content for r in results)
+    assert any("Paragraph 3 now covers" in r.page_content for r in results)
+
+
+def check_in_memory_reindex(directory):
+    documents = DocumentManager(directory_path=directory, split_processes=0)
+    embeddings = KeywordEmbeddings()
+    manager = InMemoryEmbeddingManager(embeddings, documents.local_sections, [])
+    check_reindex(manager, embeddings, documents, directory)
+
+
+def check_chroma_reindex(directory, persist_directory):
+    documents = DocumentManager(directory_path=directory, split_processes=0)
+    embeddings = KeywordEmbeddings()
+    manager = EmbeddingManager(
+        embeddings, documents.local_sections, [], persist_directory=persist_directory
+    )
+    check_reindex(manager, embeddings, documents, directory)
+
+
+def check_bundle_refresh(directory, bundle_path):
+    embeddings = KeywordEmbeddings()
+    snapshot = DirectoryLoader(directory).snapshot()
+    documents = DocumentManager(directory_path=directory, split_processes=0)
+    IndexBundle(bundle_path).write(embeddings, documents.local_sections, [], local_files=snapshot)
+    assert IndexBundle(bundle_path).local_files() == snapshot
+
+    # Changed while the server was down (e.g. by the admin API before a restart)
+    write_file(directory, "guides/clustering.md", topic_page("regression", 3))
+    os.remove(os.path.join(directory, "guides", "deep", "pipelines.md"))
+
+    core = CoreInitializer(directory, [])
+    core._embedding_manager = InMemoryEmbeddingManager.from_bundle(embeddings, bundle_path)
+    core._document_updater = core._create_document_updater()
+    before = len(embeddings.embedded)
+    stats = core._refresh_bundle_local_files(bundle_path)
+    print(f"Bundle refresh: {stats}, embedded {len(embeddings.embedded) - before} sections")
+
+    results = core.embedding_manager.query_local_embeddings_by_vector([1.0, 1.0, 1.0], k=1000)
+    assert {r.metadata["file_name"] for r in results} == {"guides/clustering.md", "regression.md"}
+    assert not any("clustering" in r.page_content or "pipelines" in r.page_content for r in results)
+    assert len(embeddings.embedded) - before == stats["added"] > 0
+
+    # Nothing changed since: the bundle is served as it is
+    IndexBundle(bundle_path).write(
+        embeddings, documents.local_sections, [], local_files=DirectoryLoader(directory).snapshot()
+    )
+    assert core._refresh_bundle_local_files(bundle_path) == {"added": 0, "removed": 0, "reused": 0}
+
+
+def main():
+    root = tempfile.mkdtemp()
+    try:
+        directory = os.path.join(root, "docs")
+        build_docs(directory, DOCS)
+        check_recursive_listing(directory)
+        check_watcher(directory)
+        check_in_memory_reindex(directory)
+
+        shutil.rmtree(directory)
+        build_docs(directory, DOCS)
+        check_chroma_reindex(directory, os.path.join(root, "database"))
+
+        shutil.rmtree(directory)
+        build_docs(directory, DOCS)
+        check_bundle_refresh(directory, os.path.join(root, "bundle"))
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+    print("Hot reindex tests passed.")
+
+
+if __name__ == "__main__":
+    main()
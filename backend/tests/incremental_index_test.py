@@ -0,0 +1,115 @@
+# -*- coding: utf-8 -*-
+"""
+incremental_index_test.py
+
+Unit test for the incremental indexing of the Chroma EmbeddingManager across restarts,
+with keyword embeddings (no internet or API key needed).
+- Checks that a restart with unchanged sources embeds nothing and reuses every section
+- Checks the sections added, updated, removed and reused after sources were edited,
+  added and removed, and that only the new sections are embedded
+- Checks that reused sections whose position changed get their new slot (on restart and
+  on an update while running), so a later edit of one of them counts as an update
+"""
+
+import os
+import shutil
+import tempfile
+from typing import Dict, List
+
+from langchain_core.documents import Document
+
+from src.utils.embedding_manager import EmbeddingManager
+from src.utils.section_hashing import SECTION_SLOT_KEY
+from tests.fakes import KeywordEmbeddings
+
+COLLECTION = "local_documents"
+
+
+def paragraphs(topic: str, count: int) -> List[str]:
+    return [f"Paragraph {n} explains {topic} with an example." for n in range(count)]
+
+
+def sections(sources: Dict[str, List[str]]) -> List[Document]:
+    return [
+        Document(page_content=text, metadata={"file_name": file_name})
+        for file_name, texts in sources.items()
+        for text in texts
+    ]
+
+
+def restart(sources, persist_directory):
+    """Starts a manager over the persisted database; returns its sync stats and embedded texts."""
+    embeddings = KeywordEmbeddings()
+    manager = EmbeddingManager(
+        embeddings, sections(sources), [], persist_directory=persist_directory, incremental=True
+    )
+    return manager, manager.sync_stats[COLLECTION], embeddings.embedded
+
+
+def stored_slots(manager) -> Dict[str, str]:
+    stored = manager.local_collection.get(include=["documents", "metadatas"])
+    return {
+        text: metadata[SECTION_SLOT_KEY]
+        for text, metadata in zip(stored["documents"], stored["metadatas"])
+    }
+
+
+def main():
+    root = tempfile.mkdtemp()
+    try:
+        persist_directory = os.path.join(root, "database")
+        sources = {
+            "regression.md": paragraphs("regression", 10),
+            "clustering.md": paragraphs("clustering", 5),
+            "pipelines.md": paragraphs("pipelines", 5),
+        }
+        _, stats, embedded = restart(sources, persist_directory)
+        assert stats == {"added": 20, "updated": 0, "removed": 0, "reused": 0}, stats
+        assert len(embedded) == 20
+
+        _, stats, embedded = restart(sources, persist_directory)
+        assert stats == {"added": 0, "updated": 0, "removed": 0, "reused": 20}, stats
+        assert embedded == []
+        print(f"Unchanged restart: {stats}")
+
+        # One paragraph edited, one inserted first (the others move down), a file
+        # removed and one added
+        sources["regression.md"][3] = "Paragraph 3 now covers regression differently."
+        sources["clustering.md"].insert(0, "An introduction to clustering.")
+        del sources["pipelines.md"]
+        sources["estimators.md"] = paragraphs("estimators", 3)
+        manager, stats, embedded = restart(sources, persist_directory)
+        print(f"Changed restart: {stats}, embedded {len(embedded)} sections")
+        assert stats == {"added": 4, "updated": 1, "removed": 5, "reused": 14}, stats
+        assert sorted(embedded) == sorted(
+            ["Paragraph 3 now covers regression differently.", "An introduction to clustering."]
+            + paragraphs("estimators", 3)
+        )
+        slots = stored_slots(manager)
+        assert len(slots) == 4 + 1 + 14
+        for file_name, texts in sources.items():
+            for position, text in enumerate(texts):
+                assert slots[text] == f"{file_name}#{position}", (text, slots[text])
+
+        # The moved paragraph now sits at position 3: editing it is an update
+        sources["clustering.md"][3] = "Paragraph 2 now covers clustering differently."
+        manager, stats, embedded = restart(sources, persist_directory)
+        assert stats == {"added": 0, "updated": 1, "removed": 0, "reused": 18}, stats
+        assert embedded == ["Paragraph 2 now covers clustering differently."]
+        print(f"Edit of a moved section: {stats}")
+
+        # Sections moved by an update while running get their new slot as well
+        sources["estimators.md"].insert(0, "An introduction to estimators.")
+        estimators = sections({"estimators.md": sources["estimators.md"]})
+        stats = manager.update_local_sources({"estimators.md": estimators})
+        assert stats == {"added": 1, "removed": 0, "reused": 3}, stats
+        slots = stored_slots(manager)
+        for position, text in enumerate(sources["estimators.md"]):
+            assert slots[text] == f"estimators.md#{position}", (text, slots[text])
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+    print("Incremental index tests passed.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+# -*- coding: utf-8 -*-
+"""
+index_bundle_test.py
+
+Unit test for the prebuilt IndexBundle (no internet needed).
+- Writes a bundle and loads it back, with Documents and with ChunkStores, checking the
+  texts, the metadata and the search results, and that the matrices are read-only
+  memory-mapped files
+- Checks that an empty collection loads as an empty index
+- Checks that a bundle of another embedding model or format version is rejected with a
+  ValueError, and a missing bundle or manifest with a FileNotFoundError
+"""
+
+import json
+import os
+import shutil
+import tempfile
+
+import numpy as np
+from langchain_core.documents import Document
+from langchain_core.embeddings import DeterministicFakeEmbedding
+
+from src.utils.index_bundle import MANIFEST_FILE, IndexBundle
+from src.utils.numpy_vector_index import NumpyVectorIndex
+from tests.fakes import TOPICS, KeywordEmbeddings
+
+QUERIES = ([1.0, 0.0, 0.0], [0.0, 1.0, 0.0], [0.2, 0.3, 1.0])
+
+
+def local_sections():
+    return [
+        Document(
+            page_content=f"Sección {n}: {TOPICS[n % 3]} and {TOPICS[n % 2]} — ñandú",
+            metadata={"file_name": f"guides/{TOPICS[n % 3]}.md", "Header 1": f"Título {n}"},
+        )
+        for n in range(30)
+    ]
+
+
+def expect_error(error, call):
+    try:
+        call()
+    except error as e:
+        return e
+    raise AssertionError(f"Expected {error.__name__}")
+
+
+def check_round_trip(bundle_path):
+    embeddings = KeywordEmbeddings()
+    sections = local_sections()
+    manifest = IndexBundle(bundle_path).write(embeddings, sections, [])
+    assert manifest["collections"] == {
+        "local": {"sections": 30, "dimension": 3},
+        "web": {"sections": 0, "dimension": 0},
+    }, manifest
+    assert sorted(os.listdir(os.path.dirname(bundle_path))) == ["bundle"]  # No leftovers
+
+    vectors = embeddings.embed_documents([section.page_content for section in sections])
+    reference = NumpyVectorIndex(embeddings, sections, np.asarray(vectors))
+    for compact in (False, True):
+        local, web = IndexBundle(bundle_path).load(embeddings, compact=compact)
+        assert [(d.page_content, d.metadata) for d in local.documents] == [
+            (s.page_content, s.metadata) for s in sections
+        ]
+        for query in QUERIES:
+            found = local.similarity_search_with_score_by_vector(query, k=5)
+            expected = reference.similarity_search_with_score_by_vector(query, k=5)
+            assert [(d.page_content, d.metadata) for d, _ in found] == [
+                (d.page_content, d.metadata) for d, _ in expected
+            ]
+            assert np.allclose([s for _, s in found], [s for _, s in expected])
+
+        # The matrix is the file itself, mapped read-only
+        assert isinstance(local.matrix, np.memmap) and not local.matrix.flags.writeable
+        expect_error(ValueError, lambda: local.matrix.__setitem__((0, 0), 1.0))
+
+        # The empty web collection loads as an empty index
+        assert len(web) == 0 and web.dimension == 0
+        assert web.similarity_search_by_vector(QUERIES[0], k=5) == []
+    print(f"Round trip: {len(sections)} local sections, empty web collection")
+
+
+def check_rejected(bundle_path):
+    expect_error(ValueError, lambda: IndexBundle(bundle_path).load(DeterministicFakeEmbedding(size=3)))
+
+    manifest_path = os.path.join(bundle_path, MANIFEST_FILE)
+    with open(manifest_path, encoding="utf-8") as file:
+        manifest = json.load(file)
+    with open(manifest_path, "w", encoding="utf-8") as file:
+        json.dump({**manifest, "format_version": 0}, file)
+    error = expect_error(ValueError, lambda: IndexBundle(bundle_path).load(KeywordEmbeddings()))
+    print(f"Rejected: other embedding model and format version ({error})")
+
+    # A bundle whose manifest is missing is incomplete
+    os.remove(manifest_path)
+    assert not IndexBundle(bundle_path).exists()
+    expect_error(FileNotFoundError, lambda: IndexBundle(bundle_path).load(KeywordEmbeddings()))
+    expect_error(FileNotFoundError, lambda: IndexBundle(bundle_path).local_files())
+    missing = os.path.join(os.path.dirname(bundle_path), "missing")
+    expect_error(FileNotFoundError, lambda: IndexBundle(missing).load(KeywordEmbeddings()))
+    print("Missing bundle or manifest: FileNotFoundError")
+
+
+def main():
+    root = tempfile.mkdtemp()
+    try:
+        bundle_path = os.path.join(root, "bundle")
+        check_round_trip(bundle_path)
+        check_rejected(bundle_path)
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+    print("Index bundle tests passed.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+# -*- coding: utf-8 -*-
+"""
+low_memory_test.py
+
+Unit test for the low-memory ingestion mode (no internet needed).
+- Checks that low-memory sections match the regular ones and that raw documents are released
+- Checks that the sections of a document share one metadata dict
+- Checks that handing the sections over leaves no reference in the DocumentManager
+- Compares the traced memory held by both modes with the MemoryProfiler
+"""
+
+import os
+import shutil
+import tempfile
+
+from src.utils.document_manager import DocumentManager
+from src.utils.memory_profiler import MemoryProfiler
+
+CORPUS_FILES = 120
+
+
+def section_keys(sections):
+    return sorted((s.metadata["file_name"], s.page_content) for s in sections)
+
+
+def check_low_memory_sections():
+    regular = DocumentManager(directory_path="./docs", split_processes=0)
+    low = DocumentManager(directory_path="./docs", split_processes=0, low_memory=True)
+
+    print(f"Sections: {len(regular.local_sections)} regular, {len(low.local_sections)} low-memory")
+    assert section_keys(low.local_sections) == section_keys(regular.local_sections)
+    assert regular.local_documents and not low.local_documents
+
+    by_file = {}
+    for section in low.local_sections:
+        by_file.setdefault(section.metadata["file_name"], []).append(section)
+    for sections in by_file.values():
+        assert all(s.metadata is sections[0].metadata for s in sections)
+    # Regular sections each hold their own copy
+    file_name = max(by_file, key=lambda name: len(by_file[name]))
+    copies = [s.metadata for s in regular.local_sections if s.metadata["file_name"] == file_name]
+    assert len({id(metadata) for metadata in copies}) == len(copies) > 1
+
+
+def check_hand_over():
+    manager = DocumentManager(directory_path="./docs", split_processes=0, low_memory=True)
+    expected = section_keys(manager.local_sections)
+    local_sections, web_sections = manager.hand_over_sections()
+
+    assert section_keys(local_sections) == expected and web_sections == []
+    assert manager.local_sections == [] and manager.local_documents == []
+    print(f"Handed over {len(local_sections)} sections")
+
+
+def build_corpus(directory):
+    """Writes copies of the documentation so metadata overhead is measurable."""
+    sources = [name for name in sorted(os.listdir("./docs")) if name.endswith(".md")]
+    for n in range(CORPUS_FILES):
+        source = sources[n % len(sources)]
+        shutil.copy(os.path.join("./docs", source), os.path.join(directory, f"{n}_{source}"))
+
+
+def check_memory_report(directory):
+    profiler = MemoryProfiler()
+    profiler.start()
+    try:
+        with profiler.measure("regular"):
+            regular = DocumentManager(directory_path=directory, split_processes=0)
+        del regular
+        profiler.record("released")
+        with profiler.measure("low_memory"):
+            low = DocumentManager(
+                directory_path=directory, split_processes=0, low_memory=True
+            )
+    finally:
+        profiler.stop()
+
+    report = profiler.report()
+    print(profiler.format_report())
+    held_regular = report["regular"]["current_mib"] - report["released"]["current_mib"]
+    held_low = report["low_memory"]["current_mib"] - report["released"]["current_mib"]
+    print(f"Held: {held_regular:.2f} MiB regular, {held_low:.2f} MiB low-memory "
+          f"({len(low.local_sections)} sections)")
+    assert 0 < held_low < held_regular
+    assert not profiler.enabled
+
+
+def main():
+    check_low_memory_sections()
+    check_hand_over()
+    directory = tempfile.mkdtemp()
+    try:
+        build_corpus(directory)
+        check_memory_report(directory)
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+    print("All low-memory checks passed.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+# -*- coding: utf-8 -*-
+"""
+markdown_cleaner_test.py
+
+Golden-output test for MarkdownCleaner (the plain-words cleaning of DocumentManager).
+- Splits every Markdown file in the docs directory like DocumentManager does
+- Checks that each cleaned section matches tests/golden/plain_sections.json, which was
+  recorded with the previous chain of regular expressions
+- Checks hand-written edge cases (badge links, tables, nested lists, tabs, unclosed code)
+"""
+
+import glob
+import json
+import os
+
+from langchain.text_splitter import MarkdownTextSplitter
+
+from src.config.config_init import MARKDOWN_SPLITTER_CONFIG
+from src.utils.markdown_cleaner import MarkdownCleaner
+
+GOLDEN_PATH = os.path.join(os.path.dirname(__file__), "golden", "plain_sections.json")
+
+
+def main():
+    with open(GOLDEN_PATH, encoding="utf-8") as file:
+        golden = json.load(file)
+    splitter = MarkdownTextSplitter(**MARKDOWN_SPLITTER_CONFIG)
+
+    paths = sorted(glob.glob("./docs/*.md"))
+    assert sorted(os.path.basename(path) for path in paths) == sorted(golden["docs"])
+    total = 0
+    for path in paths:
+        with open(path, encoding="utf-8") as file:
+            sections = splitter.split_text(file.read())
+        expected = golden["docs"][os.path.basename(path)]
+        assert len(sections) == len(expected), f"Section count changed for {path}"
+        for index, (section, output) in enumerate(zip(sections, expected)):
+            assert MarkdownCleaner.clean(section) == output, f"{path} section {index}"
+        total += len(sections)
+    print(f"{total} sections from {len(paths)} documents match the golden output.")
+
+    for case in golden["edge_cases"]:
+        assert MarkdownCleaner.clean(case["input"]) == case["output"], case["input"]
+    print(f"{len(golden['edge_cases'])} edge cases match the golden output.")
+    print("MarkdownCleaner tests passed.")
+
+
+if __name__ == "__main__":
+    main()
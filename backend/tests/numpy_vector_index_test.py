@@ -0,0 +1,122 @@
+# -*- coding: utf-8 -*-
+"""
+numpy_vector_index_test.py
+
+Unit test for the NumpyVectorIndex (no internet needed).
+- Checks that single and batched top-k searches return the same documents and scores as
+  langchain's InMemoryVectorStore, also when k is larger than the index
+- Checks that tied scores keep the first indexed documents, in index order, also at the
+  k-th place
+- Checks the searches of an empty index and of an empty batch
+"""
+
+from typing import Dict, List, Sequence
+
+import numpy as np
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+from langchain_core.vectorstores import InMemoryVectorStore
+
+from src.utils.numpy_vector_index import NumpyVectorIndex
+
+DIMENSION = 16
+
+
+class TableEmbeddings(Embeddings):
+    """Embeds each text as the vector given for it, without any remote call."""
+
+    def __init__(self, vectors: Dict[str, List[float]]) -> None:
+        self.vectors = vectors
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return [self.vectors[text] for text in texts]
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.vectors[text]
+
+
+def build(vectors: Sequence[Sequence[float]]):
+    """Returns a NumpyVectorIndex and an InMemoryVectorStore over the same sections."""
+    texts = [f"Section {n}" for n in range(len(vectors))]
+    embeddings = TableEmbeddings({text: list(map(float, v)) for text, v in zip(texts, vectors)})
+    documents = [Document(page_content=text) for text in texts]
+    store = InMemoryVectorStore(embeddings)
+    if documents:
+        store.add_documents(documents, ids=texts)
+    return NumpyVectorIndex.from_documents(documents, embeddings), store
+
+
+def results(pairs):
+    return [(doc.page_content, score) for doc, score in pairs]
+
+
+def assert_same(found, expected):
+    """Same documents, and the same scores up to the float32 precision of the index."""
+    assert [text for text, _ in found] == [text for text, _ in expected], (found, expected)
+    assert np.allclose([s for _, s in found], [s for _, s in expected], atol=1e-5)
+
+
+def check_matches_store():
+    rng = np.random.default_rng(0)
+    index, store = build(rng.standard_normal((200, DIMENSION)))
+    queries = rng.standard_normal((10, DIMENSION)).tolist()
+    for k in (1, 4, 25, 200, 500):
+        batched = index.similarity_search_with_score_by_vectors(queries, k)
+        for query, batch in zip(queries, batched):
+            expected = results(store.similarity_search_with_score_by_vector(query, k))
+            assert_same(results(index.similarity_search_with_score_by_vector(query, k)), expected)
+            assert_same(results(batch), expected)
+        assert [[doc.page_content for doc in docs] for docs in index.similarity_search_by_vectors(queries, k)] == [
+            [text for text, _ in results(batch)] for batch in batched
+        ]
+    assert len(index.similarity_search_by_vector(queries[0], 500)) == 200
+    print("Random vectors: same documents and scores as InMemoryVectorStore for k up to 500")
+
+
+def check_ties():
+    # Sections 0, 2, 4, ... and 1, 3, 5, ... have the same vectors
+    first, second = [1.0] + [0.0] * (DIMENSION - 1), [0.6, 0.8] + [0.0] * (DIMENSION - 2)
+    index, store = build([first if n % 2 == 0 else second for n in range(40)])
+
+    for k in (1, 3, 20, 21, 25, 40):
+        found = results(index.similarity_search_with_score_by_vector(first, k))
+        expected = results(store.similarity_search_with_score_by_vector(first, k))
+        # Same scores; the store orders tied sections arbitrarily, the index by position
+        assert np.allclose([s for _, s in found], [s for _, s in expected], atol=1e-5), k
+        assert [text for text, _ in found] == [
+            f"Section {n}" for n in list(range(0, 40, 2)) + list(range(1, 40, 2))
+        ][:k], (k, found)
+        if k >= 20:  # The whole group of best sections is returned by both
+            assert {text for text, _ in found[:20]} == {text for text, _ in expected[:20]}
+
+    # Every row of a batch gets the first tied sections
+    assert [[doc.page_content for doc in docs] for docs in index.similarity_search_by_vectors([second, first], 2)] == [
+        ["Section 1", "Section 3"],
+        ["Section 0", "Section 2"],
+    ]
+    print("Ties: the first indexed sections are kept, in index order")
+
+
+def check_empty():
+    index, store = build([])
+    query = [1.0] * DIMENSION
+    assert len(index) == 0 and index.dimension == 0
+    assert index.similarity_search_with_score_by_vector(query, 4) == []
+    assert store.similarity_search_with_score_by_vector(query, 4) == []
+    assert index.similarity_search_by_vectors([query, query], 4) == [[], []]
+
+    index, _ = build(np.eye(DIMENSION))
+    assert index.similarity_search_by_vectors([], 4) == []
+    assert index.similarity_search_by_vector(query, 0) == []
+    print("Empty index and empty batch: no results")
+
+
+def main():
+    check_matches_store()
+    check_ties()
+    check_empty()
+    print("NumPy vector index tests passed.")
+
+
+if __name__ == "__main__":
+    main()
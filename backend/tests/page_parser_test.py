@@ -0,0 +1,57 @@
+# -*- coding: utf-8 -*-
+"""
+page_parser_test.py
+
+Equivalence test of the PageParser backends on saved documentation pages.
+- Parses every page in tests/sample_pages with the reference "html.parser" backend
+- Checks that the "lxml" and "article" backends produce the same Markdown and metadata
+- Checks that pages without an article are rejected by every backend
+- Checks the article scan on nested articles, single-quoted and multi-class attributes
+"""
+
+import glob
+import os
+
+from src.utils.page_parser import PageParser
+
+SAMPLE_PAGES = os.path.join(os.path.dirname(__file__), "sample_pages")
+
+
+def main():
+    reference = PageParser("html.parser")
+    backends = {name: PageParser(name) for name in ("lxml", "article")}
+
+    paths = sorted(glob.glob(os.path.join(SAMPLE_PAGES, "*.html")))
+    assert paths, f"No sample pages in {SAMPLE_PAGES}"
+    for path in paths:
+        with open(path, encoding="utf-8") as file:
+            html = file.read()
+        url = f"https://example.org/{os.path.basename(path)}"
+        expected = reference.parse(html, url)
+        for name, parser in backends.items():
+            document = parser.parse(html, url)
+            assert document == expected, f"{name} differs from html.parser on {path}"
+        status = expected.metadata["title"] if expected else "no article"
+        print(f"{os.path.basename(path)}: identical on all backends ({status})")
+
+    # The scan balances nested articles and ignores articles without the class
+    html = (
+        "<article class='x'>a</article><ARTICLE class='main bd-article'>"
+        "<article><article>b</article></article>c</ARTICLE><article class=bd-article>d"
+    )
+    span = PageParser._find_article_span(html)
+    assert span is not None
+    assert html[span[0] : span[1]].endswith("c</ARTICLE>")
+    assert PageParser._find_article_span("<article class='bd-articles'></article>") is None
+    assert PageParser._find_article_span("<article class=bd-article>unclosed") is None
+
+    try:
+        PageParser("regex")
+        raise AssertionError("Unknown backends must be rejected")
+    except ValueError:
+        pass
+    print("PageParser tests passed.")
+
+
+if __name__ == "__main__":
+    main()
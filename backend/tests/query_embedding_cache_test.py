@@ -0,0 +1,112 @@
+# -*- coding: utf-8 -*-
+"""
+query_embedding_cache_test.py
+
+Unit test for the QueryEmbeddingCache, with a manual clock (no internet needed).
+- Checks that questions differing in Unicode form or whitespace (and in case, if
+  enabled) share one entry and are embedded in their normalized form
+- Checks the LRU eviction and the expiration of entries older than the TTL
+- Checks the async lookup and the hit, miss, eviction and expiration counters
+"""
+
+import asyncio
+from typing import List
+
+from src.utils.query_embedding_cache import QueryEmbeddingCache
+
+
+class ManualClock:
+    """A clock that only moves when told to."""
+
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class CountingModel:
+    """Embeds a text as its length, recording the embedded texts."""
+
+    def __init__(self) -> None:
+        self.embedded: List[str] = []
+
+    def embed(self, text: str) -> List[float]:
+        self.embedded.append(text)
+        return [float(len(text))]
+
+    async def aembed(self, text: str) -> List[float]:
+        await asyncio.sleep(0)
+        return self.embed(text)
+
+
+def check_normalization():
+    cache, model = QueryEmbeddingCache(), CountingModel()
+    # Fullwidth letters and a non-breaking space are NFKC variants of the same question
+    for question in ("¿Qué es Laredo?", "  ¿Qué   es\tLaredo?\n", "¿Ｑｕé es Laredo?"):
+        assert cache.get_or_compute(question, model.embed) == [15.0]
+    assert model.embedded == ["¿Qué es Laredo?"], model.embedded
+    cache.get_or_compute("¿qué es laredo?", model.embed)
+    assert len(model.embedded) == 2  # Case matters by default
+
+    cache = QueryEmbeddingCache(lowercase=True)
+    assert cache.normalize(" ¿QUÉ  es Laredo? ") == "¿qué es laredo?"
+    print(f"Normalization: {cache.normalize('¿Ｑｕé  es Laredo?')!r}")
+
+
+def check_eviction_and_expiration():
+    clock, model = ManualClock(), CountingModel()
+    cache = QueryEmbeddingCache(max_entries=2, ttl_seconds=60.0, clock=clock)
+    cache.get_or_compute("a", model.embed)
+    cache.get_or_compute("bb", model.embed)
+    cache.get_or_compute("a", model.embed)  # "a" is now the most recently used
+    cache.get_or_compute("ccc", model.embed)  # Evicts "bb"
+    assert cache.get("a") is not None and cache.get("bb") is None
+    assert model.embedded == ["a", "bb", "ccc"]
+
+    clock.now = 60.0  # Exactly the TTL: still valid
+    assert cache.get("ccc") == [3.0]
+    clock.now = 60.5  # The TTL counts from when an entry was stored, not last read
+    assert cache.get("a") is None
+    cache.get_or_compute("ccc", model.embed)
+    assert model.embedded == ["a", "bb", "ccc", "ccc"]
+    clock.now = 100.0
+    assert cache.get("ccc") == [3.0]
+
+    stats = cache.stats
+    assert stats == {
+        "hits": 4,
+        "misses": 6,
+        "hit_rate": 0.4,
+        "evictions": 1,
+        "expirations": 2,
+        "entries": 1,
+    }, stats
+    cache.clear()
+    assert cache.stats["entries"] == 0 and cache.stats["hits"] == 4
+    print(f"Eviction and expiration: {stats}")
+
+
+def check_async():
+    cache, model = QueryEmbeddingCache(ttl_seconds=None), CountingModel()
+
+    async def ask(question: str) -> List[float]:
+        return await cache.aget_or_compute(question, model.aembed)
+
+    assert asyncio.run(ask(" Laredo ")) == [6.0]
+    assert asyncio.run(ask("Laredo")) == [6.0]
+    assert cache.get_or_compute("Laredo", model.embed) == [6.0]
+    assert model.embedded == ["Laredo"]
+    assert cache.stats["hits"] == 2 and cache.stats["misses"] == 1, cache.stats
+    print(f"Async lookups: {cache.stats}")
+
+
+def main():
+    check_normalization()
+    check_eviction_and_expiration()
+    check_async()
+    print("Query embedding cache tests passed.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,178 @@
+# -*- coding: utf-8 -*-
+"""
+question_rewrite_test.py
+
+Unit test for the LanguageDetector, the QuestionRewriteCache and the QuestionRewriter
+(no internet or API key needed).
+- Checks the detected language of questions in several languages and scripts, and that no
+  non-English question takes the fast path
+- Checks the fast path, cache and LLM paths and their metrics, with a fake LLM
+- Checks that rewrites persist across cache instances and depend on the fingerprint
+- Runs the chatbot graph with fake models and checks when the Flash LLM is called
+"""
+
+import json
+import os
+import shutil
+import tempfile
+from typing import List
+
+from langchain_core.messages import AIMessage
+
+from src.config.config_init import QUESTION_REWRITE_CONFIG
+from src.utils.language_detector import LanguageDetector
+from src.utils.question_rewrite_cache import QuestionRewriteCache
+from src.utils.question_rewriter import QuestionRewriter
+from tests.fakes import FakeFlashLLM, FakeModelManager, build_graph
+
+ENGLISH = [
+    "How do I tune max_depth in a RandomForestClassifier?",
+    "What is SVC",
+    "what does fit do",
+    "Is there a way to export the model?",
+    "How can I use a pipeline with a scaler?",
+    "Which kernel should I use for text data?",
+    "What is the difference between bagging and boosting?",
+    "Can you show me an example of cross validation?",
+]
+OTHER = {
+    "¿Cómo configuro un proyecto en Laredo?": "es",
+    "como instalo el modelo": "es",
+    "que es un pipeline": "es",
+    "donde esta la documentacion de sklearn": "es",
+    "qué es un árbol de decisión": "es",
+    "Comment utiliser le classifieur SVC ?": "fr",
+    "Wie kann ich die Pipeline verwenden?": "de",
+    "Come si usa il classificatore?": "it",
+    "Como faço para usar o classificador?": "pt",
+    "Hoe gebruik ik de pipeline?": "nl",
+    "サポートベクターマシンとは何ですか": "ja",
+    "什么是随机森林": "zh",
+    "Что такое SVM?": "ru",
+    "서포트 벡터 머신이란?": "ko",
+}
+TRANSLATIONS = {
+    "¿Cómo configuro un proyecto en Laredo?": "How do I configure a project in the Laredo application?",
+    "como instalo el modelo": "How do I install the model?",
+    "How do I install laredo?": "How do I install the Laredo software application?",
+}
+
+
+class TableLLM:
+    """Answers the translate/optimize prompt from a table and records the prompts."""
+
+    def __init__(self) -> None:
+        self.prompts: List[str] = []
+
+    def invoke(self, prompt):
+        self.prompts.append(str(prompt))
+        for question, translation in TRANSLATIONS.items():
+            if question in str(prompt):
+                language = "en" if question.startswith("How") else "es"
+                return AIMessage(content=json.dumps({"language": language, "question": translation}))
+        if "Summarize" in str(prompt):
+            return AIMessage(content="Summary.")
+        return AIMessage(content="I cannot answer with JSON.")
+
+
+def check_detector():
+    detector = LanguageDetector()
+    for question, expected in OTHER.items():
+        language, confidence = detector.detect(question)
+        assert language == expected, (question, language, confidence)
+    for question in ENGLISH:
+        assert detector.detect(question)[0] == "en", question
+    assert detector.detect("RandomForestClassifier max_depth") == ("en", 0.0)
+    assert detector.detect("1234 ?") == ("en", 0.0)
+
+    rewriter = QuestionRewriter(lambda question: "")
+    fast = [q for q in ENGLISH if rewriter.is_fast_path(q)]
+    assert not [q for q in OTHER if rewriter.is_fast_path(q)]
+    assert len(fast) == len(ENGLISH), set(ENGLISH) - set(fast)
+    print(f"Detector: {len(OTHER)} non-English questions detected, "
+          f"{len(fast)}/{len(ENGLISH)} English questions take the fast path")
+
+
+def check_paths(cache_path):
+    llm = TableLLM()
+    cache = QuestionRewriteCache(cache_path, fingerprint="v1")
+    rewriter = QuestionRewriter(
+        lambda question: llm.invoke(question).content, cache=cache, llm_keywords=["laredo"]
+    )
+
+    assert json.loads(rewriter.rewrite("  What is SVC ")) == {"language": "en", "question": "What is SVC"}
+    spanish = "¿Cómo configuro un proyecto en Laredo?"
+    first = json.loads(rewriter.rewrite(spanish))
+    assert first == {"language": "es", "question": TRANSLATIONS[spanish]}
+    assert json.loads(rewriter.rewrite(spanish + "  ")) == first  # Normalized: cache hit
+    # English, but the prompt clarifies what Laredo is
+    assert "software application" in rewriter.rewrite("How do I install laredo?")
+    # Invalid LLM answers are returned as they are and not cached
+    assert rewriter.rewrite("Was ist ein Modell?") == "I cannot answer with JSON."
+    assert rewriter.rewrite("Was ist ein Modell?") == "I cannot answer with JSON."
+    assert len(llm.prompts) == 4
+
+    stats = rewriter.stats
+    print(f"Paths: {stats}")
+    assert stats["paths"] == {"fast_path": 1, "cache": 1, "llm": 4}
+    assert stats["llm_failures"] == 2 and stats["languages"] == {"en": 2, "es": 2}
+    assert stats["cache"]["entries"] == 2 and stats["cache"]["hits"] == 1
+    # Storing a question again replaces its rewrite without counting it twice
+    cache.put(spanish, first["question"], "es")
+    assert cache.stats["entries"] == 2, cache.stats
+    cache.close()
+
+
+def check_persistence(cache_path):
+    cache = QuestionRewriteCache(cache_path, fingerprint="v1", max_entries=3)
+    assert cache.get("como instalo el modelo") is None
+    assert cache.get("¿Cómo configuro un proyecto en Laredo?") == (
+        TRANSLATIONS["¿Cómo configuro un proyecto en Laredo?"], "es"
+    )
+    cache.put("q1", "Q1", "es")
+    cache.put("q2", "Q2", "fr")
+    assert cache.stats["entries"] == 3 and cache.stats["evictions"] == 1
+    cache.close()
+
+    other = QuestionRewriteCache(cache_path, fingerprint="v2")
+    assert other.get("q2") is None
+    other.close()
+    print("Persistence: rewrites survive a new cache instance, only for the same fingerprint")
+
+
+def check_graph(cache_path):
+    flash_llm = FakeFlashLLM({"como instalo el modelo": ("es", "How do I install the model?")})
+    graph = build_graph(
+        FakeModelManager(flash_llm),
+        rewrite_config={**QUESTION_REWRITE_CONFIG, "cache_path": cache_path},
+    )
+    config = {"configurable": {"thread_id": "1"}}
+
+    def ask(question):
+        return graph.graph.invoke({"question": question}, config)["answer"]
+
+    assert ask("What is the difference between bagging and boosting?") == "Answer 1."
+    assert flash_llm.questions == []
+    ask("como instalo el modelo")
+    ask("como instalo el modelo")
+    assert flash_llm.questions == ["como instalo el modelo"]
+    stats = graph.question_rewriter.stats
+    assert stats["paths"] == {"fast_path": 1, "cache": 1, "llm": 1}, stats
+    print(f"Graph: Flash LLM called {len(flash_llm.questions)} time(s) for 3 questions")
+
+
+def main():
+    root = tempfile.mkdtemp()
+    try:
+        cache_path = os.path.join(root, "question_rewrites.sqlite3")
+        check_detector()
+        check_paths(cache_path)
+        check_persistence(cache_path)
+        check_graph(os.path.join(root, "graph_rewrites.sqlite3"))
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+    print("Question rewrite tests passed.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+# -*- coding: utf-8 -*-
+"""
+section_stream_test.py
+
+Unit test for the streaming document pipeline (no internet needed).
+- Checks that streamed local sections, split on splitter processes, match the sections
+  split up front on the loading thread
+- Serves documentation pages from a local HTTP server, one of them slow
+- Checks that web sections are yielded while the slow page is still being fetched
+- Checks that embedding starts before the crawl finishes
+"""
+
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from langchain_core.embeddings import Embeddings
+
+from src.config.config_init import HTTP_CACHE_CONFIG, WEB_LOADER_CONFIG
+from src.utils.document_manager import DocumentManager
+from src.utils.numpy_vector_index import NumpyVectorIndex
+
+PAGE = (
+    "<html><head><title>Page {n}</title></head><body>"
+    '<article class="bd-article"><h1>Page {n}</h1>'
+    + "<p>Paragraph {n} with <em>some</em> text about estimators.</p>" * 60
+    + "</article></body></html>"
+)
+SLOW_PAGE_DELAY = 1.5
+
+
+class PageHandler(BaseHTTPRequestHandler):
+    """Serves numbered pages; '/slow' answers after SLOW_PAGE_DELAY seconds."""
+
+    protocol_version = "HTTP/1.1"
+    slow_served_at = 0.0
+
+    def do_GET(self):
+        if self.path == "/slow":
+            time.sleep(SLOW_PAGE_DELAY)
+            PageHandler.slow_served_at = time.perf_counter()
+        body = PAGE.format(n=self.path.strip("/")).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class RecordingEmbeddings(Embeddings):
+    """Returns constant vectors and records when the first batch was embedded."""
+
+    first_call_at = 0.0
+
+    def embed_documents(self, texts):
+        if not RecordingEmbeddings.first_call_at:
+            RecordingEmbeddings.first_call_at = time.perf_counter()
+        return [[1.0, float(len(text))] for text in texts]
+
+    def embed_query(self, text):
+        return [1.0, 0.0]
+
+
+def check_local_sections():
+    eager = DocumentManager(directory_path="./docs", split_processes=0)
+    with DocumentManager(directory_path="./docs", stream=True, split_processes=2) as manager:
+        streamed = list(manager.iter_local_sections())
+
+    key = lambda section: (section.metadata["file_name"], section.page_content)
+    print(f"Local sections: {len(eager.local_sections)} up front, {len(streamed)} streamed")
+    assert sorted(map(key, streamed)) == sorted(map(key, eager.local_sections))
+    assert not manager.local_documents  # Raw documents are not kept when streaming
+
+
+def check_web_sections(urls):
+    started = time.perf_counter()
+    with DocumentManager(web_paths=urls, stream=True, split_processes=0) as manager:
+        sections = manager.iter_web_sections()
+        first = next(sections)
+        first_at = time.perf_counter()
+        rest = list(sections)
+
+    print(
+        f"Web sections: {1 + len(rest)}, first after {first_at - started:.2f}s, "
+        f"slow page served after {PageHandler.slow_served_at - started:.2f}s"
+    )
+    assert first.metadata["title"].startswith("Page")
+    assert first_at < PageHandler.slow_served_at
+    assert any(section.metadata["title"] == "Page slow" for section in rest)
+
+
+def check_embedding_overlap(urls):
+    PageHandler.slow_served_at = 0.0
+    started = time.perf_counter()
+    with DocumentManager(web_paths=urls, stream=True, split_processes=0) as manager:
+        index = NumpyVectorIndex.from_documents(
+            manager.iter_web_sections(), RecordingEmbeddings(), batch_size=4
+        )
+
+    print(
+        f"Indexed {len(index)} sections, first batch embedded after "
+        f"{RecordingEmbeddings.first_call_at - started:.2f}s"
+    )
+    assert RecordingEmbeddings.first_call_at < PageHandler.slow_served_at
+
+
+def main():
+    check_local_sections()
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), PageHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    urls = [f"{base}/slow"] + [f"{base}/{n}" for n in range(5)]
+
+    # Fetch and parse on plain threads, without touching the persistent HTTP cache
+    saved = dict(WEB_LOADER_CONFIG), dict(HTTP_CACHE_CONFIG)
+    WEB_LOADER_CONFIG["parse_processes"] = 0
+    HTTP_CACHE_CONFIG["enabled"] = False
+    try:
+        check_web_sections(urls)
+        check_embedding_overlap(urls)
+        print("Section streaming tests passed.")
+    finally:
+        WEB_LOADER_CONFIG.update(saved[0])
+        HTTP_CACHE_CONFIG.update(saved[1])
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+# -*- coding: utf-8 -*-
+"""
+service_loader_test.py
+
+Unit test for the background build of the chatbot service and the readiness endpoints,
+with a stub service built phase by phase (no internet or API key needed).
+- Checks that /hello answers while the service is being built, and that /ready, /chatbot
+  and /chatbot/stream answer 503 with a Retry-After header until it is ready
+- Checks that /status reports every build phase with its progress, then the readiness
+- Checks that a failed build is reported by /status with its error, and that /ready and
+  /chatbot keep answering 503 (without Retry-After)
+"""
+
+import queue
+import threading
+import time
+from typing import Any, Callable, Optional
+
+from src.api.api import create_app
+from src.api.service_loader import PHASES
+from src.config.config_init import SERVICE_RETRY_AFTER_SECONDS
+
+TIMEOUT = 10  # Seconds to wait for the build thread
+
+
+class StubService:
+    """Answers every question without any model."""
+
+    async def generate_response(self, question: str) -> str:
+        return f"Answer to {question}"
+
+    async def generate_response_stream(self, question: str):
+        for word in ("Answer", "to", question):
+            yield f"data: {word}\n\n<END_OF_CHUNK>"
+
+
+class SteppedFactory:
+    """Builds the service one phase per `step()`, then returns it or raises `error`."""
+
+    def __init__(self, error: Optional[Exception] = None) -> None:
+        self.error = error
+        self.reached: "queue.Queue[str]" = queue.Queue()
+        self._steps = threading.Semaphore(0)
+
+    def __call__(self, progress_callback: Callable[[str], None]) -> Any:
+        for phase in PHASES:
+            progress_callback(phase)
+            self.reached.put(phase)
+            assert self._steps.acquire(timeout=TIMEOUT), f"Not released after {phase}"
+        if self.error is not None:
+            raise self.error
+        return StubService()
+
+    def step(self) -> str:
+        """Lets the build go on and returns the next phase it reached."""
+        self._steps.release()
+        return self.reached.get(timeout=TIMEOUT)
+
+    def finish(self) -> None:
+        """Lets the build go past its last phase."""
+        self._steps.release()
+
+
+def wait_for_status(client, phase: str) -> dict:
+    deadline = time.monotonic() + TIMEOUT
+    while time.monotonic() < deadline:
+        status = client.get("/status").get_json()
+        if status["phase"] == phase:
+            return status
+        time.sleep(0.01)
+    raise AssertionError(f"The build did not reach {phase}: {status}")
+
+
+def check_starting(client):
+    assert client.get("/hello").status_code == 200
+    for response in (
+        client.get("/ready"),
+        client.post("/chatbot", json={"question": "Laredo?"}),
+        client.post("/chatbot/stream", json={"question": "Laredo?"}),
+    ):
+        assert response.status_code == 503, response.get_json()
+        assert response.headers["Retry-After"] == str(SERVICE_RETRY_AFTER_SECONDS)
+        body = response.get_json()
+        assert body["error"] == "The chatbot is starting up" and not body["status"]["ready"]
+
+
+def check_build():
+    factory = SteppedFactory()
+    client = create_app(service_factory=factory).test_client()
+
+    assert factory.reached.get(timeout=TIMEOUT) == PHASES[0]
+    progress = []
+    for position, phase in enumerate(PHASES):
+        status = client.get("/status").get_json()
+        assert status["phase"] == phase and not status["ready"] and status["error"] is None
+        assert status["progress"] == round(position / len(PHASES), 2), status
+        progress.append(status["progress"])
+        check_starting(client)
+        if position + 1 < len(PHASES):
+            assert factory.step() == PHASES[position + 1]
+    factory.finish()
+
+    status = wait_for_status(client, "ready")
+    assert status["ready"] and status["progress"] == 1.0 and status["error"] is None
+    assert status["elapsed_seconds"] > 0 and "startup_ms" in status
+    assert client.get("/ready").get_json() == {"ready": True}
+    response = client.post("/chatbot", json={"question": "Laredo?"})
+    assert response.status_code == 200 and response.get_json() == {"answer": "Answer to Laredo?"}
+    response = client.post("/chatbot/stream", json={"question": "Laredo?"})
+    assert response.status_code == 200 and response.get_data(as_text=True).count("<END_OF_CHUNK>") == 3
+    print(f"Build: progress {progress} through {PHASES}, then ready")
+
+
+def check_failed_build():
+    factory = SteppedFactory(RuntimeError("No API key found"))
+    client = create_app(service_factory=factory).test_client()
+    assert factory.reached.get(timeout=TIMEOUT) == PHASES[0]
+    assert [factory.step() for _ in PHASES[1:]] == PHASES[1:]
+    factory.finish()
+
+    status = wait_for_status(client, "failed")
+    assert not status["ready"] and status["error"] == "No API key found", status
+    for response in (client.get("/ready"), client.post("/chatbot", json={"question": "Laredo?"})):
+        assert response.status_code == 503 and "Retry-After" not in response.headers
+        assert response.get_json()["error"] == "The chatbot failed to start"
+    print(f"Failed build: {status}")
+
+
+def main():
+    check_build()
+    check_failed_build()
+    print("Service loader tests passed.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+# -*- coding: utf-8 -*-
+"""
+speculative_search_test.py
+
+Unit test for the speculative search of the chatbot graph, with fake models and
+embeddings (no internet or API key needed).
+- Checks that the search on the raw question runs while the question is translated
+- Checks that the results are kept when the rewrite is nearly the same, searched again
+  when it differs, and not speculated for non-English questions
+- Checks the metrics, and that the graph searches only after translating when disabled
+"""
+
+from typing import List
+
+from src.config.config_init import SPECULATIVE_SEARCH_CONFIG
+from tests.fakes import FakeEmbeddingManager, FakeFlashLLM, FakeModelManager, build_graph
+
+REWRITES = {
+    "How do I install laredo?": ("en", "How do I install Laredo?"),
+    "What is SVC in laredo": (
+        "en",
+        "What is a Support Vector Classifier (SVC) in scikit-learn and how is it used in the Laredo application?",
+    ),
+    "como instalo el modelo": ("es", "How do I install the model?"),
+}
+
+
+class OverlapFlashLLM(FakeFlashLLM):
+    """Rewrites questions from REWRITES, waiting until a search started (at most 2 seconds)."""
+
+    def __init__(self, embedding_manager: FakeEmbeddingManager) -> None:
+        super().__init__(REWRITES)
+        self.embedding_manager = embedding_manager
+        self.overlapped: List[bool] = []
+
+    def rewrite(self, prompt):
+        # True if the raw question was embedded while this call was running
+        self.overlapped.append(self.embedding_manager.searching.wait(timeout=2))
+        return super().rewrite(prompt)
+
+
+def build(enabled: bool):
+    embedding_manager = FakeEmbeddingManager()
+    flash_llm = OverlapFlashLLM(embedding_manager)
+    graph = build_graph(
+        FakeModelManager(flash_llm),
+        embedding_manager,
+        speculation_config={**SPECULATIVE_SEARCH_CONFIG, "enabled": enabled},
+    )
+    return graph, flash_llm, embedding_manager
+
+
+def ask(graph, embedding_manager, question: str) -> List[str]:
+    """Asks a question in a new conversation and returns the contents of the context used."""
+    embedding_manager.questions.clear()
+    embedding_manager.searching.clear()
+    config = {"configurable": {"thread_id": question}}
+    response = graph.graph.invoke({"question": question}, config)
+    return [document.page_content for document in response["documents"]]
+
+
+def check_similarity():
+    from src.chatbot.graph_initializer import GraphInitializer
+
+    similarity = GraphInitializer._question_similarity
+    assert similarity("How do I install laredo?", "How do I install Laredo") == 1.0
+    assert similarity("What is SVC", "What is SVC?") == 1.0
+    assert similarity("What is SVC", "What is a Support Vector Classifier (SVC)?") < 0.8
+    assert similarity("", "What is SVC") == 0.0
+
+
+def check_speculation():
+    graph, flash_llm, embedding_manager = build(enabled=True)
+
+    # Fast path: the rewrite is the question itself
+    context = ask(graph, embedding_manager, "What does the fit method do?")
+    assert embedding_manager.questions == ["What does the fit method do?"]
+    assert context == ["local What does the fit method do?", "web What does the fit method do?"]
+
+    # LLM rewrite nearly the same: the speculative results are kept
+    context = ask(graph, embedding_manager, "How do I install laredo?")
+    assert flash_llm.overlapped == [True], "The search did not run during the translation"
+    assert embedding_manager.questions == ["How do I install laredo?"]
+    assert context == ["local How do I install laredo?", "web How do I install laredo?"]
+
+    # LLM rewrite different: searched again with the rewrite
+    context = ask(graph, embedding_manager, "What is SVC in laredo")
+    rewrite = REWRITES["What is SVC in laredo"][1]
+    assert embedding_manager.questions == ["What is SVC in laredo", rewrite]
+    assert context == [f"local {rewrite}", f"web {rewrite}"]
+
+    # Non-English: no speculation, only the translation is searched
+    context = ask(graph, embedding_manager, "como instalo el modelo")
+    assert embedding_manager.questions == ["How do I install the model?"]
+
+    stats = graph.speculative_search_stats
+    print(f"Speculative search: {stats}")
+    assert (stats["kept"], stats["requeried"], stats["skipped"]) == (2, 1, 1)
+    assert abs(stats["keep_rate"] - 2 / 3) < 1e-9
+
+
+def check_disabled():
+    graph, flash_llm, embedding_manager = build(enabled=False)
+    context = ask(graph, embedding_manager, "How do I install laredo?")
+    assert flash_llm.overlapped == [False]
+    assert embedding_manager.questions == ["How do I install Laredo?"]
+    assert context == ["local How do I install Laredo?", "web How do I install Laredo?"]
+    stats = graph.speculative_search_stats
+    assert not stats["enabled"] and stats["kept"] + stats["requeried"] + stats["skipped"] == 0
+    print("Disabled: the rewritten question is searched after the translation")
+
+
+def main():
+    check_similarity()
+    check_speculation()
+    check_disabled()
+    print("Speculative search tests passed.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+"""
+startup_profiler_test.py
+
+Unit test for the lazy imports and the StartupProfiler.
+- Imports the Flask API, the API service, the core initializer and the index CLI in a
+  fresh interpreter
+- Checks that no model provider, vector store, graph or HTML library was imported and
+  that no thread (the background service build) was started
+- Checks that the profiler accumulates steps and formats the report
+"""
+
+import subprocess
+import sys
+import time
+
+from src.utils.startup_profiler import StartupProfiler
+
+LIGHT_MODULES = [
+    "src.api.api",
+    "src.api.chatbot_service",
+    "src.api.service_loader",
+    "src.chatbot.core_initializer",
+    "src.build_index",
+]
+HEAVY_MODULES = [
+    "langchain_google_genai",
+    "langchain_chroma",
+    "chromadb",
+    "langgraph",
+    "bs4",
+    "markdownify",
+]
+
+
+def main():
+    # Import in a fresh interpreter, so modules loaded by this test do not count
+    script = (
+        "import sys, threading, time\n"
+        "started = time.perf_counter()\n"
+        f"for name in {LIGHT_MODULES!r}: __import__(name)\n"
+        "print(round((time.perf_counter() - started) * 1000))\n"
+        f"print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))\n"
+        "print(','.join(t.name for t in threading.enumerate() if t is not threading.main_thread()))\n"
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", script], capture_output=True, text=True, check=True
+    ).stdout.splitlines()
+    print(f"Import time: {output[0]} ms, heavy modules loaded: {output[1] or 'none'}")
+    assert output[1] == ""
+    # Importing the API does not start building the chatbot service
+    assert output[2:] in ([], [""]), output[2:]
+
+    profiler = StartupProfiler()
+    with profiler.measure("models"):
+        time.sleep(0.01)
+    profiler.record("models.import", 4.0)
+    profiler.record("keys", 1.0)
+    profiler.record("keys", 1.5)
+
+    report = profiler.report()
+    print(profiler.format_report())
+    assert list(report) == ["models", "models.import", "keys"]
+    assert report["models"] >= 10.0
+    assert report["keys"] == 2.5
+    # Nested steps are not added to the total twice
+    assert f"(total {report['models'] + 2.5:.1f} ms)" in profiler.format_report()
+
+    profiler.reset()
+    assert profiler.report() == {}
+    print("Startup profiler tests passed.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,231 @@
+# -*- coding: utf-8 -*-
+"""
+web_loader_test.py
+
+Unit test for WebLoader functionality against a local HTTP server (no internet needed).
+- Serves gzip-compressed documentation pages over keep-alive connections
+- Checks that pages are converted to Markdown documents with their metadata
+- Checks the per-host concurrency cap, the pool sizes and the reuse of pooled connections
+- Checks that transient errors are retried and missing pages are not
+- Prints the per-URL latency and bytes reported by the loader
+- Checks that the HTTP cache revalidates pages (ETag) without parsing them again
+- Checks that the offline mode serves every page from the cache
+- Checks that a change of parser settings parses the cached pages again
+- Checks that the asyncio engine (AsyncWebLoader) loads the same documents
+- Checks that parsing in parser processes gives the same documents
+"""
+
+import gzip
+import os
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from src.utils.async_web_loader import AsyncWebLoader
+from src.utils.http_cache import HttpCache
+from src.utils.web_loader import WebLoader
+
+PAGE = (
+    "<html><head><title>Page {n}</title></head><body>"
+    '<nav>menu</nav><article class="bd-article"><h1>Page {n}</h1>'
+    "<p>Content of page {n}. " + "Some filler text. " * 200 + "</p>"
+    '<section id="gallery-examples"><p>gallery</p></section>'
+    "</article></body></html>"
+)
+MAX_CONNECTIONS_PER_HOST = 3
+
+
+class PageHandler(BaseHTTPRequestHandler):
+    """Serves numbered pages; '/flaky' fails once with 503 and '/missing' is a 404."""
+
+    protocol_version = "HTTP/1.1"  # Keep connections alive
+    lock = threading.Lock()
+    active = 0
+    max_active = 0
+    connections = set()
+    flaky_requests = 0
+
+    def do_GET(self):
+        cls = PageHandler
+        with cls.lock:
+            cls.active += 1
+            cls.max_active = max(cls.max_active, cls.active)
+            cls.connections.add(self.client_address)
+        try:
+            time.sleep(0.02)
+            if self.path == "/missing":
+                return self._send(404, b"not found")
+            if self.path == "/flaky":
+                with cls.lock:
+                    cls.flaky_requests += 1
+                    first = cls.flaky_requests == 1
+                if first:
+                    return self._send(503, b"busy", {"Retry-After": "0"})
+            etag = f'"{self.path.strip("/")}-v1"'
+            if self.headers.get("If-None-Match") == etag:
+                return self._send(304, b"", {"ETag": etag})
+            body = PAGE.format(n=self.path.strip("/")).encode("utf-8")
+            if "gzip" in self.headers.get("Accept-Encoding", ""):
+                return self._send(
+                    200, gzip.compress(body), {"Content-Encoding": "gzip", "ETag": etag}
+                )
+            return self._send(200, body, {"ETag": etag})
+        finally:
+            with cls.lock:
+                cls.active -= 1
+
+    def _send(self, status, body, headers=None):
+        self.send_response(status)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        if status != 304:
+            self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class CountingWebLoader(WebLoader):
+    """WebLoader that counts the pages it parses."""
+
+    parsed = 0
+
+    def _parse_document(self, html_content, url):
+        CountingWebLoader.parsed += 1
+        return super()._parse_document(html_content, url)
+
+
+def check_http_cache(urls):
+    with tempfile.TemporaryDirectory() as directory:
+        http_cache = HttpCache(os.path.join(directory, "http.sqlite3"))
+
+        # First run fetches and parses everything, second run only revalidates
+        runs = []
+        for _ in range(2):
+            CountingWebLoader.parsed = 0
+            with CountingWebLoader(urls, http_cache=http_cache) as loader:
+                documents = loader.get_documents()
+            parsed = CountingWebLoader.parsed
+            runs.append((documents, loader.cache_stats, parsed))
+            print(f"HTTP cache run: {loader.cache_stats}, parsed {parsed}")
+
+        (first, first_stats, first_parsed), (second, second_stats, second_parsed) = runs
+        assert first_stats["new"] == len(urls) and first_parsed == len(urls)
+        assert second_stats["not_modified"] == len(urls) and second_parsed == 0
+        contents = lambda docs: sorted(d.page_content for d in docs)
+        assert contents(first) == contents(second)
+
+        # Offline mode: served from the cache without any request
+        with CountingWebLoader(urls, http_cache=http_cache, offline=True) as loader:
+            offline = loader.get_documents()
+        print(f"Offline run: {loader.cache_stats}")
+        assert loader.cache_stats["offline_hits"] == len(urls)
+        assert loader.fetch_stats == []
+        assert contents(offline) == contents(first)
+
+        # Another parser backend does not reuse the cached documents: the cached bodies
+        # are parsed again (without downloading them) and stored for the next run
+        for reparsed in (len(urls), 0):
+            CountingWebLoader.parsed = 0
+            with CountingWebLoader(urls, http_cache=http_cache, parser_backend="article") as loader:
+                documents = loader.get_documents()
+            print(f"Parser change run: {loader.cache_stats}, parsed {CountingWebLoader.parsed}")
+            assert loader.cache_stats["not_modified"] == len(urls)
+            assert loader.cache_stats["reparsed"] == reparsed
+            assert CountingWebLoader.parsed == reparsed
+            assert len(documents) == len(urls)
+        assert http_cache.get(urls[0])["parser"] == loader._page_parser.fingerprint
+        http_cache.close()
+
+
+def check_async_loader(urls, base, expected):
+    with PageHandler.lock:
+        PageHandler.max_active = 0
+        PageHandler.flaky_requests = 0
+    with AsyncWebLoader(
+        urls,
+        max_concurrency=16,
+        max_connections_per_host=MAX_CONNECTIONS_PER_HOST,
+        max_retries=2,
+        backoff_base=0.01,
+    ) as loader:
+        documents = loader.get_documents()
+        stats = {entry["url"]: entry for entry in loader.fetch_stats}
+
+    print(
+        f"Async engine: {len(documents)} documents, "
+        f"max concurrent requests: {PageHandler.max_active}"
+    )
+    assert sorted(d.page_content for d in documents) == expected
+    assert PageHandler.max_active <= MAX_CONNECTIONS_PER_HOST
+    assert stats[f"{base}/flaky"]["attempts"] == 2
+    assert stats[f"{base}/missing"]["attempts"] == 1
+
+
+def check_parser_processes(urls, expected):
+    with WebLoader(urls, parse_processes=2) as loader:
+        documents = loader.get_documents()
+    print(f"Parser processes: {len(documents)} documents")
+    assert sorted(d.page_content for d in documents) == expected
+
+
+def main():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), PageHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    urls = [f"{base}/{n}" for n in range(30)] + [f"{base}/flaky", f"{base}/missing"]
+
+    try:
+        with WebLoader(
+            urls,
+            max_workers=8,
+            max_connections_per_host=MAX_CONNECTIONS_PER_HOST,
+            max_pooled_hosts=2,
+            max_retries=2,
+            backoff_base=0.01,
+        ) as loader:
+            documents = loader.get_documents()
+            stats = {entry["url"]: entry for entry in loader.fetch_stats}
+            adapter = loader._get_session().get_adapter(base)
+            assert adapter._pool_connections == 2  # type: ignore
+            assert adapter._pool_maxsize == MAX_CONNECTIONS_PER_HOST  # type: ignore
+
+        print(f"Loaded {len(documents)} documents")
+        assert len(documents) == 31
+        document = next(d for d in documents if d.metadata["url"] == f"{base}/7")
+        assert document.metadata["title"] == "Page 7"
+        assert "# Page 7" in document.page_content
+        assert "gallery" not in document.page_content
+
+        print(
+            f"Max concurrent requests: {PageHandler.max_active}, "
+            f"connections opened: {len(PageHandler.connections)}"
+        )
+        assert PageHandler.max_active <= MAX_CONNECTIONS_PER_HOST
+        assert len(PageHandler.connections) <= MAX_CONNECTIONS_PER_HOST
+
+        # The flaky page succeeds on its second attempt, the missing page is not retried
+        assert stats[f"{base}/flaky"]["attempts"] == 2
+        assert stats[f"{base}/missing"]["attempts"] == 1
+        assert stats[f"{base}/missing"]["error"]
+
+        entry = stats[f"{base}/0"]
+        print(f"Fetch stats for one page: {entry}")
+        assert entry["latency_ms"] > 0
+        assert entry["wire_bytes"] < entry["bytes"]  # The page was sent compressed
+
+        check_http_cache(urls[:10])
+        expected = sorted(d.page_content for d in documents)
+        check_async_loader(urls, base, expected)
+        check_parser_processes(urls, expected)
+        print("WebLoader tests passed.")
+    finally:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()